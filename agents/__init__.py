@@ -1,25 +1,17 @@
-from agents.earnings_surprise_drift_agent import EarningsSurpriseDriftAgent
-from agents.intraday_volatility_spike_agent import IntradayVolatilitySpikeAgent
-from agents.earnings_whisper_surprise_agent import EarningsWhisperSurpriseAgent
-from agents.insider_trading_signal_agent import InsiderTradingSignalAgent
-from agents.intraday_order_book_imbalance_agent import IntradayOrderBookImbalanceAgent
-from agents.intraday_volume_spike_agent import IntradayVolumeSpikeAgent
-from agents.unusual_options_volume_agent import UnusualOptionsVolumeAgent
-from agents.crypto_stablecoin_premium_agent import CryptoStablecoinPremiumAgent
-from agents.distressed_property_agent import DistressedPropertyAgent
-from agents.code_guardian_agent import CodeGuardianAgent
-from agents.cta_flows_agent import CTAFlowsAgent
 """
 Market Inefficiency Detection Agents
 
 This module contains various AI agents for detecting market anomalies
 and inefficiencies across different asset classes and data sources.
+
+Agent modules are imported on first use through agents.registry, so
+importing this package stays cheap.
 """
 
-import importlib
 import logging
 from typing import Type, Optional, List
 from .base_agent import BaseAgent
+from .registry import registry
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +49,7 @@ AVAILABLE_AGENTS = [
 
 def get_agent_class(agent_name: str) -> Optional[Type[BaseAgent]]:
     """
-    Dynamically import and return an agent class by name
+    Resolve an agent class by name, importing its module on first use
     
     Args:
         agent_name: Name of the agent class
@@ -65,31 +57,16 @@ def get_agent_class(agent_name: str) -> Optional[Type[BaseAgent]]:
     Returns:
         Agent class or None if not found
     """
-    try:
-        # Convert agent name to module name (snake_case)
-        module_name = ''.join([
-            '_' + c.lower() if c.isupper() else c for c in agent_name
-        ]).lstrip('_')
-
-        # Import the module
-        module = importlib.import_module(f'agents.{module_name}')
+    return registry.get(agent_name)
 
-        # Get the agent class
-        agent_class = getattr(module, agent_name)
 
-        # Verify it's a BaseAgent subclass
-        if issubclass(agent_class, BaseAgent):
+def __getattr__(name):
+    # `from agents import MacroWatcherAgent` still works, lazily
+    if name[:1].isupper():
+        agent_class = registry.get(name)
+        if agent_class is not None:
             return agent_class
-        else:
-            logger.error(f"{agent_name} is not a BaseAgent subclass")
-            return None
-
-    except ImportError as e:
-        logger.error(f"Could not import agent {agent_name}: {e}")
-        return None
-    except AttributeError as e:
-        logger.error(f"Agent class {agent_name} not found in module: {e}")
-        return None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_all_agents() -> List[Type[BaseAgent]]:
@@ -2,20 +2,33 @@
 Modular Analyzers for Market Analysis Agents
 
 Contains reusable analysis components that can be used by multiple agents.
+
+Analyzers are resolved lazily on first attribute access so importing one
+lightweight analyzer doesn't pull in yfinance and pandas.
 """
 
-from .macro_bubble_detector import MacroBubbleDetector
-from .cds_analyzer import CDSAnalyzer
-from .structured_product_analyzer import StructuredProductAnalyzer
-from .forecaster import ForecasterAnalyzer
-from .regime_detector import RegimeDetector
-from .ensemble import EnsemblePredictor
+import importlib
+
+_EXPORTS = {
+    'MacroBubbleDetector': '.macro_bubble_detector',
+    'CDSAnalyzer': '.cds_analyzer',
+    'StructuredProductAnalyzer': '.structured_product_analyzer',
+    'ForecasterAnalyzer': '.forecaster',
+    'RegimeDetector': '.regime_detector',
+    'EnsemblePredictor': '.ensemble',
+    'RecoveryWaterfallEngine': '.recovery_waterfall',
+    'CapitalStack': '.recovery_waterfall',
+    'LPPLSFit': '.lppls',
+    'fit_lppls': '.lppls',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'MacroBubbleDetector',
-    'CDSAnalyzer', 
-    'StructuredProductAnalyzer',
-    'ForecasterAnalyzer',
-    'RegimeDetector',
-    'EnsemblePredictor'
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
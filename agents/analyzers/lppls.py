@@ -0,0 +1,351 @@
+"""
+LPPLS Calibration Engine
+
+Log-Periodic Power Law Singularity fits of log-prices,
+
+    ln p(t) = A + B f + C1 f cos(ω ln(tc - t)) + C2 f sin(ω ln(tc - t)),
+    f = (tc - t)^m
+
+with the linear parameters (A, B, C1, C2) concentrated out: for any
+(tc, m, ω) they are the closed-form least-squares solution of a 4x4
+normal system (Filimonov & Sornette 2013). The normal-equation moments
+of a whole tc x m x ω grid are built from batched matmuls over the
+(tc, m, N) power-law and (tc, ω, N) phase tensors, so every cell of the
+3-D grid is solved at once; the best cells are then refined by zooming
+in with progressively finer local grids.
+
+`confidence()` fits many shrinking windows ending at the last bar (in a
+long-lived process pool when more than one worker is asked for) and
+reports the DS-LPPLS confidence indicator: the fraction of windows whose
+fit passes the qualification filters, separately for bubbles (B < 0) and
+negative bubbles (B > 0). Pool workers are started with forkserver (spawn
+where that is unavailable), never by forking the caller, which may be a
+threaded scheduler or web worker.
+
+Time is normalized per window to t in [0, 1] (first to last bar), so
+tc is expressed in window lengths and A, B, C1, C2 are dimensionless;
+`tc_days` converts back to bars after the last one.
+
+  python scripts/bench_lppls.py      # fits/s versus a naive scipy fit
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LPPLSGrid:
+    """Search space for the nonlinear parameters (tc in window lengths past the first bar)."""
+    tc: Tuple[float, float] = (1.0, 1.5)
+    m: Tuple[float, float] = (0.1, 0.9)
+    omega: Tuple[float, float] = (6.0, 13.0)
+    tc_n: int = 24
+    m_n: int = 16
+    omega_n: int = 16
+    top_k: int = 3          # cells refined
+    refine_rounds: int = 3
+    refine_n: int = 7       # points per axis in each refinement grid
+
+
+@dataclass(frozen=True)
+class LPPLSFilters:
+    """DS-LPPLS qualification filters (Sornette et al. 2015)."""
+    m: Tuple[float, float] = (0.01, 0.99)
+    omega: Tuple[float, float] = (2.0, 25.0)
+    tc_horizon: float = 0.2         # tc at most this many window lengths past the last bar
+    min_damping: float = 0.5        # m|B| / (ω|C|)
+    min_oscillations: float = 2.5   # (ω / 2π) ln((tc - t1) / (tc - t2))
+
+
+DEFAULT_GRID = LPPLSGrid()
+DEFAULT_FILTERS = LPPLSFilters()
+DEFAULT_WINDOWS = tuple(range(480, 59, -20))   # bars, shrinking
+DEFAULT_WORKERS = 2   # pool size when the caller doesn't configure one
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+_RIDGE = 1e-12
+
+
+@dataclass
+class LPPLSFit:
+    tc: float
+    m: float
+    omega: float
+    A: float
+    B: float
+    C1: float
+    C2: float
+    sse: float
+    n: int
+
+    @property
+    def C(self) -> float:
+        return float(np.hypot(self.C1, self.C2))
+
+    @property
+    def tc_days(self) -> float:
+        """Bars from the last bar to the critical time."""
+        return (self.tc - 1.0) * (self.n - 1)
+
+    @property
+    def damping(self) -> float:
+        return self.m * abs(self.B) / (self.omega * self.C) if self.C > 0 else np.inf
+
+    @property
+    def oscillations(self) -> float:
+        return self.omega / (2 * np.pi) * np.log(self.tc / (self.tc - 1.0))
+
+    @property
+    def rmse(self) -> float:
+        return float(np.sqrt(self.sse / self.n))
+
+    def qualified(self, filters: LPPLSFilters = DEFAULT_FILTERS) -> bool:
+        return (filters.m[0] <= self.m <= filters.m[1]
+                and filters.omega[0] <= self.omega <= filters.omega[1]
+                and self.tc - 1.0 <= filters.tc_horizon
+                and self.damping >= filters.min_damping
+                and self.oscillations >= filters.min_oscillations)
+
+    def predict(self, t: np.ndarray) -> np.ndarray:
+        f = (self.tc - t) ** self.m
+        phase = self.omega * np.log(self.tc - t)
+        return self.A + f * (self.B + self.C1 * np.cos(phase) + self.C2 * np.sin(phase))
+
+
+@dataclass
+class LPPLSConfidence:
+    """DS-LPPLS indicator over a set of shrinking windows."""
+    bubble: float               # share of windows with a qualified B < 0 fit
+    negative_bubble: float      # share with a qualified B > 0 fit
+    windows: int
+    bubble_tc_days: Optional[float]             # median over qualified B < 0 fits, bars past the last one
+    negative_bubble_tc_days: Optional[float]    # same over qualified B > 0 fits
+    fits: List[LPPLSFit] = field(default_factory=list, repr=False)
+
+
+def _grid_sse(t: np.ndarray, y: np.ndarray, tc: np.ndarray, m: np.ndarray,
+              omega: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concentrated SSE and linear parameters for every (tc, m, ω) in the
+    product grid: shapes (T, M, W) and (T, M, W, 4). `y` must be centered.
+    """
+    log_dt = np.log(tc[:, None] - t[None, :])                            # (T, N)
+    f = np.exp(m[None, :, None] * log_dt[:, None, :])                   # (T, M, N)
+    phase = omega[None, :, None] * log_dt[:, None, :]                   # (T, W, N)
+    cos, sin = np.cos(phase), np.sin(phase)
+    cos_t, sin_t = cos.transpose(0, 2, 1), sin.transpose(0, 2, 1)       # (T, N, W)
+    f2, fy = f * f, f * y
+
+    shape = (len(tc), len(m), len(omega))
+    sf = np.broadcast_to(f.sum(-1)[..., None], shape)
+    sff = np.broadcast_to(f2.sum(-1)[..., None], shape)
+    sfy = np.broadcast_to(fy.sum(-1)[..., None], shape)
+    sg, sh = f @ cos_t, f @ sin_t
+    sfg, sfh = f2 @ cos_t, f2 @ sin_t
+    sgg = f2 @ (cos * cos).transpose(0, 2, 1)
+    sgh = f2 @ (cos * sin).transpose(0, 2, 1)
+    shh = f2 @ (sin * sin).transpose(0, 2, 1)
+    sgy, shy = fy @ cos_t, fy @ sin_t
+    n = np.full(shape, float(len(t)))
+
+    xtx = np.stack([
+        np.stack([n, sf, sg, sh], -1),
+        np.stack([sf, sff, sfg, sfh], -1),
+        np.stack([sg, sfg, sgg, sgh], -1),
+        np.stack([sh, sfh, sgh, shh], -1),
+    ], -2)
+    xty = np.stack([np.zeros(shape), sfy, sgy, shy], -1)   # sum(y) = 0 for centered y
+
+    scale = np.trace(xtx, axis1=-2, axis2=-1)[..., None, None]
+    beta = np.linalg.solve(xtx + _RIDGE * scale * np.eye(4), xty[..., None])[..., 0]
+    sse = float(y @ y) - np.einsum("...i,...i->...", beta, xty)
+    sse = np.where(np.isfinite(sse), np.maximum(sse, 0.0), np.inf)
+    return sse, beta
+
+
+def linear_params(t: np.ndarray, y: np.ndarray, tc: float, m: float, omega: float) -> Tuple[np.ndarray, float]:
+    """(A, B, C1, C2) and SSE for one (tc, m, ω), by direct least squares."""
+    f = (tc - t) ** m
+    phase = omega * np.log(tc - t)
+    X = np.column_stack([np.ones_like(t), f, f * np.cos(phase), f * np.sin(phase)])
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    return beta, float(resid @ resid)
+
+
+def _axis(lo: float, hi: float, n: int) -> np.ndarray:
+    return np.linspace(lo, hi, n) if n > 1 else np.array([(lo + hi) / 2])
+
+
+def fit_lppls(log_prices: Sequence[float], grid: LPPLSGrid = DEFAULT_GRID) -> Optional[LPPLSFit]:
+    """Best LPPLS fit of one window of log-prices (oldest first); None if too short."""
+    y = np.asarray(log_prices, dtype=float)
+    n = len(y)
+    if n < 20 or not np.all(np.isfinite(y)):
+        return None
+    t = np.linspace(0.0, 1.0, n)
+    mean = y.mean()
+    yc = y - mean
+
+    tc_lo = max(grid.tc[0], 1.0 + 0.5 / (n - 1))   # strictly after the last bar
+    bounds = ((tc_lo, grid.tc[1]), grid.m, grid.omega)
+    axes = (_axis(tc_lo, grid.tc[1], grid.tc_n), _axis(*grid.m, grid.m_n), _axis(*grid.omega, grid.omega_n))
+    steps = [float(a[1] - a[0]) if len(a) > 1 else 0.0 for a in axes]
+
+    sse, _ = _grid_sse(t, yc, *axes)
+    order = np.argsort(sse, axis=None)[:grid.top_k]
+    candidates = [tuple(axes[d][i] for d, i in enumerate(np.unravel_index(k, sse.shape))) for k in order]
+
+    best = (np.inf, None)
+    for center in candidates:
+        step = list(steps)
+        for _ in range(grid.refine_rounds):
+            local = [_axis(max(lo, c - s), min(hi, c + s), grid.refine_n if s > 0 else 1)
+                     for c, s, (lo, hi) in zip(center, step, bounds)]
+            local_sse, _ = _grid_sse(t, yc, *local)
+            idx = np.unravel_index(int(np.argmin(local_sse)), local_sse.shape)
+            center = tuple(local[d][i] for d, i in enumerate(idx))
+            step = [s * 2 / max(grid.refine_n - 1, 1) for s in step]
+        if local_sse[idx] < best[0]:
+            best = (float(local_sse[idx]), center)
+
+    if best[1] is None:
+        return None
+    tc, m, omega = best[1]
+    beta, sse = linear_params(t, yc, tc, m, omega)
+    return LPPLSFit(tc=float(tc), m=float(m), omega=float(omega), A=float(beta[0] + mean),
+                    B=float(beta[1]), C1=float(beta[2]), C2=float(beta[3]), sse=sse, n=n)
+
+
+def _fit_job(args) -> Optional[LPPLSFit]:
+    log_prices, grid = args
+    try:
+        return fit_lppls(log_prices, grid)
+    except (np.linalg.LinAlgError, FloatingPointError, ValueError) as e:
+        logger.debug(f"LPPLS fit failed: {e}")
+        return None
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Module-level pool, rebuilt only when the requested size changes."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next call builds a fresh one."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_pool():
+    """Stop the worker processes (also run at interpreter exit)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool, _pool_workers = None, 0
+
+
+def fit_windows(jobs: Sequence[np.ndarray], grid: LPPLSGrid = DEFAULT_GRID,
+                workers: Optional[int] = None) -> List[Optional[LPPLSFit]]:
+    """
+    Fit each log-price window; in the shared process pool when more than
+    one worker is asked for (default DEFAULT_WORKERS, capped at the CPU
+    count). If the pool's workers die, it is discarded and the windows
+    are fitted in-process.
+    """
+    workers = min(workers or DEFAULT_WORKERS, os.cpu_count() or 1)
+    args = [(np.asarray(j, dtype=float), grid) for j in jobs]
+    if workers <= 1 or len(args) <= 1:
+        return [_fit_job(a) for a in args]
+    pool = _get_pool(workers)
+    try:
+        return list(pool.map(_fit_job, args, chunksize=max(1, len(args) // (workers * 4))))
+    except BrokenProcessPool as e:
+        logger.warning(f"LPPLS process pool broke ({e}); fitting {len(args)} windows in-process")
+        _discard_pool(pool)
+        return [_fit_job(a) for a in args]
+
+
+def _median_tc_days(fits: List[LPPLSFit]) -> Optional[float]:
+    return float(np.median([f.tc_days for f in fits])) if fits else None
+
+
+def _summarize(fits: List[Optional[LPPLSFit]], filters: LPPLSFilters) -> LPPLSConfidence:
+    valid = [f for f in fits if f is not None]
+    qualified = [f for f in valid if f.qualified(filters)]
+    bubbles = [f for f in qualified if f.B < 0]
+    negative = [f for f in qualified if f.B > 0]
+    windows = len(fits)
+    return LPPLSConfidence(
+        bubble=len(bubbles) / windows if windows else 0.0,
+        negative_bubble=len(negative) / windows if windows else 0.0,
+        windows=windows,
+        bubble_tc_days=_median_tc_days(bubbles),
+        negative_bubble_tc_days=_median_tc_days(negative),
+        fits=valid,
+    )
+
+
+def window_slices(log_prices: np.ndarray, windows: Sequence[int] = DEFAULT_WINDOWS) -> List[np.ndarray]:
+    """Windows ending at the last bar, longest first; lengths beyond the history are dropped."""
+    return [log_prices[-w:] for w in windows if w <= len(log_prices)]
+
+
+def confidence(prices: Sequence[float], windows: Sequence[int] = DEFAULT_WINDOWS,
+               grid: LPPLSGrid = DEFAULT_GRID, filters: LPPLSFilters = DEFAULT_FILTERS,
+               workers: Optional[int] = None) -> LPPLSConfidence:
+    """DS-LPPLS confidence for one price series."""
+    return scan({"_": prices}, windows, grid, filters, workers)["_"]
+
+
+def scan(series: Dict[str, Sequence[float]], windows: Sequence[int] = DEFAULT_WINDOWS,
+         grid: LPPLSGrid = DEFAULT_GRID, filters: LPPLSFilters = DEFAULT_FILTERS,
+         workers: Optional[int] = None) -> Dict[str, LPPLSConfidence]:
+    """DS-LPPLS confidence per symbol; every (symbol, window) fit goes through one pool."""
+    keys, jobs = [], []
+    for symbol, prices in series.items():
+        log_prices = np.log(np.asarray(prices, dtype=float))
+        for window in window_slices(log_prices, windows):
+            keys.append(symbol)
+            jobs.append(window)
+    fits = fit_windows(jobs, grid, workers) if jobs else []
+    by_symbol: Dict[str, List[Optional[LPPLSFit]]] = {s: [] for s in series}
+    for symbol, fit in zip(keys, fits):
+        by_symbol[symbol].append(fit)
+    return {s: _summarize(f, filters) for s, f in by_symbol.items()}
+
+
+def synthetic_lppl(n: int = 300, tc: float = 1.05, m: float = 0.5, omega: float = 8.0,
+                   A: float = 5.0, B: float = -1.0, C1: float = 0.05, C2: float = 0.05,
+                   noise: float = 0.01, seed: int = 0) -> np.ndarray:
+    """Prices following an LPPL bubble on t in [0, 1] plus Gaussian log-noise (tests and benchmarks)."""
+    t = np.linspace(0.0, 1.0, n)
+    fit = LPPLSFit(tc, m, omega, A, B, C1, C2, 0.0, n)
+    rng = np.random.default_rng(seed)
+    return np.exp(fit.predict(t) + rng.normal(0.0, noise, n))
@@ -1,16 +1,47 @@
-n"""
+"""
 Arbitrage Finder Agent
 
 Detects arbitrage opportunities across cryptocurrency exchanges
 by comparing prices for the same assets.
+
+Quotes for every pair on every exchange are fetched concurrently into a
+pairs x exchanges bid/ask matrix (data_sources.quote_matrix); all
+cross-exchange spreads are then evaluated in one vectorized pass, net of
+taker fees on both legs. Exchanges whose taker fee is neither configured
+nor reported by ccxt are charged `default_fee`.
 """
 
 import ccxt
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Tuple
 from .base_agent import BaseAgent
-from data_sources.coinbase_client import CoinbaseClient
+from data_sources.shared import get_coinbase_client, get_exchange
+from data_sources.quote_matrix import QuoteMatrix, fetch_quote_matrix
 from config import Config
 
+DEFAULT_TAKER_FEE = 0.006  # top retail taker tier on the default exchanges
+
+
+def net_spreads(bid: np.ndarray, ask: np.ndarray, fee: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Buy-on-i / sell-on-j returns for every pair, shape (pairs, buy, sell).
+
+    gross[p, i, j] = bid[p, j] / ask[p, i] - 1
+    net[p, i, j]   = bid[p, j] * (1 - fee[p, j]) / (ask[p, i] * (1 + fee[p, i])) - 1
+
+    Same-exchange, unquoted and unknown-fee combinations are NaN.
+    """
+    buy = ask[:, :, None]
+    sell = bid[:, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gross = sell / buy - 1.0
+        net = sell * (1.0 - fee[:, None, :]) / (buy * (1.0 + fee[:, :, None])) - 1.0
+    same = np.eye(bid.shape[1], dtype=bool)[None, :, :]
+    gross = np.where(same, np.nan, gross)
+    net = np.where(same, np.nan, net)
+    return gross, net
+
+
 class ArbitrageFinderAgent(BaseAgent):
     """
     Finds arbitrage opportunities across crypto exchanges
@@ -18,45 +49,35 @@ class ArbitrageFinderAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.coinbase_client = CoinbaseClient()
+        self.coinbase_client = get_coinbase_client()
         
         # Initialize exchanges
         self.exchanges = self._initialize_exchanges()
         
         # Common trading pairs to check (removed BNB since no Binance)
-        self.trading_pairs = [
+        self.trading_pairs = self.config.get('trading_pairs', [
             'BTC/USD',
             'ETH/USD', 
             'ADA/USD',
             'SOL/USD',
             'MATIC/USD'
-        ]
+        ])
         
-        self.min_profit_threshold = Config.ARBITRAGE_PROFIT_THRESHOLD
+        self.min_profit_threshold = self.config.get('min_profit', Config.ARBITRAGE_PROFIT_THRESHOLD)
+        self.fee_overrides = self.config.get('fees', {}) or {}
+        self.default_fee = float(self.config.get('default_fee', DEFAULT_TAKER_FEE))
+        self.fetch_timeout = self.config.get('fetch_timeout', 60)
     
     def _initialize_exchanges(self) -> Dict[str, ccxt.Exchange]:
-        """Initialize exchange connections"""
+        """Shared public exchange connections (markets cached across runs)"""
         exchanges = {}
         
-        try:
-            # Public-only exchanges (no API keys needed)
-            exchanges['coinbase'] = ccxt.coinbase({
-                'sandbox': False,
-                'enableRateLimit': True,
-            })
-            
-            exchanges['kraken'] = ccxt.kraken({
-                'sandbox': False,
-                'enableRateLimit': True,
-            })
-            
-            exchanges['kucoin'] = ccxt.kucoin({
-                'sandbox': False,
-                'enableRateLimit': True,
-            })
-            
-        except Exception as e:
-            self.logger.error(f"Error initializing exchanges: {e}")
+        # Public-only exchanges (no API keys needed)
+        for exchange_id in self.config.get('exchanges', ('coinbase', 'kraken', 'kucoin')):
+            try:
+                exchanges[exchange_id] = get_exchange(exchange_id)
+            except Exception as e:
+                self.logger.error(f"Error initializing {exchange_id}: {e}")
             
         return exchanges
     
@@ -68,115 +89,83 @@ class ArbitrageFinderAgent(BaseAgent):
         if not api_guard("coinbase", "arbitrage finder exchange data"):
             return []
 
+        matrix = fetch_quote_matrix(self.exchanges, self.trading_pairs, timeout_s=self.fetch_timeout)
+        for exchange_name, error in matrix.errors.items():
+            self.logger.warning(f"No quotes from {exchange_name}: {error}")
+        self.logger.debug(
+            f"Quoted {len(matrix.pairs)} pairs x {len(matrix.exchanges)} exchanges in {matrix.elapsed_s:.2f}s"
+        )
+        return self._find_arbitrage_opportunities(matrix)
+
+    def _fee_matrix(self, matrix: QuoteMatrix) -> np.ndarray:
+        """
+        Taker fees per (pair, exchange): config overrides, else the ccxt
+        market fee, else `default_fee`.
+        """
+        fee = matrix.taker_fee.copy()
+        for e, name in enumerate(matrix.exchanges):
+            if name in self.fee_overrides:
+                fee[:, e] = float(self.fee_overrides[name])
+        return np.where(np.isnan(fee), self.default_fee, fee)
+
+    def _find_arbitrage_opportunities(self, matrix: QuoteMatrix) -> List[Dict[str, Any]]:
+        """Best net-of-fee buy/sell route per pair, for pairs above the threshold"""
         findings = []
-        
-        for pair in self.trading_pairs:
-            try:
-                # Get prices from all exchanges
-                prices = self._get_prices_for_pair(pair)
-                
-                if len(prices) < 2:
-                    continue
-                
-                # Find arbitrage opportunities
-                opportunities = self._find_arbitrage_opportunities(pair, prices)
-                findings.extend(opportunities)
-                
-            except Exception as e:
-                self.logger.error(f"Error analyzing pair {pair}: {e}")
-                
-        return findings
-    
-    def _get_prices_for_pair(self, pair: str) -> Dict[str, Dict]:
-        """Get current prices for a trading pair from all exchanges"""
-        prices = {}
-        
-        for exchange_name, exchange in self.exchanges.items():
-            try:
-                # Get ticker data
-                ticker = exchange.fetch_ticker(pair)
-                
-                if ticker and ticker.get('bid') and ticker.get('ask'):
-                    prices[exchange_name] = {
-                        'bid': ticker['bid'],
-                        'ask': ticker['ask'],
-                        'last': ticker.get('last'),
-                        'volume': ticker.get('baseVolume', 0),
-                        'timestamp': ticker.get('timestamp')
-                    }
-                    
-            except Exception as e:
-                # Some exchanges might not have this pair
-                self.logger.debug(f"Could not get {pair} from {exchange_name}: {e}")
-                continue
-                
-        return prices
-    
-    def _find_arbitrage_opportunities(self, pair: str, prices: Dict[str, Dict]) -> List[Dict[str, Any]]:
-        """Find arbitrage opportunities for a trading pair"""
-        findings = []
-        
-        if len(prices) < 2:
+        if not matrix.pairs or len(matrix.exchanges) < 2:
             return findings
         
-        # Find highest bid and lowest ask
-        highest_bid = {'exchange': None, 'price': 0}
-        lowest_ask = {'exchange': None, 'price': float('inf')}
-        
-        for exchange_name, price_data in prices.items():
-            bid = price_data.get('bid', 0)
-            ask = price_data.get('ask', float('inf'))
-            
-            if bid > highest_bid['price']:
-                highest_bid = {'exchange': exchange_name, 'price': bid}
+        fee = self._fee_matrix(matrix)
+        gross, net = net_spreads(matrix.bid, matrix.ask, fee)
                 
-            if ask < lowest_ask['price']:
-                lowest_ask = {'exchange': exchange_name, 'price': ask}
-        
-        # Calculate potential profit
-        if (highest_bid['price'] > 0 and 
-            lowest_ask['price'] < float('inf') and 
-            highest_bid['exchange'] != lowest_ask['exchange']):
-            
-            profit_percent = (highest_bid['price'] - lowest_ask['price']) / lowest_ask['price']
-            
-            if profit_percent > self.min_profit_threshold:
-                # Determine severity based on profit potential
-                if profit_percent > 0.05:  # 5%
-                    severity = 'high'
-                    confidence = 0.9
-                elif profit_percent > 0.03:  # 3%
-                    severity = 'medium'
-                    confidence = 0.8
-                else:
-                    severity = 'low'
-                    confidence = 0.7
+        P, E = len(matrix.pairs), len(matrix.exchanges)
+        flat = np.where(np.isnan(net), -np.inf, net).reshape(P, E * E)
+        best = flat.argmax(axis=1)
+        best_net = flat[np.arange(P), best]
                 
-                # Calculate volumes for analysis
-                buy_volume = prices[lowest_ask['exchange']].get('volume', 0)
-                sell_volume = prices[highest_bid['exchange']].get('volume', 0)
-                min_volume = min(buy_volume, sell_volume)
+        for p in np.flatnonzero(best_net > self.min_profit_threshold):
+            pair = matrix.pairs[p]
+            i, j = divmod(int(best[p]), E)
+            buy_exchange, sell_exchange = matrix.exchanges[i], matrix.exchanges[j]
+            buy_price, sell_price = float(matrix.ask[p, i]), float(matrix.bid[p, j])
+            profit_percent = float(best_net[p])
                 
-                findings.append(self.create_finding(
-                    title=f"Arbitrage Opportunity: {pair}",
-                    description=f"Buy {pair} on {lowest_ask['exchange']} at ${lowest_ask['price']:.4f}, "
-                               f"sell on {highest_bid['exchange']} at ${highest_bid['price']:.4f}. "
-                               f"Potential profit: {profit_percent*100:.2f}%",
-                    severity=severity,
-                    confidence=confidence,
-                    symbol=pair.split('/')[0],
-                    market_type='crypto',
-                    metadata={
-                        'trading_pair': pair,
-                        'buy_exchange': lowest_ask['exchange'],
-                        'sell_exchange': highest_bid['exchange'],
-                        'buy_price': lowest_ask['price'],
-                        'sell_price': highest_bid['price'],
-                        'profit_percent': profit_percent,
-                        'profit_absolute': highest_bid['price'] - lowest_ask['price'],
-                        'min_volume': min_volume,
-                        'all_prices': prices
-                    }
-                ))
+            # Determine severity based on profit potential
+            if profit_percent > 0.05:  # 5%
+                severity = 'high'
+                confidence = 0.9
+            elif profit_percent > 0.03:  # 3%
+                severity = 'medium'
+                confidence = 0.8
+            else:
+                severity = 'low'
+                confidence = 0.7
+
+            prices = matrix.quotes(p)
+            min_volume = min(prices[buy_exchange]['volume'], prices[sell_exchange]['volume'])
+
+            findings.append(self.create_finding(
+                title=f"Arbitrage Opportunity: {pair}",
+                description=f"Buy {pair} on {buy_exchange} at ${buy_price:.4f}, "
+                           f"sell on {sell_exchange} at ${sell_price:.4f}. "
+                           f"Potential profit after fees: {profit_percent*100:.2f}%",
+                severity=severity,
+                confidence=confidence,
+                symbol=pair.split('/')[0],
+                market_type='crypto',
+                metadata={
+                    'trading_pair': pair,
+                    'buy_exchange': buy_exchange,
+                    'sell_exchange': sell_exchange,
+                    'buy_price': buy_price,
+                    'sell_price': sell_price,
+                    'profit_percent': profit_percent,
+                    'gross_profit_percent': float(gross[p, i, j]),
+                    'buy_fee': float(fee[p, i]),
+                    'sell_fee': float(fee[p, j]),
+                    'profit_absolute': sell_price - buy_price,
+                    'min_volume': min_volume,
+                    'all_prices': prices
+                }
+            ))
                 
         return findings
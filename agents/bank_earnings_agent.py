@@ -7,7 +7,7 @@ Analyzes bank sector earnings and credit metrics including NIM proxies
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -15,7 +15,7 @@ class BankEarningsAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("BankEarningsAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.bank_stocks = ['JPM', 'BAC', 'WFC', 'GS', 'MS', 'C', 'USB', 'PNC', 'TFC', 'SCHW']
         self.yield_curve_long = '^TNX'
         self.yield_curve_short = '^IRX'
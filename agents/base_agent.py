@@ -5,8 +5,9 @@ All market inefficiency detection agents inherit from this base class.
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 from config import Config
 from telemetry.instrumentation import instrument_agent_call
@@ -18,6 +19,18 @@ class BaseAgent(ABC):
     Base class for all market inefficiency detection agents
     """
     
+    # Keep one instance alive between scheduled runs (see agents.lifecycle).
+    # Set False for agents whose __init__ must run fresh every time.
+    warm_instance = True
+    
+    # Skip analyze() when memo_inputs() are unchanged since the last run
+    # (see agents.memo). Overridable per agent with the config key 'memoize'.
+    memoize = False
+    
+    # Per-run scratch attributes and the factory that builds each empty
+    # value; reset() rebuilds them before every warm run.
+    run_state: Dict[str, Callable[[], Any]] = {}
+    
     def __init__(self, name: str = None):
         self.name = name or self.__class__.__name__
         self.config = Config.get_agent_config(self.name)
@@ -62,15 +75,82 @@ class BaseAgent(ABC):
                 
             return findings or []
         
+        from agents.memo import run_memo
+        from services.rate_budget import agent_priority, priority_scope
         try:
-            return instrument_agent_call(
-                agent_name=self.name,
-                fn=_execute
-            )
+            cpu_start = time.thread_time()
+            with priority_scope(agent_priority(self.name)):
+                findings = instrument_agent_call(
+                    agent_name=self.name,
+                    fn=_execute
+                )
+            run_memo.store(self, time.thread_time() - cpu_start)
+            return findings
         except Exception as e:
             self.logger.error(f"Error in {self.name}: {e}", exc_info=True)
             return []
     
+    def memo_symbols(self) -> List[str]:
+        """Symbols whose last bar the run depends on (config 'memo_symbols' or self.instruments)."""
+        symbols = self.config.get('memo_symbols')
+        if symbols is None:
+            symbols = getattr(self, 'instruments', None) or []
+        return list(symbols)
+    
+    def memo_inputs(self) -> Optional[Dict[str, Any]]:
+        """
+        Declared inputs of a run for agents.memo, or None if this agent
+        isn't memoized. Override to add inputs analyze() depends on.
+        """
+        if not self.config.get('memoize', self.memoize):
+            return None
+        from agents.memo import file_stamps, symbol_stamps
+        return {
+            'config': self.config,
+            'bars': symbol_stamps(self.name, self.memo_symbols()),
+            'files': file_stamps(self.config.get('memo_files') or []),
+        }
+    
+    def reset(self):
+        """
+        Per-run hook called on a warm instance before each run: rebuilds
+        every attribute named in `run_state` from its factory.
+        
+        Override (calling super) to clear other state that must not leak
+        between runs.
+        """
+        for name, factory in self.run_state.items():
+            setattr(self, name, factory())
+    
+    def refresh(self):
+        """
+        Periodic hook for warm instances: reload config and any cached
+        reference data. Shared clients are left alone.
+        """
+        self.config = Config.get_agent_config(self.name)
+    
+    def close(self):
+        """Release resources owned by this instance (not shared clients)."""
+        pass
+
+    def features(self, symbol: str, names: List[str], bars: Any = None,
+                 asof: Any = None, lag: int = 0) -> Dict[str, float]:
+        """
+        Named features (see features.definitions) for `symbol` from the
+        shared feature store, after merging `bars` into it if given. Only
+        bars the store hasn't seen are computed.
+        """
+        from features import feature_store
+        if bars is not None:
+            feature_store.update(symbol, bars)
+        return feature_store.latest(symbol, names, asof=asof, lag=lag)
+    
+    def market_features(self, names: List[str], asof: Any = None, lag: int = 0) -> Dict[str, float]:
+        """Cross-symbol features (vix, yield_curve_spread) from the shared feature store."""
+        from features import feature_store
+        from features.store import MARKET
+        return feature_store.latest(MARKET, names, asof=asof, lag=lag)
+    
     def create_finding(self, 
                       title: str,
                       description: str,
@@ -7,7 +7,7 @@ broader financial market instability.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 class BondStressAgent(BaseAgent):
@@ -17,7 +17,7 @@ class BondStressAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Bond instruments to monitor
         self.bond_instruments = {
@@ -30,6 +30,9 @@ class BondStressAgent(BaseAgent):
             'IEF': {'name': '7-10Y Treasury', 'type': 'treasury'}
         }
     
+    def memo_symbols(self) -> List[str]:
+        return list(self.bond_instruments.keys())
+    
     def analyze(self) -> List[Dict[str, Any]]:
         """
         Analyze bond markets for stress signals
@@ -125,8 +128,12 @@ class BondStressAgent(BaseAgent):
             
             for symbol, bond_info in bond_data.items():
                 if bond_info['info']['type'] == 'treasury':
-                    current_price = bond_info['data']['Close'].iloc[-1]
-                    prev_price = bond_info['data']['Close'].iloc[-30] if len(bond_info['data']) >= 30 else bond_info['data']['Close'].iloc[0]
+                    # Through the feature store, which keeps history across runs:
+                    # the 30d fetch alone is ~21 bars, short of the 30-bar lookback
+                    current_price = self.features(symbol, ['close'], bars=bond_info['data'])['close']
+                    prev_price = self.features(symbol, ['close'], lag=29)['close']
+                    if np.isnan(prev_price):
+                        prev_price = bond_info['data']['Close'].iloc[0]
                     
                     # For treasury securities, approximate yield movement (inverse to price)
                     # This is simplified - actual implementation would use real yield data
@@ -141,6 +148,8 @@ class BondStressAgent(BaseAgent):
                 ten_year_change = yields['^TNX']['yield_change']
                 three_month_change = yields['^IRX']['yield_change']
                 
+                spread = self.market_features(['yield_curve_spread'])['yield_curve_spread']
+                
                 # If short rates rising faster than long rates
                 if three_month_change > ten_year_change + 0.02:
                     findings.append(self.create_finding(
@@ -156,7 +165,8 @@ class BondStressAgent(BaseAgent):
                         metadata={
                             'three_month_change': three_month_change,
                             'ten_year_change': ten_year_change,
-                            'spread_change': three_month_change - ten_year_change
+                            'spread_change': three_month_change - ten_year_change,
+                            'yield_curve_spread': spread if not np.isnan(spread) else None
                         }
                     ))
                     
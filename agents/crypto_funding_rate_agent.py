@@ -7,7 +7,7 @@ that could indicate market imbalances or excessive leverage.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.coinbase_client import CoinbaseClient
+from data_sources.shared import get_coinbase_client
 
 class CryptoFundingRateAgent(BaseAgent):
     """
@@ -18,7 +18,7 @@ class CryptoFundingRateAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.coinbase_client = CoinbaseClient()
+        self.coinbase_client = get_coinbase_client()
         
         # Symbols to monitor (removed BNB since no Binance)
         self.symbols = [
@@ -48,10 +48,13 @@ class CryptoFundingRateAgent(BaseAgent):
         # Convert symbols to Coinbase format
         coinbase_symbols = [symbol.replace('USD', '/USD') for symbol in self.symbols]
         
+        # Get current price and volatility data instead of funding rates
+        # (one concurrent batch rather than one request after another)
+        tickers = self.coinbase_client.get_tickers(coinbase_symbols)
+        
         for symbol in coinbase_symbols:
             try:
-                # Get current price and volatility data instead of funding rates
-                ticker_data = self.coinbase_client.get_ticker(symbol)
+                ticker_data = tickers.get(symbol)
                 if not ticker_data:
                     continue
                 
@@ -24,8 +24,8 @@ from .analyzers.crypto_profile import CryptoProfileAnalyzer
 from .analyzers.crypto_vwap import CryptoVWAPAnalyzer
 from .analyzers.crypto_risk_gate import CryptoRiskGate
 from .analyzers.crypto_ensemble import CryptoEnsemblePredictor, CryptoRegimeDetector
-from data_sources.coinbase_client import CoinbaseClient
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_coinbase_client
+from data_sources.shared import get_yahoo_client
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +41,8 @@ class CryptoPredictionAgent(BaseAgent):
     def __init__(self):
         super().__init__()
         
-        self.coinbase_client = CoinbaseClient()
-        self.yahoo_client = YahooFinanceClient()
+        self.coinbase_client = get_coinbase_client()
+        self.yahoo_client = get_yahoo_client()
         
         self.technical_analyzer = CryptoTechnicalAnalyzer()
         self.orderflow_analyzer = CryptoOrderflowAnalyzer()
@@ -118,9 +118,18 @@ class CryptoPredictionAgent(BaseAgent):
         """
         findings = []
         
+        # Fetch every instrument's bars and ticker concurrently up front
+        price_data = self.yahoo_client.get_price_data_many(
+            [i['symbol'] for i in self.instruments], period='60d')
+        tickers = self.coinbase_client.get_tickers(
+            [i['coinbase_symbol'] for i in self.instruments])
+        
         for instrument in self.instruments:
             try:
-                prediction = self._generate_prediction(instrument)
+                prediction = self._generate_prediction(
+                    instrument,
+                    price_data=price_data.get(instrument['symbol']),
+                    ticker=tickers.get(instrument['coinbase_symbol']))
                 if prediction and prediction.get('status') == 'success':
                     finding = self._create_finding(prediction, instrument)
                     if finding:
@@ -132,11 +141,13 @@ class CryptoPredictionAgent(BaseAgent):
         
         return findings
     
-    def _generate_prediction(self, instrument: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Generate prediction for a single cryptocurrency"""
+    def _generate_prediction(self, instrument: Dict[str, Any], price_data=None,
+                             ticker: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Generate prediction for a single cryptocurrency (prefetched data if given)"""
         symbol = instrument['symbol']
         
-        price_data = self.yahoo_client.get_price_data(symbol, period='60d')
+        if price_data is None:
+            price_data = self.yahoo_client.get_price_data(symbol, period='60d')
         
         if price_data is None or len(price_data) < 30:
             self.logger.warning(f"Insufficient data for {symbol}")
@@ -144,7 +155,7 @@ class CryptoPredictionAgent(BaseAgent):
         
         technical = self.technical_analyzer.analyze(price_data)
         
-        ticker_data = self._get_ticker_data(instrument['coinbase_symbol'])
+        ticker_data = self._get_ticker_data(instrument['coinbase_symbol'], ticker)
         funding_rate = ticker_data.get('funding_rate')
         oi = ticker_data.get('open_interest')
         oi_change = ticker_data.get('oi_change_pct')
@@ -218,10 +229,11 @@ class CryptoPredictionAgent(BaseAgent):
         
         return result
     
-    def _get_ticker_data(self, coinbase_symbol: str) -> Dict[str, Any]:
-        """Get ticker data from Coinbase"""
+    def _get_ticker_data(self, coinbase_symbol: str, ticker: Optional[Dict] = None) -> Dict[str, Any]:
+        """Get ticker data from Coinbase (or normalize a prefetched ticker)"""
         try:
-            ticker = self.coinbase_client.get_ticker(coinbase_symbol)
+            if ticker is None:
+                ticker = self.coinbase_client.get_ticker(coinbase_symbol)
             if ticker:
                 return {
                     'last_price': float(ticker.get('last', 0)),
@@ -19,7 +19,7 @@ from .base_agent import BaseAgent
 from .analyzers.forecaster import ForecasterAnalyzer
 from .analyzers.regime_detector import RegimeDetector
 from .analyzers.ensemble import EnsemblePredictor
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class DailyPredictionAgent(BaseAgent):
     def __init__(self):
         super().__init__()
         
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.forecaster = ForecasterAnalyzer()
         self.regime_detector = RegimeDetector()
         self.ensemble = EnsemblePredictor()
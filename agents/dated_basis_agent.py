@@ -22,6 +22,8 @@ class DatedBasisAgent(BaseAgent):
     roll scheduling opportunities.
     """
 
+    run_state = {"basis_data": dict, "roll_dates": dict}
+
     def __init__(self, name: Optional[str] = None):
         super().__init__(name if name else self.__class__.__name__)
         self.basis_data = {}
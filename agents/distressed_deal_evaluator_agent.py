@@ -12,6 +12,8 @@ Enhanced with frameworks from Moyer's "Distressed Debt Analysis":
 - Enhanced liquidation valuations by asset class
 - Fulcrum security identification
 - Recovery waterfall with plan vs true value scenarios
+- Monte Carlo recovery distributions, fulcrum probabilities and percentile
+  IRRs from the shared vectorized waterfall engine (agents.analyzers.recovery_waterfall)
 
 Analysis-only. Sandbox-editable. Non-execution-sensitive.
 """
@@ -24,6 +26,13 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from agents.analyzers.recovery_waterfall import (
+    CapitalStack,
+    RecoveryWaterfallEngine,
+    ScenarioSet,
+    deal_seed,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,6 +178,9 @@ class DealEvaluation:
     source: str
     timestamp: str
 
+    # Monte Carlo recovery distribution (EV draws around the scenarios)
+    recovery_distribution: Dict[str, Any] = field(default_factory=dict)
+
 
 class DistressedDealEvaluatorAgent:
     """
@@ -273,8 +285,15 @@ class DistressedDealEvaluatorAgent:
         "guaranty_enforceability",   # Inter-company guarantees
     ]
 
+    # Monte Carlo EV draws per deal and lognormal EV dispersion around each scenario
+    RECOVERY_DRAWS = 5000
+    SCENARIO_EV_VOL = 0.15
+
     def __init__(self):
         self.deal_sources = self._load_deal_sources()
+        self.recovery_engine = RecoveryWaterfallEngine(
+            n_draws=self.RECOVERY_DRAWS, ev_vol=self.SCENARIO_EV_VOL
+        )
 
     def _load_deal_sources(self) -> List[Dict[str, Any]]:
         """Load deal data sources from environment."""
@@ -302,9 +321,19 @@ class DistressedDealEvaluatorAgent:
         signals = []
         deals = self._fetch_deals()
         
+        prepared = []
         for deal in deals:
             try:
-                evaluation = self.evaluate_deal(deal)
+                prepared.append(self._prepare_deal(deal))
+            except Exception as e:
+                logger.error(f"[DistressedDealEvaluator] Failed to evaluate deal: {e}")
+        
+        # One batched Monte Carlo pass across every deal in the sweep
+        distributions = self._simulate_recoveries(prepared)
+        
+        for ctx, distribution in zip(prepared, distributions):
+            try:
+                evaluation = self._complete_evaluation(ctx, distribution)
                 if evaluation and evaluation.signal_strength >= self.MIN_SIGNAL_STRENGTH:
                     signals.append(asdict(evaluation))
             except Exception as e:
@@ -319,6 +348,11 @@ class DistressedDealEvaluatorAgent:
         """
         Perform comprehensive evaluation of a single distressed deal.
         """
+        ctx = self._prepare_deal(deal)
+        return self._complete_evaluation(ctx, self._simulate_recoveries([ctx])[0])
+
+    def _prepare_deal(self, deal: Dict[str, Any]) -> Dict[str, Any]:
+        """Steps 1-7: distress, EBITDA, capital structure, valuation, fulcrum and scenarios."""
         company = deal.get("company_name", "Unknown")
         deal_id = deal.get("deal_id", f"deal-{hash(company) % 10000}")
         industry = deal.get("industry", "unknown")
@@ -358,6 +392,55 @@ class DistressedDealEvaluatorAgent:
             deal, cap_structure, going_concern, liquidation
         )
         
+        return {
+            "deal": deal,
+            "company": company,
+            "deal_id": deal_id,
+            "industry": industry,
+            "z_score": z_score,
+            "distress_level": distress_level,
+            "prob_default": prob_default,
+            "credit_rating": credit_rating,
+            "ebitda_analysis": ebitda_analysis,
+            "cap_structure": cap_structure,
+            "total_debt": total_debt,
+            "net_debt": net_debt,
+            "leverage_metrics": leverage_metrics,
+            "going_concern": going_concern,
+            "liquidation": liquidation,
+            "ev_midpoint": ev_midpoint,
+            "fulcrum": fulcrum,
+            "fulcrum_price": fulcrum_price,
+            "implied_ev": implied_ev,
+            "scenarios": scenarios,
+        }
+
+    def _simulate_recoveries(self, prepared: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Recovery distributions for prepared deals, as one engine batch."""
+        if not prepared:
+            return []
+        return self.recovery_engine.simulate(
+            [CapitalStack.from_layers(c["cap_structure"]) for c in prepared],
+            [ScenarioSet.from_scenarios(c["scenarios"]) for c in prepared],
+            entry_securities=[c["fulcrum"] for c in prepared],
+            seeds=[deal_seed(c["deal_id"]) for c in prepared],
+        )
+
+    def _complete_evaluation(
+        self, ctx: Dict[str, Any], distribution: Dict[str, Any]
+    ) -> Optional[DealEvaluation]:
+        """Steps 8-11: returns, arbitrage, signal and thesis."""
+        deal = ctx["deal"]
+        company, deal_id, industry = ctx["company"], ctx["deal_id"], ctx["industry"]
+        z_score, distress_level = ctx["z_score"], ctx["distress_level"]
+        prob_default, credit_rating = ctx["prob_default"], ctx["credit_rating"]
+        ebitda_analysis, cap_structure = ctx["ebitda_analysis"], ctx["cap_structure"]
+        total_debt, net_debt = ctx["total_debt"], ctx["net_debt"]
+        leverage_metrics = ctx["leverage_metrics"]
+        going_concern, liquidation, ev_midpoint = ctx["going_concern"], ctx["liquidation"], ctx["ev_midpoint"]
+        fulcrum, fulcrum_price, implied_ev = ctx["fulcrum"], ctx["fulcrum_price"], ctx["implied_ev"]
+        scenarios = ctx["scenarios"]
+        
         # 8. Calculate weighted returns
         plan_recovery, true_recovery, weighted_recovery, expected_irr = \
             self._calculate_weighted_returns(scenarios, fulcrum_price)
@@ -424,7 +507,8 @@ class DistressedDealEvaluatorAgent:
             thesis=thesis,
             key_risks=key_risks,
             source=deal.get("source", "direct"),
-            timestamp=datetime.utcnow().isoformat() + "Z"
+            timestamp=datetime.utcnow().isoformat() + "Z",
+            recovery_distribution=distribution,
         )
 
     def _calculate_altman_z(self, deal: Dict[str, Any]) -> float:
@@ -1081,88 +1165,36 @@ class DistressedDealEvaluatorAgent:
         - Plan value: Conservative (management's view)
         - True value: What market believes (often higher)
         """
-        scenarios = []
-        
-        # PLAN VALUE SCENARIOS (Conservative)
-        
-        # 1. Going Concern Restructure - Plan Value
-        plan_gc = going_concern * 0.90  # Plan typically conservative
-        gc_recovery = self._waterfall_recovery(cap_structure, plan_gc)
-        scenarios.append({
-            "scenario_name": "going_concern_plan",
-            "probability": 0.20,
-            "enterprise_value": plan_gc,
-            "recovery_by_class": gc_recovery,
-            "equity_value": max(0, plan_gc - sum(l.principal for l in cap_structure)),
-            "timeline_months": 12,
-            "plan_vs_true": "plan"
-        })
-        
-        # 2. 363 Sale - Plan Value
-        sale_plan = going_concern * 0.70
-        sale_recovery = self._waterfall_recovery(cap_structure, sale_plan)
-        scenarios.append({
-            "scenario_name": "section_363_sale_plan",
-            "probability": 0.15,
-            "enterprise_value": sale_plan,
-            "recovery_by_class": sale_recovery,
-            "equity_value": 0,
-            "timeline_months": 9,
-            "plan_vs_true": "plan"
-        })
-        
-        # TRUE VALUE SCENARIOS (Market's View)
-        
-        # 3. Going Concern - True Value (Moyer: often 10-20% higher than plan)
-        true_gc = going_concern * 1.10
-        true_gc_recovery = self._waterfall_recovery(cap_structure, true_gc)
-        scenarios.append({
-            "scenario_name": "going_concern_true",
-            "probability": 0.25,
-            "enterprise_value": true_gc,
-            "recovery_by_class": true_gc_recovery,
-            "equity_value": max(0, true_gc - sum(l.principal for l in cap_structure)),
-            "timeline_months": 12,
-            "plan_vs_true": "true"
-        })
-        
-        # 4. 363 Sale - True Value
-        sale_true = going_concern * 0.85
-        sale_true_recovery = self._waterfall_recovery(cap_structure, sale_true)
-        scenarios.append({
-            "scenario_name": "section_363_sale_true",
-            "probability": 0.20,
-            "enterprise_value": sale_true,
-            "recovery_by_class": sale_true_recovery,
-            "equity_value": 0,
-            "timeline_months": 9,
-            "plan_vs_true": "true"
-        })
-        
-        # 5. Contested Chapter 11
         contested = (going_concern + liquidation) / 2
-        contested_recovery = self._waterfall_recovery(cap_structure, contested)
-        scenarios.append({
-            "scenario_name": "contested_chapter_11",
-            "probability": 0.10,
-            "enterprise_value": contested,
-            "recovery_by_class": contested_recovery,
-            "equity_value": 0,
-            "timeline_months": 24,
-            "plan_vs_true": "plan"
-        })
+        total_principal = sum(l.principal for l in cap_structure)
+        
+        # (name, probability, EV, timeline, plan/true, equity value)
+        # Plan value is conservative (management's view); true value is the
+        # market's view, often 10-20% higher than plan (Moyer)
+        specs = [
+            ("going_concern_plan", 0.20, going_concern * 0.90, 12, "plan", True),
+            ("section_363_sale_plan", 0.15, going_concern * 0.70, 9, "plan", False),
+            ("going_concern_true", 0.25, going_concern * 1.10, 12, "true", True),
+            ("section_363_sale_true", 0.20, going_concern * 0.85, 9, "true", False),
+            ("contested_chapter_11", 0.10, contested, 24, "plan", False),
+            ("chapter_7_liquidation", 0.10, liquidation, 18, "liquidation", False),
+        ]
         
-        # 6. Liquidation
-        liq_recovery = self._waterfall_recovery(cap_structure, liquidation)
-        scenarios.append({
-            "scenario_name": "chapter_7_liquidation",
-            "probability": 0.10,
-            "enterprise_value": liquidation,
-            "recovery_by_class": liq_recovery,
-            "equity_value": 0,
-            "timeline_months": 18,
-            "plan_vs_true": "liquidation"
-        })
+        recoveries = self.recovery_engine.waterfall_points(
+            CapitalStack.from_layers(cap_structure), [ev for _, _, ev, _, _, _ in specs]
+        )
+        
+        scenarios = []
+        for (name, prob, ev, months, plan_vs_true, residual), recovery in zip(specs, recoveries):
+            scenarios.append({
+                "scenario_name": name,
+                "probability": prob,
+                "enterprise_value": ev,
+                "recovery_by_class": recovery,
+                "equity_value": max(0, ev - total_principal) if residual else 0,
+                "timeline_months": months,
+                "plan_vs_true": plan_vs_true
+            })
         
         return scenarios
 
@@ -1172,23 +1204,7 @@ class DistressedDealEvaluatorAgent:
         available_value: float
     ) -> Dict[str, float]:
         """Calculate recovery waterfall per Moyer absolute priority rule."""
-        recovery = {}
-        remaining = available_value
-        
-        for layer in sorted(cap_structure, key=lambda x: x.seniority):
-            claim = layer.principal + layer.accrued_interest
-            
-            if remaining >= claim:
-                recovery[layer.name] = 100.0
-                remaining -= claim
-            elif remaining > 0:
-                recovery[layer.name] = (remaining / claim) * 100
-                remaining = 0
-            else:
-                recovery[layer.name] = 0.0
-        
-        recovery["Equity"] = remaining if remaining > 0 else 0
-        return recovery
+        return self.recovery_engine.waterfall(CapitalStack.from_layers(cap_structure), available_value)
 
     def _calculate_weighted_returns(
         self,
@@ -8,7 +8,7 @@ price drift before earnings announcements.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -16,7 +16,7 @@ class EarningsSurpriseDetectorAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("EarningsSurpriseDetectorAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.instruments = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'TSLA', 'JPM', 'BAC', 'GS', 'WFC']
         self.volume_spike_threshold = 1.5
         self.drift_threshold = 0.03
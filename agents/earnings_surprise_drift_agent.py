@@ -9,7 +9,7 @@ import logging
 from typing import Any, Dict, List
 from datetime import datetime, timedelta
 from agents.base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class EarningsSurpriseDriftAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("EarningsSurpriseDriftAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Thresholds
         self.surprise_threshold = 0.05  # 5% earnings surprise
@@ -71,8 +71,8 @@ class EarningsWhisperSurpriseAgent(BaseAgent):
         """
         try:
             # Try to use Yahoo Finance or other data source
-            from data_sources.yahoo_finance_client import YahooFinanceClient
-            client = YahooFinanceClient()
+            from data_sources.shared import get_yahoo_client
+            client = get_yahoo_client()
             
             earnings_calendar = []
             for symbol in self.watchlist:
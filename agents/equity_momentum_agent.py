@@ -6,7 +6,7 @@ Monitors equity markets for momentum anomalies and unusual patterns.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 class EquityMomentumAgent(BaseAgent):
@@ -16,7 +16,7 @@ class EquityMomentumAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Key equity instruments to monitor
         self.instruments = [
@@ -7,7 +7,7 @@ including volume spikes, bid-ask spread compression, and unusual block trades.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -15,7 +15,7 @@ class HighFrequencyFlowAnalysisAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("HighFrequencyFlowAnalysisAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.instruments = ['SPY', 'QQQ', 'IWM', 'AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN']
         self.volume_spike_threshold = 2.0
         self.block_trade_threshold = 1.5
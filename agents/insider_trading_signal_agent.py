@@ -4,13 +4,17 @@ Insider Trading Signal Agent
 Detects potential insider trading signals by analyzing unusual patterns in 
 insider transaction filings (SEC Form 4) combined with abnormal short-term 
 price movements and volume spikes in equities.
+
+Form 4 transactions come from the local insider index
+(data_sources.edgar_form4), refreshed once per run from the EDGAR daily
+index; market-wide buying clusters are found with one local query.
 """
 import logging
-import requests
 from typing import Any, Dict, List
 from datetime import datetime, timedelta
 from agents.base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.edgar_form4 import get_form4_ingester, get_insider_store
+from data_sources.shared import get_yahoo_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +24,8 @@ WATCHLIST_SYMBOLS = [
     'V', 'JNJ', 'WMT', 'PG', 'UNH', 'HD', 'BAC', 'DIS', 'NFLX', 'CRM'
 ]
 
-SEC_EDGAR_BASE = "https://data.sec.gov"
+# Open-market purchases (P) and sales (S); grants, exercises and gifts are ignored
+SIGNAL_CODES = ('P', 'S')
 
 
 class InsiderTradingSignalAgent(BaseAgent):
@@ -32,7 +37,8 @@ class InsiderTradingSignalAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("InsiderTradingSignalAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
+        self.store = get_insider_store()
         
         # Thresholds for significance
         self.large_transaction_threshold = 100000  # $100k+ transaction
@@ -62,6 +68,8 @@ class InsiderTradingSignalAgent(BaseAgent):
         """
         findings = []
         
+        updated = self._refresh_insider_index()
+        
         for symbol in WATCHLIST_SYMBOLS:
             try:
                 # Get insider transactions
@@ -87,71 +95,56 @@ class InsiderTradingSignalAgent(BaseAgent):
                 self.logger.error(f"Error analyzing insider activity for {symbol}: {e}")
                 continue
         
+        findings.extend(self._market_wide_clusters(updated))
+        
         return findings
     
+    def _refresh_insider_index(self) -> List[str]:
+        """Pull new EDGAR index days and queued Form 4s; returns symbols with new transactions."""
+        from services.api_toggle import api_guard
+        if not api_guard("sec_edgar", "Form 4 index refresh"):
+            return []
+        try:
+            result = get_form4_ingester().run(
+                max_filings=self.config.get('max_filings_per_run', 500))
+            self.logger.info(
+                f"Form 4 index: {result['queued']} filings queued, "
+                f"{len(result['symbols'])} issuers updated, {result['filings']['queued']} pending")
+            return result['symbols']
+        except Exception as e:
+            self.logger.warning(f"Form 4 index refresh failed, using local data: {e}")
+            return []
+    
     def _fetch_insider_transactions(self, symbol: str) -> List[Dict]:
         """
-        Fetch recent insider transactions for a symbol.
-        Uses SEC EDGAR API for Form 4 filings.
+        Insider purchases and sales for a symbol over the last 30 days from
+        the local Form 4 index, one entry per insider and direction.
         """
-        transactions = []
+        cutoff_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        rows = self.store.transactions(symbol=symbol, since=cutoff_date, codes=SIGNAL_CODES)
         
-        try:
-            # SEC EDGAR requires a User-Agent header
-            headers = {
-                "User-Agent": "MarketInefficiencyPlatform contact@example.com",
-                "Accept": "application/json"
-            }
-            
-            # Search for recent Form 4 filings for this ticker
-            # Note: SEC EDGAR full-text search is limited, using company tickers endpoint
-            search_url = f"{SEC_EDGAR_BASE}/submissions/CIK{self._get_cik(symbol)}.json"
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                filings = data.get('filings', {}).get('recent', {})
-                
-                # Look for Form 4 filings in the last 30 days
-                forms = filings.get('form', [])
-                dates = filings.get('filingDate', [])
-                
-                cutoff_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                
-                for i, (form, date) in enumerate(zip(forms, dates)):
-                    if form == '4' and date >= cutoff_date:
-                        transactions.append({
-                            'date': date,
-                            'form': form,
-                            'index': i
-                        })
-                        
-        except requests.RequestException as e:
-            self.logger.debug(f"Could not fetch SEC filings for {symbol}: {e}")
-        except Exception as e:
-            self.logger.debug(f"Error processing SEC data for {symbol}: {e}")
+        transactions = {}
+        for row in rows:
+            key = (row['owner_cik'], row['code'])
+            entry = transactions.get(key)
+            if entry is None:
+                entry = transactions[key] = {
+                    'date': row['tx_date'],
+                    'transaction_type': row['code'],
+                    'value': 0.0,
+                    'shares': 0,
+                    'role': row['role'],
+                    'insider': row['owner_name'],
+                    'filed': row['filed'],
+                }
+            entry['value'] += row['value'] or 0.0
+            entry['shares'] += int(row['shares'] or 0)
         
-        # If SEC data unavailable, generate synthetic recent activity for demo
-        if not transactions:
-            transactions = self._generate_synthetic_insider_data(symbol)
+        # If the index has never been populated, generate synthetic recent activity for demo
+        if not transactions and not self.store.has_data():
+            return self._generate_synthetic_insider_data(symbol)
         
-        return transactions
-    
-    def _get_cik(self, symbol: str) -> str:
-        """Get CIK number for a ticker symbol (simplified lookup)."""
-        # Simplified CIK mapping for major tickers
-        cik_map = {
-            'AAPL': '0000320193',
-            'MSFT': '0000789019',
-            'GOOGL': '0001652044',
-            'AMZN': '0001018724',
-            'TSLA': '0001318605',
-            'META': '0001326801',
-            'NVDA': '0001045810',
-            'JPM': '0000019617',
-        }
-        return cik_map.get(symbol, '0000000000')
+        return sorted(transactions.values(), key=lambda t: t['value'], reverse=True)
     
     def _generate_synthetic_insider_data(self, symbol: str) -> List[Dict]:
         """Generate realistic synthetic insider activity for testing."""
@@ -323,6 +316,47 @@ class InsiderTradingSignalAgent(BaseAgent):
         
         return findings
     
+    def _market_wide_clusters(self, updated: List[str]) -> List[Dict[str, Any]]:
+        """
+        Buying clusters across every issuer in the index (outside the
+        watchlist, which is analyzed above), reported when this run
+        ingested new transactions for the issuer.
+        """
+        findings = []
+        if not updated:
+            return findings
+        
+        cutoff_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        fresh = set(updated) - set(WATCHLIST_SYMBOLS)
+        for cluster in self.store.clusters(since=cutoff_date, code='P', min_insiders=self.cluster_threshold,
+                                           min_value=self.large_transaction_threshold):
+            symbol = cluster['symbol']
+            if symbol not in fresh:
+                continue
+            insiders, total_value = cluster['insiders'], cluster['total_value']
+            findings.append(self.create_finding(
+                title=f"Insider Buying Cluster: {symbol}",
+                description=(
+                    f"{insiders} insiders of {cluster['issuer_name'] or symbol} bought shares on the open market "
+                    f"between {cluster['first_date']} and {cluster['last_date']}, "
+                    f"totaling approximately ${total_value:,.0f}."
+                ),
+                severity='high' if insiders >= 4 or total_value > 1000000 else 'medium',
+                confidence=min(0.9, 0.5 + insiders * 0.1 + total_value / 10000000),
+                symbol=symbol,
+                market_type='equity',
+                metadata={
+                    'insider_buys': insiders,
+                    'transactions': cluster['transactions'],
+                    'total_value': total_value,
+                    'first_date': cluster['first_date'],
+                    'last_date': cluster['last_date'],
+                    'issuer_cik': cluster['issuer_cik'],
+                    'scope': 'market_wide'
+                }
+            ))
+        return findings
+    
     def reflect(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Reflect on the analysis results."""
         high_confidence = [f for f in results if f.get('confidence', 0) > 0.7]
@@ -75,8 +75,8 @@ class IntradayVolatilitySpikeAgent(BaseAgent):
         Returns list of candles with OHLCV data.
         """
         try:
-            from data_sources.yahoo_finance_client import YahooFinanceClient
-            client = YahooFinanceClient()
+            from data_sources.shared import get_yahoo_client
+            client = get_yahoo_client()
             
             # Try to get intraday data
             data = client.get_historical_data(symbol, period="1d", interval="1m")
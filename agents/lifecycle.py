@@ -0,0 +1,213 @@
+"""
+Agent Lifecycle Manager
+
+Keeps one warm instance per agent between scheduled runs instead of
+constructing a fresh agent (and its clients, exchanges and analyzer
+stacks) on every tick.
+
+Hooks on BaseAgent:
+- reset():   before every run on a warm instance
+- refresh(): every `refresh_after` seconds (reload config / reference data)
+- close():   on teardown
+
+Instances are rebuilt after `max_age` seconds, and startup/teardown time
+is tracked per agent.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+from . import get_agent_class
+from .base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentTimings:
+    builds: int = 0
+    runs: int = 0
+    warm_runs: int = 0
+    refreshes: int = 0
+    teardowns: int = 0
+    last_startup_ms: float = 0.0
+    total_startup_ms: float = 0.0
+    last_teardown_ms: float = 0.0
+    total_teardown_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "builds": self.builds,
+            "runs": self.runs,
+            "warm_runs": self.warm_runs,
+            "refreshes": self.refreshes,
+            "teardowns": self.teardowns,
+            "last_startup_ms": round(self.last_startup_ms, 2),
+            "avg_startup_ms": round(self.total_startup_ms / self.builds, 2) if self.builds else 0.0,
+            "last_teardown_ms": round(self.last_teardown_ms, 2),
+            "total_startup_ms_saved": round(
+                (self.total_startup_ms / self.builds) * self.warm_runs, 2
+            ) if self.builds else 0.0,
+        }
+
+
+@dataclass
+class _WarmAgent:
+    instance: BaseAgent
+    created_at: float
+    refreshed_at: float
+    fresh: bool = True  # built for the upcoming run; skip reset()
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class AgentLifecycleManager:
+    """One warm instance per agent, with reset/refresh/teardown hooks."""
+
+    def __init__(self, refresh_after: float = 3600, max_age: float = 6 * 3600):
+        self.refresh_after = refresh_after
+        self.max_age = max_age
+        self._warm: Dict[str, _WarmAgent] = {}
+        self._timings: Dict[str, AgentTimings] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, agent_name: str) -> Optional[BaseAgent]:
+        agent_class = get_agent_class(agent_name)
+        if not agent_class:
+            return None
+        t0 = time.perf_counter()
+        instance = agent_class()
+        ms = (time.perf_counter() - t0) * 1000
+        t = self._timings.setdefault(agent_name, AgentTimings())
+        t.builds += 1
+        t.last_startup_ms = ms
+        t.total_startup_ms += ms
+        logger.info(f"Built agent {agent_name} in {ms:.1f}ms")
+        return instance
+
+    def _close(self, agent_name: str, instance: BaseAgent):
+        t0 = time.perf_counter()
+        try:
+            instance.close()
+        except Exception as e:
+            logger.warning(f"Error closing agent {agent_name}: {e}")
+        ms = (time.perf_counter() - t0) * 1000
+        t = self._timings.setdefault(agent_name, AgentTimings())
+        t.teardowns += 1
+        t.last_teardown_ms = ms
+        t.total_teardown_ms += ms
+
+    def _get_warm(self, agent_name: str) -> Optional[_WarmAgent]:
+        # Per-agent build lock so a slow constructor doesn't stall other agents
+        with self._lock:
+            build_lock = self._build_locks.setdefault(agent_name, threading.Lock())
+        with build_lock:
+            entry = self._warm.get(agent_name)
+            now = time.time()
+            if entry and now - entry.created_at > self.max_age and not entry.lock.locked():
+                self._warm.pop(agent_name)
+                self._close(agent_name, entry.instance)
+                entry = None
+            if entry is None:
+                instance = self._build(agent_name)
+                if instance is None:
+                    return None
+                entry = self._warm[agent_name] = _WarmAgent(instance, now, now)
+            return entry
+
+    @contextmanager
+    def acquire(self, agent_name: str) -> Iterator[Optional[BaseAgent]]:
+        """
+        Yield a ready-to-run agent instance (None if the class is unknown).
+
+        Warm instances are used by one run at a time; an overlapping run
+        (e.g. a manual run during a scheduled one) gets a throwaway instance.
+        """
+        agent_class = get_agent_class(agent_name)
+        if agent_class is None:
+            yield None
+            return
+
+        if not getattr(agent_class, "warm_instance", True):
+            yield from self._throwaway(agent_name)
+            return
+
+        entry = self._get_warm(agent_name)
+        if entry is None or not entry.lock.acquire(blocking=False):
+            yield from self._throwaway(agent_name)
+            return
+
+        t = self._timings.setdefault(agent_name, AgentTimings())
+        try:
+            if entry.fresh:
+                entry.fresh = False
+            else:
+                t.warm_runs += 1
+                if time.time() - entry.refreshed_at > self.refresh_after:
+                    entry.instance.refresh()
+                    entry.refreshed_at = time.time()
+                    t.refreshes += 1
+                entry.instance.reset()
+            t.runs += 1
+            yield entry.instance
+        finally:
+            entry.lock.release()
+
+    def _throwaway(self, agent_name: str):
+        instance = self._build(agent_name)
+        if instance is not None:
+            self._timings[agent_name].runs += 1
+        try:
+            yield instance
+        finally:
+            if instance is not None:
+                self._close(agent_name, instance)
+
+    def peek(self, agent_name: str) -> Optional[BaseAgent]:
+        """The warm instance, if one exists, without acquiring it for a run."""
+        entry = self._warm.get(agent_name)
+        return entry.instance if entry else None
+
+    def refresh(self, agent_name: str) -> bool:
+        """Run the refresh hook on a warm instance now."""
+        entry = self._warm.get(agent_name)
+        if not entry:
+            return False
+        with entry.lock:
+            entry.instance.refresh()
+            entry.refreshed_at = time.time()
+            self._timings.setdefault(agent_name, AgentTimings()).refreshes += 1
+        return True
+
+    def teardown(self, agent_name: str) -> bool:
+        """Drop an agent's warm instance; the next run rebuilds it."""
+        with self._lock:
+            entry = self._warm.pop(agent_name, None)
+        if not entry:
+            return False
+        with entry.lock:
+            self._close(agent_name, entry.instance)
+        return True
+
+    def teardown_all(self):
+        for agent_name in list(self._warm):
+            self.teardown(agent_name)
+
+    def stats(self) -> Dict[str, dict]:
+        now = time.time()
+        out = {}
+        for agent_name, t in self._timings.items():
+            entry = self._warm.get(agent_name)
+            out[agent_name] = {
+                **t.to_dict(),
+                "warm": entry is not None,
+                "age_seconds": round(now - entry.created_at, 1) if entry else None,
+            }
+        return out
+
+
+agent_pool = AgentLifecycleManager()
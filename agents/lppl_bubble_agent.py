@@ -1,14 +1,16 @@
 """
 LPPL Bubble Agent
 
-Detects potential market bubbles using Log-Periodic Power Law (LPPL) signatures
-by monitoring for super-exponential price growth, price acceleration, and
-log-periodic oscillation patterns.
+Detects potential market bubbles and negative bubbles from LPPLS fits over
+shrinking windows (the DS-LPPLS confidence indicator,
+agents.analyzers.lppls), plus a simple recent-versus-prior return
+acceleration check. Every symbol's windows are fitted together in the
+shared LPPLS process pool (config 'workers').
 """
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -16,14 +18,16 @@ class LPPLSBubbleAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("LPPLSBubbleAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.instruments = ['SPY', 'QQQ', 'BTC-USD', 'ETH-USD', 'NVDA', 'TSLA']
         self.acceleration_threshold = 1.5
         self.growth_lookback = 60
+        self.history_period = '2y'
+        self.confidence_threshold = self.config.get('confidence_threshold', 0.3)
 
     def plan(self) -> Dict[str, Any]:
         return {
-            "steps": ["fetch_price_history", "check_super_exponential_growth", "detect_lppl_signatures", "generate_findings"],
+            "steps": ["fetch_price_history", "fit_lppls_windows", "check_price_acceleration", "generate_findings"],
             "interval": "60min",
             "symbols": self.instruments,
         }
@@ -34,66 +38,92 @@ class LPPLSBubbleAgent(BaseAgent):
     def analyze(self) -> List[Dict[str, Any]]:
         findings = []
 
+        history = {}
         for symbol in self.instruments:
             try:
-                data = self.yahoo_client.get_price_data(symbol, period='6mo')
+                data = self.yahoo_client.get_price_data(symbol, period=self.history_period)
                 if data is None or len(data) < self.growth_lookback:
                     continue
+                history[symbol] = data
+            except Exception as e:
+                self.logger.error(f"Error fetching {symbol}: {e}")
+
+        try:
+            from agents.analyzers.lppls import scan
+            closes = {symbol: data['Close'].astype(float).dropna().values for symbol, data in history.items()}
+            indicators = scan(closes, workers=self.config.get('workers'))
+        except Exception as e:
+            self.logger.error(f"LPPLS scan failed: {e}")
+            indicators = {}
 
+        for symbol, data in history.items():
+            try:
                 market_type = 'crypto' if symbol.endswith('-USD') else 'equity'
 
-                findings.extend(self._check_super_exponential(symbol, data, market_type))
+                if symbol in indicators:
+                    findings.extend(self._check_lppls(symbol, indicators[symbol], data, market_type))
                 findings.extend(self._check_price_acceleration(symbol, data, market_type))
-                findings.extend(self._check_log_periodic_oscillation(symbol, data, market_type))
 
             except Exception as e:
                 self.logger.error(f"Error analyzing {symbol}: {e}")
 
         return findings
 
-    def _check_super_exponential(self, symbol: str, data, market_type: str) -> List[Dict[str, Any]]:
+    def _check_lppls(self, symbol: str, indicator, data, market_type: str) -> List[Dict[str, Any]]:
+        """Bubble / negative-bubble findings from the DS-LPPLS confidence indicator."""
         findings = []
-        try:
-            closes = data['Close'].astype(float).values
-            n = len(closes)
-            if n < 60:
-                return findings
-
-            log_prices = np.log(closes[-60:])
-            t = np.arange(60, dtype=float)
-
-            coeffs = np.polyfit(t, log_prices, 1)
-            linear_fit = np.polyval(coeffs, t)
-            residuals = log_prices - linear_fit
-
-            recent_residual = float(np.mean(residuals[-10:]))
-            early_residual = float(np.mean(residuals[:10]))
-
-            curvature = recent_residual - early_residual
+        if indicator.windows == 0:
+            return findings
+
+        closes = data['Close'].astype(float).values
+        total_return = float((closes[-1] - closes[-self.growth_lookback]) / closes[-self.growth_lookback])
+        qualified = [f for f in indicator.fits if f.qualified()]
+        metadata = {
+            'ds_lppls_bubble': float(indicator.bubble),
+            'ds_lppls_negative_bubble': float(indicator.negative_bubble),
+            'windows': int(indicator.windows),
+            'qualified_fits': len(qualified),
+            'bubble_tc_days': indicator.bubble_tc_days,
+            'negative_bubble_tc_days': indicator.negative_bubble_tc_days,
+            'median_m': float(np.median([f.m for f in qualified])) if qualified else None,
+            'median_omega': float(np.median([f.omega for f in qualified])) if qualified else None,
+            'total_return_60d': total_return,
+        }
 
-            total_return = float((closes[-1] - closes[-60]) / closes[-60])
+        if indicator.bubble >= self.confidence_threshold:
+            severity = 'critical' if indicator.bubble >= 0.6 else 'high'
+            findings.append(self.create_finding(
+                title=f"LPPLS Bubble Signature: {symbol}",
+                description=(
+                    f"{symbol} shows a qualified LPPLS bubble fit (super-exponential growth with "
+                    f"log-periodic oscillations) in {indicator.bubble:.0%} of {indicator.windows} "
+                    f"shrinking windows. 60-day return: {total_return*100:+.1f}%. "
+                    f"Median critical time: ~{indicator.bubble_tc_days:.0f} trading days out. "
+                    f"LPPL theory suggests this pattern is unsustainable and may precede a correction."
+                ),
+                severity=severity,
+                confidence=float(min(0.4 + indicator.bubble * 0.5, 0.9)),
+                symbol=symbol,
+                market_type=market_type,
+                metadata={**metadata, 'signal': 'lppls_bubble'}
+            ))
+
+        if indicator.negative_bubble >= self.confidence_threshold:
+            findings.append(self.create_finding(
+                title=f"LPPLS Negative Bubble Signature: {symbol}",
+                description=(
+                    f"{symbol} shows a qualified LPPLS negative-bubble fit (accelerating decline with "
+                    f"log-periodic oscillations) in {indicator.negative_bubble:.0%} of {indicator.windows} "
+                    f"shrinking windows. Median critical time: ~{indicator.negative_bubble_tc_days:.0f} trading days out. "
+                    f"Negative bubbles often end in a sharp rebound."
+                ),
+                severity='medium',
+                confidence=float(min(0.35 + indicator.negative_bubble * 0.5, 0.8)),
+                symbol=symbol,
+                market_type=market_type,
+                metadata={**metadata, 'signal': 'lppls_negative_bubble'}
+            ))
 
-            if curvature > 0.05 and total_return > 0.3:
-                severity = 'critical' if curvature > 0.15 else 'high'
-                findings.append(self.create_finding(
-                    title=f"Super-Exponential Growth Detected: {symbol}",
-                    description=(
-                        f"{symbol} exhibits super-exponential price growth over the past 60 trading days. "
-                        f"Total return: {total_return*100:.1f}%, Log-price curvature: {curvature:.3f}. "
-                        f"LPPL theory suggests this pattern is unsustainable and may precede a correction."
-                    ),
-                    severity=severity,
-                    confidence=float(min(0.5 + curvature * 2, 0.85)),
-                    symbol=symbol,
-                    market_type=market_type,
-                    metadata={
-                        'curvature': float(curvature),
-                        'total_return_60d': float(total_return),
-                        'signal': 'super_exponential',
-                    }
-                ))
-        except Exception as e:
-            self.logger.error(f"Error checking super-exponential for {symbol}: {e}")
         return findings
 
     def _check_price_acceleration(self, symbol: str, data, market_type: str) -> List[Dict[str, Any]]:
@@ -131,56 +161,3 @@ class LPPLSBubbleAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"Error checking price acceleration for {symbol}: {e}")
         return findings
-
-    def _check_log_periodic_oscillation(self, symbol: str, data, market_type: str) -> List[Dict[str, Any]]:
-        findings = []
-        try:
-            closes = data['Close'].astype(float).values
-            if len(closes) < 60:
-                return findings
-
-            log_prices = np.log(closes[-60:])
-            t = np.arange(60, dtype=float)
-
-            coeffs = np.polyfit(t, log_prices, 2)
-            trend = np.polyval(coeffs, t)
-            detrended = log_prices - trend
-
-            if len(detrended) < 10:
-                return findings
-
-            fft_vals = np.abs(np.fft.rfft(detrended))
-            if len(fft_vals) < 3:
-                return findings
-
-            fft_vals[0] = 0
-            dominant_freq_idx = int(np.argmax(fft_vals[1:])) + 1
-            spectral_power = float(fft_vals[dominant_freq_idx])
-            total_power = float(np.sum(fft_vals[1:]))
-
-            if total_power <= 0:
-                return findings
-
-            concentration = spectral_power / total_power
-
-            if concentration > 0.3:
-                findings.append(self.create_finding(
-                    title=f"Log-Periodic Oscillation Pattern: {symbol}",
-                    description=(
-                        f"{symbol} shows log-periodic oscillation signatures in detrended price data. "
-                        f"Spectral concentration: {concentration:.1%} at dominant frequency. "
-                        f"This pattern is consistent with LPPL bubble dynamics."
-                    ),
-                    severity='medium',
-                    confidence=float(min(0.4 + concentration, 0.75)),
-                    symbol=symbol,
-                    market_type=market_type,
-                    metadata={
-                        'spectral_concentration': float(concentration),
-                        'dominant_freq_idx': int(dominant_freq_idx),
-                        'signal': 'log_periodic',
-                    }
-                ))
-        except Exception as e:
-            self.logger.error(f"Error checking log-periodic oscillation for {symbol}: {e}")
-        return findings
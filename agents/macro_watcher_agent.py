@@ -9,7 +9,7 @@ import yfinance as yf
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 
 class MacroWatcherAgent(BaseAgent):
     """
@@ -18,7 +18,7 @@ class MacroWatcherAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Key macro indicators to monitor
         self.indicators = {
@@ -9,7 +9,7 @@ from typing import List, Dict, Any, Tuple
 import numpy as np
 from datetime import datetime, timedelta
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 
 
 class MarketCorrectionAgent(BaseAgent):
@@ -19,7 +19,7 @@ class MarketCorrectionAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Markets to monitor
         self.markets = {
@@ -129,22 +129,19 @@ class MarketCorrectionAgent(BaseAgent):
             if info['type'] in ['volatility', 'rates']:
                 return findings
             
-            # Calculate RSI
-            rsi = self._calculate_rsi(data['Close'], period=14)
-            current_rsi = rsi.iloc[-1] if len(rsi) > 0 else 50
-            
-            # Calculate moving averages
-            ma_50 = data['Close'].rolling(window=50).mean()
-            ma_200 = data['Close'].rolling(window=200).mean()
-            
-            current_price = data['Close'].iloc[-1]
-            current_ma50 = ma_50.iloc[-1]
-            current_ma200 = ma_200.iloc[-1]
+            # RSI and moving averages from the feature store, which keeps
+            # history across runs (the 6mo fetch alone can't fill a 200d MA)
+            feats = self.features(symbol, ['close', 'rsi_14', 'ma_50', 'ma_200'], bars=data)
+            current_rsi = feats['rsi_14']
+            current_price = feats['close']
+            current_ma50 = feats['ma_50']
+            current_ma200 = feats['ma_200']
             
             # Death cross warning (50MA crosses below 200MA)
             if current_ma50 < current_ma200:
-                prev_ma50 = ma_50.iloc[-5]
-                prev_ma200 = ma_200.iloc[-5]
+                prev = self.features(symbol, ['ma_50', 'ma_200'], lag=4)
+                prev_ma50 = prev['ma_50']
+                prev_ma200 = prev['ma_200']
                 
                 # Check if this is a recent crossover
                 if prev_ma50 >= prev_ma200:
@@ -398,33 +395,44 @@ class MarketCorrectionAgent(BaseAgent):
         Called by backtest runner - does NOT call any network APIs.
         Uses ctx.asof and ctx.frame(symbol) for historical data.
         """
+        return self._backtest_findings(ctx, _FrameIndicators(ctx, self._calculate_rsi))
+
+    def analyze_panel(self, ctx) -> List[Dict[str, Any]]:
+        """
+        Panel-mode variant of analyze_ctx: same checks and findings, read
+        from the backtest feature cache (ctx.feature) as of ctx.index
+        instead of recomputing indicators from each day's frames.
+        """
+        return self._backtest_findings(ctx, _PanelIndicators(ctx))
+
+    def _backtest_findings(self, ctx, ind) -> List[Dict[str, Any]]:
+        """The backtest checks, over indicators from either reader below."""
         findings = []
         symbols = ctx.meta.get("symbols", list(self.markets.keys()))
-        
+
         for symbol in symbols:
-            df = ctx.frame(symbol)
-            if df is None or df.empty or len(df) < 60:
+            bars = ind.bars(symbol)
+            if bars < 60:
                 continue
-            
+
             info = self.markets.get(symbol, {"name": symbol, "type": "equity_index"})
-            
-            findings.extend(self._check_decline_from_peak_ctx(symbol, df, info))
-            findings.extend(self._check_technical_indicators_ctx(symbol, df, info))
-            findings.extend(self._check_momentum_exhaustion_ctx(symbol, df, info))
-        
-        findings.extend(self._check_vix_spike_ctx(ctx, symbols))
-        findings.extend(self._check_breadth_deterioration_ctx(ctx, symbols))
-        findings.extend(self._check_yield_curve_ctx(ctx, symbols))
-        
+
+            findings.extend(self._check_decline_from_peak_ctx(symbol, ind, info))
+            findings.extend(self._check_technical_indicators_ctx(symbol, ind, info, bars))
+            findings.extend(self._check_momentum_exhaustion_ctx(symbol, ind, info))
+
+        findings.extend(self._check_vix_spike_ctx(ind))
+        findings.extend(self._check_breadth_deterioration_ctx(ind))
+        findings.extend(self._check_yield_curve_ctx(ind))
+
         return findings
 
-    def _check_decline_from_peak_ctx(self, symbol: str, df: Any, info: Dict) -> List[Dict[str, Any]]:
+    def _check_decline_from_peak_ctx(self, symbol: str, ind, info: Dict) -> List[Dict[str, Any]]:
         """Backtest version of decline from peak check"""
         findings = []
         try:
-            close = df['Close'].astype(float)
-            high_52w = close.tail(252).max()
-            current_price = close.iloc[-1]
+            current_price = ind.close(symbol)
+            high_52w = ind.peak_252(symbol)
             decline_pct = (current_price - high_52w) / high_52w
             
             warning_threshold = -self.correction_threshold * 0.7
@@ -447,37 +455,29 @@ class MarketCorrectionAgent(BaseAgent):
             self.logger.debug(f"Error in decline check for {symbol}: {e}")
         return findings
 
-    def _check_technical_indicators_ctx(self, symbol: str, df: Any, info: Dict) -> List[Dict[str, Any]]:
+    def _check_technical_indicators_ctx(self, symbol: str, ind, info: Dict, bars: int) -> List[Dict[str, Any]]:
         """Backtest version of technical indicators check"""
         findings = []
         try:
             if info['type'] in ['volatility', 'rates']:
                 return findings
             
-            close = df['Close'].astype(float)
-            rsi = self._calculate_rsi(close, period=14)
-            current_rsi = rsi.iloc[-1] if len(rsi) > 0 else 50
-            
-            if len(close) >= 200:
-                ma_50 = close.rolling(window=50).mean()
-                ma_200 = close.rolling(window=200).mean()
-                current_ma50 = ma_50.iloc[-1]
-                current_ma200 = ma_200.iloc[-1]
+            if bars >= 200:
+                current_ma50 = ind.ma(symbol, 50)
+                current_ma200 = ind.ma(symbol, 200)
                 
-                if current_ma50 < current_ma200 and len(ma_50) > 5:
-                    prev_ma50 = ma_50.iloc[-5]
-                    prev_ma200 = ma_200.iloc[-5]
-                    if prev_ma50 >= prev_ma200:
-                        findings.append(self.create_finding(
-                            title=f"Death Cross Detected in {info['name']}",
-                            description=f"50-day MA crossed below 200-day MA",
-                            severity='high',
-                            confidence=0.75,
-                            symbol=symbol,
-                            market_type=info['type'],
-                            metadata={'ma_50': float(current_ma50), 'ma_200': float(current_ma200)}
-                        ))
+                if current_ma50 < current_ma200 and ind.ma(symbol, 50, 4) >= ind.ma(symbol, 200, 4):
+                    findings.append(self.create_finding(
+                        title=f"Death Cross Detected in {info['name']}",
+                        description=f"50-day MA crossed below 200-day MA",
+                        severity='high',
+                        confidence=0.75,
+                        symbol=symbol,
+                        market_type=info['type'],
+                        metadata={'ma_50': float(current_ma50), 'ma_200': float(current_ma200)}
+                    ))
             
+            current_rsi = ind.rsi_14(symbol)
             extreme_threshold = self.rsi_overbought + 5
             if current_rsi > extreme_threshold:
                 findings.append(self.create_finding(
@@ -493,20 +493,17 @@ class MarketCorrectionAgent(BaseAgent):
             self.logger.debug(f"Error in technical check for {symbol}: {e}")
         return findings
 
-    def _check_momentum_exhaustion_ctx(self, symbol: str, df: Any, info: Dict) -> List[Dict[str, Any]]:
+    def _check_momentum_exhaustion_ctx(self, symbol: str, ind, info: Dict) -> List[Dict[str, Any]]:
         """Backtest version of momentum exhaustion check"""
         findings = []
         try:
             if info['type'] in ['volatility', 'rates']:
                 return findings
             
-            close = df['Close'].astype(float)
-            returns = close.pct_change()
-            recent_20d = returns.tail(20)
-            positive_days = (recent_20d > 0).sum()
+            positive_days = ind.up_days_20(symbol)
             
             if positive_days >= 16:
-                cumulative_gain = (close.iloc[-1] / close.iloc[-20] - 1)
+                cumulative_gain = ind.close(symbol) / ind.close(symbol, 19) - 1
                 findings.append(self.create_finding(
                     title=f"{info['name']} Shows Momentum Exhaustion",
                     description=f"{positive_days}/20 days positive with {cumulative_gain*100:.1f}% gain",
@@ -514,21 +511,20 @@ class MarketCorrectionAgent(BaseAgent):
                     confidence=0.60,
                     symbol=symbol,
                     market_type=info['type'],
-                    metadata={'positive_days_count': int(positive_days), 'cumulative_gain': float(cumulative_gain)}
+                    metadata={'positive_days_count': positive_days, 'cumulative_gain': float(cumulative_gain)}
                 ))
         except Exception as e:
             self.logger.debug(f"Error in momentum check for {symbol}: {e}")
         return findings
 
-    def _check_vix_spike_ctx(self, ctx, symbols: List[str]) -> List[Dict[str, Any]]:
+    def _check_vix_spike_ctx(self, ind) -> List[Dict[str, Any]]:
         """Backtest version of VIX spike check"""
         findings = []
         try:
-            vix_df = ctx.frame('^VIX')
-            if vix_df is None or vix_df.empty:
+            if not ind.bars('^VIX'):
                 return findings
             
-            current_vix = float(vix_df['Close'].iloc[-1])
+            current_vix = float(ind.close('^VIX'))
             
             if current_vix >= self.vix_critical:
                 findings.append(self.create_finding(
@@ -554,19 +550,15 @@ class MarketCorrectionAgent(BaseAgent):
             self.logger.debug(f"Error in VIX check: {e}")
         return findings
 
-    def _check_breadth_deterioration_ctx(self, ctx, symbols: List[str]) -> List[Dict[str, Any]]:
+    def _check_breadth_deterioration_ctx(self, ind) -> List[Dict[str, Any]]:
         """Backtest version of breadth check"""
         findings = []
         try:
-            spy_df = ctx.frame('SPY')
-            iwm_df = ctx.frame('IWM')
-            if spy_df is None or iwm_df is None or spy_df.empty or iwm_df.empty:
-                return findings
-            if len(spy_df) < 20 or len(iwm_df) < 20:
+            if ind.bars('SPY') < 20 or ind.bars('IWM') < 20:
                 return findings
             
-            spy_return = float(spy_df['Close'].iloc[-1] / spy_df['Close'].iloc[-20] - 1)
-            iwm_return = float(iwm_df['Close'].iloc[-1] / iwm_df['Close'].iloc[-20] - 1)
+            spy_return = float(ind.close('SPY') / ind.close('SPY', 19) - 1)
+            iwm_return = float(ind.close('IWM') / ind.close('IWM', 19) - 1)
             
             if iwm_return < spy_return - 0.05:
                 findings.append(self.create_finding(
@@ -582,16 +574,15 @@ class MarketCorrectionAgent(BaseAgent):
             self.logger.debug(f"Error in breadth check: {e}")
         return findings
 
-    def _check_yield_curve_ctx(self, ctx, symbols: List[str]) -> List[Dict[str, Any]]:
+    def _check_yield_curve_ctx(self, ind) -> List[Dict[str, Any]]:
         """Backtest version of yield curve check"""
         findings = []
         try:
-            tnx_df = ctx.frame('^TNX')
-            if tnx_df is None or tnx_df.empty or len(tnx_df) < 20:
+            if ind.bars('^TNX') < 20:
                 return findings
             
-            current_10y = float(tnx_df['Close'].iloc[-1])
-            prev_10y = float(tnx_df['Close'].iloc[-20])
+            current_10y = float(ind.close('^TNX'))
+            prev_10y = float(ind.close('^TNX', 19))
             yield_change = current_10y - prev_10y
             
             if yield_change > 0.5:
@@ -607,3 +598,61 @@ class MarketCorrectionAgent(BaseAgent):
         except Exception as e:
             self.logger.debug(f"Error in yield curve check: {e}")
         return findings
+
+
+class _FrameIndicators:
+    """Backtest indicators recomputed from each day's ctx.frame()."""
+
+    def __init__(self, ctx, rsi):
+        self.ctx = ctx
+        self._rsi = rsi
+        self._closes: Dict[str, Any] = {}
+
+    def _close(self, symbol: str):
+        if symbol not in self._closes:
+            self._closes[symbol] = self.ctx.frame(symbol)['Close'].astype(float)
+        return self._closes[symbol]
+
+    def bars(self, symbol: str) -> int:
+        df = self.ctx.frame(symbol)
+        return 0 if df is None else len(df)
+
+    def close(self, symbol: str, lag: int = 0) -> float:
+        return self._close(symbol).iloc[-1 - lag]
+
+    def peak_252(self, symbol: str) -> float:
+        return self._close(symbol).tail(252).max()
+
+    def ma(self, symbol: str, window: int, lag: int = 0) -> float:
+        return self._close(symbol).rolling(window=window).mean().iloc[-1 - lag]
+
+    def rsi_14(self, symbol: str) -> float:
+        return self._rsi(self._close(symbol), period=14).iloc[-1]
+
+    def up_days_20(self, symbol: str) -> int:
+        return int((self._close(symbol).pct_change().tail(20) > 0).sum())
+
+
+class _PanelIndicators:
+    """Backtest indicators read from the panel feature cache (ctx.feature)."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    def bars(self, symbol: str) -> int:
+        return self.ctx.bars(symbol)
+
+    def close(self, symbol: str, lag: int = 0) -> float:
+        return self.ctx.feature("close", symbol, lag)
+
+    def peak_252(self, symbol: str) -> float:
+        return self.ctx.feature("peak_252", symbol)
+
+    def ma(self, symbol: str, window: int, lag: int = 0) -> float:
+        return self.ctx.feature(f"ma_{window}", symbol, lag)
+
+    def rsi_14(self, symbol: str) -> float:
+        return self.ctx.feature("rsi_14", symbol)
+
+    def up_days_20(self, symbol: str) -> int:
+        return int(self.ctx.feature("up_days_20", symbol))
@@ -0,0 +1,162 @@
+"""
+Run Memoization
+
+Many agent runs are pure functions of their inputs: the same last bar
+for every instrument gives the same findings, which would otherwise be
+written again as new rows. Before a scheduled run, the scheduler asks
+`run_memo` for a key built from the warm agent's `memo_inputs()` (config,
+a per-symbol last-bar stamp, file fingerprints); if the key matches the
+one BaseAgent.run stored after the previous successful run, the run is
+skipped before any telemetry, reward or downstream DAG work, and only an
+"unchanged" event is logged to the memo log.
+
+Last-bar stamps are derived without a network call: while the agent's
+market calendar (services.market_hours) is open the stamp is the current
+minute, so live sessions never hit; while it is closed it is the last
+trading day, combined with the latest fingerprint any data source
+published for the symbol (services.data_events).
+
+Enable per agent with the config key `memoize` (see config.py); entries
+expire after `memo_ttl_minutes` (default one day).
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.data_events import data_events, file_fingerprint, fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_MINUTES = 24 * 60
+
+
+def last_bar_stamp(calendar: str, now: Optional[datetime] = None) -> Tuple[str, str]:
+    """("live", minute) while `calendar` is open, else ("closed", last trading day)."""
+    from services.market_hours import ET, market_hours
+
+    now = now or datetime.now(timezone.utc)
+    cal = market_hours.calendar
+    if cal.is_open(calendar, now):
+        return "live", now.strftime("%Y-%m-%dT%H:%M")
+    day = now.astimezone(ET).date()
+    for _ in range(10):
+        if cal.is_trading_day(day):
+            break
+        day -= timedelta(days=1)
+    return "closed", day.isoformat()
+
+
+def symbol_stamps(agent_name: str, symbols: Iterable[str], now: Optional[datetime] = None) -> Dict[str, List]:
+    from services.market_hours import market_hours
+
+    stamp = list(last_bar_stamp(market_hours.policy(agent_name)["calendar"], now))
+    out = {}
+    for symbol in symbols:
+        event = data_events.latest(f"bars:{symbol}")
+        out[symbol] = stamp + [event.fingerprint if event else None]
+    return out
+
+
+def file_stamps(paths: Iterable[str]) -> Dict[str, Optional[str]]:
+    import glob
+    return {p: file_fingerprint(p) for pattern in paths for p in sorted(glob.glob(pattern))}
+
+
+@dataclass
+class MemoEntry:
+    key: str
+    ts: float
+    cpu_s: float
+
+
+class RunMemo:
+    """Last input key and CPU cost per agent, plus hit/miss accounting."""
+
+    def __init__(self):
+        self._entries: Dict[str, MemoEntry] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(agent) -> Optional[str]:
+        """Fingerprint of agent.memo_inputs(), or None if memoization is off for it."""
+        try:
+            inputs = agent.memo_inputs()
+        except Exception as e:
+            logger.debug(f"{agent.name}: memo inputs unavailable ({e}), not memoizing")
+            return None
+        if inputs is None:
+            return None
+        return fingerprint(json.dumps(inputs, sort_keys=True, default=str))
+
+    def _agent_stats(self, name: str) -> Dict[str, float]:
+        return self._stats.setdefault(name, {"hits": 0, "misses": 0, "cpu_saved_s": 0.0})
+
+    def lookup(self, agent) -> Tuple[bool, Optional[str]]:
+        """(hit, key) for the upcoming run; key is None when memoization is off."""
+        key = self.key(agent)
+        if key is None:
+            return False, None
+        ttl = float(agent.config.get("memo_ttl_minutes", DEFAULT_TTL_MINUTES)) * 60
+        with self._lock:
+            entry = self._entries.get(agent.name)
+            hit = entry is not None and entry.key == key and time.time() - entry.ts < ttl
+            stats = self._agent_stats(agent.name)
+            if hit:
+                stats["hits"] += 1
+                stats["cpu_saved_s"] += entry.cpu_s
+                cpu_s = entry.cpu_s
+            else:
+                stats["misses"] += 1
+        if not hit:
+            self._count_miss(agent.name)
+            return False, key
+        self._log_unchanged(agent.name, key, cpu_s)
+        return True, key
+
+    def store(self, agent, cpu_s: float):
+        """Remember the inputs after a successful run (re-keyed, so data it fetched counts)."""
+        key = self.key(agent)
+        if key is None:
+            return
+        with self._lock:
+            self._entries[agent.name] = MemoEntry(key, time.time(), cpu_s)
+
+    @staticmethod
+    def _count_miss(agent_name: str):
+        try:
+            from telemetry.metrics import AGENT_MEMO_MISSES
+            AGENT_MEMO_MISSES.labels(agent_name).inc()
+        except Exception as e:
+            logger.debug(f"Memo telemetry failed: {e}")
+
+    def _log_unchanged(self, agent_name: str, key: str, cpu_s: float):
+        try:
+            from telemetry.memo_logger import log_unchanged
+            from telemetry.metrics import AGENT_MEMO_HITS, AGENT_CPU_SAVED
+            log_unchanged(agent_name, key, cpu_s)
+            AGENT_MEMO_HITS.labels(agent_name).inc()
+            AGENT_CPU_SAVED.labels(agent_name).inc(cpu_s)
+        except Exception as e:
+            logger.debug(f"Memo telemetry failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {}
+            for name, s in self._stats.items():
+                total = s["hits"] + s["misses"]
+                agents[name] = {**s, "hit_rate": s["hits"] / total if total else 0.0}
+        hits = sum(s["hits"] for s in agents.values())
+        total = hits + sum(s["misses"] for s in agents.values())
+        return {
+            "hit_rate": hits / total if total else 0.0,
+            "cpu_saved_s": sum(s["cpu_saved_s"] for s in agents.values()),
+            "agents": agents,
+        }
+
+
+run_memo = RunMemo()
@@ -7,7 +7,7 @@ across multiple timeframes, volume trends, and momentum-volume divergences.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -15,7 +15,7 @@ class MomentumVolumeAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("MomentumVolumeAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.instruments = ['SPY', 'QQQ', 'IWM', 'DIA', 'AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMD', 'META']
         self.momentum_periods = [5, 10, 20]
         self.strong_momentum_threshold = 0.03
@@ -0,0 +1,120 @@
+"""
+Lazy Agent Registry
+
+Maps agent class names to their modules using agents/manifest.yaml and
+imports an agent's module only when its class is first requested.
+
+Resolution order for a class name:
+1. the manifest `registry:` section (ClassName: module, or ClassName: {module: ...})
+2. `agents:` entries whose callable names the class (e.g. MacroWatcherAgent.analyze)
+3. the snake_case naming convention (CTAFlowsAgent -> agents.cta_flows_agent)
+"""
+
+import importlib
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from .base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(__file__).with_name("manifest.yaml")
+
+
+def module_name_for(class_name: str) -> str:
+    """Conventional module for an agent class, handling acronyms (CTAFlowsAgent -> cta_flows_agent)."""
+    snake = re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", class_name).lower()
+    return f"agents.{snake}"
+
+
+class AgentRegistry:
+    """Manifest-backed, import-on-first-use agent class lookup."""
+
+    def __init__(self, manifest_path: Path = MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._manifest: Dict[str, Any] = {}
+        self._classes: Dict[str, Type[BaseAgent]] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and (self._specs or mtime is None):
+            return
+
+        specs: Dict[str, Dict[str, Any]] = {}
+        manifest: Dict[str, Any] = {}
+        if mtime is not None:
+            import yaml
+            try:
+                manifest = yaml.safe_load(self.manifest_path.read_text()) or {}
+            except Exception as e:
+                logger.error(f"Could not read agent manifest {self.manifest_path}: {e}")
+                manifest = {}
+
+            for entry in manifest.get("agents", []) or []:
+                class_name = str(entry.get("callable", "")).split(".")[0]
+                if class_name[:1].isupper():
+                    specs[class_name] = {**entry, "module": entry.get("module")}
+
+            for class_name, value in (manifest.get("registry") or {}).items():
+                spec = value if isinstance(value, dict) else {"module": value}
+                specs[class_name] = {**specs.get(class_name, {}), **spec}
+
+        self._specs = specs
+        self._manifest = manifest
+        self._mtime = mtime
+
+    def names(self) -> List[str]:
+        with self._lock:
+            self._load()
+            return list(self._specs)
+
+    def spec(self, class_name: str) -> Dict[str, Any]:
+        """Manifest entry for an agent (empty dict if it isn't listed)."""
+        with self._lock:
+            self._load()
+            return dict(self._specs.get(class_name, {}))
+
+    def section(self, name: str) -> Any:
+        """A top-level manifest section (e.g. `dag`), or None."""
+        with self._lock:
+            self._load()
+            return self._manifest.get(name)
+
+    def module_for(self, class_name: str) -> str:
+        return self.spec(class_name).get("module") or module_name_for(class_name)
+
+    def get(self, class_name: str) -> Optional[Type[BaseAgent]]:
+        """Import and return an agent class, or None if it can't be resolved."""
+        cls = self._classes.get(class_name)
+        if cls is not None:
+            return cls
+
+        module_name = self.module_for(class_name)
+        try:
+            module = importlib.import_module(module_name)
+            cls = getattr(module, class_name)
+        except ImportError as e:
+            logger.error(f"Could not import agent {class_name}: {e}")
+            return None
+        except AttributeError as e:
+            logger.error(f"Agent class {class_name} not found in module: {e}")
+            return None
+
+        if not (isinstance(cls, type) and issubclass(cls, BaseAgent)):
+            logger.error(f"{class_name} is not a BaseAgent subclass")
+            return None
+
+        self._classes[class_name] = cls
+        return cls
+
+
+registry = AgentRegistry()
@@ -7,7 +7,7 @@ against SPY benchmark, monitoring momentum and flow divergence.
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -15,7 +15,7 @@ class SectorRotationSignalAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("SectorRotationSignalAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.sector_etfs = {
             'XLF': 'Financials',
             'XLK': 'Technology',
@@ -32,6 +32,9 @@ class SectorRotationSignalAgent(BaseAgent):
         self.momentum_period = 20
         self.rs_threshold = 0.03
 
+    def memo_symbols(self) -> List[str]:
+        return [self.benchmark] + list(self.sector_etfs.keys())
+
     def plan(self) -> Dict[str, Any]:
         return {
             "steps": ["fetch_sector_data", "calculate_relative_strength", "detect_rotation", "generate_findings"],
@@ -9,7 +9,7 @@ import requests
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 from data_sources.github_client import GitHubClient
 from config import Config
 
@@ -20,7 +20,7 @@ class SentimentDivergenceAgent(BaseAgent):
     
     def __init__(self):
         super().__init__()
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.github_client = GitHubClient()
         
         # Assets to monitor - expanded for more findings
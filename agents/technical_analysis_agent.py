@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 from ta.signals import generate_signals
 
 
@@ -12,7 +12,7 @@ class TechnicalAnalysisAgent(BaseAgent):
 
     def __init__(self):
         super().__init__()
-        self.yahoo = YahooFinanceClient()
+        self.yahoo = get_yahoo_client()
         self.symbols = self.config.get(
             "symbols",
             ["SPY", "QQQ", "IWM", "DIA", "TLT", "GLD", "BTC-USD"]
@@ -20,6 +20,7 @@ class TechnicalAnalysisAgent(BaseAgent):
         self.period = self.config.get("period", "6mo")
 
     def analyze(self) -> List[Dict[str, Any]]:
+        from features import feature_store
         findings = []
 
         for symbol in self.symbols:
@@ -27,7 +28,7 @@ class TechnicalAnalysisAgent(BaseAgent):
             if df is None or df.empty or len(df) < 60:
                 continue
 
-            signals, ta = generate_signals(symbol, df)
+            signals, ta = generate_signals(symbol, df, store=feature_store)
 
             for s in signals:
                 severity = "medium" if s["confidence"] >= 0.6 else "low"
@@ -7,7 +7,7 @@ RSI overbought/oversold, Bollinger Band breach, mean reversion, and volume exhau
 
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 import numpy as np
 
 
@@ -15,7 +15,7 @@ class TradeExitAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("TradeExitAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         self.instruments = ['SPY', 'QQQ', 'IWM', 'GLD', 'TLT', 'BTC-USD', 'ETH-USD']
         self.rsi_overbought = 75
         self.rsi_oversold = 25
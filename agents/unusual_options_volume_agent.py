@@ -8,7 +8,7 @@ import logging
 from typing import Any, Dict, List
 from datetime import datetime, timedelta
 from agents.base_agent import BaseAgent
-from data_sources.yahoo_finance_client import YahooFinanceClient
+from data_sources.shared import get_yahoo_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class UnusualOptionsVolumeAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("UnusualOptionsVolumeAgent")
-        self.yahoo_client = YahooFinanceClient()
+        self.yahoo_client = get_yahoo_client()
         
         # Thresholds
         self.volume_spike_threshold = 2.0  # 2x average = unusual
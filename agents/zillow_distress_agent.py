@@ -3,6 +3,10 @@ ZillowDistressAgent
 -------------------
 Turns Zillow Research metro datasets into Finding objects for distressed market detection.
 Identifies metros with: liquidity freeze, affordability shock, oversupply, rent compression.
+
+Source CSVs are preprocessed into a cached metro x month panel
+(data_sources.zillow_panel) and all metros are scored in one pass of
+2-D array operations.
 """
 
 from __future__ import annotations
@@ -18,6 +22,7 @@ import numpy as np
 import pandas as pd
 
 from agents.base_agent import BaseAgent
+from data_sources.zillow_panel import ZillowPanel, load_panel
 from models import db, Finding
 
 logger = logging.getLogger(__name__)
@@ -48,67 +53,101 @@ class ZillowDistressConfig:
     exclude_metros: Optional[List[str]] = None
 
 
-def _load_zillow_wide_csv(path: Path) -> pd.DataFrame:
-    """Load Zillow Research metro wide-format CSV."""
-    df = pd.read_csv(path)
-    
-    if "RegionName" not in df.columns:
-        raise ValueError(f"Missing RegionName in {path.name}")
-    
-    date_cols = [c for c in df.columns if _looks_like_date_col(c)]
-    if not date_cols:
-        raise ValueError(f"No date columns found in {path.name}")
-    
-    wide = df[["RegionName"] + date_cols].copy()
-    dt_cols = [pd.to_datetime(c) for c in date_cols]
-    wide.columns = ["RegionName"] + dt_cols
-    wide = wide.set_index("RegionName").sort_index(axis=1)
-    wide = wide.apply(pd.to_numeric, errors="coerce")
-    return wide
-
-
-def _looks_like_date_col(col: str) -> bool:
-    if len(col) != 10:
-        return False
-    if col[4] != "-" or col[7] != "-":
-        return False
-    try:
-        pd.to_datetime(col)
-        return True
-    except Exception:
-        return False
-
-
-def _to_long(series_wide: pd.Series) -> pd.Series:
-    s = series_wide.dropna()
-    s.index = pd.to_datetime(s.index)
-    s = s.sort_index()
-    return s
-
-
-def _zscore_latest(ts: pd.Series, lookback: int) -> Tuple[float, float, float]:
-    ts = ts.dropna()
-    if len(ts) < max(12, lookback // 2):
-        return (0.0, float("nan"), float("nan"))
-
-    window = ts.iloc[-lookback:] if len(ts) >= lookback else ts
-    mu = window.mean()
-    sig = window.std(ddof=0)
-    if sig == 0 or np.isnan(sig):
-        return (0.0, mu, sig)
-    z = (ts.iloc[-1] - mu) / sig
-    return (float(z), float(mu), float(sig))
-
-
-def _pct_change(ts: pd.Series, periods: int) -> float:
-    ts = ts.dropna()
-    if len(ts) <= periods:
-        return float("nan")
-    prev = ts.iloc[-(periods + 1)]
-    cur = ts.iloc[-1]
-    if prev == 0 or np.isnan(prev) or np.isnan(cur):
-        return float("nan")
-    return float((cur / prev) - 1.0)
+def _last_valid(X: np.ndarray) -> np.ndarray:
+    """Column index of each row's latest non-NaN value (-1 if none)."""
+    valid = ~np.isnan(X)
+    idx = X.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    idx[~valid.any(axis=1)] = -1
+    return idx
+
+
+def _take(X: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """X[row, cols[row]] per row (or per row and column for 2-D cols), NaN where cols < 0."""
+    rows = np.arange(X.shape[0]).reshape((-1,) + (1,) * (cols.ndim - 1))
+    out = X[rows, np.maximum(cols, 0)]
+    return np.where(cols >= 0, out, np.nan)
+
+
+def _compress(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Each row's non-NaN values, in order, right-aligned behind NaN padding,
+    plus the column permutation used. Positional operations on the result
+    match the per-metro code's `series.dropna()` semantics: gaps in a
+    metro's history are skipped, not counted as months.
+    """
+    order = np.argsort(~np.isnan(X), axis=1, kind="stable")
+    return np.take_along_axis(X, order, axis=1), order
+
+
+def _expand(C: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Inverse of _compress: values back at their original columns."""
+    out = np.empty_like(C)
+    np.put_along_axis(out, order, C, axis=1)
+    return out
+
+
+def _pct_change_panel(X: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Change over the previous `periods` observations of each row, at each
+    observation's month (NaN where either end is missing or zero).
+    """
+    C, order = _compress(X)
+    out = np.full_like(C, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[:, periods:] = C[:, periods:] / C[:, :-periods] - 1.0
+    out[~np.isfinite(out)] = np.nan
+    return _expand(out, order)
+
+
+def _pct_change_latest(X: np.ndarray, periods: int) -> np.ndarray:
+    """Change from `periods` observations before each row's latest value to it."""
+    C, _ = _compress(X)
+    if periods >= C.shape[1]:
+        return np.full(C.shape[0], np.nan)
+    cur, prev = C[:, -1], C[:, -1 - periods]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = cur / prev - 1.0
+    return np.where(prev == 0, np.nan, out)
+
+
+def _window(X: np.ndarray, lookback: int) -> np.ndarray:
+    """Each row's trailing `lookback` observations (NaN-padded if fewer)."""
+    C, _ = _compress(X)
+    W = C[:, -lookback:]
+    if W.shape[1] < lookback:
+        W = np.hstack([np.full((C.shape[0], lookback - W.shape[1]), np.nan), W])
+    return W
+
+
+def _nan_mean_std(W: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row mean and population std ignoring NaNs (NaN for empty rows)."""
+    valid = ~np.isnan(W)
+    n = valid.sum(axis=1)
+    filled = np.where(valid, W, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu = filled.sum(axis=1) / n
+        var = (np.where(valid, W - mu[:, None], 0.0) ** 2).sum(axis=1) / n
+    return mu, np.sqrt(var)
+
+
+def _zscore_latest(X: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    z-score of each row's latest value against its trailing window.
+    0 where the row has too little history or no variance.
+    """
+    n = (~np.isnan(X)).sum(axis=1)
+    W = _window(X, lookback)
+    mu, sig = _nan_mean_std(W)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (W[:, -1] - mu) / sig
+    bad = (n < max(12, lookback // 2)) | ~(sig > 0) | ~np.isfinite(z)
+    return np.where(bad, 0.0, z)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    z = np.asarray(z, dtype=float)
+    out = 1.0 / (1.0 + np.exp(-np.clip(z, -8.0, 8.0)))
+    return np.where(np.isnan(z), 0.5, out)
 
 
 def _safe_sigmoid(x: float) -> float:
@@ -147,6 +186,30 @@ def classify_distress_regime(features: Dict[str, float]) -> Tuple[str, float, Di
     return best, conf, candidates
 
 
+REGIMES = ("liquidity_freeze", "affordability_shock", "oversupply", "rent_compression")
+
+
+def classify_distress_regimes(
+    z_dom: np.ndarray, z_inv: np.ndarray, z_sales: np.ndarray, z_aff: np.ndarray, z_rpd: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    classify_distress_regime across many metros at once.
+    Returns (regime index into REGIMES, confidence, scores[metro, regime]).
+    """
+    dom, inv, aff, rpd = _sigmoid(z_dom), _sigmoid(z_inv), _sigmoid(z_aff), _sigmoid(z_rpd)
+    neg_sales = _sigmoid(-np.asarray(z_sales, dtype=float))
+    scores = np.column_stack([
+        0.45 * dom + 0.35 * neg_sales + 0.20 * inv,
+        0.60 * aff + 0.25 * neg_sales + 0.15 * dom,
+        0.55 * inv + 0.25 * dom + 0.20 * neg_sales,
+        0.65 * rpd + 0.20 * dom + 0.15 * neg_sales,
+    ])
+    best = np.argmax(scores, axis=1)
+    top2 = np.sort(scores, axis=1)[:, -2:]
+    conf = np.minimum(1.0, 0.55 * top2[:, 1] + 0.45 * (top2[:, 1] - top2[:, 0]))
+    return best, conf, scores
+
+
 def estimate_time_to_mean_months(
     ts: pd.Series,
     lookback: int = 60,
@@ -199,6 +262,52 @@ def estimate_time_to_mean_months(
     }
 
 
+def estimate_time_to_mean_panel(
+    X: np.ndarray,
+    lookback: int = 60,
+    target_z: float = -0.5,
+) -> Dict[str, np.ndarray]:
+    """estimate_time_to_mean_months for each row of a metro x month panel."""
+    n = (~np.isnan(X)).sum(axis=1)
+    W = _window(X, lookback)
+    x0, x1 = W[:, :-1], W[:, 1:]
+    pair = ~(np.isnan(x0) | np.isnan(x1))
+    m = pair.sum(axis=1)
+
+    # OLS slope of dx on x0 (with intercept), per row
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x0_mean = np.where(pair, x0, 0.0).sum(axis=1) / m
+        dx = x1 - x0
+        dx_mean = np.where(pair, dx, 0.0).sum(axis=1) / m
+        cx = np.where(pair, x0 - x0_mean[:, None], 0.0)
+        cy = np.where(pair, dx - dx_mean[:, None], 0.0)
+        sxx = (cx * cx).sum(axis=1)
+        b = np.where(sxx > 0, (cx * cy).sum(axis=1) / sxx, 0.0)
+    b = np.nan_to_num(b)
+
+    k = -b
+    mean_reverting = k > 1e-6
+    with np.errstate(divide="ignore", invalid="ignore"):
+        half_life = np.where(mean_reverting, math.log(2.0) / k, 120.0)
+
+    mu, sig = _nan_mean_std(W)
+    sig = np.where(sig > 0, sig, 1.0)
+    current_z = (W[:, -1] - mu) / sig
+
+    ratio = np.clip(abs(target_z) / (np.abs(current_z) + 1e-9), 0.001, 0.999)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta = np.where(current_z >= target_z, 0.0, -np.log(ratio) / k)
+    eta = np.where(~mean_reverting | (current_z == 0), 120.0, eta)
+
+    short = n < max(24, lookback // 2)
+    return {
+        "half_life_months": np.where(short, np.nan, half_life),
+        "current_z": np.where(short, np.nan, current_z),
+        "target_z": np.full(X.shape[0], float(target_z)),
+        "eta_months": np.where(short, np.nan, eta),
+    }
+
+
 def evaluate_deal_kill_rules(
     regime: str,
     features: Dict[str, float],
@@ -321,9 +430,8 @@ class ZillowDistressAgent(BaseAgent):
         super().__init__()
         self.config = config or ZillowDistressConfig()
 
-    @property
-    def name(self) -> str:
-        return "ZillowDistressAgent"
+    def refresh(self):
+        """Keep the dataclass config; the panel reloads itself when source files change."""
 
     def analyze(self) -> List[Dict]:
         """Required abstract method implementation - delegates to run()."""
@@ -340,157 +448,128 @@ class ZillowDistressAgent(BaseAgent):
             })
         return result
 
-    def run(self) -> List[Finding]:
+    def score_panel(self, panel: ZillowPanel) -> Dict[str, np.ndarray]:
+        """
+        Score every metro in the panel at once. Each array is indexed by
+        panel row; `eligible` marks metros with enough history in every
+        dataset (and passing include/exclude).
+        """
         cfg = self.config
-        data_dir = cfg.data_dir
-
-        files = {
-            "zhvi": data_dir / "Metro_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv",
-            "income_needed": data_dir / "Metro_new_homeowner_income_needed_downpayment_0.20_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv",
-            "doz_pending": data_dir / "Metro_mean_doz_pending_uc_sfrcondo_sm_month.csv",
-            "sales_now": data_dir / "Metro_sales_count_now_uc_sfrcondo_month.csv",
-            "inventory_fs": data_dir / "Metro_invt_fs_uc_sfrcondo_sm_month.csv",
-            "zori": data_dir / "Metro_zori_uc_sfrcondomfr_sm_month.csv",
+        zhvi, sales, inv = panel["zhvi"], panel["sales_now"], panel["inventory_fs"]
+        dom, aff, rent = panel["doz_pending"], panel["income_needed"], panel["zori"]
+        yoy, lookback = cfg.yoy_months, cfg.z_lookback_months
+
+        eligible = np.zeros(len(panel.metros), dtype=bool)
+        eligible[panel.rows(cfg.include_metros, cfg.exclude_metros)] = True
+        counts = np.stack([(~np.isnan(x)).sum(axis=1) for x in (zhvi, sales, inv, dom, aff, rent)])
+        eligible &= counts.min(axis=0) >= cfg.min_points
+
+        price_yoy = _pct_change_panel(zhvi, yoy)
+        rp_div = _pct_change_panel(rent, yoy) - price_yoy
+
+        z_dom = _zscore_latest(dom, lookback)
+        z_inv = _zscore_latest(inv, lookback)
+        z_aff = _zscore_latest(aff, lookback)
+        z_sales = _zscore_latest(_pct_change_panel(sales, yoy), lookback)
+        z_price_yoy = _zscore_latest(price_yoy, lookback)
+        z_rpd = _zscore_latest(rp_div, lookback)
+
+        components = {
+            "price_drawdown": _sigmoid(-z_price_yoy),
+            "sales_collapse": _sigmoid(-z_sales),
+            "inventory_spike": _sigmoid(z_inv),
+            "liquidity_freeze": _sigmoid(z_dom),
+            "affordability_stress": _sigmoid(z_aff),
+            "rent_price_divergence": _sigmoid(-z_rpd),
+        }
+        distress_score = (
+            cfg.w_price_drawdown * components["price_drawdown"]
+            + cfg.w_sales_collapse * components["sales_collapse"]
+            + cfg.w_inventory_spike * components["inventory_spike"]
+            + cfg.w_liquidity_freeze * components["liquidity_freeze"]
+            + cfg.w_affordability_stress * components["affordability_stress"]
+            + cfg.w_rent_price_divergence * components["rent_price_divergence"]
+        )
+
+        features = {
+            "z_dom": z_dom,
+            "z_inventory": z_inv,
+            "z_afford": z_aff,
+            "z_sales": z_sales,
+            "z_price_drawdown": -z_price_yoy,
+            "z_rent_price_div": -z_rpd,
+        }
+        regime, regime_conf, regime_scores = classify_distress_regimes(
+            z_dom, z_inv, z_sales, z_aff, features["z_rent_price_div"]
+        )
+
+        return {
+            "eligible": eligible,
+            "distress_score": distress_score,
+            "components": components,
+            "features": features,
+            "regime": regime,
+            "regime_confidence": regime_conf,
+            "regime_scores": regime_scores,
+            "price_yoy": price_yoy,
         }
 
-        missing = [k for k, p in files.items() if not p.exists()]
-        if missing:
-            logger.warning(f"{self.name}: missing data files: {missing}. data_dir={data_dir.resolve()}")
-            return []
+    def run(self) -> List[Finding]:
+        cfg = self.config
 
         try:
-            wide = {k: _load_zillow_wide_csv(p) for k, p in files.items()}
+            panel = load_panel(cfg.data_dir)
+        except FileNotFoundError as e:
+            logger.warning(f"{self.name}: {e}. data_dir={Path(cfg.data_dir).resolve()}")
+            return []
         except Exception as e:
             logger.exception(f"{self.name}: failed loading zillow datasets: {e}")
             return []
 
-        metros = set(wide["zhvi"].index)
-        for k in ["sales_now", "inventory_fs", "doz_pending", "income_needed", "zori"]:
-            metros &= set(wide[k].index)
+        s = self.score_panel(panel)
+        score = s["distress_score"]
+        hits = np.flatnonzero(s["eligible"] & (score >= cfg.watch_threshold))
+        # Metros are sorted by name, so a stable sort keeps name order among ties
+        hits = hits[np.argsort(-score[hits], kind="stable")][: cfg.emit_top_n]
+        if hits.size == 0:
+            return []
 
-        metros = sorted(list(metros))
-        if cfg.include_metros:
-            include = set(cfg.include_metros)
-            metros = [m for m in metros if m in include]
-        if cfg.exclude_metros:
-            exclude = set(cfg.exclude_metros)
-            metros = [m for m in metros if m not in exclude]
+        recovery = estimate_time_to_mean_panel(
+            s["price_yoy"][hits], lookback=cfg.z_lookback_months, target_z=-0.5
+        )
+        yoy_keys = {
+            "yoy_price": "zhvi", "yoy_rent": "zori", "yoy_sales": "sales_now",
+            "yoy_inventory": "inventory_fs", "yoy_dom": "doz_pending", "yoy_affordability": "income_needed",
+        }
+        yoy = {k: _pct_change_latest(panel[d][hits], cfg.yoy_months) for k, d in yoy_keys.items()}
+        latest_keys = {
+            "latest_zhvi": "zhvi", "latest_zori": "zori", "latest_dom": "doz_pending",
+            "latest_inventory": "inventory_fs", "latest_sales": "sales_now", "latest_income_needed": "income_needed",
+        }
+        latest = {k: _take(panel[d][hits], _last_valid(panel[d][hits])) for k, d in latest_keys.items()}
+        asof = panel.dates[_last_valid(panel["zhvi"][hits])]
 
         scored: List[Tuple[str, float, Dict, Dict, Dict]] = []
-
-        for metro in metros:
-            try:
-                s_zhvi = _to_long(wide["zhvi"].loc[metro])
-                s_sales = _to_long(wide["sales_now"].loc[metro])
-                s_inv = _to_long(wide["inventory_fs"].loc[metro])
-                s_dom = _to_long(wide["doz_pending"].loc[metro])
-                s_aff = _to_long(wide["income_needed"].loc[metro])
-                s_rent = _to_long(wide["zori"].loc[metro])
-            except Exception:
-                continue
-
-            if min(len(s_zhvi), len(s_sales), len(s_inv), len(s_dom), len(s_aff), len(s_rent)) < cfg.min_points:
-                continue
-
-            yoy_price = _pct_change(s_zhvi, cfg.yoy_months)
-            yoy_rent = _pct_change(s_rent, cfg.yoy_months)
-            yoy_sales = _pct_change(s_sales, cfg.yoy_months)
-            yoy_inv = _pct_change(s_inv, cfg.yoy_months)
-            yoy_dom = _pct_change(s_dom, cfg.yoy_months)
-            yoy_aff = _pct_change(s_aff, cfg.yoy_months)
-
-            z_dom, *_ = _zscore_latest(s_dom, cfg.z_lookback_months)
-            z_inv, *_ = _zscore_latest(s_inv, cfg.z_lookback_months)
-            z_aff, *_ = _zscore_latest(s_aff, cfg.z_lookback_months)
-
-            sales_yoy_series = s_sales.pct_change(cfg.yoy_months).dropna()
-            z_sales, *_ = _zscore_latest(sales_yoy_series, cfg.z_lookback_months)
-
-            price_yoy_series = s_zhvi.pct_change(cfg.yoy_months).dropna()
-            z_price_yoy, *_ = _zscore_latest(price_yoy_series, cfg.z_lookback_months)
-
-            rp_div_series = (s_rent.pct_change(cfg.yoy_months) - s_zhvi.pct_change(cfg.yoy_months)).dropna()
-            z_rpd, *_ = _zscore_latest(rp_div_series, cfg.z_lookback_months)
-
-            c_price_drawdown = _safe_sigmoid(-z_price_yoy)
-            c_sales_collapse = _safe_sigmoid(-z_sales)
-            c_inventory_spike = _safe_sigmoid(z_inv)
-            c_liquidity_freeze = _safe_sigmoid(z_dom)
-            c_affordability = _safe_sigmoid(z_aff)
-            c_rent_price_div = _safe_sigmoid(-z_rpd)
-
-            distress_score = (
-                cfg.w_price_drawdown * c_price_drawdown
-                + cfg.w_sales_collapse * c_sales_collapse
-                + cfg.w_inventory_spike * c_inventory_spike
-                + cfg.w_liquidity_freeze * c_liquidity_freeze
-                + cfg.w_affordability_stress * c_affordability
-                + cfg.w_rent_price_divergence * c_rent_price_div
-            )
-
-            features = {
-                "z_dom": z_dom,
-                "z_inventory": z_inv,
-                "z_afford": z_aff,
-                "z_sales": z_sales,
-                "z_price_drawdown": -z_price_yoy,
-                "z_rent_price_div": -z_rpd,
-            }
-
-            regime, regime_conf, regime_scores = classify_distress_regime(features)
-            recovery = estimate_time_to_mean_months(price_yoy_series, lookback=cfg.z_lookback_months, target_z=-0.5)
-            kill_eval = evaluate_deal_kill_rules(regime, features)
-
-            if distress_score < cfg.watch_threshold:
-                continue
-
-            if distress_score >= cfg.critical_threshold:
-                severity = "critical"
-            elif distress_score >= cfg.act_threshold:
-                severity = "high"
-            else:
-                severity = "medium"
-
-            components = {
-                "price_drawdown": c_price_drawdown,
-                "sales_collapse": c_sales_collapse,
-                "inventory_spike": c_inventory_spike,
-                "liquidity_freeze": c_liquidity_freeze,
-                "affordability_stress": c_affordability,
-                "rent_price_divergence": c_rent_price_div,
-            }
-
-            metrics = {
-                "yoy_price": yoy_price,
-                "yoy_rent": yoy_rent,
-                "yoy_sales": yoy_sales,
-                "yoy_inventory": yoy_inv,
-                "yoy_dom": yoy_dom,
-                "yoy_affordability": yoy_aff,
-                "latest_zhvi": float(s_zhvi.dropna().iloc[-1]),
-                "latest_zori": float(s_rent.dropna().iloc[-1]),
-                "latest_dom": float(s_dom.dropna().iloc[-1]),
-                "latest_inventory": float(s_inv.dropna().iloc[-1]),
-                "latest_sales": float(s_sales.dropna().iloc[-1]),
-                "latest_income_needed": float(s_aff.dropna().iloc[-1]),
-                "asof": str(s_zhvi.dropna().index[-1].date()),
-            }
-
-            scored.append((metro, float(distress_score), components, metrics, {
+        for j, row in enumerate(hits):
+            features = {k: float(v[row]) for k, v in s["features"].items()}
+            regime = REGIMES[int(s["regime"][row])]
+            metrics = {k: float(v[j]) for k, v in yoy.items()}
+            metrics.update({k: float(v[j]) for k, v in latest.items()})
+            metrics["asof"] = str(asof[j])
+
+            scored.append((str(panel.metros[row]), float(score[row]),
+                           {k: float(v[row]) for k, v in s["components"].items()}, metrics, {
                 "regime": regime,
-                "regime_confidence": regime_conf,
-                "regime_scores": regime_scores,
-                "recovery": recovery,
-                "kill_rules": kill_eval,
+                "regime_confidence": float(s["regime_confidence"][row]),
+                "regime_scores": dict(zip(REGIMES, map(float, s["regime_scores"][row]))),
+                "recovery": {k: float(v[j]) for k, v in recovery.items()},
+                "kill_rules": evaluate_deal_kill_rules(regime, features),
                 "features": features,
             }))
 
         if not scored:
             return []
 
-        scored.sort(key=lambda x: x[1], reverse=True)
-        scored = scored[: cfg.emit_top_n]
-
         findings: List[Finding] = []
         now = datetime.utcnow()
 
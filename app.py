@@ -71,6 +71,7 @@ def _apply_finding_council_migration(db):
             ("alerted", "BOOLEAN DEFAULT FALSE"),
             ("ta_regime", "VARCHAR(32)"),
             ("analyzed_at", "TIMESTAMP"),
+            ("cluster_id", "VARCHAR(32)"),
         ]
 
         for col_name, col_type in new_columns:
@@ -161,19 +162,20 @@ def create_app():
         def delayed_init():
             time.sleep(15)  # Wait 15 seconds for app to be fully ready and health checks to pass
             try:
-                with app.app_context():
-                    from scheduler import AgentScheduler
-                    scheduler = AgentScheduler(app)
-                    app.extensions["scheduler"] = scheduler
-                    logger.info(
-                        "AgentScheduler initialized successfully (deferred)")
+                # Only the process holding the DB lease schedules agents, so
+                # extra web workers stand by instead of duplicating jobs
+                from scheduler import run_leader_loop
+                run_leader_loop(app, threading.Event())
             except Exception as e:
                 logger.error(f"Scheduler failed to initialize: {e}")
 
         thread = threading.Thread(target=delayed_init, daemon=True)
         thread.start()
 
-    if not app.extensions.get("scheduler"):
+    # SCHEDULER_MODE=external: agents run in `python -m scheduler`, the web
+    # tier only serves requests and can scale to N workers
+    scheduler_mode = os.environ.get("SCHEDULER_MODE", "embedded")
+    if scheduler_mode == "embedded" and not app.extensions.get("scheduler"):
         init_scheduler_deferred()
         logger.info("Scheduler initialization deferred for fast startup")
 
@@ -194,6 +196,7 @@ def create_app():
     from routes.deals import deals_bp
     from routes.distressed_platform import distressed_platform_bp
     from routes.monitoring import monitoring_bp
+    from routes.stream import bp as stream_bp
     from replit_auth import make_replit_blueprint, init_auth
     from oauth_logins import oauth_bp
 
@@ -214,6 +217,7 @@ def create_app():
     app.register_blueprint(deals_bp)
     app.register_blueprint(distressed_platform_bp)
     app.register_blueprint(monitoring_bp)
+    app.register_blueprint(stream_bp)
     app.register_blueprint(replit_bp, url_prefix='/auth')
     app.register_blueprint(oauth_bp)
 
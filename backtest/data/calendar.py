@@ -1,6 +1,6 @@
 from __future__ import annotations
-from datetime import datetime
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import Dict, List
 import pandas as pd
 
 
@@ -11,3 +11,80 @@ def trading_days(start: str, end: str) -> List[datetime]:
     """
     idx = pd.date_range(start=start, end=end, freq="B")
     return [d.to_pydatetime() for d in idx]
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th `weekday` (Mon=0) of a month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def nyse_holidays(year: int) -> Dict[date, str]:
+    """NYSE full-day closures for a year (rule-based, weekend observance applied)."""
+    days = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    # New Year's Day falling on a Saturday is not observed on Dec 31
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days[_observed(new_year)] = "New Year's Day"
+    if year >= 2022:
+        days[_observed(date(year, 6, 19))] = "Juneteenth"
+    return days
+
+
+def nyse_early_closes(year: int) -> Dict[date, str]:
+    """NYSE 13:00 ET early closes for a year."""
+    holidays = nyse_holidays(year)
+    out = {}
+    candidates = {
+        date(year, 7, 3): "Independence Day eve",
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1): "Day after Thanksgiving",
+        date(year, 12, 24): "Christmas Eve",
+    }
+    for d, name in candidates.items():
+        if d.weekday() < 5 and d not in holidays:
+            out[d] = name
+    return out
+
+
+def exchange_trading_days(start: str, end: str) -> List[datetime]:
+    """trading_days() with NYSE holidays removed."""
+    days = trading_days(start, end)
+    years = {d.year for d in days}
+    closed = set()
+    for y in years:
+        closed.update(nyse_holidays(y))
+    return [d for d in days if d.date() not in closed]
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 import pandas as pd
 
+if TYPE_CHECKING:
+    from backtests.panel import FeatureCache, MarketPanel
+
 
 @dataclass
 class BacktestContext:
@@ -15,16 +18,51 @@ class BacktestContext:
     frames: dict[symbol -> DataFrame] where DF index is datetime-like and includes
             at least: ['Open','High','Low','Close','Volume'] (yfinance format).
             DataFrames are expected to be filtered to <= asof for no look-ahead.
+
+    Panel mode: when `panel` is set, `index` is the panel date index for asof,
+    frames are cut from the panel lazily on first access, and `features`
+    serves precomputed indicators as of `index` (see backtests.panel).
     """
     asof: datetime
     frames: Dict[str, pd.DataFrame] = field(default_factory=dict)
     meta: Dict[str, Any] = field(default_factory=dict)
+    panel: Optional["MarketPanel"] = None
+    features: Optional["FeatureCache"] = None
+    index: int = -1
+
+    @property
+    def has_panel(self) -> bool:
+        return self.panel is not None and self.features is not None
 
     def frame(self, symbol: str) -> Optional[pd.DataFrame]:
-        return self.frames.get(symbol)
+        df = self.frames.get(symbol)
+        if df is None and self.panel is not None and symbol in self.panel.symbols:
+            df = self.panel.frame_asof(symbol, self.index, self.meta.get("lookback"))
+            self.frames[symbol] = df
+        return df
 
     def window(self, symbol: str, lookback: int) -> Optional[pd.DataFrame]:
         df = self.frame(symbol)
         if df is None or df.empty:
             return None
         return df.tail(lookback)
+
+    def bars(self, symbol: str) -> int:
+        """Bars available for `symbol` (what len(ctx.frame(symbol)) would be)."""
+        if self.panel is None:
+            df = self.frames.get(symbol)
+            return 0 if df is None else len(df)
+        n = self.panel.bars(symbol, self.index)
+        lookback = self.meta.get("lookback")
+        return min(n, lookback) if lookback else n
+
+    def feature(self, name: str, symbol: str, lag: int = 0) -> float:
+        """
+        Precomputed feature `name` for `symbol`, `lag` bars before asof.
+        NaN for symbols outside the panel; frame-mode contexts raise.
+        """
+        if not self.has_panel:
+            raise ValueError("BacktestContext.feature() needs a panel-mode context (panel and features set)")
+        if symbol not in self.panel.symbols:
+            return float("nan")
+        return self.features.get(name, symbol, self.index, lag)
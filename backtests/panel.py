@@ -0,0 +1,157 @@
+"""
+Aligned multi-symbol market panel and precomputed feature cache for backtests.
+
+`MarketPanel` turns the per-symbol OHLCV frames into dates x symbols NumPy
+arrays on the union of trading dates (NaN where a symbol has no bar), and
+`FeatureCache` computes the features.definitions symbol features (returns,
+moving averages, RSI, rolling peaks etc.) once over the full history. Every feature at row t only uses bars up to t,
+so serving it "as of" a date index is look-ahead free.
+
+Lookups follow each symbol's own bars: `lag=k` means k bars back for that
+symbol, matching `df.iloc[-1 - k]` on the frame a BacktestContext would
+carry for the same date.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from features import definitions
+from features.definitions import rsi  # noqa: F401
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+FEATURES = tuple(definitions.FEATURES)
+
+
+def _column(df: pd.DataFrame, field: str) -> pd.Series:
+    col = df[field]
+    if isinstance(col, pd.DataFrame):  # yfinance multi-index columns
+        col = col.iloc[:, 0]
+    return col.astype(float)
+
+
+@dataclass(frozen=True)
+class MarketPanel:
+    """
+    OHLCV panel: data[field][t, s] is `field` for `symbols[s]` on `dates[t]`.
+
+    counts[t, s] is the number of bars symbol s has up to and including
+    date t; rows[s] maps a symbol's bar number to its date index. The
+    source frames are kept (sorted, de-duplicated) so a frame-based view
+    can still be cut for agents without a panel variant.
+    """
+    dates: pd.DatetimeIndex
+    symbols: tuple
+    data: Dict[str, np.ndarray]
+    counts: np.ndarray
+    rows: tuple
+    frames: Dict[str, pd.DataFrame]
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame],
+                    symbols: Optional[Sequence[str]] = None) -> "MarketPanel":
+        symbols = tuple(symbols if symbols is not None else frames)
+        clean: Dict[str, pd.DataFrame] = {}
+        for sym in symbols:
+            df = frames.get(sym)
+            if df is None or df.empty:
+                clean[sym] = pd.DataFrame()
+                continue
+            df = df[~df.index.duplicated(keep="last")]
+            clean[sym] = df if df.index.is_monotonic_increasing else df.sort_index()
+
+        indexes = [df.index for df in clean.values() if not df.empty]
+        dates = indexes[0] if indexes else pd.DatetimeIndex([])
+        for idx in indexes[1:]:
+            dates = dates.union(idx)
+        dates = pd.DatetimeIndex(dates)
+
+        T, S = len(dates), len(symbols)
+        data = {f: np.full((T, S), np.nan) for f in FIELDS}
+        present = np.zeros((T, S), dtype=bool)
+        rows = []
+        for s, sym in enumerate(symbols):
+            df = clean[sym]
+            if df.empty:
+                rows.append(np.empty(0, dtype=np.intp))
+                continue
+            at = dates.get_indexer(df.index)
+            present[at, s] = True
+            rows.append(at)
+            for f in FIELDS:
+                if f in df.columns:
+                    data[f][at, s] = _column(df, f).to_numpy()
+        counts = np.cumsum(present, axis=0)
+        return cls(dates, symbols, data, counts, tuple(rows), clean)
+
+    def index_asof(self, asof) -> int:
+        """Date index of the last panel date <= asof (-1 if none)."""
+        return int(self.dates.searchsorted(pd.Timestamp(asof), side="right")) - 1
+
+    def column(self, symbol: str) -> int:
+        return self.symbols.index(symbol)
+
+    def bars(self, symbol: str, index: int) -> int:
+        """Number of bars `symbol` has up to date index `index`."""
+        if index < 0 or symbol not in self.symbols:
+            return 0
+        return int(self.counts[index, self.column(symbol)])
+
+    def frame_asof(self, symbol: str, index: int, lookback: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """The source frame cut at `index` (and to `lookback` bars), without copying."""
+        df = self.frames.get(symbol)
+        if df is None:
+            return None
+        n = self.bars(symbol, index)
+        start = max(0, n - lookback) if lookback else 0
+        return df.iloc[start:n]
+
+
+class FeatureCache:
+    """
+    FEATURES for every symbol, computed once over the full history and
+    stored as dates x symbols arrays aligned with the panel.
+    """
+
+    def __init__(self, panel: MarketPanel, features: Iterable[str] = FEATURES):
+        self.panel = panel
+        T, S = panel.counts.shape
+        self.names = tuple(features)
+        self.values: Dict[str, np.ndarray] = {f: np.full((T, S), np.nan) for f in self.names}
+        for s, sym in enumerate(panel.symbols):
+            at = panel.rows[s]
+            if not len(at):
+                continue
+            close = pd.Series(panel.data["Close"][at, s])
+            computed = definitions.compute(close, self.names)
+            for f in self.names:
+                self.values[f][at, s] = computed[f].to_numpy()
+
+    def get(self, name: str, symbol: str, index: int, lag: int = 0) -> float:
+        """
+        `name` for `symbol` as of date index `index`, `lag` bars back on the
+        symbol's own bars. NaN if the symbol has no such bar yet.
+        """
+        panel = self.panel
+        s = panel.column(symbol)
+        n = int(panel.counts[index, s]) if index >= 0 else 0
+        if n - 1 - lag < 0:
+            return float("nan")
+        return float(self.values[name][panel.rows[s][n - 1 - lag], s])
+
+    def cross_section(self, name: str, index: int, symbols: Optional[List[str]] = None) -> np.ndarray:
+        """Latest value of `name` per symbol as of `index` (NaN where no bar yet)."""
+        panel = self.panel
+        cols = [panel.column(s) for s in symbols] if symbols is not None else list(range(len(panel.symbols)))
+        out = np.full(len(cols), np.nan)
+        if index < 0:
+            return out
+        for i, s in enumerate(cols):
+            n = int(panel.counts[index, s])
+            if n:
+                out[i] = self.values[name][panel.rows[s][n - 1], s]
+        return out
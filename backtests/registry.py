@@ -7,37 +7,44 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
 
+from services.policy_snapshot import atomic_write_json, get_policy
+
 logger = logging.getLogger(__name__)
 
 SCHEDULE_PATH = Path("agent_schedule.json")  # Root level, matching scheduler.py expectations
 
 
-def load_schedule() -> Dict[str, Dict]:
+def normalize_schedule(data: Dict[str, Any]) -> Dict[str, Dict]:
     """
-    Loads the current agent schedule.
+    Normalizes a raw schedule document.
     Handles both formats:
     - Legacy: {"AgentName": 60} (just interval)
     - New: {"AgentName": {"enabled": true, "weight": 1.0, ...}}
     """
+    result = {}
+    for agent, value in data.items():
+        if isinstance(value, (int, float)):
+            # Legacy format - convert to new format
+            result[agent] = {
+                "interval": int(value),
+                "enabled": True,
+                "weight": 1.0,
+                "reason": "legacy",
+            }
+        else:
+            result[agent] = value
+    return result
+
+
+def load_schedule() -> Dict[str, Dict]:
+    """
+    Loads the current agent schedule (normalized, see normalize_schedule).
+    """
     if not SCHEDULE_PATH.exists():
         return {}
     
     try:
-        data = json.loads(SCHEDULE_PATH.read_text())
-        # Normalize to new format
-        result = {}
-        for agent, value in data.items():
-            if isinstance(value, (int, float)):
-                # Legacy format - convert to new format
-                result[agent] = {
-                    "interval": int(value),
-                    "enabled": True,
-                    "weight": 1.0,
-                    "reason": "legacy",
-                }
-            else:
-                result[agent] = value
-        return result
+        return normalize_schedule(json.loads(SCHEDULE_PATH.read_text()))
     except (json.JSONDecodeError, OSError) as e:
         logger.error(f"Error loading schedule: {e}")
         return {}
@@ -47,8 +54,7 @@ def save_schedule(schedule: Dict[str, Dict]) -> None:
     """
     Saves the agent schedule to disk.
     """
-    SCHEDULE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SCHEDULE_PATH.write_text(json.dumps(schedule, indent=2))
+    atomic_write_json(SCHEDULE_PATH, schedule)
     logger.info(f"Saved schedule to {SCHEDULE_PATH}")
 
 
@@ -110,8 +116,7 @@ def is_agent_enabled(agent_name: str) -> bool:
     Checks if an agent is enabled.
     Returns True if agent is not in schedule (default enabled).
     """
-    cfg = get_agent_config(agent_name)
-    return cfg.get("enabled", True)
+    return get_policy().enabled(agent_name)
 
 
 def get_agent_weight(agent_name: str) -> float:
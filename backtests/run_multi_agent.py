@@ -13,8 +13,8 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
-from backtests.context import BacktestContext
-from backtests.data_yahoo import fetch_daily, slice_asof
+from backtests.data_yahoo import fetch_daily
+from backtests.runner import analyze, iter_contexts
 
 from agents.market_correction_agent import MarketCorrectionAgent
 from agents.equity_momentum_agent import EquityMomentumAgent
@@ -71,30 +71,17 @@ def main():
     print(f"\nRunning backtest for {len(agents)} agents over {len(days)} trading days...")
     
     progress_step = max(1, len(days) // 20)
-    for i, day in enumerate(days):
+    contexts = iter_contexts(data, symbols, days, lookback=lookback, panel=True)
+    for i, ctx in enumerate(contexts):
         if i % progress_step == 0:
             print(f"  Progress: {i}/{len(days)} days ({i*100//len(days)}%)")
-        
-        asof = day.to_pydatetime()
-        frames = {}
-        for sym in symbols:
-            df_full = data.get(sym, pd.DataFrame())
-            df_cut = slice_asof(df_full, asof)
-            if df_cut is not None and not df_cut.empty and lookback:
-                df_cut = df_cut.tail(lookback)
-            frames[sym] = df_cut
-
-        ctx = BacktestContext(
-            asof=asof,
-            frames=frames,
-            meta={"symbols": symbols, "lookback": lookback}
-        )
+        asof = ctx.asof
 
         for agent in agents:
             if not agent_supports_ctx(agent):
                 continue
             try:
-                findings = agent.analyze_ctx(ctx) or []
+                findings = analyze(agent, ctx)
             except Exception as e:
                 rows.append(BacktestResultRow(
                     asof=asof.isoformat(),
@@ -11,6 +11,7 @@ import pandas as pd
 
 from backtests.context import BacktestContext
 from backtests.data_yahoo import slice_asof
+from backtests.panel import FeatureCache, MarketPanel
 
 
 @dataclass
@@ -42,6 +43,57 @@ def agent_supports_ctx(agent) -> bool:
     return callable(getattr(agent, "analyze_ctx", None))
 
 
+def agent_supports_panel(agent) -> bool:
+    return callable(getattr(agent, "analyze_panel", None))
+
+
+def iter_contexts(
+    data: Dict[str, pd.DataFrame],
+    symbols: List[str],
+    days: List[pd.Timestamp],
+    lookback: int = 252,
+    panel: bool = True,
+):
+    """
+    Yield a BacktestContext per day.
+
+    Panel mode builds the aligned panel and feature cache once; each day's
+    context is then just an index into them, with frames cut on demand.
+    Frame mode slices every symbol's DataFrame every day.
+    """
+    meta = {"symbols": symbols, "lookback": lookback}
+    if panel:
+        market = MarketPanel.from_frames(data, symbols)
+        features = FeatureCache(market)
+        for day in days:
+            yield BacktestContext(
+                asof=day.to_pydatetime(),
+                meta=dict(meta),
+                panel=market,
+                features=features,
+                index=market.index_asof(day),
+            )
+        return
+
+    for day in days:
+        asof = day.to_pydatetime()
+        frames = {}
+        for sym in symbols:
+            df_full = data.get(sym, pd.DataFrame())
+            df_cut = slice_asof(df_full, asof)
+            if df_cut is not None and not df_cut.empty and lookback:
+                df_cut = df_cut.tail(lookback)
+            frames[sym] = df_cut
+        yield BacktestContext(asof=asof, frames=frames, meta=dict(meta))
+
+
+def analyze(agent, ctx: BacktestContext) -> List[Dict[str, Any]]:
+    """Panel variant when the agent has one and the context carries a panel."""
+    if ctx.has_panel and agent_supports_panel(agent):
+        return agent.analyze_panel(ctx) or []
+    return agent.analyze_ctx(ctx) or []
+
+
 def run_backtest_for_agents(
     agents: List[Tuple[str, str]],
     data: Dict[str, pd.DataFrame],
@@ -50,10 +102,13 @@ def run_backtest_for_agents(
     end: str,
     lookback: int = 252,
     output_jsonl: str = "backtests/results.jsonl",
+    panel: bool = True,
 ) -> Dict[str, Any]:
     """
     Runs backtest over business days, calling agent.analyze_ctx(ctx) when available.
     Skips agents lacking analyze_ctx to avoid fake backtests.
+    With panel=True, agents that implement analyze_panel(ctx) read the
+    precomputed feature cache instead of recomputing indicators per day.
     """
     rows: List[BacktestResultRow] = []
     days = iter_trading_days(start, end)
@@ -67,27 +122,14 @@ def run_backtest_for_agents(
             skipped.append(f"{class_name} (no analyze_ctx)")
         agent_instances.append(inst)
 
-    for day in days:
-        asof = day.to_pydatetime()
-        frames = {}
-        for sym in symbols:
-            df_full = data.get(sym, pd.DataFrame())
-            df_cut = slice_asof(df_full, asof)
-            if df_cut is not None and not df_cut.empty and lookback:
-                df_cut = df_cut.tail(lookback)
-            frames[sym] = df_cut
-
-        ctx = BacktestContext(
-            asof=asof,
-            frames=frames,
-            meta={"symbols": symbols, "lookback": lookback}
-        )
+    for ctx in iter_contexts(data, symbols, days, lookback=lookback, panel=panel):
+        asof = ctx.asof
 
         for agent in agent_instances:
             if not agent_supports_ctx(agent):
                 continue
             try:
-                findings = agent.analyze_ctx(ctx) or []
+                findings = analyze(agent, ctx)
             except Exception as e:
                 rows.append(BacktestResultRow(
                     asof=asof.isoformat(),
@@ -127,5 +169,6 @@ def run_backtest_for_agents(
         "rows": len(rows),
         "skipped_agents": skipped,
         "output": output_jsonl,
+        "panel": panel,
     }
     return summary
@@ -52,12 +52,20 @@ class Config:
             "WhaleWalletWatcherAgent": {
                 "interval": 15,
                 "threshold": cls.WHALE_WALLET_THRESHOLD,
-                "networks": ["ethereum", "bitcoin"]
+                "networks": ["ethereum", "bitcoin"],
+                "addresses": [],
+                "max_polls_per_run": 60
             },
             "ArbitrageFinderAgent": {
                 "interval": 5,
                 "exchanges": ["coinbase", "kraken", "kucoin"],
-                "min_profit": cls.ARBITRAGE_PROFIT_THRESHOLD
+                "trading_pairs": ["BTC/USD", "ETH/USD", "ADA/USD", "SOL/USD", "MATIC/USD"],
+                "min_profit": cls.ARBITRAGE_PROFIT_THRESHOLD,
+                # Taker fee per exchange; unset ones use the ccxt market fee,
+                # or default_fee where ccxt doesn't report one
+                "fees": {},
+                "default_fee": 0.006,
+                "fetch_timeout": 60
             },
             "SentimentDivergenceAgent": {
                 "interval": 30,
@@ -70,12 +78,31 @@ class Config:
                 "max_articles_per_region": 5,
                 "hotspots": ["Taiwan", "Ukraine", "Middle East", "China-US", "North Korea", "South China Sea"]
             },
+            "LPPLSBubbleAgent": {
+                "interval": cls.DEFAULT_AGENT_INTERVAL,
+                "confidence_threshold": 0.3,
+                # LPPLS window fits run in a shared forkserver pool of this size
+                "workers": 2
+            },
             "MarketCorrectionAgent": {
                 "interval": 15,
                 "correction_threshold": cls.MARKET_CORRECTION_THRESHOLD,
                 "rsi_overbought": cls.RSI_OVERBOUGHT,
                 "vix_warning": cls.VIX_WARNING,
                 "vix_critical": cls.VIX_CRITICAL
+            },
+            # Daily-bar agents: skip runs whose last bars haven't moved (agents.memo)
+            "EquityMomentumAgent": {
+                "interval": cls.DEFAULT_AGENT_INTERVAL,
+                "memoize": True
+            },
+            "BondStressAgent": {
+                "interval": cls.DEFAULT_AGENT_INTERVAL,
+                "memoize": True
+            },
+            "SectorRotationSignalAgent": {
+                "interval": cls.DEFAULT_AGENT_INTERVAL,
+                "memoize": True
             }
         }
         return configs.get(agent_name, {"interval": cls.DEFAULT_AGENT_INTERVAL})
@@ -10,19 +10,32 @@ Supported Sources:
 - SEC EDGAR (company filings)
 - News/Sentiment feeds
 - Trade claim platforms
+
+Runtime:
+- Slotted FeedItems
+- Per-feed LRU+TTL cache with a size limit
+- Process-wide per-host rate budget (services.rate_budget), shared with
+  every other client hitting the same host and fed 429/Retry-After
+- Concurrent fan-out across feeds with incremental subscriber delivery
 """
 
 import os
 import json
 import logging
 import hashlib
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 import time
 
+from data_sources.shared import get_http_session
+from services.rate_budget import rate_budget
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,9 +62,13 @@ class DataFeedConfig:
     enabled: bool = True
     custom_headers: Dict[str, str] = field(default_factory=dict)
     field_mapping: Dict[str, str] = field(default_factory=dict)
+    burst: int = 5                 # token bucket capacity
+    cache_max_entries: int = 256   # LRU bound per feed
+    cache_ttl: int = 1800          # hard upper bound on entry age (seconds)
+    keep_raw_data: bool = True     # drop raw payloads after normalization when False
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedItem:
     """Normalized data item from any feed."""
     id: str
@@ -65,6 +82,71 @@ class FeedItem:
     data_type: str = "unknown"  # deal, filing, price, news, claim
     raw_data: Dict[str, Any] = field(default_factory=dict)
     normalized_data: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identity used for de-duplicating incremental delivery."""
+        return (self.source, self.id)
+
+
+class FeedCache:
+    """
+    Thread-safe LRU cache with TTL.
+    Entries older than `ttl` are dropped on access; the least recently
+    used entry is evicted once `max_entries` is exceeded.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: int = 1800):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str, max_age: Optional[int] = None) -> Optional[Any]:
+        limit = self.ttl if max_age is None else min(max_age, self.ttl)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            cached_time, data = entry
+            if time.time() - cached_time >= limit:
+                if time.time() - cached_time >= self.ttl:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return data
+    
+    def set(self, key: str, data: Any):
+        with self._lock:
+            self._data[key] = (time.time(), data)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
 
 
 class BaseDataFeed(ABC):
@@ -74,7 +156,9 @@ class BaseDataFeed(ABC):
         self.config = config
         self.last_request_time = 0
         self._request_count = 0
-        self._cache: Dict[str, Any] = {}
+        self._cache = FeedCache(config.cache_max_entries, config.cache_ttl)
+        self._budget = rate_budget.register(config.base_url or config.name, config.rate_limit, config.burst)
+        self._session = get_http_session()
     
     @abstractmethod
     def fetch(self, **kwargs) -> List[FeedItem]:
@@ -86,13 +170,32 @@ class BaseDataFeed(ABC):
         """Normalize raw data to standard format."""
         pass
     
-    def _rate_limit(self):
-        """Enforce rate limiting."""
-        min_interval = 60.0 / self.config.rate_limit
-        elapsed = time.time() - self.last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
+    def _rate_limit(self) -> bool:
+        """
+        Per-feed request bookkeeping. The shared session takes the token
+        from this host's rate budget (blocking only this thread), skips
+        it when the response is served from the HTTP cache, and raises
+        if the wait times out, which the fetch treats as an error.
+        
+        Returns False, and the fetch is skipped without a request, while
+        throttling feedback has paused the host for longer than the
+        feed's timeout.
+        """
+        paused = self._budget.paused_for()
+        if paused > self.config.timeout:
+            logger.warning(f"[{self.config.name}] Rate budget paused for {paused:.0f}s, skipping fetch")
+            return False
+        self._request_count += 1
         self.last_request_time = time.time()
+        return True
+    
+    def _normalize_all(self, raw_items: List[Dict[str, Any]]) -> List[FeedItem]:
+        """Normalize a payload, dropping raw dicts unless configured to keep them."""
+        items = [self.normalize(raw) for raw in raw_items]
+        if not self.config.keep_raw_data:
+            for item in items:
+                item.raw_data = {}
+        return items
     
     def _cache_key(self, **kwargs) -> str:
         """Generate cache key from parameters."""
@@ -100,15 +203,11 @@ class BaseDataFeed(ABC):
     
     def _get_cached(self, key: str, max_age: int = 300) -> Optional[Any]:
         """Get cached result if not expired."""
-        if key in self._cache:
-            cached_time, data = self._cache[key]
-            if time.time() - cached_time < max_age:
-                return data
-        return None
+        return self._cache.get(key, max_age)
     
     def _set_cached(self, key: str, data: Any):
         """Cache result with timestamp."""
-        self._cache[key] = (time.time(), data)
+        self._cache.set(key, data)
 
 
 class DebtwireFeed(BaseDataFeed):
@@ -119,17 +218,16 @@ class DebtwireFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch distressed deals."""
-        self._rate_limit()
-        
         # Check cache
         cache_key = self._cache_key(**kwargs)
         cached = self._get_cached(cache_key)
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             headers = {
                 "Authorization": f"Bearer {self.config.api_key}",
                 "Content-Type": "application/json",
@@ -144,7 +242,7 @@ class DebtwireFeed(BaseDataFeed):
             }
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/deals",
                 headers=headers,
                 params=params,
@@ -156,7 +254,7 @@ class DebtwireFeed(BaseDataFeed):
             if isinstance(raw_deals, dict):
                 raw_deals = raw_deals.get("deals", raw_deals.get("data", []))
             
-            items = [self.normalize(deal) for deal in raw_deals]
+            items = self._normalize_all(raw_deals)
             self._set_cached(cache_key, items)
             return items
             
@@ -199,8 +297,6 @@ class BloombergFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch market data for securities."""
-        self._rate_limit()
-        
         securities = kwargs.get("securities", [])  # List of CUSIPs/ISINs
         fields = kwargs.get("fields", ["PX_LAST", "YLD_YTM_MID", "RTG_SP", "RTG_MOODY"])
         
@@ -209,9 +305,10 @@ class BloombergFeed(BaseDataFeed):
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             headers = {
                 "Authorization": f"Bearer {self.config.api_key}",
                 "Content-Type": "application/json",
@@ -223,7 +320,7 @@ class BloombergFeed(BaseDataFeed):
                 "fields": fields,
             }
             
-            response = requests.post(
+            response = self._session.post(
                 f"{self.config.base_url}/data",
                 headers=headers,
                 json=payload,
@@ -232,10 +329,7 @@ class BloombergFeed(BaseDataFeed):
             response.raise_for_status()
             
             raw_data = response.json()
-            items = []
-            
-            for security_data in raw_data.get("securities", []):
-                items.append(self.normalize(security_data))
+            items = self._normalize_all(raw_data.get("securities", []))
             
             self._set_cached(cache_key, items)
             return items
@@ -286,8 +380,6 @@ class PACERFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch court filings."""
-        self._rate_limit()
-        
         case_number = kwargs.get("case_number")
         court = kwargs.get("court", "deb")
         date_from = kwargs.get("date_from")
@@ -298,9 +390,10 @@ class PACERFeed(BaseDataFeed):
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             headers = {
                 "Authorization": f"Basic {self.config.api_key}",
                 **self.config.custom_headers
@@ -314,7 +407,7 @@ class PACERFeed(BaseDataFeed):
             }
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/filings",
                 headers=headers,
                 params=params,
@@ -326,7 +419,7 @@ class PACERFeed(BaseDataFeed):
             if isinstance(raw_filings, dict):
                 raw_filings = raw_filings.get("filings", raw_filings.get("documents", []))
             
-            items = [self.normalize(filing) for filing in raw_filings]
+            items = self._normalize_all(raw_filings)
             self._set_cached(cache_key, items)
             return items
             
@@ -369,8 +462,6 @@ class SECEdgarFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch SEC filings."""
-        self._rate_limit()
-        
         cik = kwargs.get("cik")
         ticker = kwargs.get("ticker")
         form_types = kwargs.get("form_types", self.DISTRESSED_FORM_TYPES)
@@ -381,9 +472,10 @@ class SECEdgarFeed(BaseDataFeed):
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             # SEC EDGAR API (no auth required, but rate limited)
             headers = {
                 "User-Agent": self.config.custom_headers.get("User-Agent", "DistressedInvestor/1.0"),
@@ -404,7 +496,7 @@ class SECEdgarFeed(BaseDataFeed):
             }
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(
+            response = self._session.get(
                 url,
                 headers=headers,
                 params=params,
@@ -416,7 +508,7 @@ class SECEdgarFeed(BaseDataFeed):
             if isinstance(raw_filings, dict):
                 raw_filings = raw_filings.get("filings", raw_filings.get("results", []))
             
-            items = [self.normalize(filing) for filing in raw_filings]
+            items = self._normalize_all(raw_filings)
             self._set_cached(cache_key, items)
             return items
             
@@ -462,8 +554,6 @@ class NewsFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch news articles."""
-        self._rate_limit()
-        
         query = kwargs.get("query")
         company = kwargs.get("company")
         keywords = kwargs.get("keywords", self.DISTRESS_KEYWORDS)
@@ -474,9 +564,10 @@ class NewsFeed(BaseDataFeed):
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             headers = {
                 "Authorization": f"Bearer {self.config.api_key}",
                 **self.config.custom_headers
@@ -495,7 +586,7 @@ class NewsFeed(BaseDataFeed):
             }
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/everything",
                 headers=headers,
                 params=params,
@@ -507,7 +598,7 @@ class NewsFeed(BaseDataFeed):
             if isinstance(raw_articles, dict):
                 raw_articles = raw_articles.get("articles", [])
             
-            items = [self.normalize(article) for article in raw_articles]
+            items = self._normalize_all(raw_articles)
             self._set_cached(cache_key, items)
             return items
             
@@ -557,8 +648,6 @@ class TradeClaimFeed(BaseDataFeed):
     
     def fetch(self, **kwargs) -> List[FeedItem]:
         """Fetch available trade claims."""
-        self._rate_limit()
-        
         debtor = kwargs.get("debtor")
         min_amount = kwargs.get("min_amount")
         claim_type = kwargs.get("claim_type")  # trade, admin, priority
@@ -568,9 +657,10 @@ class TradeClaimFeed(BaseDataFeed):
         if cached:
             return cached
         
+        if not self._rate_limit():
+            return []
+        
         try:
-            import requests
-            
             headers = {
                 "Authorization": f"Bearer {self.config.api_key}",
                 **self.config.custom_headers
@@ -584,7 +674,7 @@ class TradeClaimFeed(BaseDataFeed):
             }
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/claims",
                 headers=headers,
                 params=params,
@@ -596,7 +686,7 @@ class TradeClaimFeed(BaseDataFeed):
             if isinstance(raw_claims, dict):
                 raw_claims = raw_claims.get("claims", [])
             
-            items = [self.normalize(claim) for claim in raw_claims]
+            items = self._normalize_all(raw_claims)
             self._set_cached(cache_key, items)
             return items
             
@@ -649,9 +739,14 @@ class FeedManager:
         DataSourceType.TRADE_CLAIMS: TradeClaimFeed,
     }
     
-    def __init__(self):
+    SEEN_KEYS_PER_FEED = 5000
+    
+    def __init__(self, max_workers: int = 8):
         self.feeds: Dict[str, BaseDataFeed] = {}
         self.callbacks: Dict[str, List[Callable]] = {}
+        self.max_workers = max_workers
+        self._seen: Dict[str, "OrderedDict[Tuple[str, str], None]"] = {}
+        self._seen_lock = threading.Lock()
         self._load_feeds_from_env()
     
     def _load_feeds_from_env(self):
@@ -721,6 +816,7 @@ class FeedManager:
         """Remove a data feed."""
         if name in self.feeds:
             del self.feeds[name]
+            self._seen.pop(name, None)
             logger.info(f"[FeedManager] Unregistered feed: {name}")
     
     def get_feed(self, name: str) -> Optional[BaseDataFeed]:
@@ -742,24 +838,67 @@ class FeedManager:
     def fetch_all(self, source_type: Optional[DataSourceType] = None, **kwargs) -> List[FeedItem]:
         """
         Fetch from all feeds (optionally filtered by type).
+        
+        Feeds are fetched concurrently; each feed waits only on its own
+        source's token bucket. Subscribers receive each feed's new items
+        as soon as that feed completes. The returned list keeps feed
+        registration order.
         """
-        results = []
+        selected = [
+            (name, feed) for name, feed in self.feeds.items()
+            if feed.config.enabled and (not source_type or feed.config.source_type == source_type)
+        ]
+        if not selected:
+            return []
         
-        for name, feed in self.feeds.items():
-            if not feed.config.enabled:
-                continue
-            if source_type and feed.config.source_type != source_type:
-                continue
-            
-            try:
-                items = feed.fetch(**kwargs)
-                results.extend(items)
+        by_feed: Dict[str, List[FeedItem]] = {}
+        workers = max(1, min(self.max_workers, len(selected)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed") as pool:
+            futures = {pool.submit(feed.fetch, **kwargs): (name, feed) for name, feed in selected}
+            for future in as_completed(futures):
+                name, feed = futures[future]
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logger.error(f"[FeedManager] Error fetching from {name}: {e}")
+                    continue
+                by_feed[name] = items
                 logger.info(f"[FeedManager] Fetched {len(items)} items from {name}")
-            except Exception as e:
-                logger.error(f"[FeedManager] Error fetching from {name}: {e}")
+                self._deliver(name, feed, items)
         
+        results = []
+        for name, _ in selected:
+            results.extend(by_feed.get(name, []))
         return results
     
+    def _new_items(self, name: str, items: List[FeedItem]) -> List[FeedItem]:
+        """Items from `name` not delivered before (bounded memory of seen keys)."""
+        with self._seen_lock:
+            seen = self._seen.setdefault(name, OrderedDict())
+            fresh = []
+            for item in items:
+                key = item.key
+                if key in seen:
+                    seen.move_to_end(key)
+                    continue
+                seen[key] = None
+                fresh.append(item)
+            while len(seen) > self.SEEN_KEYS_PER_FEED:
+                seen.popitem(last=False)
+            return fresh
+    
+    def _deliver(self, name: str, feed: BaseDataFeed, items: List[FeedItem]):
+        """Push only never-seen items from one feed to its subscribers."""
+        callbacks = self.callbacks.get(feed.config.source_type.value)
+        if not callbacks or not items:
+            return
+        for item in self._new_items(name, items):
+            for callback in callbacks:
+                try:
+                    callback(item)
+                except Exception as e:
+                    logger.warning(f"[FeedManager] Subscriber error for {name}: {e}")
+    
     def fetch_deals(self, **kwargs) -> List[FeedItem]:
         """Fetch distressed deals from all deal flow sources."""
         return self.fetch_all(DataSourceType.DEAL_FLOW, **kwargs)
@@ -783,7 +922,10 @@ class FeedManager:
         return self.fetch_all(DataSourceType.TRADE_CLAIMS, debtor=debtor, **kwargs)
     
     def subscribe(self, source_type: DataSourceType, callback: Callable[[FeedItem], None]):
-        """Subscribe to updates from a source type."""
+        """
+        Subscribe to updates from a source type.
+        The callback is invoked once per new item, as each feed's fetch completes.
+        """
         key = source_type.value
         if key not in self.callbacks:
             self.callbacks[key] = []
@@ -854,6 +996,8 @@ class FeedManager:
                     "source_type": feed.config.source_type.value,
                     "status": "healthy" if feed.config.enabled else "disabled",
                     "last_request": feed.last_request_time,
+                    "request_count": feed._request_count,
+                    "cache": feed._cache.stats(),
                 }
                 status["feeds"][name] = feed_status
             except Exception as e:
@@ -3,19 +3,53 @@ Data Sources Module
 
 Contains clients for various external data sources including
 market data, blockchain data, and alternative data sources.
+
+Clients are resolved lazily on first attribute access so importing one
+lightweight submodule doesn't pull in ccxt, yfinance and pandas.
 """
 
-from .coinbase_client import CoinbaseClient
-from .etherscan_client import EtherscanClient
-from .github_client import GitHubClient
-from .yahoo_finance_client import YahooFinanceClient
-from .schwab_client import SchwabClient, get_schwab_client
+import importlib
+
+_EXPORTS = {
+    'CoinbaseClient': '.coinbase_client',
+    'EtherscanClient': '.etherscan_client',
+    'GitHubClient': '.github_client',
+    'YahooFinanceClient': '.yahoo_finance_client',
+    'SchwabClient': '.schwab_client',
+    'get_schwab_client': '.schwab_client',
+    'get_coinbase_client': '.shared',
+    'get_etherscan_client': '.shared',
+    'get_exchange': '.shared',
+    'get_http_session': '.shared',
+    'get_yahoo_client': '.shared',
+    'fetch_quote_matrix': '.quote_matrix',
+    'AsyncCoinbaseClient': '.coinbase_client',
+    'AsyncEtherscanClient': '.etherscan_client',
+    'AsyncSchwabClient': '.schwab_client',
+    'AsyncYahooFinanceClient': '.yahoo_finance_client',
+    'get_async_coinbase_client': '.shared',
+    'get_async_etherscan_client': '.shared',
+    'get_async_exchange': '.shared',
+    'get_async_http_client': '.shared',
+    'get_async_schwab_client': '.shared',
+    'get_async_yahoo_client': '.shared',
+    'gather_limited': '.shared',
+    'run_async': '.shared',
+    'WalletTracker': '.wallet_tracker',
+    'get_wallet_tracker': '.wallet_tracker',
+    'Form4Ingester': '.edgar_form4',
+    'InsiderStore': '.edgar_form4',
+    'get_form4_ingester': '.edgar_form4',
+    'get_insider_store': '.edgar_form4',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'CoinbaseClient',
-    'EtherscanClient', 
-    'GitHubClient',
-    'YahooFinanceClient',
-    'SchwabClient',
-    'get_schwab_client',
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
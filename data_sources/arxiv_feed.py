@@ -1,6 +1,7 @@
-import requests
 import feedparser
 
+from data_sources.shared import get_http_session
+
 ARXIV_API = "http://export.arxiv.org/api/query"
 
 def fetch_arxiv(query: str, max_results: int = 10):
@@ -11,7 +12,7 @@ def fetch_arxiv(query: str, max_results: int = 10):
         "sortBy": "submittedDate",
         "sortOrder": "descending",
     }
-    r = requests.get(ARXIV_API, params=params, timeout=20)
+    r = get_http_session().get(ARXIV_API, params=params, timeout=20)
     r.raise_for_status()
     feed = feedparser.parse(r.text)
     items = []
@@ -8,11 +8,14 @@ has excellent API reliability.
 
 import ccxt
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from config import Config
+from services.rate_budget import rate_budget
 
 logger = logging.getLogger(__name__)
 
+RATE_BUDGET_TIMEOUT = 60  # seconds
+
 class CoinbaseClient:
     """
     Client for Coinbase API data
@@ -39,6 +42,19 @@ class CoinbaseClient:
         except Exception as e:
             logger.error(f"Error initializing Coinbase client: {e}")
     
+    def _take_budget(self):
+        """
+        Wait for a token from the Coinbase rate budget (ccxt's own limiter is
+        per instance); ConnectionError if the budget refuses within the timeout
+        """
+        if not rate_budget.acquire("coinbase", timeout=RATE_BUDGET_TIMEOUT):
+            raise ConnectionError("Coinbase rate budget exhausted")
+    
+    @staticmethod
+    def _report_throttle(error: Exception):
+        if isinstance(error, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+            rate_budget.feedback("coinbase", 429)
+    
     def get_ticker(self, symbol: str) -> Optional[Dict]:
         """
         Get ticker data for a symbol
@@ -53,13 +69,23 @@ class CoinbaseClient:
             return None
             
         try:
+            self._take_budget()
             ticker = self.exchange.fetch_ticker(symbol)
             return dict(ticker) if ticker else None
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting ticker for {symbol}: {e}")
             return None
     
+    def get_tickers(self, symbols: Sequence[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Ticker data for several symbols, fetched concurrently
+        (see AsyncCoinbaseClient.get_tickers)
+        """
+        from .shared import get_async_coinbase_client, run_async
+        return run_async(get_async_coinbase_client().get_tickers(symbols))
+    
     def get_funding_rate(self, symbol: str) -> Optional[Dict]:
         """
         Get current funding rate for a futures symbol
@@ -75,10 +101,12 @@ class CoinbaseClient:
             
         try:
             # Get funding rate info
+            self._take_budget()
             funding_rate = self.exchange.fetch_funding_rate(symbol)
             return funding_rate
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting funding rate for {symbol}: {e}")
             return None
     
@@ -97,10 +125,12 @@ class CoinbaseClient:
             return None
             
         try:
+            self._take_budget()
             history = self.exchange.fetch_funding_rate_history(symbol, limit=limit)
             return history
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting funding rate history for {symbol}: {e}")
             return None
     
@@ -119,10 +149,12 @@ class CoinbaseClient:
             return None
             
         try:
+            self._take_budget()
             orderbook = self.exchange.fetch_order_book(symbol, limit)
             return dict(orderbook) if orderbook else None
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting orderbook for {symbol}: {e}, using fallback")
             return self._fallback_orderbook(symbol)
     
@@ -173,13 +205,20 @@ class CoinbaseClient:
             return None
             
         try:
+            self._take_budget()
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
             return ohlcv
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting OHLCV for {symbol}: {e}")
             return None
     
+    def get_ohlcv_many(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100) -> Dict[str, Optional[List]]:
+        """OHLCV for several symbols, fetched concurrently"""
+        from .shared import get_async_coinbase_client, run_async
+        return run_async(get_async_coinbase_client().get_ohlcv_many(symbols, timeframe, limit))
+    
     def get_24hr_stats(self, symbol: str) -> Optional[Dict]:
         """
         Get 24-hour ticker statistics
@@ -194,6 +233,7 @@ class CoinbaseClient:
             return None
             
         try:
+            self._take_budget()
             stats = self.exchange.fetch_ticker(symbol)
             
             return {
@@ -207,6 +247,7 @@ class CoinbaseClient:
             }
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting 24hr stats for {symbol}: {e}")
             return None
     
@@ -229,5 +270,61 @@ class CoinbaseClient:
             }
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting exchange info: {e}")
             return None
+
+
+class AsyncCoinbaseClient:
+    """
+    Asyncio counterpart of CoinbaseClient on a per-loop ccxt.async_support
+    exchange. Each request waits on the Coinbase rate budget without
+    blocking the event loop; batch methods run concurrently.
+    """
+    
+    def __init__(self):
+        self.api_key = Config.COINBASE_API_KEY
+        self.secret = Config.COINBASE_SECRET
+        self.passphrase = Config.COINBASE_PASSPHRASE
+    
+    async def _exchange(self):
+        from .shared import get_async_exchange
+        return await get_async_exchange('coinbase', apiKey=self.api_key, secret=self.secret,
+                                        passphrase=self.passphrase, sandbox=False)
+    
+    async def _call(self, method: str, *args, **kwargs):
+        exchange = await self._exchange()
+        if not await rate_budget.acquire_async("coinbase", timeout=RATE_BUDGET_TIMEOUT):
+            raise ccxt.RateLimitExceeded("Coinbase rate budget exhausted")
+        try:
+            return await getattr(exchange, method)(*args, **kwargs)
+        except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+            rate_budget.feedback("coinbase", 429)
+            raise
+    
+    async def get_ticker(self, symbol: str) -> Optional[Dict]:
+        try:
+            ticker = await self._call('fetch_ticker', symbol)
+            return dict(ticker) if ticker else None
+        except Exception as e:
+            logger.error(f"Error getting ticker for {symbol}: {e}")
+            return None
+    
+    async def get_tickers(self, symbols: Sequence[str]) -> Dict[str, Optional[Dict]]:
+        """Ticker per symbol, requested concurrently (None where the fetch failed)"""
+        from .shared import gather_limited
+        results = await gather_limited(self.get_ticker(s) for s in symbols)
+        return {s: (None if isinstance(r, BaseException) else r) for s, r in zip(symbols, results)}
+    
+    async def get_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[List]:
+        try:
+            return await self._call('fetch_ohlcv', symbol, timeframe, limit=limit)
+        except Exception as e:
+            logger.error(f"Error getting OHLCV for {symbol}: {e}")
+            return None
+    
+    async def get_ohlcv_many(self, symbols: Sequence[str], timeframe: str = '1h', limit: int = 100) -> Dict[str, Optional[List]]:
+        """OHLCV per symbol, requested concurrently"""
+        from .shared import gather_limited
+        results = await gather_limited(self.get_ohlcv(s, timeframe, limit) for s in symbols)
+        return {s: (None if isinstance(r, BaseException) else r) for s, r in zip(symbols, results)}
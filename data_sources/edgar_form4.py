@@ -0,0 +1,430 @@
+"""
+SEC EDGAR Form 4 ingestion and local insider-transaction index.
+
+Pulls the EDGAR daily form index incrementally by filing date, queues
+every Form 4 / 4/A it lists, then fetches and parses queued filings into
+a local SQLite table (data_cache/edgar/form4.sqlite) indexed by issuer
+and transaction date, so agents query insider activity locally instead
+of calling SEC per symbol:
+
+    from data_sources.edgar_form4 import get_form4_ingester, get_insider_store
+    get_form4_ingester().run()                      # new index days + queued filings
+    get_insider_store().transactions(symbol="AAPL", since="2024-01-01")
+    get_insider_store().clusters(since="2024-01-01", code="P", min_insiders=3)
+
+A run costs one index request per filing day not yet seen (normally
+one) plus one request per filing never fetched before, capped at
+`max_filings` per run, newest first; the rest stays queued for the next
+run. Both are streamed: the index line by line, and each submission
+through an XMLPullParser fed chunk by chunk from the <ownershipDocument>
+onward, keeping only non-derivative transactions. A day whose index
+isn't published yet is retried next run; one still missing a few days
+later is taken to be a holiday.
+
+Issuers with new transactions are published as `form4:<SYMBOL>` data
+events (services.data_events).
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEC_BASE = "https://www.sec.gov"
+USER_AGENT = os.getenv("SEC_USER_AGENT", "MarketInefficiencyPlatform contact@example.com")
+DEFAULT_DB = Path("data_cache/edgar/form4.sqlite")
+
+FORM_TYPES = ("4", "4/A")
+BOOTSTRAP_DAYS = 30
+MAX_FILINGS_PER_RUN = 500
+MAX_ATTEMPTS = 3
+HOLIDAY_AFTER_DAYS = 3      # an index still missing this long after the day is a holiday
+CHUNK_SIZE = 16 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    accession TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    form TEXT NOT NULL,
+    filed TEXT NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0,      -- 0 queued, 1 parsed, -1 failed
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_filings_queue ON filings(status, filed);
+CREATE TABLE IF NOT EXISTS insider_tx (
+    accession TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    issuer_cik TEXT NOT NULL,
+    symbol TEXT,
+    issuer_name TEXT,
+    owner_cik TEXT,
+    owner_name TEXT,
+    role TEXT,
+    tx_date TEXT NOT NULL,
+    filed TEXT NOT NULL,
+    code TEXT,
+    acquired INTEGER,
+    shares REAL,
+    price REAL,
+    value REAL,
+    shares_after REAL,
+    PRIMARY KEY (accession, seq)
+);
+CREATE INDEX IF NOT EXISTS ix_tx_symbol_date ON insider_tx(symbol, tx_date);
+CREATE INDEX IF NOT EXISTS ix_tx_issuer_date ON insider_tx(issuer_cik, tx_date);
+CREATE INDEX IF NOT EXISTS ix_tx_date_code ON insider_tx(tx_date, code);
+CREATE TABLE IF NOT EXISTS ingest_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_TX_COLUMNS = ("accession", "seq", "issuer_cik", "symbol", "issuer_name", "owner_cik", "owner_name", "role",
+               "tx_date", "filed", "code", "acquired", "shares", "price", "value", "shares_after")
+
+
+def _iso(day: str) -> str:
+    """YYYYMMDD or YYYY-MM-DD -> YYYY-MM-DD."""
+    day = day.strip()
+    return f"{day[:4]}-{day[4:6]}-{day[6:8]}" if len(day) == 8 and day.isdigit() else day[:10]
+
+
+def index_url(day: date, base_url: str = SEC_BASE) -> str:
+    return f"{base_url}/Archives/edgar/daily-index/{day.year}/QTR{(day.month - 1) // 3 + 1}/form.{day:%Y%m%d}.idx"
+
+
+def parse_form_index(lines: Iterable[str], forms: Sequence[str] = FORM_TYPES) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    (accession, path, form, filed) for each `forms` row of a daily
+    form.idx, in order; rows listed under both issuer and owner repeat.
+    """
+    rows = False
+    for line in lines:
+        if not rows:
+            rows = line.startswith("----")
+            continue
+        parts = re.split(r"\s{2,}", line.strip())
+        if len(parts) < 5 or parts[0] not in forms:
+            continue
+        path = parts[-1]
+        accession = path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+        yield accession, path, parts[0], _iso(parts[-2])
+
+
+def _text(el: Optional[ET.Element], path: str) -> Optional[str]:
+    """Form 4 wraps most leaves in <value>; accept either shape."""
+    if el is None:
+        return None
+    value = el.findtext(f"{path}/value")
+    if value is None:
+        value = el.findtext(path)
+    value = value.strip() if value else None
+    return value or None
+
+
+def _number(el: ET.Element, path: str) -> Optional[float]:
+    value = _text(el, path)
+    try:
+        return float(value.replace(",", "")) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _flag(el: ET.Element, path: str) -> bool:
+    return (_text(el, path) or "").lower() in ("1", "true")
+
+
+def _role(owner: ET.Element) -> str:
+    rel = owner.find("reportingOwnerRelationship")
+    if rel is None:
+        return "Insider"
+    if _flag(rel, "isOfficer"):
+        return _text(rel, "officerTitle") or "Officer"
+    if _flag(rel, "isDirector"):
+        return "Director"
+    if _flag(rel, "isTenPercentOwner"):
+        return "10% Owner"
+    return _text(rel, "otherText") or "Other"
+
+
+def parse_form4(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Non-derivative transactions of one Form 4 submission (raw .txt or
+    bare XML), parsed incrementally from byte chunks. Issuer and first
+    reporting owner precede the transaction table, so each row is
+    complete when its element closes.
+    """
+    marker = b"<ownershipDocument"
+    parser: Optional[ET.XMLPullParser] = None
+    head = b""
+    issuer: Dict[str, Optional[str]] = {}
+    owner: Dict[str, Optional[str]] = {}
+    seq = 0
+    done = False
+
+    for chunk in chunks:
+        if parser is None:
+            head += chunk
+            start = head.find(marker)
+            if start < 0:
+                head = head[-len(marker):]
+                continue
+            parser, chunk = ET.XMLPullParser(events=("end",)), head[start:]
+        parser.feed(chunk)
+        try:
+            for _, el in parser.read_events():
+                if el.tag == "issuer":
+                    issuer = {"issuer_cik": (_text(el, "issuerCik") or "").lstrip("0"),
+                              "issuer_name": _text(el, "issuerName"),
+                              "symbol": (_text(el, "issuerTradingSymbol") or "").upper() or None}
+                elif el.tag == "reportingOwner" and not owner:
+                    owner = {"owner_cik": (_text(el, "reportingOwnerId/rptOwnerCik") or "").lstrip("0"),
+                             "owner_name": _text(el, "reportingOwnerId/rptOwnerName"),
+                             "role": _role(el)}
+                elif el.tag == "nonDerivativeTransaction":
+                    shares = _number(el, "transactionAmounts/transactionShares")
+                    price = _number(el, "transactionAmounts/transactionPricePerShare")
+                    disposed = _text(el, "transactionAmounts/transactionAcquiredDisposedCode")
+                    yield {
+                        **issuer, **owner,
+                        "seq": seq,
+                        "tx_date": _iso(_text(el, "transactionDate") or ""),
+                        "code": _text(el, "transactionCoding/transactionCode"),
+                        "acquired": None if disposed is None else int(disposed == "A"),
+                        "shares": shares,
+                        "price": price,
+                        "value": shares * price if shares is not None and price is not None else None,
+                        "shares_after": _number(el, "postTransactionAmounts/sharesOwnedFollowingTransaction"),
+                    }
+                    seq += 1
+                    el.clear()
+                elif el.tag == "derivativeTransaction":
+                    el.clear()
+                elif el.tag == "ownershipDocument":
+                    done = True
+        except ET.ParseError:
+            if not done:   # anything after </ownershipDocument> (</XML>, SGML trailer) is expected
+                raise
+        if done:
+            return
+
+
+class InsiderStore:
+    """SQLite-backed insider-transaction table plus the filing queue and ingest cursor."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------------------------------------------------- state
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO ingest_state (key, value) VALUES (?, ?)", (key, value))
+
+    # ----------------------------------------------------------------- queue
+
+    def enqueue(self, entries: Iterable[Tuple[str, str, str, str]]) -> int:
+        """Queue (accession, path, form, filed) rows not seen before; returns how many were new."""
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO filings (accession, path, form, filed) VALUES (?, ?, ?, ?)", entries)
+            return self._conn.total_changes - before
+
+    def pending(self, limit: int) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT accession, path, form, filed FROM filings WHERE status = 0 "
+                "ORDER BY filed DESC, accession LIMIT ?", (limit,)).fetchall()
+
+    def record_filing(self, accession: str, filed: str, rows: List[Dict[str, Any]]):
+        """Store a parsed filing's transactions and mark it done, atomically."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM insider_tx WHERE accession = ?", (accession,))
+            self._conn.executemany(
+                f"INSERT INTO insider_tx ({', '.join(_TX_COLUMNS)}) VALUES ({', '.join('?' * len(_TX_COLUMNS))})",
+                [tuple({**r, "accession": accession, "filed": filed}.get(c) for c in _TX_COLUMNS) for r in rows])
+            self._conn.execute("UPDATE filings SET status = 1, attempts = attempts + 1 WHERE accession = ?",
+                               (accession,))
+
+    def record_failure(self, accession: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE filings SET attempts = attempts + 1, "
+                "status = CASE WHEN attempts + 1 >= ? THEN -1 ELSE 0 END WHERE accession = ?",
+                (MAX_ATTEMPTS, accession))
+
+    # ----------------------------------------------------------------- queries
+
+    def transactions(self, symbol: Optional[str] = None, issuer_cik: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None,
+                     codes: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Transactions matching every given filter, newest first."""
+        where, args = [], []
+        if symbol:
+            where.append("symbol = ?")
+            args.append(symbol.upper())
+        if issuer_cik:
+            where.append("issuer_cik = ?")
+            args.append(issuer_cik.lstrip("0"))
+        if since:
+            where.append("tx_date >= ?")
+            args.append(since)
+        if until:
+            where.append("tx_date <= ?")
+            args.append(until)
+        if codes:
+            where.append(f"code IN ({', '.join('?' * len(codes))})")
+            args.extend(codes)
+        sql = "SELECT * FROM insider_tx" + (f" WHERE {' AND '.join(where)}" if where else "")
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY tx_date DESC, accession, seq", args).fetchall()
+        return [dict(r) for r in rows]
+
+    def clusters(self, since: str, code: str = "P", min_insiders: int = 3,
+                 min_value: float = 0.0) -> List[Dict[str, Any]]:
+        """Issuers where at least `min_insiders` distinct insiders traded `code` since `since`, market-wide."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT issuer_cik, MAX(symbol) AS symbol, MAX(issuer_name) AS issuer_name, "
+                "COUNT(DISTINCT owner_cik) AS insiders, COUNT(*) AS transactions, "
+                "COALESCE(SUM(value), 0) AS total_value, MIN(tx_date) AS first_date, MAX(tx_date) AS last_date, "
+                "MAX(filed) AS last_filed "
+                "FROM insider_tx WHERE tx_date >= ? AND code = ? GROUP BY issuer_cik "
+                "HAVING insiders >= ? AND total_value >= ? ORDER BY insiders DESC, total_value DESC",
+                (since, code, min_insiders, min_value)).fetchall()
+        return [dict(r) for r in rows]
+
+    def has_data(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM insider_tx LIMIT 1").fetchone() is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queue = dict(self._conn.execute("SELECT status, COUNT(*) FROM filings GROUP BY status").fetchall())
+            tx = self._conn.execute("SELECT COUNT(*), MIN(tx_date), MAX(tx_date) FROM insider_tx").fetchone()
+        return {
+            "filings": {"queued": queue.get(0, 0), "parsed": queue.get(1, 0), "failed": queue.get(-1, 0)},
+            "transactions": tx[0],
+            "tx_date_range": [tx[1], tx[2]],
+            "last_index_date": self.get_state("last_index_date"),
+        }
+
+
+class Form4Ingester:
+    """Incremental daily-index crawl plus streaming Form 4 parsing into an InsiderStore."""
+
+    def __init__(self, store: InsiderStore, session=None, base_url: str = SEC_BASE,
+                 user_agent: str = USER_AGENT):
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate"}
+        self._session = session
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .shared import get_http_session
+            self._session = get_http_session()
+        return self._session
+
+    def update_index(self, through: Optional[date] = None, since: Optional[date] = None) -> int:
+        """Queue Form 4s from each daily index after the cursor (or from `since`) through `through`."""
+        today = date.today()
+        through = through or today
+        last = self.store.get_state("last_index_date")
+        if since is None:
+            since = (date.fromisoformat(last) + timedelta(days=1)) if last else today - timedelta(days=BOOTSTRAP_DAYS)
+
+        queued = 0
+        day = since
+        while day <= through:
+            if day.weekday() < 5:
+                response = self.session.get(index_url(day, self.base_url), headers=self.headers,
+                                            timeout=30, stream=True)
+                with response:
+                    if response.status_code == 200:
+                        lines = response.iter_lines(chunk_size=CHUNK_SIZE, decode_unicode=False)
+                        queued += self.store.enqueue(parse_form_index(l.decode("latin-1") for l in lines))
+                    elif response.status_code == 404 and (today - day).days >= HOLIDAY_AFTER_DAYS:
+                        logger.debug(f"No EDGAR index for {day} (holiday)")
+                    else:
+                        logger.info(f"EDGAR index for {day} not available yet ({response.status_code})")
+                        break
+            self.store.set_state("last_index_date", day.isoformat())
+            day += timedelta(days=1)
+        return queued
+
+    def fetch_filing(self, path: str) -> Iterator[Dict[str, Any]]:
+        url = f"{self.base_url}/Archives/{path.lstrip('/')}"
+        response = self.session.get(url, headers=self.headers, timeout=30, stream=True)
+        with response:
+            response.raise_for_status()
+            yield from parse_form4(response.iter_content(chunk_size=CHUNK_SIZE))
+
+    def ingest_pending(self, max_filings: int = MAX_FILINGS_PER_RUN) -> Set[str]:
+        """Fetch and parse up to `max_filings` queued filings; returns the symbols that got new rows."""
+        symbols: Set[str] = set()
+        for filing in self.store.pending(max_filings):
+            try:
+                rows = list(self.fetch_filing(filing["path"]))
+            except Exception as e:
+                logger.warning(f"Form 4 {filing['accession']} failed: {e}")
+                self.store.record_failure(filing["accession"])
+                continue
+            self.store.record_filing(filing["accession"], filing["filed"], rows)
+            symbols.update(r["symbol"] for r in rows if r.get("symbol"))
+        return symbols
+
+    def run(self, max_filings: int = MAX_FILINGS_PER_RUN, through: Optional[date] = None) -> Dict[str, Any]:
+        """One incremental pass; returns what changed."""
+        queued = self.update_index(through=through)
+        symbols = self.ingest_pending(max_filings)
+        from services.data_events import data_events
+        stamp = datetime.now(timezone.utc).isoformat()
+        for symbol in symbols:
+            data_events.publish(f"form4:{symbol}", stamp, kind="filing")
+        return {"queued": queued, "symbols": sorted(symbols), **self.store.stats()}
+
+
+_store: Optional[InsiderStore] = None
+_ingester: Optional[Form4Ingester] = None
+_lock = threading.Lock()
+
+
+def get_insider_store() -> InsiderStore:
+    """Process-wide insider-transaction store."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = InsiderStore()
+        return _store
+
+
+def get_form4_ingester() -> Form4Ingester:
+    global _ingester
+    store = get_insider_store()
+    with _lock:
+        if _ingester is None:
+            _ingester = Form4Ingester(store)
+        return _ingester
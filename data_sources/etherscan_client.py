@@ -7,7 +7,7 @@ wallet balances, and smart contract information.
 
 import requests
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -17,10 +17,11 @@ class EtherscanClient:
     Client for Etherscan API data
     """
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        from .shared import get_http_session
         self.api_key = Config.ETHERSCAN_API_KEY
         self.base_url = "https://api.etherscan.io/api"
-        self.session = requests.Session()
+        self.session = session or get_http_session()
     
     def get_account_balance(self, address: str) -> Optional[float]:
         """
@@ -90,6 +91,19 @@ class EtherscanClient:
             
         return None
     
+    def get_transactions_many(self, addresses: Sequence[str], limit: int = 10) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Recent transactions for several addresses, fetched concurrently
+        (see AsyncEtherscanClient.get_transactions_many)
+        """
+        from .shared import get_async_etherscan_client, run_async
+        return run_async(get_async_etherscan_client().get_transactions_many(addresses, limit))
+    
+    def get_balances(self, addresses: Sequence[str]) -> Dict[str, float]:
+        """ETH balances for several addresses in batched balancemulti requests"""
+        from .shared import get_async_etherscan_client, run_async
+        return run_async(get_async_etherscan_client().get_balances(addresses))
+    
     def get_internal_transactions(self, address: str, limit: int = 10) -> Optional[List[Dict]]:
         """
         Get internal transactions for an address
@@ -246,3 +260,94 @@ class EtherscanClient:
             logger.error(f"Error getting contract ABI for {contract_address}: {e}")
             
         return None
+
+
+class AsyncEtherscanClient:
+    """
+    Asyncio counterpart of EtherscanClient on the shared pooled async
+    HTTP client. Requests wait on the Etherscan rate budget without
+    blocking the event loop.
+    """
+    
+    def __init__(self, base_url: str = "https://api.etherscan.io/api"):
+        self.api_key = Config.ETHERSCAN_API_KEY
+        self.base_url = base_url
+    
+    async def _call(self, params: Dict) -> Optional[Dict]:
+        from .shared import budgeted_get
+        response = await budgeted_get(self.base_url, params={**params, 'apikey': self.api_key}, timeout=10)
+        return response.json()
+    
+    async def get_transactions(self, address: str, limit: int = 10) -> Optional[List[Dict]]:
+        """Recent transactions for an address (newest first)"""
+        try:
+            data = await self._call({
+                'module': 'account',
+                'action': 'txlist',
+                'address': address,
+                'startblock': 0,
+                'endblock': 99999999,
+                'page': 1,
+                'offset': limit,
+                'sort': 'desc',
+            })
+            if data.get('status') == '1':
+                return data.get('result', [])
+        except Exception as e:
+            logger.error(f"Error getting transactions for {address}: {e}")
+        return None
+    
+    async def get_transactions_since(self, address: str, startblock: int, limit: int = 100) -> Optional[List[Dict]]:
+        """
+        Transactions at or after `startblock` (oldest first, at most
+        `limit`); an empty list when there are none, None on error
+        """
+        try:
+            data = await self._call({
+                'module': 'account',
+                'action': 'txlist',
+                'address': address,
+                'startblock': startblock,
+                'endblock': 99999999,
+                'page': 1,
+                'offset': limit,
+                'sort': 'asc',
+            })
+            if data.get('status') == '1':
+                return data.get('result', [])
+            if data.get('message', '').startswith('No transactions found'):
+                return []
+            logger.warning(f"Etherscan txlist for {address}: {data.get('message')} {data.get('result')}")
+        except Exception as e:
+            logger.error(f"Error getting transactions for {address} since block {startblock}: {e}")
+        return None
+    
+    async def get_transactions_many(self, addresses: Sequence[str], limit: int = 10) -> Dict[str, Optional[List[Dict]]]:
+        """Recent transactions for each address, requested concurrently"""
+        from .shared import gather_limited
+        results = await gather_limited(self.get_transactions(a, limit) for a in addresses)
+        return {a: (None if isinstance(r, BaseException) else r) for a, r in zip(addresses, results)}
+    
+    async def get_balances(self, addresses: Sequence[str]) -> Dict[str, float]:
+        """ETH balances for up to 20 addresses per request (balancemulti)"""
+        from .shared import gather_limited
+        chunks = [list(addresses[i:i + 20]) for i in range(0, len(addresses), 20)]
+        
+        async def _chunk(chunk):
+            data = await self._call({
+                'module': 'account',
+                'action': 'balancemulti',
+                'address': ','.join(chunk),
+                'tag': 'latest',
+            })
+            if data.get('status') != '1':
+                return {}
+            return {row['account']: int(row.get('balance', '0')) / 1e18 for row in data.get('result', [])}
+        
+        balances = {}
+        for result in await gather_limited(_chunk(c) for c in chunks):
+            if isinstance(result, BaseException):
+                logger.error(f"Error getting balances: {result}")
+            else:
+                balances.update(result)
+        return balances
@@ -19,9 +19,11 @@ class GitHubClient:
     """
     
     def __init__(self):
+        from .http_cache import CachingSession
         self.token = Config.GITHUB_TOKEN
         self.base_url = "https://api.github.com"
-        self.session = requests.Session()
+        # Own session (it carries the auth header), same rate budget and response store
+        self.session = CachingSession()
         
         if self.token:
             self.session.headers.update({
@@ -1,5 +1,6 @@
 import os
-import requests
+
+from data_sources.shared import get_http_session
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 
@@ -8,7 +9,7 @@ def search_github_repos(query: str, max_items: int = 10):
     if GITHUB_TOKEN:
         headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
 
-    r = requests.get(
+    r = get_http_session().get(
         "https://api.github.com/search/repositories",
         params={"q": query, "sort": "updated", "order": "desc", "per_page": max_items},
         headers=headers,
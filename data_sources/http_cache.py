@@ -0,0 +1,382 @@
+"""
+HTTP Response Cache
+
+Conditional-request caching for the REST data sources. `CachingSession`
+is a BudgetedSession (pooled, rate-budgeted) that keeps GET responses in
+an on-disk store under data_cache/http:
+
+- fresh entries (Cache-Control max-age, or the per-source TTL below) are
+  served without touching the network or the rate budget
+- stale entries with an ETag / Last-Modified are revalidated with
+  If-None-Match / If-Modified-Since; a 304 is served from the store
+- `no-store` responses and non-200s are never stored, nor are 200s that
+  a per-source predicate rejects (Etherscan reports errors and rate
+  limits as HTTP 200 with `"status": "0"`)
+- streamed GETs (`stream=True`) bypass the cache; served responses have
+  their whole body in memory, and iter_content()/iter_lines()/raw read it
+- credential query parameters (CREDENTIAL_PARAMS) are stripped from the
+  URL kept in the metadata and from log messages
+
+Per-source TTLs override max-age for hosts (matched by domain suffix)
+whose payloads change slowly or don't send cache headers; a call can
+also pass `cache_ttl=` (seconds, 0 to always revalidate). Responses
+served from the store carry `from_cache = True`.
+
+Hit/revalidation/miss counts and bytes saved per host are in `stats()`
+and exported to Prometheus.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .shared import BudgetedSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path("data_cache/http")
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_ENTRIES = 5000
+
+# host suffix: seconds a stored response is served without revalidating
+SOURCE_TTLS: Dict[str, float] = {
+    "export.arxiv.org": 3600,
+    "sec.gov": 600,
+    "api.github.com": 300,   # 304s don't count against GitHub's rate limit
+    "newsapi.org": 300,
+    "api.etherscan.io": 60,
+}
+
+
+
+def _etherscan_ok(response: requests.Response) -> bool:
+    try:
+        return str(response.json().get("status")) == "1"
+    except (ValueError, AttributeError):
+        return False
+
+
+# host suffix: predicate a 200 response must pass to be stored
+SOURCE_CACHEABLE: Dict[str, Callable[[requests.Response], bool]] = {
+    "api.etherscan.io": _etherscan_ok,
+}
+
+# Query parameters (lowercased) that carry credentials and never reach disk or logs
+CREDENTIAL_PARAMS = {"apikey", "api_key", "key", "token", "access_token", "secret", "client_secret"}
+
+# Headers that identify a different representation of the same URL
+VARY_HEADERS = ("Accept", "Authorization", "X-API-Key")
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def _cache_control(headers) -> Dict[str, Optional[str]]:
+    out = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            out[name.lower()] = value.strip('"') or None
+    return out
+
+
+def _host(url: str) -> str:
+    from services.rate_budget import RateBudget
+    return RateBudget.host_of(url)
+
+
+def _for_host(table: Dict[str, Any], url: str) -> Any:
+    parts = _host(url).split(".")
+    for i in range(len(parts) - 1):
+        value = table.get(".".join(parts[i:]))
+        if value is not None:
+            return value
+    return None
+
+
+def redact_url(url: str) -> str:
+    """The URL without credential query parameters."""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in CREDENTIAL_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def source_ttl(url: str) -> Optional[float]:
+    """Override TTL for the URL's host, if one is configured."""
+    return _for_host(SOURCE_TTLS, url)
+
+
+def cacheable(response: requests.Response) -> bool:
+    """False if the host's predicate marks this 200 as an error payload."""
+    check = _for_host(SOURCE_CACHEABLE, response.url)
+    return check is None or check(response)
+
+
+class HttpCacheStore:
+    """
+    On-disk response store: <key>.json (metadata) + <key>.body, written
+    atomically. At most `max_entries` are kept on disk, oldest evicted
+    first; entries written by earlier processes are indexed on first write.
+    """
+
+    def __init__(self, root: Path = DEFAULT_ROOT, max_entries: int = MAX_ENTRIES):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._index: Optional[Dict[str, float]] = None   # key -> stored_at, every entry on disk
+        self._lock = threading.Lock()
+
+    def _scan(self) -> Dict[str, float]:
+        """key -> last write time for every entry on disk (orphaned bodies count as oldest)."""
+        index: Dict[str, float] = {}
+        if not self.root.is_dir():
+            return index
+        for path in self.root.glob("*/*"):
+            key, suffix = path.stem, path.suffix
+            if suffix == ".json":
+                try:
+                    index[key] = path.stat().st_mtime
+                except OSError:
+                    pass
+            elif suffix == ".body":
+                index.setdefault(key, 0.0)
+        return index
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        meta = self._meta.get(key)
+        if meta is None:
+            try:
+                meta = json.loads(self._path(key, ".json").read_text())
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._meta[key] = meta
+        return meta
+
+    def body(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key, ".body").read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, meta: Dict[str, Any], body: bytes):
+        # Body first: a reader that sees the new metadata always finds its body
+        self._write(self._path(key, ".body"), body)
+        self._write(self._path(key, ".json"), json.dumps(meta).encode())
+        with self._lock:
+            if self._index is None:
+                self._index = self._scan()
+            self._meta[key] = meta
+            self._index[key] = meta["stored_at"]
+            overflow = len(self._index) - self.max_entries
+            evict = sorted(self._index, key=self._index.get)[:overflow] if overflow > 0 else []
+            for old in evict:
+                self._meta.pop(old, None)
+                self._index.pop(old, None)
+        for old in evict:
+            self.delete(old)
+
+    def touch(self, key: str, **updates):
+        """Update metadata after a 304 (new stored_at / max-age / validators)."""
+        meta = self.meta(key)
+        if meta is None:
+            return
+        meta = {**meta, **{k: v for k, v in updates.items() if v is not None}}
+        self._write(self._path(key, ".json"), json.dumps(meta).encode())
+        with self._lock:
+            self._meta[key] = meta
+            if self._index is not None:
+                self._index[key] = meta["stored_at"]
+
+    def delete(self, key: str):
+        for suffix in (".json", ".body"):
+            try:
+                self._path(key, suffix).unlink()
+            except OSError:
+                pass
+        with self._lock:
+            self._meta.pop(key, None)
+            if self._index is not None:
+                self._index.pop(key, None)
+
+
+class CachingSession(BudgetedSession):
+    """BudgetedSession with an ETag/Last-Modified-aware response cache for GETs."""
+
+    def __init__(self, store: Optional[HttpCacheStore] = None):
+        super().__init__()
+        self.store = store or get_cache_store()
+
+    def _key(self, prepared: requests.PreparedRequest) -> str:
+        h = hashlib.sha256(prepared.url.encode())
+        for name in VARY_HEADERS:
+            h.update(f"\n{name}:{prepared.headers.get(name, '')}".encode())
+        return h.hexdigest()[:40]
+
+    @staticmethod
+    def _from_store(meta: Dict[str, Any], body: bytes, prepared) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta.get("status", 200)
+        response._content = body
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.headers = CaseInsensitiveDict(meta.get("headers") or {})
+        stored_url = meta.get("url")
+        # The stored URL is redacted; the request URL is exact unless there was a redirect
+        response.url = prepared.url if not stored_url or stored_url == redact_url(prepared.url) else stored_url
+        response.encoding = meta.get("encoding")
+        response.request = prepared
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+    @staticmethod
+    def _freshness(response: requests.Response, cache_ttl: Optional[float]) -> Tuple[bool, float]:
+        """(storable, seconds the response stays fresh)."""
+        cc = _cache_control(response.headers)
+        if "no-store" in cc:
+            return False, 0.0
+        if cache_ttl is not None:
+            return True, float(cache_ttl)
+        override = source_ttl(response.url)
+        if override is not None:
+            return True, override
+        if "no-cache" in cc:
+            return True, 0.0
+        try:
+            return True, float(cc.get("max-age") or 0)
+        except ValueError:
+            return True, 0.0
+
+    def request(self, method, url, params=None, data=None, headers=None, cookies=None, files=None,
+                auth=None, timeout=None, allow_redirects=True, proxies=None, hooks=None, stream=None,
+                verify=None, cert=None, json=None, cache_ttl: Optional[float] = None):
+        send = dict(params=params, data=data, headers=headers, cookies=cookies, files=files, auth=auth,
+                    timeout=timeout, allow_redirects=allow_redirects, proxies=proxies, hooks=hooks,
+                    stream=stream, verify=verify, cert=cert, json=json)
+        if method.upper() != "GET" or stream:
+            return super().request(method, url, **send)
+
+        prepared = self.prepare_request(requests.Request("GET", url, params=params, headers=headers,
+                                                         cookies=cookies, auth=auth))
+        host = _host(prepared.url)
+        key = self._key(prepared)
+        meta = self.store.meta(key)
+        body = self.store.body(key) if meta is not None else None
+        if body is None:
+            meta = None
+        now = time.time()
+
+        if meta is not None and now - meta["stored_at"] < meta.get("ttl", 0):
+            _count(host, "hit", len(body))
+            return self._from_store(meta, body, prepared)
+
+        conditional = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                conditional["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional["If-Modified-Since"] = meta["last_modified"]
+        response = super().request(method, url, **{**send, "headers": conditional})
+
+        if response.status_code == 304 and meta is not None:
+            _, ttl = self._freshness(response, cache_ttl)
+            self.store.touch(key, stored_at=now, ttl=ttl,
+                             etag=response.headers.get("ETag"),
+                             last_modified=response.headers.get("Last-Modified"))
+            _count(host, "revalidated", len(body))
+            return self._from_store(self.store.meta(key) or meta, body, prepared)
+
+        _count(host, "miss", 0)
+        if response.status_code == 200 and cacheable(response):
+            self._store(key, response, cache_ttl, now)
+        return response
+
+    def _store(self, key: str, response: requests.Response, cache_ttl: Optional[float], now: float):
+        storable, ttl = self._freshness(response, cache_ttl)
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if not storable or (ttl <= 0 and not etag and not last_modified):
+            return
+        body = response.content
+        if len(body) > MAX_BODY_BYTES:
+            return
+        meta = {
+            "url": redact_url(response.url),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            "encoding": response.encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": now,
+            "ttl": ttl,
+        }
+        try:
+            self.store.put(key, meta, body)
+        except OSError as e:
+            logger.warning(f"HTTP cache write failed for {redact_url(response.url)}: {e}")
+
+
+_store: Optional[HttpCacheStore] = None
+_store_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def get_cache_store() -> HttpCacheStore:
+    """Process-wide on-disk store shared by every CachingSession."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HttpCacheStore()
+        return _store
+
+
+def _count(host: str, result: str, bytes_saved: int):
+    with _stats_lock:
+        s = _stats.setdefault(host, {"hit": 0, "revalidated": 0, "miss": 0, "bytes_saved": 0})
+        s[result] += 1
+        s["bytes_saved"] += bytes_saved
+    try:
+        from telemetry.metrics import HTTP_CACHE_REQUESTS, HTTP_CACHE_BYTES_SAVED
+        HTTP_CACHE_REQUESTS.labels(host, result).inc()
+        if bytes_saved:
+            HTTP_CACHE_BYTES_SAVED.labels(host).inc(bytes_saved)
+    except Exception as e:
+        logger.debug(f"HTTP cache metrics failed: {e}")
+
+
+def stats() -> Dict[str, Any]:
+    with _stats_lock:
+        hosts = {h: dict(s) for h, s in _stats.items()}
+    for s in hosts.values():
+        total = s["hit"] + s["revalidated"] + s["miss"]
+        s["hit_rate"] = round((s["hit"] + s["revalidated"]) / total, 3) if total else 0.0
+    return {"hosts": hosts, "source_ttls": dict(SOURCE_TTLS)}
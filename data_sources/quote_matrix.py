@@ -0,0 +1,170 @@
+"""
+Cross-exchange quote fan-out.
+
+Fetches top-of-book quotes for many pairs on many ccxt exchanges at once
+and assembles them into a pairs x exchanges matrix. Each exchange is
+queried on its own worker thread (a ccxt instance is not safe for
+concurrent calls, but different instances are), using one bulk
+`fetch_tickers` call where the exchange supports it and falling back to
+per-pair `fetch_ticker` otherwise. Wall time is therefore roughly the
+slowest single exchange rather than the sum of every round trip.
+
+A fetch that times out is abandoned, not killed: its thread keeps using
+the exchange instance until the call returns. Such an exchange is skipped
+by later fan-outs until that fetch finishes, so no instance is ever
+called from two threads at once.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_S = 30.0
+
+# id(exchange instance) -> the fetch currently running against it
+_in_flight: Dict[int, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+@dataclass
+class QuoteMatrix:
+    """bid/ask/last/volume[p, e] for pairs[p] on exchanges[e]; NaN where not quoted."""
+    pairs: Tuple[str, ...]
+    exchanges: Tuple[str, ...]
+    bid: np.ndarray
+    ask: np.ndarray
+    last: np.ndarray
+    volume: np.ndarray
+    timestamp: np.ndarray
+    taker_fee: np.ndarray
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+    def quotes(self, p: int) -> Dict[str, Dict[str, Any]]:
+        """Quotes for pair index p keyed by exchange (only exchanges that quote it)."""
+        out = {}
+        for e, name in enumerate(self.exchanges):
+            if np.isnan(self.bid[p, e]) or np.isnan(self.ask[p, e]):
+                continue
+            out[name] = {
+                "bid": float(self.bid[p, e]),
+                "ask": float(self.ask[p, e]),
+                "last": None if np.isnan(self.last[p, e]) else float(self.last[p, e]),
+                "volume": 0.0 if np.isnan(self.volume[p, e]) else float(self.volume[p, e]),
+                "timestamp": None if np.isnan(self.timestamp[p, e]) else int(self.timestamp[p, e]),
+            }
+        return out
+
+
+def _supported(exchange, pairs: Sequence[str]) -> List[str]:
+    markets = getattr(exchange, "markets", None)
+    if not markets:
+        return list(pairs)
+    return [p for p in pairs if p in markets]
+
+
+def _fetch_exchange(exchange, pairs: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Tickers for `pairs` on one exchange: one bulk call if possible."""
+    pairs = _supported(exchange, pairs)
+    if not pairs:
+        return {}
+    has = getattr(exchange, "has", {}) or {}
+    if has.get("fetchTickers"):
+        try:
+            tickers = exchange.fetch_tickers(pairs)
+            return {p: t for p, t in tickers.items() if p in pairs}
+        except Exception as e:
+            logger.debug(f"{exchange.id} fetch_tickers({len(pairs)} pairs) failed, per-pair fallback: {e}")
+
+    tickers, error = {}, None
+    for pair in pairs:
+        try:
+            tickers[pair] = exchange.fetch_ticker(pair)
+        except Exception as e:
+            error = e
+            logger.debug(f"Could not get {pair} from {exchange.id}: {e}")
+    if not tickers and error is not None:
+        raise error
+    return tickers
+
+
+def _taker_fee(exchange, pair: str) -> float:
+    market = (getattr(exchange, "markets", None) or {}).get(pair) or {}
+    fee = market.get("taker")
+    if fee is None:
+        fee = ((getattr(exchange, "fees", None) or {}).get("trading") or {}).get("taker")
+    return float(fee) if fee is not None else np.nan
+
+
+def _release(key: int, fut: Future) -> None:
+    with _in_flight_lock:
+        if _in_flight.get(key) is fut:
+            del _in_flight[key]
+
+
+def fetch_quote_matrix(
+    exchanges: Dict[str, Any],
+    pairs: Sequence[str],
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    max_workers: Optional[int] = None,
+) -> QuoteMatrix:
+    """
+    Quote every pair on every exchange concurrently. Exchanges that fail or
+    don't answer within `timeout_s` are left as NaN and listed in `errors`,
+    as are exchanges whose fetch from an earlier call is still running.
+    """
+    pairs = tuple(pairs)
+    names = tuple(exchanges)
+    shape = (len(pairs), len(names))
+    m = QuoteMatrix(pairs, names, *(np.full(shape, np.nan) for _ in range(6)))
+    if not names or not pairs:
+        return m
+
+    start = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(names), thread_name_prefix="quotes")
+    futures = {}
+    with _in_flight_lock:
+        for name in names:
+            key = id(exchanges[name])
+            if key in _in_flight:
+                m.errors[name] = "previous fetch still in flight"
+                continue
+            fut = pool.submit(_fetch_exchange, exchanges[name], pairs)
+            _in_flight[key] = fut
+            futures[fut] = name
+    for fut, name in futures.items():
+        fut.add_done_callback(lambda f, key=id(exchanges[name]): _release(key, f))
+    done, pending = wait(futures, timeout=timeout_s)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    row = {p: i for i, p in enumerate(pairs)}
+    for fut, name in futures.items():
+        e = names.index(name)
+        if fut in pending:
+            m.errors[name] = f"timed out after {timeout_s:.0f}s"
+            continue
+        try:
+            tickers = fut.result()
+        except Exception as exc:
+            m.errors[name] = str(exc)
+            continue
+        for pair, t in tickers.items():
+            p = row.get(pair)
+            if p is None or not t or not t.get("bid") or not t.get("ask"):
+                continue
+            m.bid[p, e] = t["bid"]
+            m.ask[p, e] = t["ask"]
+            m.last[p, e] = t.get("last") if t.get("last") is not None else np.nan
+            m.volume[p, e] = t.get("baseVolume") or 0.0
+            m.timestamp[p, e] = t.get("timestamp") if t.get("timestamp") is not None else np.nan
+            m.taker_fee[p, e] = _taker_fee(exchanges[name], pair)
+
+    m.elapsed_s = time.monotonic() - start
+    return m
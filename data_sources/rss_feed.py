@@ -1,7 +1,12 @@
 import feedparser
 
+from data_sources.shared import get_http_session
+
 def fetch_rss(url: str, max_items: int = 10):
-    feed = feedparser.parse(url)
+    # Fetch through the shared caching session (ETag/Last-Modified), parse the bytes
+    r = get_http_session().get(url, timeout=20)
+    r.raise_for_status()
+    feed = feedparser.parse(r.content)
     items = []
     for e in feed.entries[:max_items]:
         items.append({
@@ -17,6 +17,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
+from services.rate_budget import rate_budget
+
 logger = logging.getLogger(__name__)
 
 TOKEN_FILE = Path("data/schwab_tokens.json")
@@ -28,6 +30,21 @@ TOKEN_URL = f"{BASE_URL}/v1/oauth/token"
 MARKET_DATA_URL = f"{BASE_URL}/marketdata/v1"
 
 
+def _price_history_params(symbol, period_type, period, frequency_type, frequency, start_date, end_date) -> dict:
+    params = {
+        "symbol": symbol,
+        "periodType": period_type,
+        "period": period,
+        "frequencyType": frequency_type,
+        "frequency": frequency,
+    }
+    if start_date:
+        params["startDate"] = start_date
+    if end_date:
+        params["endDate"] = end_date
+    return params
+
+
 class SchwabClient:
     """
     Client for Charles Schwab / Thinkorswim API.
@@ -186,7 +203,11 @@ class SchwabClient:
 
         for attempt in range(retries + 1):
             try:
+                if not rate_budget.acquire(url, timeout=15):
+                    logger.warning("Schwab: rate budget exhausted, skipping request")
+                    return None
                 resp = requests.request(method, url, headers=headers, params=params, timeout=15)
+                rate_budget.feedback_response(resp)
                 if resp.ok:
                     return resp.json()
                 elif resp.status_code == 401 and attempt < retries:
@@ -229,19 +250,14 @@ class SchwabClient:
         end_date: int = None,
     ) -> Optional[Dict]:
         url = f"{MARKET_DATA_URL}/pricehistory"
-        params = {
-            "symbol": symbol,
-            "periodType": period_type,
-            "period": period,
-            "frequencyType": frequency_type,
-            "frequency": frequency,
-        }
-        if start_date:
-            params["startDate"] = start_date
-        if end_date:
-            params["endDate"] = end_date
+        params = _price_history_params(symbol, period_type, period, frequency_type, frequency, start_date, end_date)
         return self._request("GET", url, params)
 
+    def get_price_history_many(self, symbols: List[str], **kwargs) -> Dict[str, Optional[Dict]]:
+        """Price history for several symbols, fetched concurrently (see AsyncSchwabClient)"""
+        from .shared import get_async_schwab_client, run_async
+        return run_async(get_async_schwab_client().get_price_history_many(symbols, **kwargs))
+
     def get_daily_history(self, symbol: str, days: int = 365) -> Optional[Dict]:
         return self.get_price_history(
             symbol=symbol,
@@ -360,3 +376,56 @@ def get_schwab_client() -> SchwabClient:
         if _client_instance is None:
             _client_instance = SchwabClient()
         return _client_instance
+
+
+class AsyncSchwabClient:
+    """
+    Asyncio counterpart of SchwabClient for market data. Tokens are owned
+    by the shared SchwabClient (refreshed in a worker thread when needed);
+    requests go through the shared pooled async client and wait on the
+    Schwab rate budget without blocking the event loop.
+    """
+
+    def __init__(self, sync_client: Optional[SchwabClient] = None):
+        self.sync = sync_client or get_schwab_client()
+
+    async def _request(self, url: str, params: dict = None) -> Optional[dict]:
+        import asyncio
+        from .shared import budgeted_get
+
+        for attempt in range(2):
+            if not self.sync.is_authenticated and not await asyncio.to_thread(self.sync._ensure_token):
+                logger.warning("Schwab: not authenticated, skipping request")
+                return None
+            headers = {"Authorization": f"Bearer {self.sync.access_token}", "Content-Type": "application/json"}
+            try:
+                resp = await budgeted_get(url, params=params, headers=headers, timeout=15)
+            except Exception as e:
+                logger.error(f"Schwab API error: {e}")
+                return None
+            if resp.status_code == 200:
+                return resp.json()
+            if resp.status_code == 401 and attempt == 0:
+                logger.info("Schwab: 401 received, refreshing token")
+                if await asyncio.to_thread(self.sync.refresh_access_token):
+                    continue
+            logger.error(f"Schwab API error: {resp.status_code} {resp.text[:200]}")
+            return None
+        return None
+
+    async def get_quotes(self, symbols: List[str], fields: str = "quote,fundamental") -> Optional[Dict]:
+        if not symbols:
+            return None
+        return await self._request(f"{MARKET_DATA_URL}/quotes", {"symbols": ",".join(symbols), "fields": fields})
+
+    async def get_price_history(self, symbol: str, period_type: str = "day", period: int = 10,
+                                frequency_type: str = "minute", frequency: int = 1,
+                                start_date: int = None, end_date: int = None) -> Optional[Dict]:
+        params = _price_history_params(symbol, period_type, period, frequency_type, frequency, start_date, end_date)
+        return await self._request(f"{MARKET_DATA_URL}/pricehistory", params)
+
+    async def get_price_history_many(self, symbols: List[str], **kwargs) -> Dict[str, Optional[Dict]]:
+        """Price history per symbol, requested concurrently"""
+        from .shared import gather_limited
+        results = await gather_limited(self.get_price_history(s, **kwargs) for s in symbols)
+        return {s: (None if isinstance(r, BaseException) else r) for s, r in zip(symbols, results)}
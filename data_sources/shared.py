@@ -0,0 +1,271 @@
+"""
+Shared Data Source Clients
+
+Process-wide, long-lived client singletons so agents stop rebuilding
+exchange objects and HTTP sessions on every scheduled run.
+
+- One pooled requests.Session (keep-alive, so no per-run TLS handshake)
+  that takes a token from the host's rate budget before every request
+  and reports throttling back (services.rate_budget), and caches GETs
+  with conditional requests (data_sources.http_cache)
+- One ccxt exchange per exchange id, with market metadata loaded once
+  and reloaded only when older than MARKETS_TTL
+- Shared CoinbaseClient / EtherscanClient / YahooFinanceClient
+- Asyncio side: one pooled httpx.AsyncClient and one ccxt.async_support
+  exchange per event loop, the async client counterparts, and a
+  background event loop (`run_async`) so sync wrappers can run batch
+  coroutines from the scheduler's worker threads
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MARKETS_TTL = 6 * 3600  # seconds
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+_lock = threading.RLock()
+_session: Optional[requests.Session] = None
+_exchanges: Dict[str, object] = {}
+_exchange_locks: Dict[str, threading.Lock] = {}
+_markets_loaded: Dict[str, float] = {}
+_clients: Dict[str, object] = {}
+# Per event loop: {"http": httpx.AsyncClient, "exchange:<id>": ccxt exchange}
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+
+BATCH_CONCURRENCY = 8
+ASYNC_TIMEOUT = 20.0  # seconds per request
+
+
+class BudgetedSession(requests.Session):
+    """requests.Session that waits on the per-host rate budget and feeds responses back."""
+
+    budget_timeout: Optional[float] = 60.0
+
+    def request(self, method, url, *args, **kwargs):
+        from services.rate_budget import rate_budget
+        if not rate_budget.acquire(url, timeout=self.budget_timeout):
+            raise requests.exceptions.ConnectionError(f"Rate budget exhausted for {url}")
+        response = super().request(method, url, *args, **kwargs)
+        rate_budget.feedback_response(response)
+        return response
+
+
+def get_http_session() -> requests.Session:
+    """Pooled, rate-budgeted, caching keep-alive session shared by all HTTP data sources."""
+    from .http_cache import CachingSession
+
+    global _session
+    with _lock:
+        if _session is None:
+            session = CachingSession()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_exchange(exchange_id: str, load_markets: bool = True, **options):
+    """
+    Shared public ccxt exchange instance.
+
+    Markets are loaded on first use and refreshed after MARKETS_TTL, so
+    symbol lookups don't refetch exchange metadata on every run. The
+    network load holds only that exchange's lock, never the module
+    `_lock`, so a slow exchange doesn't stall the other shared getters.
+    """
+    import ccxt
+
+    with _lock:
+        exchange_lock = _exchange_locks.setdefault(exchange_id, threading.Lock())
+
+    with exchange_lock:
+        exchange = _exchanges.get(exchange_id)
+        if exchange is None:
+            config = {"sandbox": False, "enableRateLimit": True, **options}
+            exchange = getattr(ccxt, exchange_id)(config)
+
+        if load_markets:
+            loaded = _markets_loaded.get(exchange_id)
+            if loaded is None or time.time() - loaded > MARKETS_TTL:
+                try:
+                    exchange.load_markets(reload=loaded is not None)
+                    _markets_loaded[exchange_id] = time.time()
+                except Exception as e:
+                    logger.warning(f"Could not load {exchange_id} markets: {e}")
+
+        with _lock:
+            exchange = _exchanges.setdefault(exchange_id, exchange)
+        return exchange
+
+
+def _shared(key: str, factory):
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+
+def get_coinbase_client():
+    from .coinbase_client import CoinbaseClient
+    return _shared("coinbase", CoinbaseClient)
+
+
+def get_etherscan_client():
+    from .etherscan_client import EtherscanClient
+    return _shared("etherscan", EtherscanClient)
+
+
+def get_yahoo_client():
+    from .yahoo_finance_client import YahooFinanceClient
+    return _shared("yahoo", YahooFinanceClient)
+
+
+def _resources() -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        return _loop_resources.setdefault(loop, {})
+
+
+def get_async_http_client():
+    """Pooled httpx.AsyncClient for the running event loop."""
+    import httpx
+
+    resources = _resources()
+    client = resources.get("http")
+    if client is None or client.is_closed:
+        client = resources["http"] = httpx.AsyncClient(
+            timeout=ASYNC_TIMEOUT,
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_CONNECTIONS),
+        )
+    return client
+
+
+async def get_async_exchange(exchange_id: str, **options):
+    """ccxt.async_support exchange for the running event loop, markets loaded once."""
+    import ccxt.async_support as ccxt_async
+
+    resources = _resources()
+    key = f"exchange:{exchange_id}"
+    exchange = resources.get(key)
+    if exchange is None:
+        config = {"enableRateLimit": True, **options}
+        exchange = resources[key] = getattr(ccxt_async, exchange_id)(config)
+    if not getattr(exchange, "markets", None):
+        try:
+            await exchange.load_markets()
+        except Exception as e:
+            logger.warning(f"Could not load {exchange_id} markets (async): {e}")
+    return exchange
+
+
+async def budgeted_get(url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                       timeout: Optional[float] = None, priority: Optional[str] = None):
+    """GET with the shared async client after an (event-loop) wait on the host's rate budget."""
+    import httpx
+    from services.rate_budget import rate_budget
+
+    if not await rate_budget.acquire_async(url, priority=priority, timeout=60):
+        raise httpx.ConnectError(f"Rate budget exhausted for {url}")
+    response = await get_async_http_client().get(url, params=params, headers=headers,
+                                                 timeout=timeout or ASYNC_TIMEOUT)
+    rate_budget.feedback_response(response)
+    return response
+
+
+async def gather_limited(coros, limit: int = BATCH_CONCURRENCY):
+    """asyncio.gather with at most `limit` coroutines in flight; exceptions are returned."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _one(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_one(c) for c in coros), return_exceptions=True)
+
+
+async def aclose_async_resources():
+    """Close the running loop's pooled client and exchanges (call before the loop ends)."""
+    with _lock:
+        resources = _loop_resources.pop(asyncio.get_running_loop(), {})
+    for name, resource in resources.items():
+        try:
+            await resource.aclose() if name == "http" else await resource.close()
+        except Exception as e:
+            logger.debug(f"Error closing {name}: {e}")
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _bg_loop
+    with _lock:
+        if _bg_loop is None or _bg_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="data-sources-aio", daemon=True).start()
+            _bg_loop = loop
+        return _bg_loop
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None):
+    """
+    Run a coroutine to completion from sync code on the shared background
+    loop (whose pooled clients persist between calls) and return its result.
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_async called from the data-sources loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def get_async_coinbase_client():
+    from .coinbase_client import AsyncCoinbaseClient
+    return _shared("async_coinbase", AsyncCoinbaseClient)
+
+
+def get_async_etherscan_client():
+    from .etherscan_client import AsyncEtherscanClient
+    return _shared("async_etherscan", AsyncEtherscanClient)
+
+
+def get_async_yahoo_client():
+    from .yahoo_finance_client import AsyncYahooFinanceClient
+    return _shared("async_yahoo", AsyncYahooFinanceClient)
+
+
+def get_async_schwab_client():
+    from .schwab_client import AsyncSchwabClient
+    return _shared("async_schwab", AsyncSchwabClient)
+
+
+def reset_shared_clients():
+    """Drop every shared client; the next getter call rebuilds it."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _exchanges.clear()
+        _markets_loaded.clear()
+        _clients.clear()
+        bg_loop = _bg_loop
+    if bg_loop is not None and bg_loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_async_resources(), bg_loop).result(5)
+        except Exception as e:
+            logger.debug(f"Error closing async resources: {e}")
@@ -0,0 +1,307 @@
+"""
+Incremental wallet tracking.
+
+Each watched address keeps a cursor (the last block seen and the tx
+hashes already seen in it) plus a bounded local history of its
+transactions, persisted in data_cache/wallets/state.json. `poll()` asks
+Etherscan only for blocks at or after the cursor and returns just the
+transactions not seen before, so every transfer is reported once and
+the history survives restarts. A newly watched address is seeded from
+its latest BOOTSTRAP_TXS transactions, which go into the history but are
+not reported as new.
+
+To watch hundreds of addresses under the Etherscan budget:
+
+- balances are checked first with balancemulti (20 addresses a call);
+  only addresses whose balance moved get a txlist request, plus any not
+  polled for FULL_POLL_SECONDS (a zero-value call leaves the balance
+  unchanged apart from gas)
+- txlist requests fan out on the async client, each waiting on the
+  shared rate budget, least recently polled first and at most
+  `max_polls` per call; the rest carry over to the next call
+- a full page means more transactions are waiting, so the address is
+  polled again next time regardless of its balance
+
+`rapid_fire()` and `repeated_amounts()` look for bursts and uniform
+amounts across the stored history rather than the latest page.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path("data_cache/wallets")
+STATE_FILE = "state.json"
+STATE_VERSION = 1
+
+PAGE_SIZE = 100
+BOOTSTRAP_TXS = 10
+MAX_HISTORY = 200           # transactions kept per address
+FULL_POLL_SECONDS = 3600
+
+
+class WalletTx(NamedTuple):
+    """One transaction, as stored (a JSON list on disk)."""
+
+    block: int
+    timestamp: int
+    hash: str
+    value_eth: float
+    sender: str
+    recipient: str
+
+    @classmethod
+    def from_etherscan(cls, tx: Dict[str, Any]) -> "WalletTx":
+        return cls(
+            int(tx.get("blockNumber") or 0),
+            int(tx.get("timeStamp") or 0),
+            tx.get("hash", ""),
+            int(tx.get("value") or 0) / 1e18,
+            (tx.get("from") or "").lower(),
+            (tx.get("to") or "").lower(),
+        )
+
+    def direction(self, address: str) -> str:
+        return "outgoing" if self.sender == address.lower() else "incoming"
+
+
+@dataclass
+class WalletCursor:
+    block: int = 0
+    hashes: List[str] = field(default_factory=list)   # already seen in `block`
+    balance: Optional[float] = None                    # at the last complete poll
+    polled_at: float = 0.0
+
+
+def rapid_fire(txs: Sequence[WalletTx], max_gap: int = 300, min_count: int = 4) -> List[List[WalletTx]]:
+    """Runs of at least `min_count` transactions each within `max_gap` seconds of the previous one."""
+    ordered = sorted(txs, key=lambda t: (t.timestamp, t.block))
+    bursts, run = [], ordered[:1]
+    for prev, tx in zip(ordered, ordered[1:]):
+        if tx.timestamp - prev.timestamp < max_gap:
+            run.append(tx)
+            continue
+        if len(run) >= min_count:
+            bursts.append(run)
+        run = [tx]
+    if len(run) >= min_count:
+        bursts.append(run)
+    return bursts
+
+
+def repeated_amounts(txs: Sequence[WalletTx], tolerance: float = 0.1, min_count: int = 3,
+                     min_amount: float = 10.0) -> List[List[WalletTx]]:
+    """Groups of at least `min_count` non-zero transfers whose amounts lie within `tolerance` of each other."""
+    ordered = sorted((t for t in txs if t.value_eth > 0), key=lambda t: t.value_eth)
+    groups, group = [], []
+    for tx in ordered:
+        if group and tx.value_eth > group[0].value_eth * (1 + tolerance):
+            groups.append(group)
+            group = []
+        group.append(tx)
+    if group:
+        groups.append(group)
+    return [g for g in groups
+            if len(g) >= min_count and sum(t.value_eth for t in g) / len(g) > min_amount]
+
+
+class WalletTracker:
+    """Per-address cursors and transaction history, polled incrementally."""
+
+    def __init__(self, root: Path = DEFAULT_ROOT, client=None, max_history: int = MAX_HISTORY,
+                 persist: bool = True):
+        self.path = Path(root) / STATE_FILE
+        self.max_history = max_history
+        self.persist = persist
+        self._client = client
+        self._cursors: Dict[str, WalletCursor] = {}
+        self._history: Dict[str, Deque[WalletTx]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.stats = {"polls": 0, "balance_skips": 0, "requests": 0, "new_txs": 0, "errors": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .shared import get_async_etherscan_client
+            self._client = get_async_etherscan_client()
+        return self._client
+
+    # ----------------------------------------------------------------- storage
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.persist or not self.path.exists():
+            return
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Wallet tracker state unreadable, starting fresh: {e}")
+            return
+        if state.get("version") != STATE_VERSION:
+            return
+        for address, entry in state.get("wallets", {}).items():
+            self._cursors[address] = WalletCursor(**entry["cursor"])
+            self._history[address] = deque((WalletTx(*row) for row in entry["txs"]), maxlen=self.max_history)
+
+    def _save(self):
+        if not self.persist:
+            return
+        state = {
+            "version": STATE_VERSION,
+            "wallets": {a: {"cursor": asdict(c), "txs": [list(t) for t in self._history.get(a, ())]}
+                        for a, c in self._cursors.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    # ----------------------------------------------------------------- reads
+
+    def cursor(self, address: str) -> Optional[WalletCursor]:
+        with self._lock:
+            self._load()
+            return self._cursors.get(address.lower())
+
+    def history(self, address: str) -> List[WalletTx]:
+        """Stored transactions for `address`, oldest first."""
+        with self._lock:
+            self._load()
+            return list(self._history.get(address.lower(), ()))
+
+    # ----------------------------------------------------------------- polling
+
+    def _due(self, addresses: List[str], balances: Dict[str, float], now: float) -> List[str]:
+        due = []
+        for address in addresses:
+            cursor = self._cursors.get(address.lower())
+            balance = balances.get(address.lower())
+            if (cursor is None or cursor.balance is None or balance is None
+                    or balance != cursor.balance or now - cursor.polled_at >= FULL_POLL_SECONDS):
+                due.append(address)
+            else:
+                self.stats["balance_skips"] += 1
+        return sorted(due, key=lambda a: self._cursors[a.lower()].polled_at if a.lower() in self._cursors else 0.0)
+
+    async def _fetch(self, address: str) -> Optional[List[Dict]]:
+        cursor = self._cursors.get(address.lower())
+        if cursor is None:
+            txs = await self.client.get_transactions(address, limit=BOOTSTRAP_TXS)
+            return list(reversed(txs)) if txs is not None else None
+        return await self.client.get_transactions_since(address, cursor.block, limit=PAGE_SIZE)
+
+    def _ingest(self, address: str, raw: List[Dict], balance: Optional[float], now: float) -> List[WalletTx]:
+        key = address.lower()
+        cursor = self._cursors.get(key)
+        bootstrap = cursor is None
+        if bootstrap:
+            cursor = self._cursors[key] = WalletCursor()
+        history = self._history.setdefault(key, deque(maxlen=self.max_history))
+
+        seen = set(cursor.hashes)
+        new = []
+        for tx in sorted((WalletTx.from_etherscan(t) for t in raw), key=lambda t: t.block):
+            if tx.block < cursor.block or (tx.block == cursor.block and tx.hash in seen):
+                continue
+            if tx.block > cursor.block:
+                cursor.block, cursor.hashes, seen = tx.block, [], set()
+            cursor.hashes.append(tx.hash)
+            seen.add(tx.hash)
+            history.append(tx)
+            new.append(tx)
+
+        cursor.polled_at = now
+        # A full page means more are waiting: leave the balance unset so the next poll fetches again
+        cursor.balance = None if (not bootstrap and len(raw) >= PAGE_SIZE) else balance
+        return [] if bootstrap else new
+
+    async def poll_async(self, addresses: Iterable[str], max_polls: Optional[int] = None,
+                         now: Optional[float] = None) -> Dict[str, List[WalletTx]]:
+        """New transactions per address since the previous poll (oldest first)."""
+        from .shared import gather_limited
+
+        addresses = list(dict.fromkeys(addresses))
+        now = now or time.time()
+        with self._lock:
+            self._load()
+        try:
+            balances = {a.lower(): b for a, b in (await self.client.get_balances(addresses)).items()}
+        except Exception as e:
+            logger.warning(f"Balance pre-check failed, polling every address: {e}")
+            balances = {}
+        self.stats["requests"] += (len(addresses) + 19) // 20
+
+        with self._lock:
+            due = self._due(addresses, balances, now)
+        if max_polls is not None:
+            due = due[:max_polls]
+        results = await gather_limited(self._fetch(a) for a in due)
+        self.stats["requests"] += len(due)
+
+        out: Dict[str, List[WalletTx]] = {a: [] for a in addresses}
+        with self._lock:
+            for address, raw in zip(due, results):
+                if raw is None or isinstance(raw, BaseException):
+                    self.stats["errors"] += 1
+                    continue
+                out[address] = self._ingest(address, raw, balances.get(address.lower()), now)
+            self.stats["polls"] += 1
+            self.stats["new_txs"] += sum(len(v) for v in out.values())
+            if due:
+                try:
+                    self._save()
+                except OSError as e:
+                    logger.warning(f"Could not persist wallet tracker state: {e}")
+
+        from services.data_events import data_events
+        for address, new in out.items():
+            if new:
+                data_events.publish(f"wallet:{address.lower()}", new[-1].hash, kind="tx")
+        return out
+
+    def poll(self, addresses: Iterable[str], max_polls: Optional[int] = None) -> Dict[str, List[WalletTx]]:
+        """Sync wrapper around poll_async on the shared data-sources loop."""
+        from .shared import run_async
+        return run_async(self.poll_async(addresses, max_polls))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            return {
+                "stats": dict(self.stats),
+                "wallets": {a: {**asdict(c), "hashes": len(c.hashes), "stored_txs": len(self._history.get(a, ()))}
+                            for a, c in self._cursors.items()},
+            }
+
+
+_tracker: Optional[WalletTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_wallet_tracker() -> WalletTracker:
+    """Process-wide tracker shared by every wallet-watching agent."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = WalletTracker()
+        return _tracker
@@ -5,14 +5,24 @@ Provides access to Yahoo Finance market data including stock prices,
 indices, and economic indicators.
 """
 
+import asyncio
+import contextvars
 import yfinance as yf
 import logging
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from datetime import datetime, timedelta
 
+from services.data_events import data_events
+from services.rate_budget import rate_budget
+
 logger = logging.getLogger(__name__)
 
+RATE_BUDGET_TIMEOUT = 60  # seconds
+
+# Set in worker threads whose token was already taken on the event loop
+_budget_prepaid = contextvars.ContextVar("yahoo_budget_prepaid", default=False)
+
 class YahooFinanceClient:
     """
     Client for Yahoo Finance data
@@ -22,6 +32,21 @@ class YahooFinanceClient:
         # Yahoo Finance doesn't require API keys
         pass
     
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        """
+        yf.Ticker for one lookup, after taking a token from the Yahoo rate
+        budget; ConnectionError if the budget refuses within the timeout
+        """
+        if not _budget_prepaid.get() and not rate_budget.acquire("yahoo_finance", timeout=RATE_BUDGET_TIMEOUT):
+            raise ConnectionError("Yahoo Finance rate budget exhausted")
+        return yf.Ticker(symbol)
+    
+    @staticmethod
+    def _report_throttle(error: Exception):
+        """Feed yfinance rate-limit errors back into the Yahoo budget"""
+        if "RateLimit" in type(error).__name__ or "Too Many Requests" in str(error):
+            rate_budget.feedback("yahoo_finance", 429)
+    
     def get_price_data(self, symbol: str, period: str = '1mo') -> Optional[pd.DataFrame]:
         """
         Get price data for a symbol
@@ -34,19 +59,29 @@ class YahooFinanceClient:
             DataFrame with OHLCV data or None
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             data = ticker.history(period=period)
             
             if data.empty:
                 logger.warning(f"No data found for symbol {symbol}")
                 return None
-                
+            
+            data_events.publish_bars(symbol, data)
             return data
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting price data for {symbol}: {e}")
             return None
     
+    def get_price_data_many(self, symbols: Sequence[str], period: str = '1mo') -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Price data for several symbols, fetched concurrently
+        (see AsyncYahooFinanceClient.get_price_data_many)
+        """
+        from .shared import get_async_yahoo_client, run_async
+        return run_async(get_async_yahoo_client().get_price_data_many(symbols, period))
+    
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
         Get current price for a symbol
@@ -58,7 +93,7 @@ class YahooFinanceClient:
             Current price or None
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             info = ticker.info
             
             # Try different price fields
@@ -68,6 +103,7 @@ class YahooFinanceClient:
                 return float(price)
                 
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting current price for {symbol}: {e}")
             
         return None
@@ -83,7 +119,7 @@ class YahooFinanceClient:
             Ticker info dictionary or None
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             info = ticker.info
             
             return {
@@ -102,6 +138,7 @@ class YahooFinanceClient:
             }
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting ticker info for {symbol}: {e}")
             return None
     
@@ -115,14 +152,9 @@ class YahooFinanceClient:
         Returns:
             Dictionary mapping symbols to prices
         """
-        prices = {}
-        
-        for symbol in symbols:
-            price = self.get_current_price(symbol)
-            if price is not None:
-                prices[symbol] = price
-                
-        return prices
+        from .shared import get_async_yahoo_client, run_async
+        prices = run_async(get_async_yahoo_client().get_current_prices(symbols))
+        return {symbol: price for symbol, price in prices.items() if price is not None}
     
     def get_historical_data(self, symbol: str, start_date: datetime, end_date: datetime = None) -> Optional[pd.DataFrame]:
         """
@@ -140,7 +172,7 @@ class YahooFinanceClient:
             if end_date is None:
                 end_date = datetime.now()
                 
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             data = ticker.history(start=start_date, end=end_date)
             
             if data.empty:
@@ -150,6 +182,7 @@ class YahooFinanceClient:
             return data
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting historical data for {symbol}: {e}")
             return None
     
@@ -203,7 +236,7 @@ class YahooFinanceClient:
             Financial data dictionary or None
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             info = ticker.info
             
             return {
@@ -224,6 +257,7 @@ class YahooFinanceClient:
             }
             
         except Exception as e:
+            self._report_throttle(e)
             logger.error(f"Error getting financial data for {symbol}: {e}")
             return None
     
@@ -289,7 +323,7 @@ class YahooFinanceClient:
         
         for name, symbol in indices.items():
             try:
-                ticker = yf.Ticker(symbol)
+                ticker = self._ticker(symbol)
                 info = ticker.info
                 hist = ticker.history(period='2d')
                 
@@ -308,6 +342,54 @@ class YahooFinanceClient:
                     }
                     
             except Exception as e:
+                self._report_throttle(e)
                 logger.error(f"Error getting summary for {name}: {e}")
                 
         return summary
+
+
+def _prepaid(fn, *args):
+    _budget_prepaid.set(True)
+    return fn(*args)
+
+
+class AsyncYahooFinanceClient:
+    """
+    Asyncio counterpart of YahooFinanceClient. yfinance is blocking, so
+    each lookup waits for its Yahoo rate-budget token on the event loop
+    and then runs the sync client in a worker thread; batch methods run
+    the lookups concurrently.
+    """
+    
+    def __init__(self, sync_client: Optional[YahooFinanceClient] = None):
+        self._sync_client = sync_client
+    
+    @property
+    def sync(self) -> YahooFinanceClient:
+        if self._sync_client is None:
+            from .shared import get_yahoo_client
+            self._sync_client = get_yahoo_client()
+        return self._sync_client
+    
+    async def _run(self, fn, *args):
+        if not await rate_budget.acquire_async("yahoo_finance", timeout=RATE_BUDGET_TIMEOUT):
+            logger.warning(f"Yahoo Finance rate budget exhausted, skipping {fn.__name__}{args}")
+            return None
+        return await asyncio.to_thread(_prepaid, fn, *args)
+    
+    async def get_price_data(self, symbol: str, period: str = '1mo') -> Optional[pd.DataFrame]:
+        return await self._run(self.sync.get_price_data, symbol, period)
+    
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        return await self._run(self.sync.get_current_price, symbol)
+    
+    async def get_price_data_many(self, symbols: Sequence[str], period: str = '1mo') -> Dict[str, Optional[pd.DataFrame]]:
+        """Price data per symbol, fetched concurrently"""
+        from .shared import gather_limited
+        results = await gather_limited(self.get_price_data(s, period) for s in symbols)
+        return {s: (None if isinstance(r, BaseException) else r) for s, r in zip(symbols, results)}
+    
+    async def get_current_prices(self, symbols: Sequence[str]) -> Dict[str, Optional[float]]:
+        from .shared import gather_limited
+        results = await gather_limited(self.get_current_price(s) for s in symbols)
+        return {s: (None if isinstance(r, BaseException) else r) for s, r in zip(symbols, results)}
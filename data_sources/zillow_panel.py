@@ -0,0 +1,216 @@
+"""
+Columnar Zillow Research panel.
+
+Converts the wide Zillow metro CSVs (one column per month) into a single
+aligned metro x month NumPy panel, cached next to the sources as
+`.zillow_panel.npz`. The panel is rebuilt only when a source file's
+mtime or size changes; within a process it is kept in memory, so repeat
+loads are a stat() per file.
+
+  python -m data_sources.zillow_panel [data_dir]   # prebuild the panel
+"""
+
+import csv
+import logging
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path("data/zillow")
+PANEL_FILE = ".zillow_panel.npz"
+PANEL_VERSION = 1
+
+ZILLOW_FILES = {
+    "zhvi": "Metro_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv",
+    "income_needed": "Metro_new_homeowner_income_needed_downpayment_0.20_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv",
+    "doz_pending": "Metro_mean_doz_pending_uc_sfrcondo_sm_month.csv",
+    "sales_now": "Metro_sales_count_now_uc_sfrcondo_month.csv",
+    "inventory_fs": "Metro_invt_fs_uc_sfrcondo_sm_month.csv",
+    "zori": "Metro_zori_uc_sfrcondomfr_sm_month.csv",
+}
+
+_DATE_COL = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass(frozen=True)
+class ZillowPanel:
+    """
+    Aligned panel: values[d, m, t] is dataset `datasets[d]` for metro
+    `metros[m]` in month `dates[t]` (NaN where Zillow has no value).
+    Metros are the sorted intersection across datasets; months are the
+    union, each labelled with the latest source date in that month.
+    """
+
+    datasets: Tuple[str, ...]
+    metros: np.ndarray
+    dates: np.ndarray
+    values: np.ndarray
+    signature: Tuple[Tuple[str, int, int], ...]
+
+    def __getitem__(self, dataset: str) -> np.ndarray:
+        return self.values[self.datasets.index(dataset)]
+
+    def rows(self, include: Optional[Iterable[str]] = None,
+             exclude: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Row indices of the metros to score."""
+        keep = np.ones(len(self.metros), dtype=bool)
+        if include:
+            keep &= np.isin(self.metros, list(include))
+        if exclude:
+            keep &= ~np.isin(self.metros, list(exclude))
+        return np.flatnonzero(keep)
+
+
+_cache: Dict[str, ZillowPanel] = {}
+_lock = threading.Lock()
+
+
+def source_signature(paths: Dict[str, Path]) -> Tuple[Tuple[str, int, int], ...]:
+    sig = []
+    for name, path in sorted(paths.items()):
+        st = path.stat()
+        sig.append((name, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _read_wide_csv(path: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(metros, dates as datetime64[D], values[metro, date]) from one wide CSV."""
+    import pandas as pd
+
+    with path.open(newline="") as f:
+        header = next(csv.reader(f))
+    if "RegionName" not in header:
+        raise ValueError(f"Missing RegionName in {path.name}")
+    date_cols = [c for c in header if _DATE_COL.match(c)]
+    if not date_cols:
+        raise ValueError(f"No date columns found in {path.name}")
+
+    df = pd.read_csv(
+        path,
+        usecols=["RegionName"] + date_cols,
+        dtype={c: "float64" for c in date_cols} | {"RegionName": str},
+    )
+    # Ambiguous metro names can't be matched across files
+    df = df[~df["RegionName"].duplicated(keep=False)]
+
+    dates = np.array(date_cols, dtype="datetime64[D]")
+    order = np.argsort(dates, kind="stable")
+    return (
+        df["RegionName"].to_numpy(dtype=object),
+        dates[order],
+        df[date_cols].to_numpy(dtype=np.float64)[:, order],
+    )
+
+
+def build_panel(paths: Dict[str, Path]) -> ZillowPanel:
+    """Parse the source CSVs and align them into one panel."""
+    signature = source_signature(paths)
+    datasets = tuple(sorted(paths))
+    raw = {name: _read_wide_csv(paths[name]) for name in datasets}
+
+    metros = None
+    for names, _, _ in raw.values():
+        metros = set(names) if metros is None else metros & set(names)
+    metros = np.array(sorted(metros), dtype=object)
+
+    all_dates = np.unique(np.concatenate([d for _, d, _ in raw.values()]))
+    months, last_day = np.unique(all_dates.astype("datetime64[M]")[::-1], return_index=True)
+    dates = all_dates[::-1][last_day]
+
+    values = np.full((len(datasets), len(metros), len(months)), np.nan)
+    for d, name in enumerate(datasets):
+        names, src_dates, src_values = raw[name]
+        row_of = {m: i for i, m in enumerate(names)}
+        src_rows = np.array([row_of[m] for m in metros], dtype=np.intp)
+        cols = np.searchsorted(months, src_dates.astype("datetime64[M]"))
+        values[d][:, cols] = src_values[src_rows]
+
+    return ZillowPanel(datasets, metros, dates, values, signature)
+
+
+def _save(panel: ZillowPanel, path: Path):
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez(
+        tmp,
+        version=PANEL_VERSION,
+        datasets=np.array(panel.datasets),
+        metros=panel.metros.astype(str),
+        dates=panel.dates,
+        values=panel.values,
+        signature=np.array([f"{n}|{m}|{s}" for n, m, s in panel.signature]),
+    )
+    tmp.replace(path)
+
+
+def _load(path: Path, signature) -> Optional[ZillowPanel]:
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            if int(npz["version"]) != PANEL_VERSION:
+                return None
+            stored = tuple(tuple(s.split("|")) for s in npz["signature"].tolist())
+            if stored != tuple((n, str(m), str(s)) for n, m, s in signature):
+                return None
+            return ZillowPanel(
+                tuple(npz["datasets"].tolist()),
+                npz["metros"].astype(object),
+                npz["dates"],
+                npz["values"],
+                signature,
+            )
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Zillow panel {path}: {e}")
+        return None
+
+
+def load_panel(data_dir: Path = DATA_DIR, files: Optional[Dict[str, str]] = None) -> ZillowPanel:
+    """
+    Panel for the Zillow CSVs in `data_dir`, rebuilt only if a source
+    changed. Raises FileNotFoundError listing missing datasets.
+    """
+    data_dir = Path(data_dir)
+    paths = {k: data_dir / v for k, v in (files or ZILLOW_FILES).items()}
+    missing = [k for k, p in paths.items() if not p.exists()]
+    if missing:
+        raise FileNotFoundError(f"missing Zillow data files: {missing}")
+
+    signature = source_signature(paths)
+    key = str(data_dir.resolve())
+    with _lock:
+        panel = _cache.get(key)
+        if panel is not None and panel.signature == signature:
+            return panel
+
+        panel_path = data_dir / PANEL_FILE
+        panel = _load(panel_path, signature) if panel_path.exists() else None
+        if panel is None:
+            logger.info(f"Building Zillow panel from {len(paths)} CSVs in {data_dir}")
+            panel = build_panel(paths)
+            try:
+                _save(panel, panel_path)
+            except OSError as e:
+                logger.warning(f"Could not cache Zillow panel: {e}")
+        _cache[key] = panel
+        return panel
+
+
+def main(argv: List[str]) -> int:
+    data_dir = Path(argv[0]) if argv else DATA_DIR
+    try:
+        panel = load_panel(data_dir)
+    except FileNotFoundError as e:
+        print(f"{e} (in {data_dir})", file=sys.stderr)
+        return 1
+    print(f"{len(panel.metros)} metros x {len(panel.dates)} months "
+          f"({panel.dates[0]} .. {panel.dates[-1]}), datasets={list(panel.datasets)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,7 +2,7 @@ import json
 import yaml
 from pathlib import Path
 
-from eval.harness import run_suite
+from eval.harness import run_suites
 from meta.prompt_variant_manager import ensure_variants, load_variant, save_champion
 
 def _set_prompt_text(prompt_path: str, text: str):
@@ -10,18 +10,12 @@ def _set_prompt_text(prompt_path: str, text: str):
 
 def run_all_evals(manifest):
     summaries = {}
-    for a in manifest["agents"]:
-        out = f"eval/results/{a['name']}.json"
-        results = run_suite(
-            module=a["module"],
-            callable_name=a["callable"],
-            suite_path=a["eval_suite"],
-            out_path=out,
-            eval_adapter=a.get("eval_adapter")
-        )
+    for name, results in run_suites(manifest["agents"]).items():
+        if isinstance(results, Exception):
+            results = []
         total = len(results)
         passed = sum(1 for r in results if r["ok"])
-        summaries[a["name"]] = {"total": total, "passed": passed, "success_rate": passed / max(total, 1)}
+        summaries[name] = {"total": total, "passed": passed, "success_rate": passed / max(total, 1)}
     global_score = sum(v["success_rate"] for v in summaries.values()) / max(len(summaries), 1)
     return global_score, summaries
 
@@ -1,12 +1,43 @@
+"""
+Eval harness: runs an agent's eval suite and records results + telemetry.
+
+Cases run concurrently in worker processes, with a per-case timeout
+(`eval_timeout_s`): a hung case's workers are killed, not abandoned.
+Agents whose cases can't hang may use a thread pool instead (manifest
+`eval_executor: thread` with `eval_timeout_s: 0`); each worker thread
+builds its own callable, since agent instances aren't thread-safe.
+Results are cached per
+(agent source fingerprint, case hash) so unchanged agents skip
+re-evaluation; cache hits don't emit telemetry. Each results file
+carries per-case latency percentiles.
+"""
+import hashlib
+import importlib
+import importlib.util
 import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
 import time
-import importlib
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Callable, Any, Dict, List
+from typing import Callable, Any, Dict, List, Optional, Tuple
 
 from telemetry.logger import log_event, new_run_id
 from telemetry.reward import reward as compute_reward
 
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path("eval/results/.cache")
+PROMPTS_DIR = Path("agents/prompts")
+DEFAULT_TIMEOUT_S = float(os.environ.get("EVAL_CASE_TIMEOUT_S", 120))
+DEFAULT_MAX_WORKERS = int(os.environ.get("EVAL_MAX_WORKERS", 8))
+
 def load_callable(module_path: str, callable_name: str) -> Callable:
     mod = importlib.import_module(module_path)
     if "." in callable_name:
@@ -48,8 +79,290 @@ def validate_schema(output: Any, schema: Dict) -> bool:
     
     return True
 
+def _module_files(module_path: str) -> List[Path]:
+    try:
+        spec = importlib.util.find_spec(module_path)
+    except (ImportError, ValueError):
+        return []
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return []
+    origin = Path(spec.origin)
+    files = [origin]
+    prompts = origin.parent / "prompts"
+    if prompts.is_dir():
+        files += sorted(p for p in prompts.rglob("*") if p.is_file())
+    return files
+
+
+def source_fingerprint(module: str, callable_name: str, eval_adapter: str = None) -> str:
+    """
+    Hash of everything an eval result depends on: the agent module (and
+    its prompts/ dir), the adapter module, and the shared agent prompts.
+    """
+    h = hashlib.sha256(f"{module}|{callable_name}|{eval_adapter}".encode())
+    files = _module_files(module)
+    if eval_adapter:
+        files += _module_files(eval_adapter.split(":")[0])
+    if PROMPTS_DIR.is_dir():
+        files += sorted(p for p in PROMPTS_DIR.rglob("*") if p.is_file())
+    for f in files:
+        h.update(str(f).encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+def case_hash(case: Dict) -> str:
+    return hashlib.sha256(json.dumps(case, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    """Per-agent eval results keyed by case hash, valid for one source fingerprint."""
+
+    def __init__(self, module: str, callable_name: str, fingerprint: str, cache_dir: Path = None):
+        self.fingerprint = fingerprint
+        safe = f"{module}.{callable_name}".replace("/", "_")
+        self.path = Path(cache_dir or CACHE_DIR) / f"{safe}.json"
+        self.cases: Dict[str, Dict] = {}
+        try:
+            doc = json.loads(self.path.read_text())
+            if doc.get("fingerprint") == fingerprint:
+                self.cases = doc.get("cases") or {}
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.cases.get(key)
+
+    def put(self, key: str, result: Dict):
+        self.cases[key] = result
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"fingerprint": self.fingerprint, "cases": self.cases}, default=str))
+        os.replace(tmp, self.path)
+
+
+_fn_cache: Dict[Tuple, Tuple[str, Callable]] = {}
+_fn_lock = threading.Lock()
+
+
+def _resolve(module: str, callable_name: str, eval_adapter: Optional[str], fingerprint: str) -> Callable:
+    """
+    The eval callable, instantiated once per process and source version.
+    A changed fingerprint reloads the module so edited agents are re-imported.
+    """
+    key = (module, callable_name, eval_adapter)
+    with _fn_lock:
+        cached = _fn_cache.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        if cached:
+            for name in (module, eval_adapter.split(":")[0] if eval_adapter else None):
+                mod = sys.modules.get(name) if name else None
+                if mod is not None:
+                    importlib.reload(mod)
+        fn = load_adapter(eval_adapter) if eval_adapter else load_callable(module, callable_name)
+        _fn_cache[key] = (fingerprint, fn)
+        return fn
+
+
+def _execute_case(fn: Callable, case: Dict, is_adapter: bool) -> Dict:
+    t0 = time.time()
+    try:
+        input_data = case.get("input", {})
+        if isinstance(input_data, dict):
+            output = fn(input_data) if is_adapter else fn(**input_data)
+        else:
+            output = fn(input_data)
+
+        schema = case.get("schema")
+        schema_valid = validate_schema(output, schema)
+
+        ok = schema_valid
+        err = None if schema_valid else "Schema validation failed"
+        raised = False
+    except Exception as e:
+        output = None
+        ok = False
+        err = str(e)
+        raised = True
+    return {
+        "output": output, "ok": ok, "error": err, "raised": raised,
+        "latency_ms": int((time.time() - t0) * 1000),
+    }
+
+
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _process_case(module, callable_name, eval_adapter, fingerprint, case, index=None):
+    """
+    Process-pool entry point: resolve the callable in the worker, report
+    (index, start time) to the parent's timeout clock, then run the case.
+    """
+    fn = _resolve(module, callable_name, eval_adapter, fingerprint)
+    if _started_queue is not None and index is not None:
+        _started_queue.put((index, time.time()))
+    return _execute_case(fn, case, bool(eval_adapter))
+
+
+_local = threading.local()
+
+
+def _thread_case(module, callable_name, eval_adapter, fingerprint, case):
+    """Thread-pool entry point: each worker thread builds and reuses its own callable."""
+    fns = getattr(_local, "fns", None)
+    if fns is None:
+        fns = _local.fns = {}
+    key = (module, callable_name, eval_adapter, fingerprint)
+    fn = fns.get(key)
+    if fn is None:
+        fn = fns[key] = load_adapter(eval_adapter) if eval_adapter else load_callable(module, callable_name)
+    return _execute_case(fn, case, bool(eval_adapter))
+
+
+def _process_pool(workers: int):
+    """
+    (pool, started queue). Workers are never forked from this (threaded)
+    process, and report when each case starts executing.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    ctx = multiprocessing.get_context(method)
+    started = ctx.SimpleQueue()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                               initializer=_init_worker, initargs=(started,))
+    return pool, started
+
+
+def _kill_pool(pool: ProcessPoolExecutor):
+    """Kill every worker process, including ones stuck in a case."""
+    terminate = getattr(pool, "terminate_workers", None)   # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        proc.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _percentile(sorted_xs: List[float], q: float) -> float:
+    if not sorted_xs:
+        return 0.0
+    k = (len(sorted_xs) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_xs) - 1)
+    return sorted_xs[lo] + (sorted_xs[hi] - sorted_xs[lo]) * (k - lo)
+
+
+def latency_summary(results: List[Dict]) -> Dict[str, Any]:
+    """Per-case latency percentiles over executed (non-cached) cases."""
+    executed = sorted(r["latency_s"] * 1000 for r in results if not r.get("cached"))
+    return {
+        "cases": len(results),
+        "executed": len(executed),
+        "cached": sum(1 for r in results if r.get("cached")),
+        "timeouts": sum(1 for r in results if r.get("timed_out")),
+        "p50_ms": round(_percentile(executed, 50), 1),
+        "p95_ms": round(_percentile(executed, 95), 1),
+        "p99_ms": round(_percentile(executed, 99), 1),
+        "max_ms": round(executed[-1], 1) if executed else 0.0,
+    }
+
+
+def _result(fut) -> Dict:
+    try:
+        return fut.result()
+    except Exception as e:
+        return {"output": None, "ok": False, "error": str(e), "raised": True, "latency_ms": 0}
+
+
+def _run_threads(cases, module, callable_name, eval_adapter, fingerprint, workers) -> Dict[int, Dict]:
+    raw: Dict[int, Dict] = {}
+    _resolve(module, callable_name, eval_adapter, fingerprint)  # reloads edited modules once
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eval") as pool:
+        futures = {
+            pool.submit(_thread_case, module, callable_name, eval_adapter, fingerprint, case): i
+            for i, case in cases
+        }
+        for fut, i in futures.items():
+            raw[i] = _result(fut)
+    return raw
+
+
+def _run_cases(cases, module, callable_name, eval_adapter, fingerprint, executor, max_workers, timeout_s):
+    """
+    Run cases concurrently; returns {index: raw result}.
+
+    With the process executor, a case still running `timeout_s` after its
+    worker started executing it is reported as timed out and the pool's
+    workers are killed; cases that hadn't finished are resubmitted to a
+    fresh pool. The thread executor has no timeout (threads can't be
+    stopped). If the pool breaks (workers dying on startup or mid-case),
+    the unfinished cases fall back to the thread executor.
+    """
+    raw: Dict[int, Dict] = {}
+    if not cases:
+        return raw
+
+    workers = max(1, min(max_workers, len(cases)))
+    if executor != "process":
+        return _run_threads(cases, module, callable_name, eval_adapter, fingerprint, workers)
+
+    todo = dict(cases)
+    while todo:
+        pool, started_queue = _process_pool(min(workers, len(todo)))
+        futures = {
+            pool.submit(_process_case, module, callable_name, eval_adapter, fingerprint, case, i): i
+            for i, case in todo.items()
+        }
+        started: Dict[int, float] = {}
+        pending = set(futures)
+        killed = broken = False
+        while pending and not killed and not broken:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if isinstance(fut.exception(), BrokenProcessPool):
+                    broken = True
+                    continue
+                i = futures[fut]
+                raw[i] = _result(fut)
+                todo.pop(i)
+            while not started_queue.empty():
+                i, ts = started_queue.get()
+                started[i] = ts
+            now = time.time()
+            for fut in pending:
+                i = futures[fut]
+                if i in started and timeout_s and now - started[i] > timeout_s:
+                    raw[i] = {
+                        "output": None, "ok": False, "raised": True, "timed_out": True,
+                        "error": f"Timed out after {timeout_s:g}s",
+                        "latency_ms": int((now - started[i]) * 1000),
+                    }
+                    todo.pop(i)
+                    killed = True
+        if killed or broken:
+            _kill_pool(pool)
+        else:
+            pool.shutdown(wait=True)
+        started_queue.close()
+        if broken:
+            logger.warning(f"eval process pool broke; running {len(todo)} case(s) of {module} on threads")
+            raw.update(_run_threads(list(todo.items()), module, callable_name, eval_adapter,
+                                    fingerprint, min(workers, len(todo))))
+            break
+    return raw
+
+
 def run_suite(module: str, callable_name: str, suite_path: str, out_path: str, 
-              eval_adapter: str = None):
+              eval_adapter: str = None, executor: str = "process",
+              max_workers: int = None, timeout_s: float = None, use_cache: bool = True):
     suite_file = Path(suite_path)
     
     if not suite_file.exists():
@@ -63,71 +376,78 @@ def run_suite(module: str, callable_name: str, suite_path: str, out_path: str,
         }, indent=2))
         return []
     
-    if eval_adapter:
-        fn = load_adapter(eval_adapter)
-    else:
-        fn = load_callable(module, callable_name)
-    
-    suite = suite_file.read_text().splitlines()
-    results = []
-
-    for line in suite:
-        if not line.strip():
-            continue
-        case = json.loads(line)
-        run_id = new_run_id()
-        t0 = time.time()
-        try:
-            input_data = case.get("input", {})
-            if isinstance(input_data, dict):
-                output = fn(input_data) if eval_adapter else fn(**input_data)
-            else:
-                output = fn(input_data)
-            
-            schema = case.get("schema")
-            schema_valid = validate_schema(output, schema)
-            
-            ok = schema_valid
-            err = None if schema_valid else "Schema validation failed"
-        except Exception as e:
-            output = None
-            ok = False
-            err = str(e)
-
-        lat_ms = int((time.time() - t0) * 1000)
-        
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    timeout_s = DEFAULT_TIMEOUT_S if timeout_s is None else timeout_s
+    if executor == "serial":
+        executor, max_workers = "thread", 1
+    if executor == "thread" and timeout_s:
+        # A hung thread can't be stopped; only worker processes can enforce the timeout
+        executor = "process"
+
+    fingerprint = source_fingerprint(module, callable_name, eval_adapter)
+    cache = ResultCache(module, callable_name, fingerprint) if use_cache else None
+
+    cases = [json.loads(line) for line in suite_file.read_text().splitlines() if line.strip()]
+    keys = [case_hash(c) for c in cases]
+    results: List[Optional[Dict]] = [None] * len(cases)
+
+    todo = []
+    for i, (case, key) in enumerate(zip(cases, keys)):
+        hit = cache.get(key) if cache else None
+        if hit is not None:
+            results[i] = {**hit, "id": case.get("id"), "cached": True}
+        else:
+            todo.append((i, case))
+
+    raw = _run_cases(todo, module, callable_name, eval_adapter, fingerprint, executor, max_workers, timeout_s)
+
+    for i, case in todo:
+        r = raw[i]
+        lat_ms = r["latency_ms"]
         event = {
             "agent": module,
             "latency_ms": lat_ms,
             "cost_usd": None,
         }
-        r = compute_reward(event, output)
+        reward = compute_reward(event, r["output"])
         
         log_event(
             agent=module,
-            run_id=run_id,
+            run_id=new_run_id(),
             latency_ms=lat_ms,
             cost_usd=None,
-            error=err,
-            reward=r,
+            error=r["error"],
+            reward=reward,
         )
 
-        results.append({
+        results[i] = {
             "id": case.get("id"),
-            "ok": ok,
+            "ok": r["ok"],
             "latency_s": round(lat_ms / 1000, 4),
-            "output": output,
-            "error": err,
-            "reward": r
-        })
+            "output": r["output"],
+            "error": r["error"],
+            "reward": reward,
+        }
+        if r.get("timed_out"):
+            results[i]["timed_out"] = True
+        # Exceptions and timeouts may be transient; only cache completed runs
+        if cache and not r["raised"]:
+            cache.put(keys[i], results[i])
+
+    if cache and todo:
+        try:
+            cache.save()
+        except OSError as e:
+            logger.warning(f"Could not write eval cache for {module}: {e}")
 
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
     Path(out_path).write_text(json.dumps({
         "module": module,
         "callable": callable_name,
         "suite": suite_path,
+        "latency": latency_summary(results),
         "results": results
-    }, indent=2))
+    }, indent=2, default=str))
 
     return results
 
@@ -137,5 +457,26 @@ def run_suite_from_manifest(agent_config: Dict) -> List[Dict]:
         callable_name=agent_config["callable"],
         suite_path=agent_config["eval_suite"],
         out_path=f"eval/results/{agent_config['name']}.json",
-        eval_adapter=agent_config.get("eval_adapter")
+        eval_adapter=agent_config.get("eval_adapter"),
+        executor=agent_config.get("eval_executor", "process"),
+        timeout_s=agent_config.get("eval_timeout_s"),
     )
+
+def run_suites(agent_configs: List[Dict], max_workers: int = 4) -> Dict[str, Any]:
+    """
+    Run many agents' suites concurrently (e.g. a promotion sweep).
+    Returns {agent name: results list, or the exception raised}.
+    """
+    configs = [a for a in agent_configs if a.get("eval_suite")]
+    out: Dict[str, Any] = {}
+    if not configs:
+        return out
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(configs))),
+                            thread_name_prefix="eval-suite") as pool:
+        futures = {pool.submit(run_suite_from_manifest, a): a["name"] for a in configs}
+        for fut, name in futures.items():
+            try:
+                out[name] = fut.result()
+            except Exception as e:
+                out[name] = e
+    return out
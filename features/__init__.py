@@ -0,0 +1,21 @@
+"""Versioned, as-of feature store shared by live agents and backtests"""
+import importlib
+
+# Resolved on first access: the submodules import pandas
+_EXPORTS = {
+    'FEATURES': 'features.definitions', 'MARKET_FEATURES': 'features.definitions',
+    'Feature': 'features.definitions', 'MarketFeature': 'features.definitions',
+    'FeatureStore': 'features.store', 'AsOfView': 'features.store',
+    'LookAheadError': 'features.store', 'feature_store': 'features.store',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
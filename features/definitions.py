@@ -0,0 +1,83 @@
+"""
+Named, versioned feature definitions.
+
+A `Feature` is computed from one symbol's close series; a `MarketFeature`
+from the closes of several symbols aligned on date. Every definition uses
+trailing data only. `window` is the number of bars of history a value
+depends on, which is what lets the store update incrementally.
+
+Bump `version` whenever a definition changes: stored columns with an older
+version are recomputed from the stored closes on next access.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    version: int
+    window: int
+    compute: Callable[[pd.Series], pd.Series]
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class MarketFeature:
+    name: str
+    version: int
+    inputs: Tuple[str, ...]
+    compute: Callable[..., pd.Series]
+    description: str = ""
+
+
+def rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """Simple-moving-average RSI (the definition the agents use)."""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def _ma(n: int):
+    return lambda close: close.rolling(n).mean()
+
+
+def _peak(close: pd.Series) -> pd.Series:
+    return close.rolling(252, min_periods=1).max()
+
+
+FEATURES: Dict[str, Feature] = {f.name: f for f in (
+    Feature("close", 1, 1, lambda c: c, "Close price"),
+    Feature("ret", 1, 2, lambda c: c.pct_change(), "1-bar return"),
+    Feature("ma_20", 1, 20, _ma(20), "20-bar simple moving average"),
+    Feature("ma_50", 1, 50, _ma(50), "50-bar simple moving average"),
+    Feature("ma_200", 1, 200, _ma(200), "200-bar simple moving average"),
+    Feature("rsi_14", 1, 15, rsi, "14-bar RSI"),
+    Feature("vol_20", 1, 21, lambda c: c.pct_change().rolling(20).std(), "20-bar return volatility"),
+    Feature("peak_252", 1, 252, _peak, "Rolling 52-week high"),
+    Feature("drawdown_252", 1, 252, lambda c: c / _peak(c) - 1.0, "Drawdown from the 52-week high"),
+    Feature("up_days_20", 1, 21,
+            lambda c: (c.pct_change() > 0).astype(float).rolling(20, min_periods=1).sum(),
+            "Up days in the last 20 bars"),
+)}
+
+MARKET_FEATURES: Dict[str, MarketFeature] = {f.name: f for f in (
+    MarketFeature("vix", 1, ("^VIX",), lambda vix: vix, "VIX level"),
+    MarketFeature("yield_curve_spread", 1, ("^TNX", "^IRX"), lambda tnx, irx: tnx - irx,
+                  "10Y minus 3M Treasury yield"),
+)}
+
+WARMUP = max(f.window for f in FEATURES.values())
+
+
+def compute(close: pd.Series, names=None) -> pd.DataFrame:
+    """Symbol features for a close series, one column per name."""
+    names = list(names) if names is not None else list(FEATURES)
+    close = close.astype(float)
+    return pd.DataFrame({n: FEATURES[n].compute(close) for n in names}, index=close.index)
@@ -0,0 +1,289 @@
+"""
+Feature store: named, versioned features per symbol as time-indexed columns.
+
+    from features import feature_store
+    feature_store.update("SPY", bars)            # incremental; only new bars computed
+    feature_store.latest("SPY", ["rsi_14", "ma_200"])
+    feature_store.market(["vix", "yield_curve_spread"], asof=day)
+
+Each symbol is one DataFrame (DatetimeIndex x feature columns), persisted
+as parquet under data_cache/features with a manifest recording the
+definition version of every column. `update` appends only bars newer than
+the stored history, recomputing them from a warm-up tail; a revised bar
+recomputes from that date on. Columns whose definition version changed
+are rebuilt from the stored closes on load.
+
+Reads are as-of: `asof` clips to rows on or before it. Backtests should
+read through `view(asof)`, which refuses any read past its date with
+LookAheadError.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from features.definitions import FEATURES, MARKET_FEATURES, WARMUP, compute
+from services.data_events import bars_fingerprint, data_events
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path("data_cache/features")
+MANIFEST = "manifest.json"
+MARKET = "_market"
+
+
+class LookAheadError(RuntimeError):
+    """A read asked for data after the as-of date it is bound to."""
+
+
+def _close(bars: Union[pd.DataFrame, pd.Series]) -> pd.Series:
+    if isinstance(bars, pd.DataFrame) and "Date" in bars.columns:
+        bars = bars.set_index("Date")
+    if pd.api.types.is_integer_dtype(bars.index) and len(bars):
+        raise ValueError("bars need a date index or a Date column")
+    close = bars["Close"] if isinstance(bars, pd.DataFrame) else bars
+    if isinstance(close, pd.DataFrame):  # yfinance multi-index columns
+        close = close.iloc[:, 0]
+    close = close.astype(float).dropna()
+    index = pd.DatetimeIndex(close.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    close = pd.Series(close.to_numpy(), index=index, name="close")
+    close = close[~close.index.duplicated(keep="last")]
+    return close if close.index.is_monotonic_increasing else close.sort_index()
+
+
+def _naive(asof) -> pd.Timestamp:
+    """as-of date comparable with the stored (tz-naive) index."""
+    ts = pd.Timestamp(asof)
+    return ts.tz_localize(None) if ts.tz is not None else ts
+
+
+def _safe(symbol: str) -> str:
+    return symbol.replace("^", "_").replace("/", "_").replace(":", "_")
+
+
+class FeatureStore:
+    def __init__(self, root: Union[str, Path] = DEFAULT_ROOT, persist: bool = True):
+        self.root = Path(root)
+        self.persist = persist
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._manifest: Optional[Dict[str, Dict]] = None
+        self._lock = threading.RLock()
+
+    # ----------------------------------------------------------------- storage
+
+    def _path(self, symbol: str) -> Path:
+        return self.root / f"{_safe(symbol)}.parquet"
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self._manifest is None:
+            path = self.root / MANIFEST
+            try:
+                self._manifest = json.loads(path.read_text()) if path.exists() else {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable feature manifest {path}: {e}")
+                self._manifest = {}
+        return self._manifest
+
+    def _save(self, symbol: str, df: pd.DataFrame, versions: Dict[str, int]):
+        manifest = self._load_manifest()
+        manifest[symbol] = {
+            "versions": versions,
+            "rows": len(df),
+            "last": df.index[-1].isoformat() if len(df) else None,
+        }
+        if not self.persist:
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(symbol)
+            tmp = path.with_name(path.name + ".tmp")
+            df.to_parquet(tmp)
+            os.replace(tmp, path)
+            tmp = self.root / (MANIFEST + ".tmp")
+            tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+            os.replace(tmp, self.root / MANIFEST)
+        except OSError as e:
+            logger.warning(f"Could not persist features for {symbol}: {e}")
+
+    def _frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        """In-memory frame for `symbol`, loading it and rebuilding stale columns."""
+        df = self._frames.get(symbol)
+        if df is not None:
+            return df
+        path = self._path(symbol)
+        if not self.persist or not path.exists():
+            return None
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feature file {path}: {e}")
+            return None
+
+        stored = self._load_manifest().get(symbol, {}).get("versions", {})
+        defs = MARKET_FEATURES if symbol == MARKET else FEATURES
+        stale = [n for n, f in defs.items() if stored.get(n) != f.version or n not in df.columns]
+        if stale:
+            logger.info(f"Rebuilding {symbol} features {stale} (definition changed)")
+            if symbol == MARKET:
+                df = self._compute_market()
+            elif "close" in df.columns:
+                df = compute(df["close"])
+            self._save(symbol, df, {n: f.version for n, f in defs.items()})
+        self._frames[symbol] = df
+        return df
+
+    # ----------------------------------------------------------------- updates
+
+    def update(self, symbol: str, bars: Union[pd.DataFrame, pd.Series]) -> int:
+        """
+        Merge new bars for `symbol` and compute their features.
+        Returns the number of rows (re)computed; 0 if nothing was new.
+        """
+        close = _close(bars)
+        if close.empty:
+            return 0
+        with self._lock:
+            cur = self._frame(symbol)
+            if cur is None or cur.empty:
+                df = compute(close)
+                changed = len(df)
+            else:
+                last = cur.index[-1]
+                old = close[close.index <= last]
+                start = None
+                if len(old):
+                    known = cur["close"].reindex(old.index)
+                    differs = known.isna().to_numpy() | ~np.isclose(known.to_numpy(), old.to_numpy(),
+                                                                    rtol=1e-12, atol=0.0, equal_nan=True)
+                    if differs.any():
+                        start = old.index[differs.argmax()]  # revised or back-filled bar
+                if start is None:
+                    new = close[close.index > last]
+                    keep = cur
+                else:
+                    keep = cur[cur.index < start]
+                    merged = pd.concat([cur["close"][cur.index >= start], close[close.index >= start]])
+                    new = merged[~merged.index.duplicated(keep="last")].sort_index()
+                if new.empty:
+                    return 0
+                history = pd.concat([keep["close"].iloc[-WARMUP:], new])
+                computed = compute(history).iloc[-len(new):]
+                df = pd.concat([keep, computed])
+                changed = len(new)
+
+            self._frames[symbol] = df
+            self._save(symbol, df, {n: f.version for n, f in FEATURES.items()})
+            data_events.publish(f"features:{symbol}", bars_fingerprint(df), kind="bar")
+            if any(symbol in f.inputs for f in MARKET_FEATURES.values()):
+                self._update_market()
+            return changed
+
+    def _compute_market(self) -> pd.DataFrame:
+        """Market features on the union of input dates, inputs carried forward (as of)."""
+        columns = {}
+        for name, feat in MARKET_FEATURES.items():
+            inputs = []
+            for sym in feat.inputs:
+                df = self._frame(sym)
+                inputs.append(df["close"] if df is not None else None)
+            if any(s is None for s in inputs):
+                continue
+            aligned = pd.concat(inputs, axis=1, keys=range(len(inputs))).ffill()
+            columns[name] = feat.compute(*(aligned[i] for i in range(len(inputs))))
+        return pd.DataFrame(columns)
+
+    def _update_market(self):
+        # Pointwise in their inputs, so a full pass is as cheap as a diff
+        df = self._compute_market()
+        self._frames[MARKET] = df
+        self._save(MARKET, df, {n: f.version for n, f in MARKET_FEATURES.items()})
+
+    # ------------------------------------------------------------------- reads
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            known = set(self._frames) | set(self._load_manifest())
+        return sorted(s for s in known if s != MARKET)
+
+    def get(self, symbol: str, names: Optional[Iterable[str]] = None,
+            asof=None, lookback: Optional[int] = None) -> pd.DataFrame:
+        """Feature history for `symbol` up to `asof` (last `lookback` rows)."""
+        defs = MARKET_FEATURES if symbol == MARKET else FEATURES
+        names = list(names) if names is not None else list(defs)
+        unknown = [n for n in names if n not in defs]
+        if unknown:
+            raise KeyError(f"unknown features for {symbol}: {unknown}")
+        with self._lock:
+            df = self._frame(symbol)
+        if df is None:
+            return pd.DataFrame(columns=names, dtype=float)
+        end = len(df) if asof is None else int(df.index.searchsorted(_naive(asof), side="right"))
+        start = max(0, end - lookback) if lookback else 0
+        return df.iloc[start:end][[n for n in names if n in df.columns]]
+
+    def latest(self, symbol: str, names: Iterable[str], asof=None, lag: int = 0) -> Dict[str, float]:
+        """Values `lag` rows before the last row on or before `asof` (NaN if unavailable)."""
+        names = list(names)
+        rows = self.get(symbol, names, asof=asof, lookback=lag + 1)
+        if len(rows) <= lag:
+            return {n: float("nan") for n in names}
+        row = rows.iloc[-1 - lag]
+        return {n: float(row[n]) if n in row else float("nan") for n in names}
+
+    def value(self, symbol: str, name: str, asof=None, lag: int = 0) -> float:
+        return self.latest(symbol, [name], asof=asof, lag=lag)[name]
+
+    def market(self, names: Optional[Iterable[str]] = None, asof=None,
+               lookback: Optional[int] = None) -> pd.DataFrame:
+        return self.get(MARKET, names, asof=asof, lookback=lookback)
+
+    def view(self, asof) -> "AsOfView":
+        return AsOfView(self, asof)
+
+
+class AsOfView:
+    """
+    Read-only window onto a FeatureStore bound to an as-of date. Reads
+    default to that date; asking for a later one raises LookAheadError.
+    A backtest advances the view once per simulated day.
+    """
+
+    def __init__(self, store: FeatureStore, asof):
+        self.store = store
+        self.asof = pd.Timestamp(asof)
+
+    def advance(self, asof) -> "AsOfView":
+        self.asof = pd.Timestamp(asof)
+        return self
+
+    def _check(self, asof) -> pd.Timestamp:
+        if asof is None:
+            return self.asof
+        asof = pd.Timestamp(asof)
+        if asof > self.asof:
+            raise LookAheadError(f"read as of {asof.date()} from a view bound to {self.asof.date()}")
+        return asof
+
+    def get(self, symbol, names=None, asof=None, lookback=None) -> pd.DataFrame:
+        return self.store.get(symbol, names, asof=self._check(asof), lookback=lookback)
+
+    def latest(self, symbol, names, asof=None, lag: int = 0) -> Dict[str, float]:
+        return self.store.latest(symbol, names, asof=self._check(asof), lag=lag)
+
+    def value(self, symbol, name, asof=None, lag: int = 0) -> float:
+        return self.store.value(symbol, name, asof=self._check(asof), lag=lag)
+
+    def market(self, names=None, asof=None, lookback=None) -> pd.DataFrame:
+        return self.store.market(names, asof=self._check(asof), lookback=lookback)
+
+
+feature_store = FeatureStore()
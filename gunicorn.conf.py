@@ -2,8 +2,12 @@
 import os
 
 timeout = 120
-workers = 1
-worker_class = "sync"
+# Safe to raise once agents run in `python -m scheduler` (SCHEDULER_MODE=external);
+# in embedded mode the DB scheduler lease still keeps a single scheduler.
+workers = int(os.environ.get("GUNICORN_WORKERS", 1))
+# Threaded worker so long-lived findings streams (SSE) don't block requests
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
 
 reload_engine = "poll"
 
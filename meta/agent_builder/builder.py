@@ -1,4 +1,5 @@
 import re
+import yaml
 from pathlib import Path
 
 
@@ -95,7 +96,7 @@ def create_agent(class_name: str, config: dict) -> Path:
 
 
 def _update_agents_init(class_name: str, module_name: str):
-    """Update agents/__init__.py to include the new agent."""
+    """Register the new agent: AVAILABLE_AGENTS plus the lazy manifest registry."""
     init_file = Path("agents/__init__.py")
     
     if not init_file.exists():
@@ -103,17 +104,6 @@ def _update_agents_init(class_name: str, module_name: str):
     
     content = init_file.read_text()
     
-    import_line = f"from agents.{module_name} import {class_name}"
-    if import_line not in content:
-        lines = content.split('\n')
-        insert_idx = 0
-        for i, line in enumerate(lines):
-            if line.startswith('from agents.'):
-                insert_idx = i + 1
-        
-        lines.insert(insert_idx, import_line)
-        content = '\n'.join(lines)
-    
     if 'AVAILABLE_AGENTS' in content:
         if f'"{class_name}"' not in content:
             content = re.sub(
@@ -123,3 +113,22 @@ def _update_agents_init(class_name: str, module_name: str):
             )
     
     init_file.write_text(content)
+    _register_in_manifest(class_name, f"agents.{module_name}")
+
+
+def _register_in_manifest(class_name: str, module: str):
+    """Add ClassName: module to the manifest registry (agents are imported lazily)."""
+    manifest = Path("agents/manifest.yaml")
+    if not manifest.exists():
+        return
+    
+    text = manifest.read_text()
+    data = yaml.safe_load(text) or {}
+    registry = data.get("registry") or {}
+    if class_name in registry:
+        return
+    
+    # The registry is the manifest's last section; append to keep comments intact
+    if "registry" not in data:
+        text = text.rstrip("\n") + "\n\nregistry:\n"
+    manifest.write_text(text.rstrip("\n") + f"\n  {class_name}: {module}\n")
@@ -8,41 +8,26 @@ from datetime import datetime, timezone
 import yaml
 
 from meta.agent_builder.promotion_policy import promotion_decision, get_promotion_report
-from telemetry.rolling_stats import _mean, _std, _drawdown
+from telemetry.ledger import performance_ledger
+from services.policy_snapshot import atomic_write_json
 
 MANIFEST_PATH = Path("agents/manifest.yaml")
-TELEMETRY_EVENTS = Path("telemetry/events.jsonl")
 SCHEDULE_PATH = Path("agent_schedule.json")
 PROMOTION_REPORT_PATH = Path("meta/reports/promotion_report.json")
 
 
 def load_agent_stats(agent_name: str, window: int = 500) -> dict:
-    """Load rolling stats for an agent from telemetry events."""
-    if not TELEMETRY_EVENTS.exists():
-        return {"count": 0}
-    
-    lines = TELEMETRY_EVENTS.read_text().splitlines()[-5000:]
-    rewards = []
-    
-    for ln in lines:
-        try:
-            e = json.loads(ln)
-            if e.get("agent") == agent_name and e.get("reward") is not None:
-                rewards.append(float(e["reward"]))
-        except Exception:
-            continue
-    
-    rewards = rewards[-window:]
-    
-    if not rewards:
+    """Load rolling stats for an agent from the performance ledger."""
+    st = performance_ledger.stats(agent_name, window=window)
+    if not st["count"]:
         return {"count": 0}
     
     return {
-        "count": len(rewards),
-        "avg_reward": _mean(rewards),
-        "cap_reward_mean": _mean(rewards),
-        "sharpe": _mean(rewards) / _std(rewards) if _std(rewards) > 1e-9 else 0.0,
-        "drawdown": _drawdown(rewards)
+        "count": st["count"],
+        "avg_reward": st["mean"],
+        "cap_reward_mean": st["mean"],
+        "sharpe": st["sharpe"],
+        "drawdown": st["max_drawdown"]
     }
 
 
@@ -150,7 +135,7 @@ def apply_proposed_changes(report: dict, dry_run: bool = True) -> dict:
             applied.append({**change, "dry_run": True})
     
     if not dry_run and applied:
-        SCHEDULE_PATH.write_text(json.dumps(schedule, indent=2))
+        atomic_write_json(SCHEDULE_PATH, schedule)
     
     return {"applied": applied, "dry_run": dry_run}
 
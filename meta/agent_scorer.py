@@ -11,6 +11,7 @@ from typing import Dict, List, Optional
 import logging
 
 import pandas as pd
+from services.policy_snapshot import atomic_write_json
 
 logger = logging.getLogger(__name__)
 
@@ -191,8 +192,7 @@ def write_schedule_updates(
                 cfg["rank"] = None
                 cfg["score"] = 0.0
 
-        with open(schedule_path, "w") as f:
-            json.dump(schedule, f, indent=2)
+        atomic_write_json(schedule_path, schedule)
         return schedule
 
     eligible.sort(key=lambda x: x.score, reverse=True)
@@ -238,8 +238,7 @@ def write_schedule_updates(
             cfg["score"] = 0.0
             cfg["reason"] = "insufficient data (0 < {})".format(min_signals)
 
-    with open(schedule_path, "w") as f:
-        json.dump(schedule, f, indent=2)
+    atomic_write_json(schedule_path, schedule)
 
     logger.info(f"Updated schedule for {len(eligible)} agents")
     return schedule
@@ -1,10 +1,12 @@
 import json
+import os
 from pathlib import Path
 from math import log, sqrt, exp
 from collections import defaultdict, deque
 from meta.decay import _decay as agent_decay_model, decay_multiplier
 
 EVENTS = Path("telemetry/events.jsonl")
+STATE = Path("meta/allocator_state.json")
 
 
 class UCBAllocator:
@@ -15,6 +17,11 @@ class UCBAllocator:
     - Capital fades smoothly when agents stop working
     - Exploration is damped during uncertainty
     - No abrupt disable unless upstream policy says so
+
+    Bandit state (reward windows, counts, last positive pull) is persisted
+    to `state_path` together with a byte-offset watermark into the events
+    log, so each ingest only reads events appended since the last one and
+    a restart restores the state without replaying the log.
     """
 
     def __init__(
@@ -22,24 +29,75 @@ class UCBAllocator:
         window=500,
         exploration=1.5,
         half_life=200,
-        min_decay=0.15
+        min_decay=0.15,
+        state_path=STATE,
+        events_path=EVENTS
     ):
         self.window = window
         self.exploration = exploration
         self.half_life = half_life
         self.min_decay = min_decay
 
+        self.state_path = Path(state_path) if state_path else None
+        self.events_path = Path(events_path)
+
         self.rewards = defaultdict(lambda: deque(maxlen=window))
+        self.reward_sums = defaultdict(float)
         self.counts = defaultdict(int)
         self.last_positive = defaultdict(lambda: None)
 
+        self.watermark = {"offset": 0, "inode": None}
+
         self.global_decay_multiplier = 1.0
 
+        self.load_state()
+
+    def _push_reward(self, agent: str, r: float):
+        rs = self.rewards[agent]
+        if len(rs) == rs.maxlen:
+            self.reward_sums[agent] -= rs[0]
+        rs.append(r)
+        self.reward_sums[agent] += r
+        self.counts[agent] += 1
+
+        if r > 0:
+            self.last_positive[agent] = self.counts[agent]
+
     def ingest_events(self, last_n=5000):
-        if not EVENTS.exists():
-            return
+        """
+        Ingest events appended to the events log since the watermark.
+
+        The first ingest (no watermark yet) bootstraps from the last
+        `last_n` events. If the log was rotated or truncated, ingest
+        restarts at the beginning of the new file.
+
+        Returns the number of reward events ingested.
+        """
+        if not self.events_path.exists():
+            return 0
+
+        st = self.events_path.stat()
+        offset = int(self.watermark.get("offset") or 0)
+        inode = self.watermark.get("inode")
+        bootstrap = inode is None
+
+        if not bootstrap and (inode != st.st_ino or st.st_size < offset):
+            offset = 0
+
+        if st.st_size == offset and not bootstrap:
+            return 0
 
-        for ln in EVENTS.read_text().splitlines()[-last_n:]:
+        with self.events_path.open("rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+
+        end = chunk.rfind(b"\n") + 1
+        lines = chunk[:end].splitlines()
+        if bootstrap:
+            lines = lines[-last_n:]
+
+        ingested = 0
+        for ln in lines:
             try:
                 e = json.loads(ln)
             except Exception:
@@ -49,12 +107,54 @@ class UCBAllocator:
             reward = e.get("reward")
 
             if agent and reward is not None:
-                r = float(reward)
-                self.rewards[agent].append(r)
-                self.counts[agent] += 1
+                try:
+                    r = float(reward)
+                except (TypeError, ValueError):
+                    continue
+                self._push_reward(agent, r)
+                ingested += 1
+
+        self.watermark = {"offset": offset + end, "inode": st.st_ino}
+        self.save_state()
+
+        return ingested
+
+    def load_state(self):
+        """Restore bandit state and watermark from `state_path`."""
+        if not self.state_path or not self.state_path.exists():
+            return False
+        try:
+            doc = json.loads(self.state_path.read_text())
+        except Exception:
+            return False
 
-                if r > 0:
-                    self.last_positive[agent] = self.counts[agent]
+        for agent, rs in (doc.get("rewards") or {}).items():
+            dq = deque((float(r) for r in rs), maxlen=self.window)
+            self.rewards[agent] = dq
+            self.reward_sums[agent] = sum(dq)
+        for agent, n in (doc.get("counts") or {}).items():
+            self.counts[agent] = int(n)
+        for agent, n in (doc.get("last_positive") or {}).items():
+            self.last_positive[agent] = None if n is None else int(n)
+
+        self.watermark = doc.get("watermark") or {"offset": 0, "inode": None}
+        return True
+
+    def save_state(self):
+        """Write bandit state atomically (tmp file + rename)."""
+        if not self.state_path:
+            return
+        doc = {
+            "window": self.window,
+            "watermark": self.watermark,
+            "rewards": {a: list(rs) for a, rs in self.rewards.items() if rs},
+            "counts": dict(self.counts),
+            "last_positive": {a: n for a, n in self.last_positive.items() if n is not None},
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(doc, separators=(",", ":")))
+        os.replace(tmp, self.state_path)
 
     def _decay_factor(self, agent: str) -> float:
         """
@@ -87,7 +187,7 @@ class UCBAllocator:
         rs = self.rewards[agent]
         n = max(self.counts[agent], 1)
 
-        mean = sum(rs) / len(rs) if rs else 0.0
+        mean = self.reward_sums[agent] / len(rs) if rs else 0.0
 
         bonus = self.exploration * sqrt(log(max(total_pulls, 2)) / n)
 
@@ -111,7 +211,8 @@ class UCBAllocator:
         total_budget_runs=100,
         uncertainty_decay=1.0,
         agent_uncertainty=None,
-        regime: str = "unknown"
+        regime: str = "unknown",
+        redundant=None
     ):
         """
         uncertainty_decay:
@@ -120,6 +221,8 @@ class UCBAllocator:
           per-agent uncertainty dict from LLM council disagreement
         regime:
           current market regime for regime-specific decay
+        redundant:
+          precomputed set of redundant agents (looked up when None)
         """
         min_runs = min_runs or {}
         max_runs = max_runs or {}
@@ -127,11 +230,12 @@ class UCBAllocator:
 
         self.global_decay_multiplier = float(uncertainty_decay)
 
-        try:
-            from meta.redundancy import find_redundant_agents
-            redundant = find_redundant_agents()
-        except Exception:
-            redundant = set()
+        if redundant is None:
+            try:
+                from meta.redundancy import find_redundant_agents
+                redundant = find_redundant_agents()
+            except Exception:
+                redundant = set()
 
         total_pulls = sum(self.counts[a] for a in agents) + 1
         
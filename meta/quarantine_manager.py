@@ -1,12 +1,7 @@
-import json
-from pathlib import Path
-from collections import defaultdict, deque
-
 from services.quarantine import quarantine, clear_quarantine, quarantined_agents
+from telemetry.ledger import performance_ledger
 from telemetry.rolling_stats import update_prom_metrics
 
-EVENTS = Path("telemetry/events.jsonl")
-
 EXEMPT_AGENTS = {
     'CodeGuardianAgent', 'HealthCheckAgent', 'MetaSupervisorAgent',
 }
@@ -26,43 +21,32 @@ def compute_drawdown(rewards):
 
 
 def run(window=500, last_n=5000, dd_limit=-10.0, sharpe_floor=-0.05):
-    if not EVENTS.exists():
+    """
+    Quarantine agents whose rolling reward window shows a deep drawdown
+    and a negative average. Stats come from the streaming performance
+    ledger; `last_n` is kept for callers but no longer bounds the lookback
+    (each agent's window holds its last `window` rewards).
+    """
+    stats = performance_ledger.all_stats(window=window)
+    if not stats:
         return {"ok": True, "quarantined": [], "cleared": []}
 
-    lines = EVENTS.read_text().splitlines()[-last_n:]
-    by = defaultdict(lambda: deque(maxlen=window))
-
-    for ln in lines:
-        try:
-            e = json.loads(ln)
-        except Exception:
-            continue
-        a = e.get("agent")
-        r = e.get("reward")
-        if a and r is not None:
-            try:
-                by[a].append(float(r))
-            except Exception:
-                pass
-
     q_before = set(quarantined_agents().keys())
     q_now = set()
 
-    for agent, dq in by.items():
+    for agent, st in stats.items():
         if agent in EXEMPT_AGENTS:
             if agent in q_before:
                 clear_quarantine(agent)
             continue
 
-        rs = list(dq)
-
-        if len(rs) < MIN_SAMPLES:
+        if st["count"] < MIN_SAMPLES:
             if agent in q_before:
                 clear_quarantine(agent)
             continue
 
-        dd = compute_drawdown(rs)
-        avg_reward = sum(rs) / len(rs) if rs else 0.0
+        dd = st["max_drawdown"]
+        avg_reward = st["mean"]
 
         should_quarantine = (
             dd <= dd_limit and avg_reward < -0.15
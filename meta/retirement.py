@@ -4,6 +4,8 @@ from pathlib import Path
 from collections import defaultdict, deque
 import yaml
 
+from telemetry.ledger import performance_ledger
+
 def load_events(path="telemetry/events.jsonl", last_n=5000):
     p = Path(path)
     if not p.exists():
@@ -18,7 +20,18 @@ def load_events(path="telemetry/events.jsonl", last_n=5000):
             pass
     return out
 
-def rolling_metrics(events, window=200):
+def rolling_metrics(events=None, window=200):
+    """
+    Rolling average reward per agent. Reads the streaming performance
+    ledger unless an explicit list of events is given.
+    """
+    if events is None:
+        return {
+            a: {"rolling_avg_reward": st["mean"], "n": st["count"]}
+            for a, st in performance_ledger.all_stats(window=window).items()
+            if st["count"]
+        }
+
     by = defaultdict(lambda: deque(maxlen=window))
     for e in events:
         a = e.get("agent")
@@ -38,8 +51,7 @@ def rolling_metrics(events, window=200):
 
 def retire_candidates(manifest_path="agents/manifest.yaml", min_n=100, reward_floor=0.05):
     manifest = yaml.safe_load(Path(manifest_path).read_text())
-    events = load_events()
-    m = rolling_metrics(events)
+    m = rolling_metrics()
 
     candidates = []
     for a in manifest["agents"]:
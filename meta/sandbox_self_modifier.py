@@ -7,7 +7,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.llm_client import call_llm
 from meta.safe_patch_apply import apply_patch, PatchError
-from eval.harness import run_suite
+from eval.harness import run_suites
 
 PROTECTED_PREFIXES = (
     ".github/",
@@ -38,21 +38,12 @@ def collect_editable_agents(manifest):
 
 def run_all_evals(manifest):
     failures = []
-    for a in manifest["agents"]:
-        out = f"eval/results/{a['name']}.json"
-        try:
-            results = run_suite(
-                module=a["module"],
-                callable_name=a["callable"],
-                suite_path=a["eval_suite"],
-                out_path=out,
-                eval_adapter=a.get("eval_adapter")
-            )
-            if any(not r["ok"] for r in results):
-                failures.append(a["name"])
-        except Exception as e:
-            print(f"Warning: Could not run eval for {a['name']}: {e}")
-            failures.append(a["name"])
+    for name, results in run_suites(manifest["agents"]).items():
+        if isinstance(results, Exception):
+            print(f"Warning: Could not run eval for {name}: {results}")
+            failures.append(name)
+        elif any(not r["ok"] for r in results):
+            failures.append(name)
     return failures
 
 def main():
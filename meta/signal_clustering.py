@@ -7,7 +7,6 @@ Identifies redundant agents by clustering signal behavior.
 import numpy as np
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
-from sklearn.cluster import AgglomerativeClustering
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,6 +56,8 @@ class SignalClusterer:
         corr = np.nan_to_num(corr, nan=0.0)
         distance = 1 - corr
 
+        from sklearn.cluster import AgglomerativeClustering  # heavy, only needed here
+
         model = AgglomerativeClustering(
             metric="precomputed",
             linkage="average",
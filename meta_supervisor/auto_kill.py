@@ -1,6 +1,6 @@
-import json
 from pathlib import Path
 from meta_supervisor.kill_list import load_kill_list
+from services.policy_snapshot import atomic_write_json
 
 KILL = Path("meta_supervisor/policy/kill_list.json")
 
@@ -16,6 +16,5 @@ def apply_auto_kills(report: dict):
             changed = True
 
     if changed:
-        KILL.parent.mkdir(parents=True, exist_ok=True)
-        KILL.write_text(json.dumps(k, indent=2))
+        atomic_write_json(KILL, k)
     return {"killed": to_kill, "changed": changed}
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from services.policy_snapshot import atomic_write_json
 
 KILL = Path("meta_supervisor/policy/kill_list.json")
 
@@ -10,8 +11,7 @@ DEFAULT = {
 
 def load_kill_list():
     if not KILL.exists():
-        KILL.parent.mkdir(parents=True, exist_ok=True)
-        KILL.write_text(json.dumps(DEFAULT, indent=2))
+        atomic_write_json(KILL, DEFAULT)
         return DEFAULT
     return json.loads(KILL.read_text())
 
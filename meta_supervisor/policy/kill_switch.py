@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 
 from services.quarantine import is_quarantined
+from services.policy_snapshot import atomic_write_json
 
 KILL = Path("meta_supervisor/state/kill_switch.json")
 
@@ -16,8 +17,7 @@ def _load():
 
 
 def _save(data):
-    KILL.parent.mkdir(parents=True, exist_ok=True)
-    KILL.write_text(json.dumps(data, indent=2))
+    atomic_write_json(KILL, data)
 
 
 def agent_disabled(agent: str) -> bool:
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from datetime import datetime, timezone
+from services.policy_snapshot import atomic_write_json
 
 RECONCILED = Path("alpha/reconciled.jsonl")
 TELEMETRY = Path("telemetry/events.jsonl")
@@ -22,8 +23,7 @@ def load_json_list(p: Path) -> list:
         return []
 
 def save_json_list(p: Path, data: list):
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, indent=2))
+    atomic_write_json(p, data)
 
 def compute_agent_metrics(agent: str, lookback: int = 50) -> dict:
     recon = [r for r in load_jsonl(RECONCILED) if r.get("agent") == agent][-lookback:]
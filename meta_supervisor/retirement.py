@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from datetime import datetime, timezone
+from services.policy_snapshot import atomic_write_json
 
 RETIREMENT_LOG = Path("meta_supervisor/state/retirement_log.json")
 KILLED_AGENTS = Path("meta_supervisor/state/killed_agents.json")
@@ -136,8 +137,7 @@ def kill_agent(agent_name: str, reason: str):
         "reason": reason,
     })
     
-    KILLED_AGENTS.parent.mkdir(parents=True, exist_ok=True)
-    KILLED_AGENTS.write_text(json.dumps(existing, indent=2))
+    atomic_write_json(KILLED_AGENTS, existing)
 
 def kill_strategy_class(strategy_name: str, reason: str):
     """Kill an entire strategy class."""
@@ -156,8 +156,7 @@ def kill_strategy_class(strategy_name: str, reason: str):
         "status": "killed",
     })
     
-    KILLED_STRATEGIES.parent.mkdir(parents=True, exist_ok=True)
-    KILLED_STRATEGIES.write_text(json.dumps(existing, indent=2))
+    atomic_write_json(KILLED_STRATEGIES, existing)
 
 def is_agent_killed(agent_name: str) -> bool:
     """Check if agent is on kill list."""
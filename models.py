@@ -137,6 +137,9 @@ class Finding(db.Model):
     fund_council: Mapped[str | None] = mapped_column(String(16), nullable=True)
     real_estate_council: Mapped[str | None] = mapped_column(String(16), nullable=True)
 
+    # Near-duplicate cluster (services.finding_similarity)
+    cluster_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -163,6 +166,7 @@ class Finding(db.Model):
             "ta_council": self.ta_council,
             "fund_council": self.fund_council,
             "real_estate_council": self.real_estate_council,
+            "cluster_id": self.cluster_id,
         }
 
 
@@ -194,6 +198,24 @@ class AgentStatus(db.Model):
         }
 
 
+class SchedulerLease(db.Model):
+    """Single-row lock so only one process runs the AgentScheduler."""
+    __tablename__ = "scheduler_lease"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128), nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "holder": self.holder,
+            "acquired_at": self.acquired_at.isoformat() if self.acquired_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+
+
 class MarketData(db.Model):
     __tablename__ = "market_data"
 
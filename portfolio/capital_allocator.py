@@ -188,34 +188,26 @@ def run_allocation(portfolio_value: float = 1_000_000, limit: int = 500) -> Dict
 def get_regime_state() -> Dict:
     """Get current regime state from API or cache."""
     try:
-        from regime import extract_features, score_regimes, regime_confidence
+        from regime import extract_features_asof, merge_inputs, score_regimes, regime_confidence
         from regime.confidence import get_cached_regime, cache_regime
         from data_sources.price_loader import load_spy
         import yfinance as yf
         
         spy = load_spy(start="2020-01-01", use_cache=True)
         
-        try:
-            vix = yf.download("^VIX", period="3mo", progress=False)
-        except Exception:
-            vix = spy.copy()
-            vix["Close"] = 20.0
+        # Inputs go through the feature store: a failed download falls back
+        # to the history already stored for that symbol
+        frames = {"SPY": spy}
+        for symbol in ("^VIX", "^TNX", "GLD"):
+            try:
+                frames[symbol] = yf.download(symbol, period="3mo", progress=False)
+            except Exception:
+                frames[symbol] = None
         
-        try:
-            tnx = yf.download("^TNX", period="3mo", progress=False)
-        except Exception:
-            tnx = spy.copy()
-            tnx["Close"] = 4.0
-        
-        try:
-            gld = yf.download("GLD", period="3mo", progress=False)
-        except Exception:
-            gld = None
-        
-        if len(spy) < 20 or len(vix) < 20 or len(tnx) < 20:
+        if not merge_inputs(frames):
             return {}
         
-        features = extract_features(spy, vix, tnx, gld)
+        features = extract_features_asof()
         scores = score_regimes(features)
         
         state = regime_confidence(
@@ -21,6 +21,11 @@ from enum import Enum
 import math
 import uuid
 
+from portfolio.position_book import (
+    PositionBook, nav_returns, historical_var, historical_es,
+    parametric_var, parametric_es,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -184,6 +189,10 @@ class Portfolio:
     """
     Main portfolio management class.
     Tracks positions, calculates risk, enforces limits.
+
+    Risk calculations run on a PositionBook (struct-of-arrays) that is
+    rebuilt lazily whenever the position set changes. Code that mutates
+    Position objects directly should call invalidate_book().
     """
     
     def __init__(
@@ -207,6 +216,19 @@ class Portfolio:
         self.high_water_mark = initial_capital
         self.max_drawdown = 0
         
+        self._book: Optional[PositionBook] = None
+    
+    @property
+    def book(self) -> PositionBook:
+        """Array-backed view of open positions."""
+        if self._book is None:
+            self._book = PositionBook(self.positions.values())
+        return self._book
+    
+    def invalidate_book(self):
+        """Force the position book to be rebuilt on next access."""
+        self._book = None
+        
     # === Position Management ===
     
     def add_position(self, position: Position) -> Tuple[bool, str]:
@@ -223,6 +245,7 @@ class Portfolio:
         
         # Add position
         self.positions[position.position_id] = position
+        self.invalidate_book()
         self.cash -= cost
         
         # Record trade
@@ -267,6 +290,7 @@ class Portfolio:
         # Move to closed
         self.closed_positions.append(position)
         del self.positions[position_id]
+        self.invalidate_book()
         
         # Update cash
         self.cash += proceeds
@@ -309,6 +333,7 @@ class Portfolio:
         # Update position
         position.face_amount -= exit_amount
         position.realized_pnl += realized_pnl
+        self.invalidate_book()
         
         # Update cash
         self.cash += proceeds
@@ -323,9 +348,22 @@ class Portfolio:
     
     def update_marks(self, prices: Dict[str, float]):
         """Update all position marks with new prices."""
-        for pos_id, position in self.positions.items():
-            if position.security_id in prices:
-                position.update_mark(prices[position.security_id])
+        book = self.book
+        rows = book.mark(prices)
+        if not rows.size:
+            return
+        
+        # Write the vectorized marks back to the Position objects
+        unrealized = book.unrealized_pnl[rows]
+        cost_basis = book.cost_basis[rows]
+        now = datetime.utcnow().isoformat()
+        for i, pnl, cost in zip(rows.tolist(), unrealized.tolist(), cost_basis.tolist()):
+            position = book.positions[i]
+            position.current_price = float(book.price[i])
+            position.current_value = float(book.value[i])
+            position.unrealized_pnl = pnl
+            position.unrealized_pnl_pct = pnl / cost if cost > 0 else 0
+            position.last_updated = now
     
     # === Risk Limit Checking ===
     
@@ -333,6 +371,7 @@ class Portfolio:
         """Check if new position would violate limits."""
         violations = []
         nav = self._calculate_nav()
+        book = self.book
         
         # Single position limit
         position_value = new_position.face_amount * (new_position.entry_price / 100)
@@ -340,44 +379,31 @@ class Portfolio:
             violations.append(f"Single position limit ({self.risk_limits.max_single_position_pct*100:.0f}%)")
         
         # Issuer limit
-        issuer_exposure = sum(
-            p.current_value for p in self.positions.values()
-            if p.company_id == new_position.company_id
-        )
+        issuer_exposure = book.exposure_of("issuer", [new_position.company_id])
         if (issuer_exposure + position_value) / nav > self.risk_limits.max_single_issuer_pct:
             violations.append(f"Single issuer limit ({self.risk_limits.max_single_issuer_pct*100:.0f}%)")
         
         # Sector limit
-        sector_exposure = sum(
-            p.current_value for p in self.positions.values()
-            if p.industry == new_position.industry
-        )
+        sector_exposure = book.exposure_of("sector", [new_position.industry])
         if (sector_exposure + position_value) / nav > self.risk_limits.max_sector_exposure_pct:
             violations.append(f"Sector limit ({self.risk_limits.max_sector_exposure_pct*100:.0f}%)")
         
         # Seniority limits
         if new_position.security_type in [SecurityType.SUBORDINATED, SecurityType.CONVERTIBLE]:
-            sub_exposure = sum(
-                p.current_value for p in self.positions.values()
-                if p.security_type in [SecurityType.SUBORDINATED, SecurityType.CONVERTIBLE]
+            sub_exposure = book.exposure_of(
+                "seniority", [SecurityType.SUBORDINATED.value, SecurityType.CONVERTIBLE.value]
             )
             if (sub_exposure + position_value) / nav > self.risk_limits.max_subordinated_pct:
                 violations.append(f"Subordinated limit ({self.risk_limits.max_subordinated_pct*100:.0f}%)")
         
         if new_position.security_type == SecurityType.EQUITY:
-            equity_exposure = sum(
-                p.current_value for p in self.positions.values()
-                if p.security_type == SecurityType.EQUITY
-            )
+            equity_exposure = book.exposure_of("seniority", [SecurityType.EQUITY.value])
             if (equity_exposure + position_value) / nav > self.risk_limits.max_equity_pct:
                 violations.append(f"Equity limit ({self.risk_limits.max_equity_pct*100:.0f}%)")
         
         # Status limits
         if new_position.case_status == "bankruptcy":
-            bk_exposure = sum(
-                p.current_value for p in self.positions.values()
-                if p.case_status == "bankruptcy"
-            )
+            bk_exposure = book.exposure_of("status", ["bankruptcy"])
             if (bk_exposure + position_value) / nav > self.risk_limits.max_bankruptcy_pct:
                 violations.append(f"Bankruptcy limit ({self.risk_limits.max_bankruptcy_pct*100:.0f}%)")
         
@@ -395,43 +421,33 @@ class Portfolio:
         if nav <= 0:
             return alerts
         
+        book = self.book
+        
         # Concentration by issuer
-        issuer_exposures: Dict[str, float] = {}
-        for pos in self.positions.values():
-            issuer_exposures[pos.company_id] = issuer_exposures.get(pos.company_id, 0) + pos.current_value
-        
-        for issuer, exposure in issuer_exposures.items():
-            pct = exposure / nav
-            if pct > self.risk_limits.max_single_issuer_pct:
-                alerts.append(RiskAlert(
-                    alert_id=str(uuid.uuid4()),
-                    alert_type="concentration",
-                    severity="critical" if pct > self.risk_limits.max_single_issuer_pct * 1.2 else "warning",
-                    message=f"Issuer {issuer} at {pct*100:.1f}% (limit: {self.risk_limits.max_single_issuer_pct*100:.0f}%)",
-                    metric_name="issuer_concentration",
-                    current_value=pct,
-                    limit_value=self.risk_limits.max_single_issuer_pct,
-                    timestamp=datetime.utcnow().isoformat(),
-                ))
+        for issuer, pct in book.breaches("issuer", nav, self.risk_limits.max_single_issuer_pct):
+            alerts.append(RiskAlert(
+                alert_id=str(uuid.uuid4()),
+                alert_type="concentration",
+                severity="critical" if pct > self.risk_limits.max_single_issuer_pct * 1.2 else "warning",
+                message=f"Issuer {issuer} at {pct*100:.1f}% (limit: {self.risk_limits.max_single_issuer_pct*100:.0f}%)",
+                metric_name="issuer_concentration",
+                current_value=pct,
+                limit_value=self.risk_limits.max_single_issuer_pct,
+                timestamp=datetime.utcnow().isoformat(),
+            ))
         
         # Sector concentration
-        sector_exposures: Dict[str, float] = {}
-        for pos in self.positions.values():
-            sector_exposures[pos.industry] = sector_exposures.get(pos.industry, 0) + pos.current_value
-        
-        for sector, exposure in sector_exposures.items():
-            pct = exposure / nav
-            if pct > self.risk_limits.max_sector_exposure_pct:
-                alerts.append(RiskAlert(
-                    alert_id=str(uuid.uuid4()),
-                    alert_type="sector_concentration",
-                    severity="warning",
-                    message=f"Sector {sector} at {pct*100:.1f}%",
-                    metric_name="sector_concentration",
-                    current_value=pct,
-                    limit_value=self.risk_limits.max_sector_exposure_pct,
-                    timestamp=datetime.utcnow().isoformat(),
-                ))
+        for sector, pct in book.breaches("sector", nav, self.risk_limits.max_sector_exposure_pct):
+            alerts.append(RiskAlert(
+                alert_id=str(uuid.uuid4()),
+                alert_type="sector_concentration",
+                severity="warning",
+                message=f"Sector {sector} at {pct*100:.1f}%",
+                metric_name="sector_concentration",
+                current_value=pct,
+                limit_value=self.risk_limits.max_sector_exposure_pct,
+                timestamp=datetime.utcnow().isoformat(),
+            ))
         
         # Drawdown check
         current_dd = (self.high_water_mark - nav) / self.high_water_mark
@@ -467,70 +483,39 @@ class Portfolio:
     
     def _calculate_nav(self) -> float:
         """Calculate Net Asset Value."""
-        position_value = sum(p.current_value for p in self.positions.values())
-        return self.cash + position_value
+        return self.cash + self.book.total_value()
     
     def _calculate_exposure(self, exposure_type: str) -> Dict[str, float]:
         """Calculate exposure breakdown."""
-        exposures: Dict[str, float] = {}
-        
-        for pos in self.positions.values():
-            if exposure_type == "sector":
-                key = pos.industry
-            elif exposure_type == "seniority":
-                key = pos.security_type.value
-            elif exposure_type == "status":
-                key = pos.case_status
-            else:
-                key = "other"
-            
-            exposures[key] = exposures.get(key, 0) + pos.current_value
-        
-        return exposures
+        return self.book.group_exposure(exposure_type)
+    
+    def _recent_returns(self, lookback: int):
+        """NAV returns over the most recent `lookback` snapshot intervals."""
+        navs = [s.nav for s in self.snapshots[-(lookback + 1):]]
+        return nav_returns(navs)
     
-    def _calculate_var(self, confidence: float = 0.95, lookback: int = 20) -> float:
+    def _calculate_var(self, confidence: float = 0.95, lookback: int = 20, method: str = "historical") -> float:
         """
-        Calculate Value at Risk using historical simulation.
-        Uses recent P&L changes.
+        Calculate Value at Risk from recent snapshot returns.
+        method: "historical" (empirical quantile) or "parametric" (Gaussian).
         """
         if len(self.snapshots) < lookback:
             return 0
         
-        # Get recent daily returns
-        returns = []
-        for i in range(1, min(lookback + 1, len(self.snapshots))):
-            if self.snapshots[i-1].nav > 0:
-                ret = (self.snapshots[i].nav - self.snapshots[i-1].nav) / self.snapshots[i-1].nav
-                returns.append(ret)
-        
-        if not returns:
-            return 0
-        
-        # Sort and find VaR percentile
-        sorted_returns = sorted(returns)
-        var_index = int((1 - confidence) * len(sorted_returns))
-        
-        return abs(sorted_returns[var_index]) if var_index < len(sorted_returns) else 0
+        returns = self._recent_returns(lookback)
+        if method == "parametric":
+            return parametric_var(returns, confidence)
+        return historical_var(returns, confidence)
     
-    def _calculate_expected_shortfall(self, confidence: float = 0.95, lookback: int = 20) -> float:
+    def _calculate_expected_shortfall(self, confidence: float = 0.95, lookback: int = 20, method: str = "historical") -> float:
         """Calculate Expected Shortfall (CVaR)."""
         if len(self.snapshots) < lookback:
             return 0
         
-        returns = []
-        for i in range(1, min(lookback + 1, len(self.snapshots))):
-            if self.snapshots[i-1].nav > 0:
-                ret = (self.snapshots[i].nav - self.snapshots[i-1].nav) / self.snapshots[i-1].nav
-                returns.append(ret)
-        
-        if not returns:
-            return 0
-        
-        sorted_returns = sorted(returns)
-        var_index = int((1 - confidence) * len(sorted_returns))
-        tail = sorted_returns[:var_index + 1]
-        
-        return abs(sum(tail) / len(tail)) if tail else 0
+        returns = self._recent_returns(lookback)
+        if method == "parametric":
+            return parametric_es(returns, confidence)
+        return historical_es(returns, confidence)
     
     # === Snapshot & Reporting ===
     
@@ -544,8 +529,10 @@ class Portfolio:
         current_dd = (self.high_water_mark - nav) / self.high_water_mark if self.high_water_mark > 0 else 0
         self.max_drawdown = max(self.max_drawdown, current_dd)
         
+        book = self.book
+        
         # Calculate P&L
-        total_unrealized = sum(p.unrealized_pnl for p in self.positions.values())
+        total_unrealized = float(book.unrealized_pnl.sum())
         total_realized = sum(p.realized_pnl for p in self.closed_positions)
         total_pnl = total_unrealized + total_realized
         
@@ -573,8 +560,8 @@ class Portfolio:
             snapshot_id=str(uuid.uuid4()),
             timestamp=datetime.utcnow().isoformat(),
             nav=nav,
-            gross_exposure=sum(p.current_value for p in self.positions.values()),
-            net_exposure=sum(p.current_value for p in self.positions.values()),  # Simplified
+            gross_exposure=book.total_value(),
+            net_exposure=book.total_value(),  # Simplified
             cash=self.cash,
             total_pnl=total_pnl,
             realized_pnl=total_realized,
@@ -588,10 +575,10 @@ class Portfolio:
             exposure_by_status=self._calculate_exposure("status"),
             var_95=self._calculate_var(0.95),
             expected_shortfall=self._calculate_expected_shortfall(0.95),
-            portfolio_duration=sum(p.duration * p.current_value for p in self.positions.values()) / nav if nav > 0 else 0,
-            avg_recovery_estimate=sum(p.recovery_estimate * p.current_value for p in self.positions.values()) / nav if nav > 0 else 0,
+            portfolio_duration=book.value_weighted(book.duration, nav),
+            avg_recovery_estimate=book.value_weighted(book.recovery, nav),
             position_count=len(self.positions),
-            issuer_count=len(set(p.company_id for p in self.positions.values())),
+            issuer_count=len(book.labels["issuer"]),
         )
         
         self.snapshots.append(snapshot)
@@ -648,6 +635,7 @@ class Portfolio:
     def get_risk_report(self) -> Dict[str, Any]:
         """Get risk metrics report."""
         nav = self._calculate_nav()
+        book = self.book
         
         return {
             "nav": nav,
@@ -658,13 +646,12 @@ class Portfolio:
             "max_drawdown": self.max_drawdown * 100,
             "var_95": self._calculate_var(0.95) * 100,
             "expected_shortfall": self._calculate_expected_shortfall(0.95) * 100,
+            "var_95_parametric": self._calculate_var(0.95, method="parametric") * 100,
+            "expected_shortfall_parametric": self._calculate_expected_shortfall(0.95, method="parametric") * 100,
             "position_count": len(self.positions),
-            "issuer_count": len(set(p.company_id for p in self.positions.values())),
+            "issuer_count": len(book.labels["issuer"]),
             "avg_position_size": nav / len(self.positions) if self.positions else 0,
-            "largest_position_pct": max(
-                (p.current_value / nav * 100 for p in self.positions.values()),
-                default=0
-            ),
+            "largest_position_pct": float(book.value.max()) / nav * 100 if len(book) and nav else 0,
             "active_alerts": len([a for a in self.alerts if not a.acknowledged]),
         }
     
@@ -678,31 +665,14 @@ class Portfolio:
         - name: Scenario name
         - price_shocks: Dict of security_type -> price change (e.g., -0.20 for -20%)
         - recovery_shocks: Dict of status -> recovery change
+        
+        All scenarios are evaluated in one batched pass over the position book.
         """
         results = []
         current_nav = self._calculate_nav()
+        pnls = self.book.stress(scenarios).tolist()
         
-        for scenario in scenarios:
-            scenario_pnl = 0
-            
-            for pos in self.positions.values():
-                # Apply price shock
-                price_shock = scenario.get("price_shocks", {}).get(
-                    pos.security_type.value, 
-                    scenario.get("price_shocks", {}).get("default", 0)
-                )
-                
-                # Apply recovery shock based on status
-                recovery_shock = scenario.get("recovery_shocks", {}).get(
-                    pos.case_status,
-                    0
-                )
-                
-                # Combined shock
-                total_shock = price_shock + recovery_shock
-                position_pnl = pos.current_value * total_shock
-                scenario_pnl += position_pnl
-            
+        for scenario, scenario_pnl in zip(scenarios, pnls):
             results.append({
                 "scenario": scenario.get("name", "Unknown"),
                 "pnl": scenario_pnl,
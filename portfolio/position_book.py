@@ -0,0 +1,212 @@
+"""
+Array-Backed Position Book
+==========================
+Struct-of-arrays view over portfolio positions for vectorized risk.
+
+Features:
+- Mark-to-market of every position in one pass
+- Exposure group-bys (sector, seniority, status, issuer) via bincount
+- Historical and parametric VaR / Expected Shortfall
+- Batched stress testing: all scenarios applied as one matrix product
+"""
+
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+GROUP_FIELDS = ("sector", "seniority", "status", "issuer")
+
+
+def _encode(labels: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Factorize labels into (unique labels, int codes) preserving first-seen order."""
+    index: Dict[str, int] = {}
+    codes = np.empty(len(labels), dtype=np.int64)
+    for i, label in enumerate(labels):
+        code = index.get(label)
+        if code is None:
+            code = index[label] = len(index)
+        codes[i] = code
+    return list(index), codes
+
+
+class PositionBook:
+    """
+    Columnar snapshot of open positions.
+
+    Row i of every array corresponds to `positions[i]`. The book is built
+    once per change to the position set; marks are applied in place.
+    """
+
+    def __init__(self, positions: Iterable[Any]):
+        self.positions = list(positions)
+        n = len(self.positions)
+
+        def col(attr):
+            return np.fromiter((getattr(p, attr) for p in self.positions), dtype=np.float64, count=n)
+
+        self.face = col("face_amount")
+        self.entry_price = col("entry_price")
+        self.price = col("current_price")
+        self.value = col("current_value")
+        self.realized_pnl = col("realized_pnl")
+        self.duration = col("duration")
+        self.recovery = col("recovery_estimate")
+
+        self.labels: Dict[str, List[str]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        for name, values in (
+            ("sector", [p.industry for p in self.positions]),
+            ("seniority", [p.security_type.value for p in self.positions]),
+            ("status", [p.case_status for p in self.positions]),
+            ("issuer", [p.company_id for p in self.positions]),
+        ):
+            self.labels[name], self.codes[name] = _encode(values)
+
+        self._security_index: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.positions):
+            self._security_index.setdefault(p.security_id, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    # === Mark-to-Market ===
+
+    @property
+    def cost_basis(self) -> np.ndarray:
+        return self.face * (self.entry_price / 100)
+
+    @property
+    def unrealized_pnl(self) -> np.ndarray:
+        return self.value - self.cost_basis + self.realized_pnl
+
+    def mark(self, prices: Dict[str, float]) -> np.ndarray:
+        """
+        Apply new prices keyed by security_id.
+
+        Returns the row indices that were re-marked.
+        """
+        rows: List[int] = []
+        new_prices: List[float] = []
+        for security_id, price in prices.items():
+            idx = self._security_index.get(security_id)
+            if idx:
+                rows.extend(idx)
+                new_prices.extend([price] * len(idx))
+
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        if rows_arr.size:
+            self.price[rows_arr] = new_prices
+            self.value[rows_arr] = self.face[rows_arr] * (self.price[rows_arr] / 100)
+        return rows_arr
+
+    # === Exposure ===
+
+    def total_value(self) -> float:
+        return float(self.value.sum())
+
+    def group_totals(self, by: str, weights: np.ndarray = None) -> np.ndarray:
+        """Sum `weights` (default: market value) per label of `by`."""
+        w = self.value if weights is None else weights
+        return np.bincount(self.codes[by], weights=w, minlength=len(self.labels[by]))
+
+    def group_exposure(self, by: str) -> Dict[str, float]:
+        """Exposure by sector / seniority / status / issuer."""
+        if by not in GROUP_FIELDS:
+            return {"other": self.total_value()} if len(self) else {}
+        return dict(zip(self.labels[by], self.group_totals(by).tolist()))
+
+    def exposure_of(self, by: str, labels: Iterable[str]) -> float:
+        """Current exposure for one or more labels of `by` (0 if absent)."""
+        wanted = set(labels)
+        totals = self.group_totals(by)
+        return float(sum(t for label, t in zip(self.labels[by], totals) if label in wanted))
+
+    def breaches(self, by: str, nav: float, limit_pct: float) -> List[Tuple[str, float]]:
+        """Labels of `by` whose exposure / nav exceeds `limit_pct`."""
+        if nav <= 0 or not len(self):
+            return []
+        pct = self.group_totals(by) / nav
+        hits = np.flatnonzero(pct > limit_pct)
+        return [(self.labels[by][i], float(pct[i])) for i in hits]
+
+    def value_weighted(self, column: np.ndarray, denominator: float) -> float:
+        if denominator <= 0:
+            return 0
+        return float(column @ self.value) / denominator
+
+    # === Stress Testing ===
+
+    def stress(self, scenarios: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        P&L for every scenario at once.
+
+        Shocks are additive per position (price shock by security type plus
+        recovery shock by case status) and linear in value, so each scenario's
+        P&L is shock_matrix @ exposure_by_group; positions never need to be
+        expanded per scenario.
+        """
+        n_scen = len(scenarios)
+        if not n_scen or not len(self):
+            return np.zeros(n_scen)
+
+        types = self.labels["seniority"]
+        statuses = self.labels["status"]
+
+        price_shocks = np.zeros((n_scen, len(types)))
+        recovery_shocks = np.zeros((n_scen, len(statuses)))
+        for s, scenario in enumerate(scenarios):
+            ps = scenario.get("price_shocks", {}) or {}
+            default = ps.get("default", 0)
+            price_shocks[s] = [ps.get(t, default) for t in types]
+            rs = scenario.get("recovery_shocks", {}) or {}
+            recovery_shocks[s] = [rs.get(k, 0) for k in statuses]
+
+        return price_shocks @ self.group_totals("seniority") + recovery_shocks @ self.group_totals("status")
+
+
+# === VaR / Expected Shortfall ===
+
+def nav_returns(navs: Sequence[float]) -> np.ndarray:
+    """Simple returns between consecutive NAVs, skipping non-positive bases."""
+    arr = np.asarray(navs, dtype=np.float64)
+    if arr.size < 2:
+        return np.empty(0)
+    prev, curr = arr[:-1], arr[1:]
+    ok = prev > 0
+    return (curr[ok] - prev[ok]) / prev[ok]
+
+
+def historical_var(returns: np.ndarray, confidence: float = 0.95) -> float:
+    if returns.size == 0:
+        return 0
+    k = int((1 - confidence) * returns.size)
+    return abs(float(np.partition(returns, k)[k])) if k < returns.size else 0
+
+
+def historical_es(returns: np.ndarray, confidence: float = 0.95) -> float:
+    if returns.size == 0:
+        return 0
+    k = min(int((1 - confidence) * returns.size), returns.size - 1)
+    tail = np.partition(returns, k)[:k + 1]
+    return abs(float(tail.mean()))
+
+
+def parametric_var(returns: np.ndarray, confidence: float = 0.95) -> float:
+    """Gaussian VaR: -(mu - z * sigma)."""
+    if returns.size < 2:
+        return 0
+    z = NormalDist().inv_cdf(confidence)
+    mu, sigma = float(returns.mean()), float(returns.std(ddof=1))
+    return max(z * sigma - mu, 0.0)
+
+
+def parametric_es(returns: np.ndarray, confidence: float = 0.95) -> float:
+    """Gaussian ES: sigma * pdf(z) / (1 - c) - mu."""
+    if returns.size < 2:
+        return 0
+    dist = NormalDist()
+    z = dist.inv_cdf(confidence)
+    mu, sigma = float(returns.mean()), float(returns.std(ddof=1))
+    return max(sigma * dist.pdf(z) / (1 - confidence) - mu, 0.0)
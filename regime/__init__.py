@@ -1,6 +1,6 @@
 from .definitions import REGIMES
-from .features import extract_features
+from .features import extract_features, extract_features_asof, merge_inputs
 from .scoring import score_regimes
 from .confidence import regime_confidence
 
-__all__ = ['REGIMES', 'extract_features', 'score_regimes', 'regime_confidence']
+__all__ = ['REGIMES', 'extract_features', 'extract_features_asof', 'merge_inputs', 'score_regimes', 'regime_confidence']
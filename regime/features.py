@@ -22,3 +22,54 @@ def extract_features(spy_df, vix_df, rates_df, commodities_df=None):
         features["commodities"] = "up" if comm_return > 0 else "down"
 
     return features
+
+
+REQUIRED_INPUTS = ("SPY", "^VIX", "^TNX")
+
+
+def merge_inputs(frames, store=None) -> bool:
+    """
+    Merge freshly downloaded input bars ({symbol: frame}; None or empty
+    frames are skipped, keeping what the store already has) into the
+    feature store. True if SPY, ^VIX and ^TNX each have 20 bars there.
+    """
+    if store is None:
+        from features import feature_store as store
+
+    for symbol, df in frames.items():
+        if df is None or len(df) == 0:
+            continue
+        try:
+            store.update(symbol, df)
+        except (KeyError, ValueError, TypeError):
+            continue
+    return all(store.value(s, "close", lag=19) == store.value(s, "close", lag=19) for s in REQUIRED_INPUTS)
+
+
+def extract_features_asof(store=None, asof=None, commodities_symbol="GLD"):
+    """
+    extract_features from the shared feature store as of `asof` (latest if
+    None). `store` may be a FeatureStore or an AsOfView; inputs must have
+    been merged into it (SPY, ^VIX, ^TNX and optionally commodities).
+    """
+    if store is None:
+        from features import feature_store as store
+    from features.store import MARKET
+
+    spy_now = store.value("SPY", "close", asof=asof)
+    spy_20d = store.value("SPY", "close", asof=asof, lag=19)
+    vix_level = store.value(MARKET, "vix", asof=asof)
+    rates_change = store.value("^TNX", "close", asof=asof) - store.value("^TNX", "close", asof=asof, lag=19)
+
+    features = {
+        "spy_trend": "up" if spy_now / spy_20d - 1 > 0 else "down",
+        "volatility": "high" if vix_level > 25 else "low",
+        "rates_trend": "up" if rates_change > 0.1 else "down_or_flat"
+    }
+
+    comm_20d = store.value(commodities_symbol, "close", asof=asof, lag=19)
+    if comm_20d == comm_20d:  # not NaN: at least 20 bars
+        comm_now = store.value(commodities_symbol, "close", asof=asof)
+        features["commodities"] = "up" if comm_now / comm_20d - 1 > 0 else "down"
+
+    return features
@@ -4,7 +4,6 @@ from models import Finding, AgentStatus, MarketData, db
 from datetime import datetime, timedelta
 import logging
 from functools import wraps
-import yfinance as yf
 from services.startup_failure_tracker import get_startup_failures, clear_startup_failures
 
 # Rate Limiting and Caching Imports (Option B & C Implementation)
@@ -137,6 +136,75 @@ def get_agents():
         return jsonify({'error': str(e)}), 500
 
 
+@api_bp.route('/agents/lifecycle', methods=['GET'])
+@api_login_required
+def agent_lifecycle():
+    """Warm-instance pool stats: startup/teardown time and reuse per agent"""
+    from agents.lifecycle import agent_pool
+    return jsonify(agent_pool.stats())
+
+
+@api_bp.route('/agents/market-hours', methods=['GET'])
+@api_login_required
+def agent_market_hours():
+    """Session gating per agent: calendar, runs, skipped off-hours runs and requests saved"""
+    from services.market_hours import market_hours
+    return jsonify(market_hours.stats())
+
+
+@api_bp.route('/agents/triggers', methods=['GET'])
+@api_login_required
+def agent_triggers():
+    """Data-change trigger gate, DAG node state and the latest input fingerprints"""
+    from services.data_events import data_events
+    from services.triggers import agent_dag, trigger_gate
+    return jsonify({
+        "gate": trigger_gate.stats(),
+        "dag": agent_dag.stats(),
+        "inputs": data_events.snapshot(),
+    })
+
+
+@api_bp.route('/agents/memo', methods=['GET'])
+@api_login_required
+def agent_memo():
+    """Run memoization: hit rate and CPU seconds saved per agent"""
+    from agents.memo import run_memo
+    return jsonify(run_memo.stats())
+
+
+@api_bp.route('/rate-budget', methods=['GET'])
+@api_login_required
+def rate_budget_status():
+    """Outbound request budget per upstream host: utilization, throttling, waiters by priority"""
+    from services.rate_budget import rate_budget
+    return jsonify(rate_budget.stats())
+
+
+@api_bp.route('/http-cache', methods=['GET'])
+@api_login_required
+def http_cache_status():
+    """Conditional-request cache per host: hits, 304 revalidations, misses and bytes saved"""
+    from data_sources import http_cache
+    return jsonify(http_cache.stats())
+
+
+@api_bp.route('/wallet-tracker', methods=['GET'])
+@api_login_required
+def wallet_tracker_status():
+    """Per-address cursors, stored history sizes and polling stats of the wallet tracker"""
+    from data_sources.wallet_tracker import get_wallet_tracker
+    return jsonify(get_wallet_tracker().snapshot())
+
+
+@api_bp.route('/insider-index', methods=['GET'])
+@api_login_required
+def insider_index_status():
+    """Local Form 4 index: filing queue, transaction count and date coverage"""
+    from data_sources.edgar_form4 import get_insider_store
+    return jsonify(get_insider_store().stats())
+
+
 @api_bp.route('/agents/<agent_name>/start', methods=['POST'])
 @api_login_required
 def start_agent(agent_name):
@@ -333,6 +401,7 @@ def spy_series():
     Query params:
       - period: default '6mo' (e.g., '1y', '2y', 'max')
     """
+    import yfinance as yf  # deferred: pulls in pandas/numpy
     period = request.args.get("period", "6mo")
 
     try:
@@ -638,39 +707,31 @@ def regime_state():
     Returns current market regime with confidence and transition state.
     Uses softmax probability engine with hysteresis for stable regime detection.
     """
-    from regime import extract_features, score_regimes, regime_confidence
+    import yfinance as yf  # deferred: pulls in pandas/numpy
+    from regime import extract_features_asof, merge_inputs, score_regimes, regime_confidence
     from regime.confidence import get_cached_regime, cache_regime
     from data_sources.price_loader import load_spy
-    import yfinance as yf
 
     try:
         spy = load_spy(start="2020-01-01", use_cache=True)
 
-        try:
-            vix = yf.download("^VIX", period="3mo", progress=False)
-        except Exception:
-            vix = spy.copy()
-            vix["Close"] = 20.0
-
-        try:
-            tnx = yf.download("^TNX", period="3mo", progress=False)
-        except Exception:
-            tnx = spy.copy()
-            tnx["Close"] = 4.0
-
-        try:
-            gld = yf.download("GLD", period="3mo", progress=False)
-        except Exception:
-            gld = None
+        # Inputs go through the feature store: a failed download falls back
+        # to the history already stored for that symbol
+        frames = {"SPY": spy}
+        for symbol in ("^VIX", "^TNX", "GLD"):
+            try:
+                frames[symbol] = yf.download(symbol, period="3mo", progress=False)
+            except Exception:
+                frames[symbol] = None
 
-        if len(spy) < 20 or len(vix) < 20 or len(tnx) < 20:
+        if not merge_inputs(frames):
             return jsonify({
                 "error": "Insufficient market data",
                 "active_regime": "unknown",
                 "confidence": 0.0
             })
 
-        features = extract_features(spy, vix, tnx, gld)
+        features = extract_features_asof()
         scores = score_regimes(features)
 
         state = regime_confidence(features,
@@ -750,6 +811,15 @@ def ensemble_signal():
     from portfolio.agent_decay import AgentDecayModel
     import json
 
+    # Fresh result from the scheduler's ensemble DAG node, if there is one
+    try:
+        from scheduler import _ensemble_state
+        if _ensemble_state and datetime.utcnow() - datetime.fromisoformat(
+                _ensemble_state["timestamp"]) < timedelta(minutes=15):
+            return jsonify(_ensemble_state)
+    except Exception:
+        pass
+
     try:
         from regime.confidence import get_cached_regime
 
@@ -800,6 +870,7 @@ def regime_council():
     Run multi-LLM regime council (GPT + Claude + Gemini).
     Returns ensemble regime probabilities with disagreement detection.
     """
+    import yfinance as yf  # deferred: pulls in pandas/numpy
     from meta.regime_council import RegimeCouncil, build_signals_from_findings
     from datetime import datetime
 
@@ -812,7 +883,6 @@ def regime_council():
         } for f in Finding.query.order_by(Finding.timestamp.desc()).limit(
             50).all()]
 
-        import yfinance as yf
         market_data = {}
         try:
             vix = yf.download("^VIX", period="5d", progress=False)
@@ -1075,9 +1145,9 @@ def spy_uncertainty():
     """
     Get SPY price data with uncertainty bands for visualization.
     """
+    import yfinance as yf  # deferred: pulls in pandas/numpy
     try:
         from telemetry.uncertainty_events import load_recent_uncertainty
-        import yfinance as yf
         from datetime import datetime, timedelta
 
         end = datetime.now()
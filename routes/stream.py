@@ -0,0 +1,121 @@
+"""
+Findings stream (Server-Sent Events).
+
+Pushes newly committed findings to dashboard clients as they are
+published on the process-local findings bus, replacing interval polling.
+
+Query parameters (comma-separated, any-of):
+    agent, symbol, severity
+Resume:
+    Last-Event-ID header (sent automatically by EventSource on reconnect)
+    or ?last_id=<finding id>
+"""
+
+import json
+import logging
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import func
+
+from models import Finding
+from websocket.bus import FindingFilter, finding_event, findings_bus
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint("stream", __name__)
+
+HEARTBEAT_SECONDS = 15
+MAX_STREAM_SECONDS = 600  # clients reconnect with Last-Event-ID
+MAX_BACKFILL = 200
+INTERNAL_AGENTS = ("HeartbeatAgent", "CodeQualityGuardianAgent", "SystemUpgradeAdvisorAgent")
+
+
+def _sse(event: dict, cursor: int) -> str:
+    # The SSE id is the resume cursor (highest id sent), not necessarily this event's id
+    return f"id: {cursor}\nevent: finding\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _last_id():
+    raw = request.headers.get("Last-Event-ID") or request.args.get("last_id")
+    try:
+        return int(raw) if raw not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def _backfill(filters: FindingFilter, last_id: int):
+    """Findings newer than last_id from the database, for resumes the ring can't cover."""
+    q = Finding.query.filter(Finding.id > last_id, ~Finding.agent_name.in_(INTERNAL_AGENTS))
+    if filters.agents:
+        q = q.filter(func.lower(Finding.agent_name).in_(filters.agents))
+    if filters.symbols:
+        q = q.filter(func.upper(Finding.symbol).in_(filters.symbols))
+    if filters.severities:
+        q = q.filter(func.lower(Finding.severity).in_(filters.severities))
+    rows = q.order_by(Finding.id.asc()).limit(MAX_BACKFILL).all()
+    return [e for e in (finding_event(f) for f in rows) if filters.matches(e)]
+
+
+@bp.route("/api/stream/findings")
+def stream_findings():
+    """SSE stream of new findings with server-side filtering and resume."""
+    filters = FindingFilter(
+        agents=request.args.get("agent"),
+        symbols=request.args.get("symbol"),
+        severities=request.args.get("severity"),
+    )
+    last_id = _last_id()
+    findings_bus.ensure_db_relay(current_app._get_current_object())
+    sub, backlog, complete = findings_bus.subscribe(filters, last_id)
+
+    if last_id is not None and not complete:
+        try:
+            backlog = _backfill(filters, last_id)
+        except Exception as e:
+            logger.warning(f"Stream backfill failed: {e}")
+
+    def generate():
+        cursor = last_id or 0
+        sent = set()
+        deadline = time.monotonic() + MAX_STREAM_SECONDS
+
+        def emit(event):
+            nonlocal cursor
+            # Relay and in-process publishes can overlap or arrive out of id order
+            if event["id"] in sent or event.get("agent_name") in INTERNAL_AGENTS:
+                return None
+            if last_id is not None and event["id"] <= last_id:
+                return None
+            sent.add(event["id"])
+            cursor = max(cursor, event["id"])
+            return _sse(event, cursor)
+
+        try:
+            yield f"retry: 3000\n: connected {findings_bus.stats()['last_id']}\n\n"
+            for event in backlog:
+                chunk = emit(event)
+                if chunk:
+                    yield chunk
+            while time.monotonic() < deadline:
+                event = sub.get(timeout=HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                chunk = emit(event)
+                if chunk:
+                    yield chunk
+        finally:
+            findings_bus.unsubscribe(sub)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.route("/api/stream/stats")
+def stream_stats():
+    """Subscriber and publish counters for the findings bus."""
+    return jsonify({"ok": True, **findings_bus.stats()})
@@ -2,16 +2,20 @@
 Technical Analysis API endpoints for dashboard overlays.
 """
 from flask import Blueprint, jsonify, request
-from data_sources.price_loader import load_symbol_frame
-from ta.ta_engine import rsi, ta_vote, get_ta_signals
-import numpy as np
+import math
 
 ta_bp = Blueprint("ta", __name__)
 
 
+def load_symbol_frame(symbol, *args, **kwargs):
+    # Deferred: price_loader pulls in yfinance and pandas
+    from data_sources.price_loader import load_symbol_frame as _load
+    return _load(symbol, *args, **kwargs)
+
+
 def _clean_nan(val):
     """Convert NaN to None for JSON serialization."""
-    if isinstance(val, float) and np.isnan(val):
+    if isinstance(val, float) and math.isnan(val):
         return None
     return val
 
@@ -27,6 +31,7 @@ def ta_data(symbol):
     Get TA data for a symbol (prices, RSI).
     Used by dashboard for chart overlays.
     """
+    from ta.ta_engine import rsi
     df = load_symbol_frame(symbol)
 
     if df.empty:
@@ -50,6 +55,7 @@ def ta_vote_endpoint(symbol):
     """
     Get TA vote (ACT/WATCH/IGNORE) for a symbol.
     """
+    from ta.ta_engine import ta_vote
     df = load_symbol_frame(symbol)
     
     if df.empty:
@@ -59,7 +65,7 @@ def ta_vote_endpoint(symbol):
             "reason": "no_data"
         })
     
-    result = ta_vote(df)
+    result = ta_vote(df, symbol)
     result["ok"] = True
     result["symbol"] = symbol
     
@@ -71,6 +77,7 @@ def ta_signals_endpoint(symbol):
     """
     Get comprehensive TA signals for a symbol.
     """
+    from ta.ta_engine import get_ta_signals
     df = load_symbol_frame(symbol)
     
     result = get_ta_signals(df, symbol)
@@ -88,6 +95,7 @@ def ta_batch():
     """
     Get TA data for multiple symbols.
     """
+    from ta.ta_engine import ta_vote
     data = request.get_json() or {}
     symbols = data.get("symbols", [])
     
@@ -101,7 +109,7 @@ def ta_batch():
             results[symbol] = {"ok": False}
             continue
         
-        vote = ta_vote(df)
+        vote = ta_vote(df, symbol)
         results[symbol] = {
             "ok": True,
             "vote": vote.get("vote"),
@@ -2,22 +2,24 @@ import json
 import threading
 import time
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 from agents import get_agent_class
+from agents.lifecycle import agent_pool
+from agents.memo import run_memo
 from models import AgentStatus, Finding
 from services.agent_run_wrapper import run_with_telemetry
-from services.kill_switch import is_killed
-from meta_supervisor.kill_list import is_killed as meta_is_killed
-from meta_supervisor.policy.kill_switch import agent_disabled as policy_agent_disabled
+from services.market_hours import market_hours
+from services.triggers import agent_dag, trigger_gate
+from services.policy_snapshot import atomic_write_json, get_policy, policy_snapshot
 from notifiers.email_meta import send_meta_email
 from meta.allocator import UCBAllocator
 from meta.quarantine_manager import run as quarantine_run
 from trading.guardrails import TradeGuardrails, GuardrailConfig, KillSwitch
-from backtests.registry import is_agent_enabled as meta_agent_enabled
 from meta.regime_rotation import apply_regime_rotation, load_regime_stats
 from meta.llm_council import run_llm_council
 from meta.uncertainty import compute_controls
@@ -29,6 +31,7 @@ logger = logging.getLogger(__name__)
 _cached_regime_state = None
 _regime_weights = {}
 _uncertainty_state = None
+_ensemble_state = None
 _force_started_agents = set()
 
 class AgentScheduler:
@@ -126,8 +129,7 @@ class AgentScheduler:
             "BondStressAgent": 60
         }
         
-        with open("agent_schedule.json", "w") as f:
-            json.dump(default_agents, f, indent=2)
+        atomic_write_json("agent_schedule.json", default_agents)
         
         # Import db here to avoid circular import
         from models import db
@@ -170,7 +172,7 @@ class AgentScheduler:
                     logger.info(f"Force-starting agent {agent_name} (bypassing restrictions)")
                 
                 job = self.scheduler.add_job(
-                    func=lambda name=agent_name: run_with_telemetry(name, self._run_agent, name),
+                    func=lambda name=agent_name: self._run_scheduled(name),
                     trigger=IntervalTrigger(minutes=status.schedule_interval),
                     id=agent_name,
                     replace_existing=True
@@ -202,6 +204,7 @@ class AgentScheduler:
                     self.scheduler.remove_job(agent_name)
                     del self.active_jobs[agent_name]
                 
+                agent_pool.teardown(agent_name)
                 status.is_active = False
                 db.session.commit()
                 
@@ -212,6 +215,92 @@ class AgentScheduler:
             logger.error(f"Error stopping agent {agent_name}: {e}")
             return False
     
+    def _run_scheduled(self, agent_name: str):
+        """
+        Interval-trigger entry point: skip off-session runs, runs with no
+        new triggering data and runs whose declared inputs haven't changed
+        (agents.memo) before any telemetry or work, then queue the DAG
+        nodes downstream of the agent. A skipped run queues nothing; the
+        trigger gate marks the inputs consumed once _run_agent commits.
+        """
+        if agent_name not in _force_started_agents:
+            if not market_hours.should_run(agent_name) or not trigger_gate.should_run(agent_name):
+                return None
+            if self._memo_hit(agent_name):
+                return None
+        result = run_with_telemetry(agent_name, self._run_agent, agent_name)
+        for node in agent_dag.completed(agent_name):
+            self._queue_dag_node(node)
+        return result
+    
+    def _memo_hit(self, agent_name: str) -> bool:
+        """True if the warm instance's memo inputs match its last successful run."""
+        agent = agent_pool.peek(agent_name)
+        if agent is None:
+            return False
+        hit, _ = run_memo.lookup(agent)
+        if hit:
+            logger.info(f"{agent_name} inputs unchanged, skipping run")
+        return hit
+    
+    def _dag_nodes(self):
+        """DAG node name -> downstream consumer (manifest `dag:` section)"""
+        return {
+            "ensemble": self._run_ensemble,
+            "uncertainty_council": self._update_uncertainty_state,
+            "regime_rotation": self._update_regime_weights,
+            "agent_allocation": self._rebalance_agent_allocation,
+        }
+    
+    def _queue_dag_node(self, node: str):
+        if node not in self._dag_nodes():
+            logger.warning(f"Unknown DAG node {node} in manifest")
+            agent_dag.abandon(node)
+            return
+        try:
+            self.scheduler.add_job(
+                func=self._run_dag_node,
+                args=[node],
+                trigger=DateTrigger(run_date=datetime.now() + timedelta(seconds=agent_dag.debounce(node))),
+                id=f"dag:{node}",
+                replace_existing=True
+            )
+        except Exception as e:
+            logger.error(f"Error queueing DAG node {node}: {e}")
+            agent_dag.abandon(node)
+    
+    def _run_dag_node(self, node: str):
+        upstream = agent_dag.started(node)
+        logger.info(f"DAG node {node} running after {len(upstream)} upstream agents")
+        self._dag_nodes()[node]()
+    
+    def _run_ensemble(self):
+        """Ensemble vote over recent findings (DAG node; served by /api/ensemble)"""
+        global _ensemble_state
+        from meta.ensemble_agent import run_ensemble
+        from portfolio.agent_decay import AgentDecayModel
+        from regime.confidence import get_cached_regime
+        
+        with self.app.app_context():
+            try:
+                decay_model = AgentDecayModel()
+                decay_factors = {
+                    agent: (1.0 if cfg.get("reason") == "legacy"
+                            else decay_model.decay_factor(cfg.get("score", 0.0), cfg.get("days_since_eval", 30)))
+                    for agent, cfg in get_policy().schedule.items()
+                }
+                findings = [{
+                    "agent": f.agent_name,
+                    "title": f.title,
+                    "description": f.description,
+                    "severity": f.severity,
+                } for f in Finding.query.order_by(Finding.timestamp.desc()).limit(200).all()]
+                state = _cached_regime_state or {}
+                regime = state.get("active_regime") or get_cached_regime() or "risk_on"
+                _ensemble_state = run_ensemble(findings, regime, float(state.get("confidence", 0.5)), decay_factors)
+            except Exception as e:
+                logger.error(f"Ensemble update error: {e}")
+    
     def _run_agent(self, agent_name: str):
         """Execute an agent and store results"""
         from models import db
@@ -221,27 +310,15 @@ class AgentScheduler:
         SYSTEM_AGENTS = ['CodeGuardianAgent', 'HealthCheckAgent', 'MetaSupervisorAgent']
         
         if not is_force_started and agent_name not in SYSTEM_AGENTS:
-            if is_killed(agent_name):
-                logger.warning(f"Agent {agent_name} is disabled by kill-switch")
-                return
-            
-            if meta_is_killed(agent_name):
-                logger.warning(f"Agent {agent_name} is on meta-supervisor kill-list")
-                return
-            
-            if policy_agent_disabled(agent_name):
-                logger.warning(f"Agent {agent_name} is disabled by policy kill-switch")
+            policy = get_policy()
+            blocked = policy.blocked(agent_name)
+            if blocked == "regime rotation":
+                logger.info(f"Agent {agent_name} muted by regime rotation "
+                            f"(weight={policy.regime_weight(agent_name):.3f})")
                 return
-            
-            if not meta_agent_enabled(agent_name):
-                logger.warning(f"Agent {agent_name} is disabled by Meta-Agent ranking")
+            if blocked:
+                logger.warning(f"Agent {agent_name} is disabled by {blocked}")
                 return
-            
-            if _regime_weights:
-                regime_weight = _regime_weights.get(agent_name, 1.0)
-                if regime_weight < 0.01:
-                    logger.info(f"Agent {agent_name} muted by regime rotation (weight={regime_weight:.3f})")
-                    return
         
         if is_force_started:
             logger.info(f"Agent {agent_name} running (force-started, bypassing restrictions)")
@@ -253,14 +330,13 @@ class AgentScheduler:
             logger.warning(f"Uncertainty spike active: signals are provisional ({(_uncertainty_state or {}).get('label')})")
         
         with self.app.app_context():
+            indexed = []  # similarity-index entries to drop if the findings roll back
             try:
-                agent_class = get_agent_class(agent_name)
-                if not agent_class:
-                    logger.error(f"Agent class not found: {agent_name}")
-                    return
-                
-                agent = agent_class()
-                findings = agent.run()
+                with agent_pool.acquire(agent_name) as agent:
+                    if agent is None:
+                        logger.error(f"Agent class not found: {agent_name}")
+                        return
+                    findings = agent.run()
                 
                 if isinstance(findings, dict) and "ensemble_score_final" in findings:
                     ok, reason = self.guardrails.check({
@@ -288,6 +364,8 @@ class AgentScheduler:
                 # Store findings
                 stored_findings = []
                 if findings:
+                    from services.finding_similarity import finding_index, warm_from_db
+                    warm_from_db()
                     for finding_data in findings:
                         finding = Finding()
                         finding.agent_name = agent_name
@@ -303,6 +381,7 @@ class AgentScheduler:
                         }
                         finding.symbol = finding_data.get('symbol')
                         finding.market_type = finding_data.get('market_type')
+                        finding.cluster_id = finding_index.assign_finding(finding_data, added=indexed)
                         db.session.add(finding)
                         db.session.flush()
                         stored_findings.append(finding)
@@ -322,6 +401,14 @@ class AgentScheduler:
                                 logger.error(f"Auto-analysis failed for finding {finding.id}: {analysis_err}")
                 
                 db.session.commit()
+                indexed.clear()
+                trigger_gate.completed(agent_name)
+                
+                try:
+                    from websocket.bus import findings_bus
+                    findings_bus.publish_findings(stored_findings)
+                except Exception as push_err:
+                    logger.warning(f"Findings push failed for {agent_name}: {push_err}")
                 
                 self._run_council_on_findings(stored_findings)
                 
@@ -337,6 +424,8 @@ class AgentScheduler:
             except Exception as e:
                 logger.error(f"Error running agent {agent_name}: {e}")
                 db.session.rollback()
+                if indexed:
+                    finding_index.discard(indexed)
                 
                 try:
                     status = AgentStatus.query.filter_by(agent_name=agent_name).first()
@@ -352,6 +441,15 @@ class AgentScheduler:
                 regime = (_cached_regime_state or {}).get("active_regime", "unknown")
                 _failure_heatmap.update(agent_name, regime, -1)
     
+    def shutdown(self, wait: bool = False):
+        """Stop all jobs without touching persisted agent state (for leader handoff)"""
+        try:
+            self.scheduler.shutdown(wait=wait)
+        except Exception as e:
+            logger.warning(f"Scheduler shutdown error: {e}")
+        self.active_jobs.clear()
+        agent_pool.teardown_all()
+    
     def get_agent_status(self) -> Dict:
         """Get status of all agents"""
         from models import db
@@ -418,10 +516,37 @@ class AgentScheduler:
             
             client = OpenAI(api_key=api_key, base_url=base_url) if base_url else OpenAI(api_key=api_key)
             
-            for finding in findings:
+            # One council call per near-duplicate cluster; reuse votes a
+            # recent member of the cluster already got
+            from services.finding_similarity import group_by_cluster
+            from models import Finding
+            clusters = group_by_cluster(findings)
+            voted = {}
+            cluster_ids = [cid for cid, fs in clusters.items() if fs[0].cluster_id]
+            if cluster_ids:
+                since = datetime.utcnow() - timedelta(hours=24)
+                for prior in (Finding.query
+                              .filter(Finding.cluster_id.in_(cluster_ids),
+                                      Finding.ta_council.isnot(None),
+                                      Finding.timestamp >= since)
+                              .order_by(Finding.timestamp.desc())
+                              .all()):
+                    voted.setdefault(prior.cluster_id, prior)
+            
+            def copy_votes(src, members):
+                for other in members:
+                    if other is not src and other.ta_council is None:
+                        other.ta_council = src.ta_council
+                        other.fund_council = src.fund_council
+                        other.real_estate_council = src.real_estate_council
+            
+            for cid, members in clusters.items():
                 try:
-                    if finding.ta_council is not None:
+                    finding = voted.get(cid) or next((f for f in members if f.ta_council is not None), None)
+                    if finding is not None:
+                        copy_votes(finding, members)
                         continue
+                    finding = members[0]
                     
                     is_re = finding.market_type in ('real_estate', 'private_equity', 'private_company')
                     is_re = is_re or 'distress' in (finding.agent_name or '').lower()
@@ -465,15 +590,18 @@ class AgentScheduler:
                     if is_re and finding.real_estate_council is None:
                         finding.real_estate_council = finding.ta_council or 'watch'
                     
+                    copy_votes(finding, members)
+                    
                 except Exception as e:
-                    logger.debug(f"Council analysis failed for finding {finding.id}: {e}")
+                    logger.debug(f"Council analysis failed for cluster {cid}: {e}")
                     continue
             
             from models import db
             db.session.commit()
             council_count = sum(1 for f in findings if f.ta_council is not None)
             if council_count:
-                logger.info(f"Council analysis completed for {council_count}/{len(findings)} findings")
+                logger.info(f"Council analysis completed for {council_count}/{len(findings)} findings "
+                            f"({len(clusters)} clusters)")
             
         except Exception as e:
             logger.error(f"Council runner error: {e}")
@@ -1207,35 +1335,27 @@ class AgentScheduler:
         
         with self.app.app_context():
             try:
-                from regime import extract_features, score_regimes, regime_confidence
+                from regime import extract_features_asof, merge_inputs, score_regimes, regime_confidence
                 from regime.confidence import get_cached_regime, cache_regime
                 from data_sources.price_loader import load_spy
                 import yfinance as yf
                 
                 spy = load_spy(start="2020-01-01", use_cache=True)
                 
-                try:
-                    vix = yf.download("^VIX", period="3mo", progress=False)
-                except Exception:
-                    vix = spy.copy()
-                    vix["Close"] = 20.0
-                
-                try:
-                    tnx = yf.download("^TNX", period="3mo", progress=False)
-                except Exception:
-                    tnx = spy.copy()
-                    tnx["Close"] = 4.0
+                # Inputs go through the feature store: a failed download falls back
+                # to the history already stored for that symbol
+                frames = {"SPY": spy}
+                for symbol in ("^VIX", "^TNX", "GLD"):
+                    try:
+                        frames[symbol] = yf.download(symbol, period="3mo", progress=False)
+                    except Exception:
+                        frames[symbol] = None
                 
-                try:
-                    gld = yf.download("GLD", period="3mo", progress=False)
-                except Exception:
-                    gld = None
-                
-                if len(spy) < 20 or len(vix) < 20 or len(tnx) < 20:
+                if not merge_inputs(frames):
                     logger.warning("Insufficient market data for regime detection")
                     return
                 
-                features = extract_features(spy, vix, tnx, gld)
+                features = extract_features_asof()
                 scores = score_regimes(features)
                 
                 state = regime_confidence(
@@ -1277,6 +1397,8 @@ class AgentScheduler:
                 except Exception as sub_err:
                     logger.debug(f"Substitution skipped: {sub_err}")
                 
+                policy_snapshot.set_regime_weights(_regime_weights)
+                
                 try:
                     from meta.decay_heatmap import decay_heatmap
                     from meta.decay import _decay
@@ -1319,3 +1441,80 @@ class AgentScheduler:
                 
             except Exception as e:
                 logger.error(f"Regime rotation error: {e}")
+
+
+def run_leader_loop(app, stop_event: threading.Event, exit_on_loss: bool = False,
+                    lease_ttl: Optional[int] = None) -> bool:
+    """
+    Run the AgentScheduler only while holding the DB scheduler lease.
+    
+    Standby processes poll for the lease and take over when the leader's
+    lease expires. Returns False if leadership was lost and exit_on_loss
+    is set, True when stop_event is set.
+    """
+    from services.scheduler_lease import SchedulerLease
+    
+    with app.app_context():
+        lease = SchedulerLease(ttl=lease_ttl) if lease_ttl else SchedulerLease()
+        renew_every = max(lease.ttl / 3, 1)
+        
+        while not stop_event.is_set():
+            if not lease.acquire():
+                stop_event.wait(renew_every)
+                continue
+            
+            logger.info(f"Acquired scheduler lease as {lease.holder}")
+            scheduler = AgentScheduler(app)
+            app.extensions["scheduler"] = scheduler
+            last_renewed = time.monotonic()
+            
+            while not stop_event.wait(renew_every):
+                renewed = lease.renew()
+                if renewed:
+                    last_renewed = time.monotonic()
+                elif renewed is False or time.monotonic() - last_renewed > lease.ttl:
+                    logger.error("Lost scheduler lease; stopping scheduler")
+                    break
+            
+            scheduler.shutdown()
+            app.extensions.pop("scheduler", None)
+            if stop_event.is_set():
+                lease.release()
+                return True
+            if exit_on_loss:
+                return False
+    return True
+
+
+def main(argv=None) -> int:
+    """Standalone scheduler worker: `python -m scheduler`"""
+    import argparse
+    import os
+    import signal
+    
+    parser = argparse.ArgumentParser(description="Run the agent scheduler as a standalone worker")
+    parser.add_argument("--lease-ttl", type=int, default=None, help="Scheduler lease TTL in seconds")
+    parser.add_argument("--stay-on-loss", action="store_true",
+                        help="Return to standby instead of exiting when the lease is lost")
+    args = parser.parse_args(argv)
+    
+    # The web-side embedded scheduler must not start inside this process
+    os.environ["SCHEDULER_MODE"] = "external"
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    from app import create_app
+    app = create_app()
+    
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    
+    ok = run_leader_loop(app, stop, exit_on_loss=not args.stay_on_loss, lease_ttl=args.lease_ttl)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    import sys
+    import scheduler as _scheduler  # run against the importable module, not __main__
+    sys.exit(_scheduler.main())
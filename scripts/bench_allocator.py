@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+UCB allocator benchmark: cold state restore and allocate() latency over a
+synthetic fleet of agents, each with a full reward window.
+
+  python scripts/bench_allocator.py
+  python scripts/bench_allocator.py --agents 100 250 500 --rewards 500 --json out.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from meta.allocator import UCBAllocator  # noqa: E402
+
+
+def benchmark_allocate(n_agents: int = 120, rewards_per_agent: int = 500, repeats: int = 20,
+                       seed: int = 7) -> Dict:
+    """
+    Timings in milliseconds for a cold state restore and for allocate()
+    (mean / worst over `repeats` calls). The redundancy lookup is skipped
+    so only the allocator itself is measured.
+    """
+    rng = random.Random(seed)
+    agents = [f"BenchAgent{i:03d}" for i in range(n_agents)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = Path(tmp) / "allocator_state.json"
+        events_path = Path(tmp) / "events.jsonl"
+
+        alloc = UCBAllocator(state_path=state_path, events_path=events_path)
+        for a in agents:
+            for _ in range(rewards_per_agent):
+                alloc._push_reward(a, rng.gauss(0.05, 1.0))
+        alloc.save_state()
+
+        t0 = time.perf_counter()
+        alloc = UCBAllocator(state_path=state_path, events_path=events_path)
+        restore_ms = (time.perf_counter() - t0) * 1000
+
+        timings = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            alloc.allocate(agents, total_budget_runs=n_agents * 2, redundant=set())
+            timings.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "agents": n_agents,
+        "rewards_per_agent": rewards_per_agent,
+        "restore_ms": round(restore_ms, 3),
+        "allocate_mean_ms": round(sum(timings) / len(timings), 3),
+        "allocate_max_ms": round(max(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[100, 250, 500], help="fleet sizes to time")
+    parser.add_argument("--rewards", type=int, default=500, help="rewards per agent")
+    parser.add_argument("--repeats", type=int, default=20, help="allocate() calls per fleet size")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = [benchmark_allocate(n, args.rewards, args.repeats) for n in args.agents]
+    for r in results:
+        print(f"{r['agents']:>5} agents: restore {r['restore_ms']:8.2f} ms  "
+              f"allocate mean {r['allocate_mean_ms']:7.2f} ms  max {r['allocate_max_ms']:7.2f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
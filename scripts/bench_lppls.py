@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+LPPLS fitting benchmark: the grid engine (agents.analyzers.lppls) versus
+a naive scipy.optimize fit of all seven parameters from random starts,
+on synthetic LPPL series with known tc / m / ω.
+
+Reports fits per second and the median absolute parameter error of each.
+
+  python scripts/bench_lppls.py
+  python scripts/bench_lppls.py --series 20 --n 250 --starts 10 --json out.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from agents.analyzers.lppls import LPPLSFit, fit_lppls, synthetic_lppl  # noqa: E402
+
+
+def naive_fit(log_prices: np.ndarray, starts: int, seed: int = 0) -> LPPLSFit:
+    """All seven parameters by bounded least squares from `starts` random initial points."""
+    from scipy.optimize import least_squares
+
+    n = len(log_prices)
+    t = np.linspace(0.0, 1.0, n)
+    rng = np.random.default_rng(seed)
+    lo = [-np.inf, -np.inf, -np.inf, -np.inf, 1.0 + 0.5 / (n - 1), 0.1, 6.0]
+    hi = [np.inf, np.inf, np.inf, np.inf, 1.5, 0.9, 13.0]
+
+    def residuals(p):
+        A, B, C1, C2, tc, m, omega = p
+        f = (tc - t) ** m
+        phase = omega * np.log(tc - t)
+        return A + f * (B + C1 * np.cos(phase) + C2 * np.sin(phase)) - log_prices
+
+    best = None
+    for _ in range(starts):
+        x0 = [log_prices.mean(), -1.0, 0.0, 0.0,
+              rng.uniform(lo[4], hi[4]), rng.uniform(0.1, 0.9), rng.uniform(6.0, 13.0)]
+        result = least_squares(residuals, x0, bounds=(lo, hi), method="trf")
+        if best is None or result.cost < best.cost:
+            best = result
+    A, B, C1, C2, tc, m, omega = best.x
+    return LPPLSFit(tc, m, omega, A, B, C1, C2, 2 * best.cost, n)
+
+
+def _run(name: str, fit, cases: List[Dict]) -> Dict:
+    errors = {"tc": [], "m": [], "omega": []}
+    start = time.perf_counter()
+    for case in cases:
+        result = fit(np.log(case["prices"]))
+        for key in errors:
+            errors[key].append(abs(getattr(result, key) - case[key]))
+    elapsed = time.perf_counter() - start
+    return {
+        "method": name,
+        "fits": len(cases),
+        "seconds": round(elapsed, 3),
+        "fits_per_s": round(len(cases) / elapsed, 2),
+        **{f"median_err_{k}": round(float(np.median(v)), 4) for k, v in errors.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=12, help="synthetic series to fit")
+    parser.add_argument("--n", type=int, default=250, help="bars per series")
+    parser.add_argument("--noise", type=float, default=0.01, help="log-price noise sd")
+    parser.add_argument("--starts", type=int, default=10, help="random starts for the naive fit")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    cases = []
+    for i in range(args.series):
+        params = {"tc": rng.uniform(1.02, 1.2), "m": rng.uniform(0.2, 0.8), "omega": rng.uniform(6.5, 12.5)}
+        prices = synthetic_lppl(n=args.n, noise=args.noise, seed=i,
+                                C1=rng.uniform(-0.06, 0.06), C2=rng.uniform(-0.06, 0.06), **params)
+        cases.append({**params, "prices": prices})
+
+    results = [
+        _run("grid", fit_lppls, cases),
+        _run(f"scipy x{args.starts}", lambda y: naive_fit(y, args.starts), cases),
+    ]
+    for r in results:
+        print(f"{r['method']:>12}: {r['fits_per_s']:8.2f} fits/s  "
+              f"median |Δtc| {r['median_err_tc']:.4f}  |Δm| {r['median_err_m']:.4f}  "
+              f"|Δω| {r['median_err_omega']:.4f}")
+    print(f"speedup: {results[0]['fits_per_s'] / results[1]['fits_per_s']:.1f}x")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Dashboard load test: latency percentiles for the dashboard endpoints
+while agents are running.
+
+Before/after comparison for moving the scheduler out of the web tier:
+
+  # before: scheduler embedded in a single web worker
+  SCHEDULER_MODE=embedded GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py main:app
+  python scripts/load_test_dashboard.py --force-start-all --cookie "session=..." \\
+      --label embedded --out before.json
+
+  # after: standalone scheduler worker, web scaled out
+  python -m scheduler &
+  SCHEDULER_MODE=external GUNICORN_WORKERS=4 gunicorn -c gunicorn.conf.py main:app
+  python scripts/load_test_dashboard.py --label external --out after.json
+
+  python scripts/load_test_dashboard.py --compare before.json after.json
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+DEFAULT_PATHS = [
+    "/dashboard/api/findings/recent?limit=10",
+    "/api/dashboard/signals",
+    "/dashboard/api/chart_data?days=2",
+    "/healthz",
+]
+
+
+def _worker(base_url, paths, cookies, deadline, timeout, results, lock):
+    session = requests.Session()
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            r = session.get(base_url + path, cookies=cookies, timeout=timeout)
+            ok = r.status_code < 500
+        except requests.RequestException:
+            ok = False
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            results.setdefault(path, []).append((ms, ok))
+
+
+def _summary(samples):
+    lat = np.array([ms for ms, _ in samples])
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "requests": int(lat.size),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p95_ms": round(float(np.percentile(lat, 95)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+        "max_ms": round(float(lat.max()), 1),
+    }
+
+
+def run(args):
+    cookies = {}
+    if args.cookie:
+        name, _, value = args.cookie.partition("=")
+        cookies[name] = value
+
+    if args.force_start_all:
+        r = requests.post(args.base_url + "/api/agents/force-start-all", cookies=cookies, timeout=60)
+        print(f"force-start-all: HTTP {r.status_code}")
+        time.sleep(args.warmup)
+
+    results, lock = {}, threading.Lock()
+    deadline = time.monotonic() + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(_worker, args.base_url, args.paths, cookies, deadline, args.timeout, results, lock)
+
+    all_samples = [s for samples in results.values() for s in samples]
+    report = {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "overall": _summary(all_samples) if all_samples else {},
+        "paths": {p: _summary(s) for p, s in results.items()},
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{'path':45s} {'p99 ' + before['label']:>18s} {'p99 ' + after['label']:>18s} {'change':>8s}")
+    rows = [("overall", before["overall"], after["overall"])]
+    rows += [(p, before["paths"][p], after["paths"].get(p)) for p in before["paths"]]
+    for name, b, a in rows:
+        if not a:
+            continue
+        change = (a["p99_ms"] - b["p99_ms"]) / b["p99_ms"] * 100 if b["p99_ms"] else 0.0
+        print(f"{name:45s} {b['p99_ms']:>16.1f}ms {a['p99_ms']:>16.1f}ms {change:>7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard latency under agent load")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=int, default=60, help="Seconds to run")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    parser.add_argument("--cookie", help="Session cookie (name=value) for authenticated endpoints")
+    parser.add_argument("--force-start-all", action="store_true",
+                        help="Force-start every agent first (embedded scheduler only)")
+    parser.add_argument("--warmup", type=int, default=30, help="Seconds to wait after force-start")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out", help="Write JSON results here")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
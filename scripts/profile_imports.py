@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Import-time profiler: cold-start cost of each module.
+
+Runs the target in a fresh interpreter under `python -X importtime` and
+reports the slowest imports (cumulative and self time), cost per
+top-level package, and which first-party import pulled in a given module.
+
+  python scripts/profile_imports.py                      # web cold start (app:create_app)
+  python scripts/profile_imports.py --target scheduler   # just import a module
+  python scripts/profile_imports.py --why ccxt           # import chain for ccxt
+  python scripts/profile_imports.py --json out.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Environment for a side-effect-light web cold start
+COLD_START_ENV = {
+    "SCHEDULER_MODE": "external",
+    "REPL_ID": "import-profile",
+    "DATABASE_URL": "sqlite:///:memory:",
+}
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    parent: Optional[str] = None
+    children: List[str] = field(default_factory=list)
+
+
+def _snippet(target: str) -> str:
+    module, _, attr = target.partition(":")
+    code = f"import {module}"
+    if attr:
+        code = f"from {module} import {attr}; {attr}()"
+    return code
+
+
+def run_importtime(target: str, env: Dict[str, str] = None):
+    """Run `target` cold with -X importtime. Returns (records, wall seconds)."""
+    full_env = {**os.environ, **COLD_START_ENV, **(env or {})}
+    # Keep the project first on sys.path without letting it shadow the stdlib
+    # (the repo has a top-level `logging` package).
+    code = f"import sys; sys.path.append({ROOT!r}); {_snippet(target)}"
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-P", "-X", "importtime", "-c", code],
+        cwd=ROOT, env=full_env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        tail = "\n".join(l for l in proc.stderr.splitlines() if not l.startswith("import time:"))[-2000:]
+        raise RuntimeError(f"target {target!r} failed:\n{tail}")
+    return parse_importtime(proc.stderr), wall
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """
+    Parse -X importtime output into records with parent links.
+
+    Children are printed before their parent, one indent level deeper.
+    """
+    records: List[ImportRecord] = []
+    pending: Dict[int, List[ImportRecord]] = defaultdict(list)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rec = ImportRecord(name.strip(), int(self_us), int(cum_us), depth)
+        for child in pending.pop(depth + 1, []):
+            child.parent = rec.name
+            rec.children.append(child.name)
+        pending[depth].append(rec)
+        records.append(rec)
+    return records
+
+
+def first_party(name: str) -> bool:
+    top = name.split(".")[0]
+    return os.path.isdir(os.path.join(ROOT, top)) or os.path.isfile(os.path.join(ROOT, top + ".py"))
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for r in records:
+        totals[r.name.split(".")[0]] += r.self_us
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def why(records: List[ImportRecord], module: str) -> List[str]:
+    """Import chain from the root down to the first import of `module`."""
+    index = {r.name: r for r in records}
+    rec = index.get(module)
+    chain = []
+    while rec is not None:
+        chain.append(rec.name)
+        rec = index.get(rec.parent) if rec.parent else None
+    return list(reversed(chain))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile cold-start import cost")
+    parser.add_argument("--target", default="app:create_app",
+                        help="module or module:factory to run cold (default: app:create_app)")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--why", action="append", default=[], help="show the import chain for a module")
+    parser.add_argument("--json", help="write the full report here")
+    args = parser.parse_args()
+
+    records, wall = run_importtime(args.target)
+    total_us = sum(r.self_us for r in records)
+
+    print(f"{args.target}: {wall:.2f}s wall, {total_us / 1e6:.2f}s in imports, {len(records)} modules\n")
+
+    print(f"{'cumulative':>11s} {'self':>9s}  module (first-party, by cumulative)")
+    fp = sorted((r for r in records if first_party(r.name)), key=lambda r: -r.cumulative_us)
+    for r in fp[:args.top]:
+        print(f"{r.cumulative_us / 1e3:9.1f}ms {r.self_us / 1e3:7.1f}ms  {r.name}")
+
+    print(f"\n{'self':>11s}  package (all modules, self time)")
+    for pkg, us in list(by_package(records).items())[:args.top]:
+        print(f"{us / 1e3:9.1f}ms  {pkg}")
+
+    for module in args.why:
+        chain = why(records, module)
+        print(f"\nwhy {module}: " + (" -> ".join(chain) if chain else "not imported"))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "target": args.target,
+                "wall_s": wall,
+                "import_s": total_us / 1e6,
+                "modules": [r.__dict__ for r in records],
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
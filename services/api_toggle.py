@@ -81,9 +81,19 @@ def set_all_apis(enabled: bool):
 
 
 def api_guard(api_name: str, action_description: str = ""):
+    """
+    False if the API is toggled off, or if its host is paused by the
+    rate budget after a 429/Retry-After (services.rate_budget).
+    """
+    desc = f" ({action_description})" if action_description else ""
     if not is_api_enabled(api_name):
-        desc = f" ({action_description})" if action_description else ""
         msg = f"API '{api_name}' is disabled via admin toggle{desc}. Skipping."
         logger.info(msg)
         return False
+    from services.rate_budget import ALIASES, rate_budget
+    if api_name in ALIASES:
+        paused = rate_budget.paused_for(api_name)
+        if paused > 0:
+            logger.info(f"API '{api_name}' is rate limited for another {paused:.0f}s{desc}. Skipping.")
+            return False
     return True
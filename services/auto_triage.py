@@ -67,7 +67,7 @@ def auto_analyze_and_alert(finding_id: int, force: bool = False) -> Dict[str, An
 
     try:
         df = load_symbol_frame(f.symbol) if f.symbol else None
-        ta = ta_vote(df)
+        ta = ta_vote(df, f.symbol)
     except Exception as e:
         logger.warning(f"TA analysis failed for {f.symbol}: {e}")
         ta = {"vote": "WATCH", "score": 0.5, "reason": f"error: {e}"}
@@ -0,0 +1,136 @@
+"""
+Data Change Events
+
+Process-wide registry of input fingerprints. Data sources publish an
+event whenever the content behind an input key changes:
+
+    bars:SPY                 new or updated bar (yahoo client)
+    features:SPY             new or revised bars in the feature store
+    file:data/zillow/x.csv   a watched file's content changed
+
+`publish()` only records an event (and bumps the sequence number) when
+the fingerprint differs from the last one seen for that key, so callers
+can publish on every fetch. Consumers remember the sequence number they
+last consumed and ask `changed_since()` whether any input matching their
+declared patterns (fnmatch, e.g. "bars:*" or "file:data/zillow/*.csv")
+moved on.
+"""
+import glob
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DataEvent:
+    key: str
+    fingerprint: str
+    seq: int
+    ts: float
+    kind: str = "update"
+
+
+def fingerprint(obj: Any) -> str:
+    """Short content hash of bytes/str, a pandas object, or anything with a stable repr."""
+    h = hashlib.blake2b(digest_size=12)
+    if isinstance(obj, bytes):
+        h.update(obj)
+    elif isinstance(obj, str):
+        h.update(obj.encode("utf-8"))
+    elif hasattr(obj, "index") and hasattr(obj, "to_numpy"):
+        import pandas as pd
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    else:
+        h.update(repr(obj).encode("utf-8"))
+    return h.hexdigest()
+
+
+def bars_fingerprint(df) -> Optional[str]:
+    """Fingerprint of the latest bar (index + last row), cheap enough to take on every fetch."""
+    if df is None or len(df) == 0:
+        return None
+    return fingerprint((str(df.index[-1]), len(df), tuple(df.iloc[-1].tolist())))
+
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """Stat-based fingerprint (mtime, size, inode) of a file; None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}-{st.st_ino:x}"
+
+
+class DataEvents:
+    """Latest fingerprint and change sequence per input key."""
+
+    def __init__(self):
+        self._latest: Dict[str, DataEvent] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.stats = {"published": 0, "changed": 0}
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def publish(self, key: str, fp: Optional[str], kind: str = "update") -> bool:
+        """Record `fp` for `key`; returns True (and emits an event) if it changed."""
+        if fp is None:
+            return False
+        with self._lock:
+            self.stats["published"] += 1
+            prev = self._latest.get(key)
+            if prev is not None and prev.fingerprint == fp:
+                return False
+            self._seq += 1
+            self._latest[key] = DataEvent(key, fp, self._seq, time.time(), kind)
+            self.stats["changed"] += 1
+        logger.debug(f"Data changed: {key} ({kind})")
+        return True
+
+    def publish_bars(self, symbol: str, df) -> bool:
+        return self.publish(f"bars:{symbol}", bars_fingerprint(df), kind="bar")
+
+    def latest(self, key: str) -> Optional[DataEvent]:
+        return self._latest.get(key)
+
+    def changed_since(self, patterns: Iterable[str], seq: int) -> List[DataEvent]:
+        """Events newer than `seq` whose key matches any of `patterns`."""
+        patterns = list(patterns)
+        with self._lock:
+            events = [e for e in self._latest.values() if e.seq > seq]
+        return sorted((e for e in events if any(fnmatchcase(e.key, p) for p in patterns)),
+                      key=lambda e: e.seq)
+
+    def poll_files(self, patterns: Iterable[str]) -> int:
+        """
+        Publish file events for `file:<glob>` patterns by stat-ing the
+        matching files. Returns how many changed.
+        """
+        changed = 0
+        for pattern in patterns:
+            if not pattern.startswith("file:"):
+                continue
+            for path in glob.glob(pattern[len("file:"):]):
+                changed += self.publish(f"file:{path}", file_fingerprint(path), kind="file")
+        return changed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "seq": self._seq,
+                "stats": dict(self.stats),
+                "inputs": {k: {"fingerprint": e.fingerprint, "seq": e.seq, "ts": e.ts, "kind": e.kind}
+                           for k, e in self._latest.items()},
+            }
+
+
+data_events = DataEvents()
@@ -3,35 +3,20 @@ import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from telemetry.ledger import performance_ledger
+
 logger = logging.getLogger(__name__)
 
 EVENTS = Path("telemetry/events.jsonl")
 
 
 def load_portfolio_equity(window_n: int = 5000) -> list:
-    """Load equity curve from telemetry events."""
-    if not EVENTS.exists():
-        return []
-
-    eq = 0.0
-    curve = []
+    """Equity curve (cumulative reward) over the last `window_n` rewards, from the performance ledger."""
     try:
-        lines = EVENTS.read_text().splitlines()[-window_n:]
-        for ln in lines:
-            try:
-                e = json.loads(ln)
-            except json.JSONDecodeError:
-                logger.debug(f"Skipping malformed JSON line in events file")
-                continue
-            r = e.get("reward")
-            ts = e.get("ts") or e.get("timestamp")
-            if r is None:
-                continue
-            eq += float(r)
-            curve.append({"t": ts, "equity": eq})
+        return performance_ledger.portfolio_curve(last_n=window_n)
     except Exception as ex:
         logger.warning(f"Error loading equity curve: {ex}")
-    return curve
+        return []
 
 
 def max_drawdown(curve: list) -> float:
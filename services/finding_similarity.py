@@ -0,0 +1,243 @@
+"""
+Finding Similarity Index
+
+Local near-duplicate detection for finding text (title + description),
+so that "Bearish RSI Divergence in SPY" reported by several agents is one
+cluster rather than several LLM calls and memo lines.
+
+Text is normalized (lowercase, numbers collapsed to '#'), shingled into
+word unigrams and bigrams, and summarized by a 64-permutation MinHash.
+An LSH table (16 bands x 4 rows) finds candidates in O(1) per insert;
+a candidate joins the cluster if its estimated Jaccard similarity is at
+least `threshold`. Matching is scoped to the finding's symbol and a
+time window. No external service is involved.
+
+Cluster ids are derived from the founding member's signature, so the
+same text yields the same id in every process.
+"""
+import hashlib
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.6
+WINDOW_HOURS = 24
+MAX_ITEMS = 5000
+
+_PRIME = (1 << 31) - 1
+_NUMBER = re.compile(r"[$]?\d[\d,]*(?:\.\d+)?%?")
+_TOKEN = re.compile(r"[a-z#^]+")
+
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def finding_text(finding: Any) -> str:
+    """Title and (truncated) description of a Finding model or finding dict."""
+    if isinstance(finding, dict):
+        title, desc = finding.get("title"), finding.get("description")
+    else:
+        title, desc = getattr(finding, "title", None), getattr(finding, "description", None)
+    return f"{title or ''} {(desc or '')[:500]}"
+
+
+def shingles(text: str) -> List[str]:
+    tokens = _TOKEN.findall(_NUMBER.sub(" # ", text.lower()))
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint64 values) of the text's shingle set."""
+    grams = set(shingles(text))
+    if not grams:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    x = np.fromiter((zlib.crc32(g.encode("utf-8")) % _PRIME for g in grams), dtype=np.uint64, count=len(grams))
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _cluster_id(sig: np.ndarray, scope: str) -> str:
+    digest = hashlib.blake2b(sig.tobytes() + scope.encode("utf-8"), digest_size=6).hexdigest()
+    return f"c{digest}"
+
+
+class FindingIndex:
+    """Streaming MinHash/LSH clustering of finding text."""
+
+    def __init__(self, threshold: float = THRESHOLD, window_hours: float = WINDOW_HOURS,
+                 max_items: int = MAX_ITEMS):
+        self.threshold = threshold
+        self.window = timedelta(hours=window_hours)
+        self.max_items = max_items
+        self._items: "OrderedDict[int, Tuple[np.ndarray, str, datetime, list]]" = OrderedDict()
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.stats = {"inserted": 0, "joined": 0}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _band_keys(self, sig: np.ndarray, scope: str) -> list:
+        bands = sig.reshape(BANDS, ROWS)
+        return [(scope, i, bands[i].tobytes()) for i in range(BANDS)]
+
+    def _unlink(self, item: int, keys: list):
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(item)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[key]
+
+    def _evict(self):
+        while len(self._items) > self.max_items:
+            item, (_, _, _, keys) = self._items.popitem(last=False)
+            self._unlink(item, keys)
+
+    def assign(self, text: str, symbol: Optional[str] = None, ts: Optional[datetime] = None,
+               cluster_id: Optional[str] = None, added: Optional[list] = None) -> str:
+        """
+        Insert one finding's text and return its cluster id. Pass
+        `cluster_id` to re-index a finding that already has one, and a
+        list as `added` to collect the entry for a later discard().
+        """
+        ts = ts or datetime.utcnow()
+        scope = (symbol or "").upper()
+        sig = signature(text)
+        keys = self._band_keys(sig, scope)
+
+        with self._lock:
+            if cluster_id is None:
+                best, best_sim = None, self.threshold
+                seen = set()
+                for key in keys:
+                    for item in self._buckets.get(key, ()):
+                        if item in seen:
+                            continue
+                        seen.add(item)
+                        other_sig, other_cluster, other_ts, _ = self._items[item]
+                        if abs(ts - other_ts) > self.window:
+                            continue
+                        sim = similarity(sig, other_sig)
+                        if sim >= best_sim:
+                            best, best_sim = other_cluster, sim
+                if best is not None:
+                    cluster_id = best
+                    self.stats["joined"] += 1
+                else:
+                    cluster_id = _cluster_id(sig, scope)
+
+            self._seq += 1
+            self._items[self._seq] = (sig, cluster_id, ts, keys)
+            for key in keys:
+                self._buckets[key].append(self._seq)
+            if added is not None:
+                added.append(self._seq)
+            self.stats["inserted"] += 1
+            self._evict()
+        return cluster_id
+
+    def assign_finding(self, finding: Any, added: Optional[list] = None) -> str:
+        """assign() for a Finding model or finding dict."""
+        get = finding.get if isinstance(finding, dict) else (lambda k: getattr(finding, k, None))
+        ts = get("timestamp")
+        return self.assign(finding_text(finding), symbol=get("symbol"),
+                           ts=ts if isinstance(ts, datetime) else None, added=added)
+
+    def discard(self, added: Iterable[int]) -> int:
+        """
+        Drop entries collected by assign(added=...), e.g. when the findings
+        they were assigned for are rolled back. Returns how many were present.
+        """
+        n = 0
+        with self._lock:
+            for item in added:
+                entry = self._items.pop(item, None)
+                if entry is not None:
+                    self._unlink(item, entry[3])
+                    n += 1
+        return n
+
+    def warm(self, findings: Iterable[Any]) -> int:
+        """Re-index findings that already carry a cluster_id (oldest first)."""
+        n = 0
+        for f in findings:
+            cid = getattr(f, "cluster_id", None)
+            if cid:
+                self.assign(finding_text(f), symbol=getattr(f, "symbol", None),
+                            ts=getattr(f, "timestamp", None), cluster_id=cid)
+                n += 1
+        return n
+
+
+finding_index = FindingIndex()
+_warmed = False
+_warm_lock = threading.Lock()
+
+
+def warm_from_db(hours: float = WINDOW_HOURS, limit: int = MAX_ITEMS) -> int:
+    """
+    Load recent clustered findings into the shared index once per process;
+    a failed warm-up (e.g. the DB isn't reachable yet) is retried next call.
+    """
+    global _warmed
+    with _warm_lock:
+        if _warmed:
+            return 0
+        try:
+            from models import Finding
+            since = datetime.utcnow() - timedelta(hours=hours)
+            rows = (
+                Finding.query
+                .filter(Finding.timestamp >= since, Finding.cluster_id.isnot(None))
+                .order_by(Finding.timestamp.desc())
+                .limit(limit)
+                .all()
+            )
+            _warmed = True
+            n = finding_index.warm(reversed(rows))
+            logger.info(f"Finding similarity index warmed with {n} findings")
+            return n
+        except Exception as e:
+            logger.warning(f"Finding similarity warm-up skipped: {e}")
+            return 0
+
+
+def group_by_cluster(findings: Iterable[Any], index: Optional[FindingIndex] = None) -> "OrderedDict[str, list]":
+    """
+    Findings grouped by cluster, in first-seen order. Findings without a
+    cluster_id are clustered against each other with a throwaway index
+    (or `index`), so older rows dedupe too.
+    """
+    groups: "OrderedDict[str, list]" = OrderedDict()
+    local = None
+    for f in findings:
+        get = f.get if isinstance(f, dict) else (lambda k, f=f: getattr(f, k, None))
+        key = get("cluster_id")
+        if not key:
+            if local is None:
+                local = index if index is not None else FindingIndex(window_hours=24 * 365)
+            key = local.assign_finding(f)
+        groups.setdefault(key, []).append(f)
+    return groups
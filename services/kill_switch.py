@@ -3,6 +3,7 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 from meta_supervisor.agent_registry import AGENT_STRATEGY_CLASS
+from services.policy_snapshot import atomic_write_json
 
 KILLED_AGENTS = Path("meta_supervisor/state/killed_agents.json")
 KILLED_STRATEGIES = Path("meta_supervisor/state/killed_strategies.json")
@@ -27,13 +28,11 @@ def _load_agent_dict(p: Path) -> dict:
         return {}
 
 def _save_agents(data: dict):
-    KILLED_AGENTS.parent.mkdir(parents=True, exist_ok=True)
     items = [{"agent": k, **v} for k, v in data.items()]
-    KILLED_AGENTS.write_text(json.dumps(items, indent=2))
+    atomic_write_json(KILLED_AGENTS, items)
 
 def _save_strategies(strategies: set):
-    KILLED_STRATEGIES.parent.mkdir(parents=True, exist_ok=True)
-    KILLED_STRATEGIES.write_text(json.dumps(sorted(strategies), indent=2))
+    atomic_write_json(KILLED_STRATEGIES, sorted(strategies))
 
 def is_agent_killed(agent_name: str) -> bool:
     data = _load_list(KILLED_AGENTS)
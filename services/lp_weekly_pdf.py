@@ -4,14 +4,9 @@ import base64
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content, Attachment, FileContent, FileName, FileType, Disposition
-
-from services.weekly_charts import cvar_heatmap_by_regime_png, live_vs_sim_attribution_png
+# reportlab, sendgrid and the matplotlib charts are imported where used so
+# loading this module (e.g. via the scheduler) stays cheap.
 from meta_supervisor.capital_movement import capital_movement_table
 
 logger = logging.getLogger(__name__)
@@ -26,7 +21,7 @@ def load_report() -> dict:
         return {}
     return json.loads(REPORT_PATH.read_text())
 
-def _draw_wrapped(c: canvas.Canvas, x: int, y: int, text: str, max_width: int, line_h: int = 12):
+def _draw_wrapped(c: "canvas.Canvas", x: int, y: int, text: str, max_width: int, line_h: int = 12):
     words = (text or "").split()
     line = ""
     for w in words:
@@ -47,6 +42,10 @@ def build_weekly_pdf(report: dict) -> Path:
     OUT.parent.mkdir(parents=True, exist_ok=True)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.pdfgen import canvas
+    from services.weekly_charts import cvar_heatmap_by_regime_png, live_vs_sim_attribution_png
+
     out = OUT_DIR / "lp_weekly_summary.pdf"
     c = canvas.Canvas(str(out), pagesize=LETTER)
     w, h = LETTER
@@ -233,6 +232,9 @@ This is an informational summary. Not investment advice.
         with open(pdf_path, "rb") as f:
             pdf_data = base64.b64encode(f.read()).decode()
 
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail, Email, To, Content, Attachment, FileContent, FileName, FileType, Disposition
+
         sg = SendGridAPIClient(api_key)
 
         for recipient in recipients:
@@ -0,0 +1,173 @@
+"""
+Market-Hours Gate
+
+Session-aware scheduling for agents whose data only moves while a market
+is open. Each agent declares a calendar in the agents/manifest.yaml
+`registry:` section:
+
+    EquityMomentumAgent: {module: agents.equity_momentum_agent, calendar: equity,
+                          requests_per_run: 8}
+
+Calendars:
+- equity         NYSE regular session (09:30-16:00 ET, 13:00 on early closes)
+- fx             Sunday 17:00 ET to Friday 17:00 ET, closed Jan 1 / Dec 25
+- macro_monthly  NYSE trading days, 08:00-16:00 ET (release windows)
+- crypto         24/7
+- always         no gating (the default for undeclared agents)
+
+While its calendar is closed an agent keeps its interval trigger but only
+actually runs every `off_hours_interval` minutes (manifest, default 240).
+Skipped runs and the outbound requests they would have made
+(`requests_per_run`, default 1) are counted in `stats()`.
+
+The session table is built per year from backtest.data.calendar
+(weekday seed minus NYSE holidays, plus early closes).
+"""
+import logging
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from backtest.data.calendar import exchange_trading_days, nyse_early_closes
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+
+CALENDARS = ("equity", "fx", "macro_monthly", "crypto", "always")
+DEFAULT_CALENDAR = "always"
+DEFAULT_OFF_HOURS_MINUTES = 240
+# Keep the gate open a little past the close so the closing bar is picked up
+CLOSE_GRACE_MINUTES = 15
+
+_HOURS = {
+    "equity": (time(9, 30), time(16, 0)),
+    "macro_monthly": (time(8, 0), time(16, 0)),
+}
+EARLY_CLOSE = time(13, 0)
+FX_CUTOFF = time(17, 0)
+
+
+class ExchangeCalendar:
+    """Per-year table of NYSE trading days and early closes; sessions are derived from it."""
+
+    def __init__(self, grace_minutes: int = CLOSE_GRACE_MINUTES):
+        self.grace = timedelta(minutes=grace_minutes)
+        self._years: Dict[int, Dict[date, bool]] = {}
+        self._lock = threading.Lock()
+
+    def _table(self, year: int) -> Dict[date, bool]:
+        """{trading date: early_close} for a year, built once."""
+        table = self._years.get(year)
+        if table is None:
+            with self._lock:
+                table = self._years.get(year)
+                if table is None:
+                    early = nyse_early_closes(year)
+                    days = exchange_trading_days(f"{year}-01-01", f"{year}-12-31")
+                    table = {d.date(): d.date() in early for d in days}
+                    self._years[year] = table
+        return table
+
+    def is_trading_day(self, day: date) -> bool:
+        return day in self._table(day.year)
+
+    def session(self, calendar: str, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """(open, close) in ET for an hours-based calendar on `day`, or None if closed all day."""
+        table = self._table(day.year)
+        if day not in table:
+            return None
+        start, end = _HOURS[calendar]
+        if table[day] and calendar == "equity":
+            end = EARLY_CLOSE
+        return datetime.combine(day, start, ET), datetime.combine(day, end, ET)
+
+    def is_open(self, calendar: str, when: Optional[datetime] = None) -> bool:
+        if calendar in ("crypto", "always") or calendar not in CALENDARS:
+            return True
+        when = (when or datetime.now(timezone.utc)).astimezone(ET)
+        if calendar == "fx":
+            return self._fx_open(when)
+        session = self.session(calendar, when.date())
+        if session is None:
+            return False
+        return session[0] <= when < session[1] + self.grace
+
+    @staticmethod
+    def _fx_open(when: datetime) -> bool:
+        if (when.month, when.day) in ((1, 1), (12, 25)):
+            return False
+        wd, t = when.weekday(), when.time()
+        if wd == 5:
+            return False
+        if wd == 6:
+            return t >= FX_CUTOFF
+        if wd == 4:
+            return t < FX_CUTOFF
+        return True
+
+
+class MarketHoursGate:
+    """Decides whether a scheduled agent run should go ahead, and counts what was saved."""
+
+    def __init__(self, calendar: Optional[ExchangeCalendar] = None, registry=None):
+        self.calendar = calendar or ExchangeCalendar()
+        self._registry = registry
+        self._last_run: Dict[str, datetime] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from agents.registry import registry
+            self._registry = registry
+        return self._registry
+
+    def policy(self, agent_name: str) -> Dict[str, Any]:
+        spec = self.registry.spec(agent_name)
+        calendar = spec.get("calendar") or DEFAULT_CALENDAR
+        if calendar not in CALENDARS:
+            logger.warning(f"Unknown calendar {calendar!r} for {agent_name}, not gating")
+            calendar = DEFAULT_CALENDAR
+        return {
+            "calendar": calendar,
+            "off_hours_interval": float(spec.get("off_hours_interval", DEFAULT_OFF_HOURS_MINUTES)),
+            "requests_per_run": int(spec.get("requests_per_run", 1)),
+        }
+
+    def should_run(self, agent_name: str, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        policy = self.policy(agent_name)
+        is_open = self.calendar.is_open(policy["calendar"], now)
+        with self._lock:
+            stats = self._stats.setdefault(agent_name, {
+                "calendar": policy["calendar"], "runs": 0, "off_hours_runs": 0,
+                "skipped": 0, "requests_saved": 0,
+            })
+            stats["calendar"] = policy["calendar"]
+            last = self._last_run.get(agent_name)
+            off_hours_due = last is None or now - last >= timedelta(minutes=policy["off_hours_interval"])
+            if is_open or off_hours_due:
+                self._last_run[agent_name] = now
+                stats["runs"] += 1
+                if not is_open:
+                    stats["off_hours_runs"] += 1
+                return True
+            stats["skipped"] += 1
+            stats["requests_saved"] += policy["requests_per_run"]
+        logger.debug(f"{agent_name}: {policy['calendar']} market closed, skipping run")
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {name: dict(s) for name, s in self._stats.items()}
+        return {
+            "runs_saved": sum(s["skipped"] for s in agents.values()),
+            "requests_saved": sum(s["requests_saved"] for s in agents.values()),
+            "agents": agents,
+        }
+
+
+market_hours = MarketHoursGate()
@@ -0,0 +1,241 @@
+"""
+Agent Policy Snapshot
+
+One immutable, in-memory view of every policy input the scheduler gates
+runs on:
+
+- services.kill_switch            killed_agents.json / killed_strategies.json
+- meta_supervisor.kill_list       policy/kill_list.json
+- meta_supervisor.policy          state/kill_switch.json
+- services.quarantine             quarantine.json
+- backtests.registry              agent_schedule.json
+- scheduler regime rotation       in-memory weights (set_regime_weights)
+
+`policy_snapshot.get()` stats the files (no reads) and only rebuilds when
+a file's (mtime, inode, size) changed or a writer called `bump()`; the
+gate itself is then a few set lookups. Writers use `atomic_write_json`
+(temp file + rename), so a rebuild never parses half-written JSON.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MUTE_WEIGHT = 0.01
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def atomic_write_json(path, data: Any, indent: int = 2) -> None:
+    """Write JSON via a temp file in the same directory and os.replace, then bump the policy version."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    policy_snapshot.bump()
+
+
+def _names(items: Iterable[Any], key: str) -> FrozenSet[str]:
+    """Names from a list of strings or of {key: name, ...} dicts."""
+    out = set()
+    for item in items or ():
+        if isinstance(item, str):
+            out.add(item)
+        elif isinstance(item, dict) and item.get(key):
+            out.add(item[key])
+    return frozenset(out)
+
+
+def _read(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text())
+    except Exception as e:
+        logger.warning(f"Policy file {path} unreadable, treating as empty: {e}")
+        return default
+
+
+def _read_dict(path: Path) -> Dict[str, Any]:
+    data = _read(path, {})
+    return data if isinstance(data, dict) else {}
+
+
+def _sources() -> Dict[str, Path]:
+    """Current policy file locations (read from the owning modules so overrides apply)."""
+    from services import kill_switch, quarantine
+    from meta_supervisor import kill_list
+    from meta_supervisor.policy import kill_switch as policy_kill_switch
+    from backtests import registry
+
+    return {
+        "killed_agents": kill_switch.KILLED_AGENTS,
+        "killed_strategies": kill_switch.KILLED_STRATEGIES,
+        "kill_list": kill_list.KILL,
+        "policy_kill_switch": policy_kill_switch.KILL,
+        "quarantine": quarantine.QPATH,
+        "schedule": registry.SCHEDULE_PATH,
+    }
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+@dataclass(frozen=True)
+class PolicySnapshot:
+    """Merged kill lists, quarantine, schedule and regime weights at one version."""
+    killed_agents: FrozenSet[str] = frozenset()
+    killed_strategies: FrozenSet[str] = frozenset()
+    meta_killed_agents: FrozenSet[str] = frozenset()
+    meta_killed_strategies: FrozenSet[str] = frozenset()
+    disabled_agents: FrozenSet[str] = frozenset()
+    disabled_strategies: FrozenSet[str] = frozenset()
+    quarantined: FrozenSet[str] = frozenset()
+    schedule: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: _EMPTY)
+    regime_weights: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+    strategy_classes: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+    version: int = 0
+    built_at: float = 0.0
+
+    def enabled(self, agent: str) -> bool:
+        """Meta-Agent schedule flag (agents missing from the schedule are enabled)."""
+        return bool((self.schedule.get(agent) or {}).get("enabled", True))
+
+    def weight(self, agent: str) -> float:
+        return float((self.schedule.get(agent) or {}).get("weight", 1.0))
+
+    def regime_weight(self, agent: str) -> float:
+        return float(self.regime_weights.get(agent, 1.0))
+
+    def blocked(self, agent: str) -> Optional[str]:
+        """Why `agent` must not run, or None. Checks run in the scheduler's historical order."""
+        strategy = self.strategy_classes.get(agent)
+        if agent in self.killed_agents or (strategy and strategy in self.killed_strategies):
+            return "kill-switch"
+        if agent in self.meta_killed_agents:
+            return "meta-supervisor kill-list"
+        if agent in self.quarantined or agent in self.disabled_agents:
+            return "policy kill-switch"
+        if not self.enabled(agent):
+            return "Meta-Agent ranking"
+        if self.regime_weights and self.regime_weight(agent) < MUTE_WEIGHT:
+            return "regime rotation"
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "killed_agents": sorted(self.killed_agents),
+            "killed_strategies": sorted(self.killed_strategies),
+            "meta_killed_agents": sorted(self.meta_killed_agents),
+            "meta_killed_strategies": sorted(self.meta_killed_strategies),
+            "disabled_agents": sorted(self.disabled_agents),
+            "disabled_strategies": sorted(self.disabled_strategies),
+            "quarantined": sorted(self.quarantined),
+            "disabled_by_schedule": sorted(a for a in self.schedule if not self.enabled(a)),
+            "muted_by_regime": sorted(a for a, w in self.regime_weights.items() if w < MUTE_WEIGHT),
+        }
+
+
+def build_snapshot(sources: Dict[str, Path], regime_weights: Mapping[str, float],
+                   version: int) -> PolicySnapshot:
+    """Parse every policy file once into a PolicySnapshot."""
+    from backtests.registry import normalize_schedule
+    from meta_supervisor.agent_registry import AGENT_STRATEGY_CLASS
+
+    kill_list = _read_dict(sources["kill_list"])
+    kill_switch = _read_dict(sources["policy_kill_switch"])
+    quarantine = _read_dict(sources["quarantine"])
+    schedule = normalize_schedule(_read_dict(sources["schedule"]))
+
+    return PolicySnapshot(
+        killed_agents=_names(_read(sources["killed_agents"], []), "agent"),
+        killed_strategies=_names(_read(sources["killed_strategies"], []), "strategy"),
+        meta_killed_agents=frozenset(kill_list.get("agents") or ()),
+        meta_killed_strategies=frozenset(kill_list.get("strategy_classes") or ()),
+        disabled_agents=frozenset(kill_switch.get("disabled_agents") or ()),
+        disabled_strategies=frozenset(kill_switch.get("disabled_strategies") or ()),
+        quarantined=frozenset(a for a, q in (quarantine.get("agents") or {}).items()
+                              if isinstance(q, dict) and q.get("active")),
+        schedule=MappingProxyType({a: MappingProxyType(dict(c)) for a, c in schedule.items()
+                                  if isinstance(c, dict)}),
+        regime_weights=MappingProxyType(dict(regime_weights)),
+        strategy_classes=MappingProxyType(dict(AGENT_STRATEGY_CLASS)),
+        version=version,
+        built_at=time.time(),
+    )
+
+
+class PolicyCache:
+    """Process-wide PolicySnapshot, rebuilt on file change or version bump."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._regime_weights: Mapping[str, float] = _EMPTY
+        self._snapshot: Optional[PolicySnapshot] = None
+        self._stamps: Optional[tuple] = None
+        self.stats = {"gets": 0, "rebuilds": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        """Invalidate the current snapshot (called by writers after a write)."""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def set_regime_weights(self, weights: Optional[Mapping[str, float]]) -> None:
+        with self._lock:
+            self._regime_weights = MappingProxyType(dict(weights or {}))
+            self._version += 1
+
+    def get(self) -> PolicySnapshot:
+        sources = _sources()
+        # Stamp before parsing: a write landing mid-rebuild changes the
+        # stamp again and forces another rebuild on the next call.
+        stamps = tuple((name, _stamp(path)) for name, path in sources.items())
+        snap = self._snapshot
+        self.stats["gets"] += 1
+        if snap is not None and stamps == self._stamps and snap.version == self._version:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and stamps == self._stamps and snap.version == self._version:
+                return snap
+            snap = build_snapshot(sources, self._regime_weights, self._version)
+            self._snapshot, self._stamps = snap, stamps
+            self.stats["rebuilds"] += 1
+            return snap
+
+
+policy_snapshot = PolicyCache()
+
+
+def get_policy() -> PolicySnapshot:
+    return policy_snapshot.get()
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from datetime import datetime, timezone
+from services.policy_snapshot import atomic_write_json
 
 QPATH = Path("meta_supervisor/quarantine.json")
 
@@ -15,9 +16,8 @@ def _load():
 
 
 def _save(doc):
-    QPATH.parent.mkdir(parents=True, exist_ok=True)
     doc["updated_at"] = datetime.now(timezone.utc).isoformat()
-    QPATH.write_text(json.dumps(doc, indent=2))
+    atomic_write_json(QPATH, doc)
 
 
 def is_quarantined(agent_name: str) -> bool:
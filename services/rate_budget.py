@@ -0,0 +1,352 @@
+"""
+Outbound Rate Budget
+
+One process-wide token bucket per upstream host, shared by every agent,
+feed and client that talks to it, so one agent bursting against Yahoo or
+Etherscan no longer gets everyone else throttled or banned.
+
+Priority classes decide who gets scarce tokens:
+
+- critical     risk agents; may take the last token in the bucket
+- normal       the default
+- exploratory  research/prediction agents; leave half the burst for others
+
+A caller is also held back while a caller of a higher class is waiting on
+the same host. The class comes from the `priority:` key of the agent's
+entry in the agents/manifest.yaml `registry:` section; BaseAgent.run
+scopes it (`priority_scope`) so clients pick it up without plumbing.
+
+`acquire()` blocks only the calling thread; `await acquire_async()`
+sleeps on the event loop instead. Clients report responses through
+`feedback()`: a 429/503 halves the host's rate and pauses it for
+Retry-After (or an exponential backoff), successes restore the rate
+additively. Hosts resolve by domain suffix, so query2.finance.yahoo.com
+shares the finance.yahoo.com budget; toggle names from
+services.api_toggle ("etherscan", "yahoo_finance", ...) work as aliases.
+
+Budgets can be overridden in config/rate_budgets.json:
+
+    {"api.etherscan.io": {"rate_per_min": 240, "burst": 4}}
+"""
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path("config/rate_budgets.json")
+
+PRIORITIES = ("critical", "normal", "exploratory")
+DEFAULT_PRIORITY = "normal"
+# Share of the burst (above one token) each class must leave in the bucket
+RESERVE = {"critical": 0.0, "normal": 0.2, "exploratory": 0.5}
+
+# host: (requests per minute, burst)
+DEFAULT_BUDGETS: Dict[str, Tuple[float, int]] = {
+    "finance.yahoo.com": (120, 10),
+    "api.coinbase.com": (600, 10),
+    "api.etherscan.io": (300, 5),     # 5 req/s on the free tier
+    "sec.gov": (600, 10),             # SEC fair access: 10 req/s across www/data/efts
+    "api.github.com": (80, 10),       # 5000/h authenticated
+    "api.schwabapi.com": (120, 10),
+    "newsapi.org": (60, 5),
+    "export.arxiv.org": (20, 1),      # one request per 3 seconds
+}
+DEFAULT_HOST_BUDGET = (120, 10)
+
+ALIASES = {
+    "yahoo_finance": "finance.yahoo.com",
+    "coinbase": "api.coinbase.com",
+    "etherscan": "api.etherscan.io",
+    "sec_edgar": "sec.gov",
+    "github": "api.github.com",
+    "schwab": "api.schwabapi.com",
+    "news_api": "newsapi.org",
+    "arxiv": "export.arxiv.org",
+}
+
+THROTTLE_STATUSES = (429, 503)
+MIN_RATE_FRACTION = 0.1
+RECOVERY_STEP = 0.05
+MAX_BACKOFF_S = 300.0
+MAX_POLL_S = 1.0
+UTILIZATION_WINDOW_S = 60.0
+
+_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("rate_budget_priority", default=None)
+
+
+@contextlib.contextmanager
+def priority_scope(priority: Optional[str]):
+    """Default priority class for acquire() calls made inside the block (threads and tasks)."""
+    token = _priority.set(priority if priority in PRIORITIES else None)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def agent_priority(agent_name: str, registry=None) -> str:
+    """Priority class declared for an agent in the manifest (default normal)."""
+    if registry is None:
+        from agents.registry import registry
+    priority = registry.spec(agent_name).get("priority") or DEFAULT_PRIORITY
+    if priority not in PRIORITIES:
+        logger.warning(f"Unknown priority {priority!r} for {agent_name}, using {DEFAULT_PRIORITY}")
+        priority = DEFAULT_PRIORITY
+    return priority
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostBudget:
+    """Priority-aware token bucket for one host, adapted by throttling feedback."""
+
+    def __init__(self, host: str, rate_per_min: float, burst: int = 5):
+        self.host = host
+        self.base_rate = max(rate_per_min, 1e-6) / 60.0
+        self.rate = self.base_rate
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._backoff = 1.0
+        self._waiting = [0] * len(PRIORITIES)
+        self._granted_at: deque = deque()
+        self._cond = threading.Condition()
+        self.counters = {"granted": 0, "timeouts": 0, "throttled": 0, "wait_s": 0.0,
+                         "by_priority": {p: 0 for p in PRIORITIES}}
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _floor(self, rank: int) -> float:
+        """Tokens a caller of this rank must leave behind."""
+        reserve = RESERVE[PRIORITIES[rank]] * (self.capacity - 1)
+        return reserve + sum(self._waiting[:rank])
+
+    def try_acquire(self, priority: str = DEFAULT_PRIORITY) -> float:
+        """Take a token if this class may. Returns 0, or seconds to wait before retrying."""
+        rank = PRIORITIES.index(priority)
+        with self._cond:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            floor = self._floor(rank)
+            if self.tokens - 1 >= floor - 1e-9:
+                self.tokens -= 1
+                self.counters["granted"] += 1
+                self.counters["by_priority"][priority] += 1
+                self._granted_at.append(now)
+                return 0.0
+            return (floor + 1 - self.tokens) / self.rate
+
+    def _wait(self, rank: int, delta: int):
+        with self._cond:
+            self._waiting[rank] += delta
+            if delta < 0:
+                self._cond.notify_all()
+
+    def acquire(self, priority: str = DEFAULT_PRIORITY, timeout: Optional[float] = None) -> bool:
+        wait = self.try_acquire(priority)
+        if wait == 0:
+            return True
+        rank = PRIORITIES.index(priority)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        self._wait(rank, +1)
+        try:
+            while wait > 0:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        return False
+                    wait = min(wait, remaining)
+                with self._cond:
+                    self._cond.wait(min(wait, MAX_POLL_S))
+                wait = self.try_acquire(priority)
+            return True
+        finally:
+            self._wait(rank, -1)
+            self.counters["wait_s"] += time.monotonic() - start
+
+    async def acquire_async(self, priority: str = DEFAULT_PRIORITY, timeout: Optional[float] = None) -> bool:
+        wait = self.try_acquire(priority)
+        if wait == 0:
+            return True
+        rank = PRIORITIES.index(priority)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        self._wait(rank, +1)
+        try:
+            while wait > 0:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        return False
+                    wait = min(wait, remaining)
+                await asyncio.sleep(min(wait, MAX_POLL_S))
+                wait = self.try_acquire(priority)
+            return True
+        finally:
+            self._wait(rank, -1)
+            self.counters["wait_s"] += time.monotonic() - start
+
+    def feedback(self, status: int, retry_after: Optional[float] = None):
+        """Adapt to a response: back off on throttling, recover on success."""
+        with self._cond:
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self.counters["throttled"] += 1
+                self._refill(now)
+                self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate / 2)
+                pause = retry_after if retry_after is not None else self._backoff
+                self._backoff = min(MAX_BACKOFF_S, self._backoff * 2)
+                self.paused_until = max(self.paused_until, now + pause)
+                self.tokens = 0.0
+                logger.warning(f"{self.host} throttled ({status}), pausing {pause:.1f}s, "
+                               f"rate now {self.rate * 60:.0f}/min")
+            elif status < 400:
+                self._backoff = 1.0
+                if self.rate < self.base_rate:
+                    self._refill(now)
+                    self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+    def paused_for(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            while self._granted_at and now - self._granted_at[0] > UTILIZATION_WINDOW_S:
+                self._granted_at.popleft()
+            recent = len(self._granted_at)
+            return {
+                "rate_per_min": round(self.rate * 60, 2),
+                "base_rate_per_min": round(self.base_rate * 60, 2),
+                "burst": self.capacity,
+                "tokens": round(self.tokens, 2),
+                "last_minute": recent,
+                "utilization": round(recent / (self.base_rate * UTILIZATION_WINDOW_S), 3),
+                "paused_s": round(max(0.0, self.paused_until - now), 1),
+                "waiting": dict(zip(PRIORITIES, self._waiting)),
+                **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in self.counters.items()
+                   if k != "by_priority"},
+                "by_priority": dict(self.counters["by_priority"]),
+            }
+
+
+class RateBudget:
+    """Registry of HostBudgets, resolved by host, URL or api_toggle alias."""
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None,
+                 config_path: Optional[Path] = CONFIG_PATH):
+        self._configured: Dict[str, Tuple[float, int]] = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        if config_path is not None and config_path.exists():
+            try:
+                for host, cfg in json.loads(config_path.read_text()).items():
+                    self._configured[host] = (float(cfg["rate_per_min"]), int(cfg.get("burst", 5)))
+            except Exception as e:
+                logger.warning(f"Rate budget config {config_path} unreadable, using defaults: {e}")
+        self._budgets: Dict[str, HostBudget] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(target: str) -> str:
+        """Host for a URL, bare host or alias."""
+        target = ALIASES.get(target, target)
+        if "://" in target:
+            target = urlparse(target).netloc
+        return target.split("@")[-1].split(":")[0].lower()
+
+    def _key(self, host: str) -> str:
+        """Most specific configured domain for `host` (or the host itself)."""
+        parts = host.split(".")
+        for i in range(len(parts) - 1):
+            candidate = ".".join(parts[i:])
+            if candidate in self._configured:
+                return candidate
+        return host
+
+    def budget(self, target: str) -> HostBudget:
+        key = self._key(self.host_of(target))
+        budget = self._budgets.get(key)
+        if budget is None:
+            with self._lock:
+                budget = self._budgets.get(key)
+                if budget is None:
+                    rate, burst = self._configured.get(key, DEFAULT_HOST_BUDGET)
+                    budget = self._budgets[key] = HostBudget(key, rate, burst)
+        return budget
+
+    def register(self, target: str, rate_per_min: float, burst: int = 5) -> HostBudget:
+        """Declare a budget for a host nothing is configured for yet (first caller wins)."""
+        host = self.host_of(target)
+        with self._lock:
+            if self._key(host) not in self._configured:
+                self._configured[host] = (rate_per_min, burst)
+        return self.budget(host)
+
+    @staticmethod
+    def _priority(priority: Optional[str]) -> str:
+        priority = priority or _priority.get() or DEFAULT_PRIORITY
+        return priority if priority in PRIORITIES else DEFAULT_PRIORITY
+
+    def acquire(self, target: str, priority: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Wait (this thread only) for a token on `target`'s host. False on timeout."""
+        return self.budget(target).acquire(self._priority(priority), timeout)
+
+    async def acquire_async(self, target: str, priority: Optional[str] = None,
+                            timeout: Optional[float] = None) -> bool:
+        """Like acquire(), but sleeps on the event loop."""
+        return await self.budget(target).acquire_async(self._priority(priority), timeout)
+
+    def feedback(self, target: str, status: int, retry_after: Any = None):
+        if not isinstance(retry_after, (int, float)) or isinstance(retry_after, bool):
+            retry_after = retry_after_seconds(retry_after)
+        self.budget(target).feedback(status, retry_after)
+
+    def feedback_response(self, response) -> None:
+        """feedback() from a requests/httpx response."""
+        try:
+            self.feedback(str(response.url), response.status_code, response.headers.get("Retry-After"))
+        except Exception as e:
+            logger.debug(f"Rate budget feedback failed: {e}")
+
+    def paused_for(self, target: str) -> float:
+        """Seconds left on a throttling pause for `target` (0 if none)."""
+        return self.budget(target).paused_for()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            budgets = dict(self._budgets)
+        return {"hosts": {key: b.stats() for key, b in sorted(budgets.items())},
+                "priorities": list(PRIORITIES)}
+
+
+rate_budget = RateBudget()
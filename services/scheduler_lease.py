@@ -0,0 +1,104 @@
+"""
+Scheduler Lease
+
+DB-backed leader election so exactly one process runs the AgentScheduler,
+whether it is the standalone worker (`python -m scheduler`) or a web
+worker with the embedded scheduler enabled.
+
+The lease is a single row with an expiry. The holder renews it every
+ttl/3 seconds; anyone may take it over once it has expired.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from models import SchedulerLease as LeaseRow, db
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "agent-scheduler"
+DEFAULT_TTL = int(os.environ.get("SCHEDULER_LEASE_TTL", 60))
+
+
+def _holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SchedulerLease:
+    """Acquire / renew / release a named lease row. Call inside an app context."""
+
+    def __init__(self, name: str = LEASE_NAME, ttl: int = DEFAULT_TTL, holder: str = None):
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or _holder_id()
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free, expired, or already ours."""
+        now = datetime.utcnow()
+        expires = now + timedelta(seconds=self.ttl)
+        try:
+            result = db.session.execute(
+                update(LeaseRow)
+                .where(LeaseRow.name == self.name)
+                .where(or_(LeaseRow.holder == self.holder, LeaseRow.expires_at < now))
+                .values(holder=self.holder, acquired_at=now, expires_at=expires)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return True
+
+            if db.session.get(LeaseRow, self.name) is not None:
+                return False
+
+            db.session.add(LeaseRow(name=self.name, holder=self.holder, acquired_at=now, expires_at=expires))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Scheduler lease acquire failed: {e}")
+            return False
+
+    def renew(self):
+        """
+        Extend our lease.
+
+        True: renewed. False: someone else holds it, stop scheduling now.
+        None: DB error; the caller keeps running until the lease would expire.
+        """
+        try:
+            result = db.session.execute(
+                update(LeaseRow)
+                .where(LeaseRow.name == self.name, LeaseRow.holder == self.holder)
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=self.ttl))
+            )
+            db.session.commit()
+            return result.rowcount == 1
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Scheduler lease renew failed: {e}")
+            return None
+
+    def release(self):
+        try:
+            db.session.execute(
+                update(LeaseRow)
+                .where(LeaseRow.name == self.name, LeaseRow.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Scheduler lease release failed: {e}")
+
+    def current(self) -> dict:
+        row = db.session.get(LeaseRow, self.name)
+        return row.to_dict() if row else {}
@@ -2,13 +2,16 @@
 Signal Compression Service
 
 Compresses multiple findings into IC memo theses.
-Groups by (symbol, market_type) and time proximity.
+Groups by (symbol, market_type) and time proximity; within a thesis,
+near-duplicate findings (same similarity cluster) are listed once.
 """
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import List, Dict, Any
 import logging
 
+from services.finding_similarity import group_by_cluster
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +20,8 @@ def compress_findings(findings: list, window_minutes: int = 90) -> List[Dict[str
     Merge many findings into a small set of theses.
     
     Simple deterministic clustering: (symbol, market_type) + time bucket.
+    Supporting findings are deduplicated by similarity cluster, newest
+    member first, with the agents that reported it.
     
     Args:
         findings: List of Finding model instances
@@ -59,6 +64,21 @@ def compress_findings(findings: list, window_minutes: int = 90) -> List[Dict[str
         )
         avg_conf = conf_sum / max(len(fs), 1)
         
+        clusters = group_by_cluster(fs)
+        supporting = []
+        for cid, members in list(clusters.items())[:6]:
+            x = members[0]
+            supporting.append({
+                "id": getattr(x, 'id', None),
+                "agent": getattr(x, 'agent_name', 'unknown'),
+                "severity": getattr(x, 'severity', 'medium'),
+                "confidence": getattr(x, 'consensus_confidence', None) or getattr(x, 'confidence', 0.5),
+                "title": getattr(x, 'title', ''),
+                "cluster_id": cid,
+                "agents": sorted({getattr(m, 'agent_name', None) or 'unknown' for m in members}),
+                "duplicates": len(members) - 1,
+            })
+        
         start_ts = getattr(fs[-1], 'timestamp', datetime.min)
         end_ts = getattr(fs[0], 'timestamp', datetime.min)
         
@@ -72,15 +92,8 @@ def compress_findings(findings: list, window_minutes: int = 90) -> List[Dict[str
             "consensus": consensus,
             "confidence": round(float(avg_conf), 3),
             "headline": getattr(top, 'title', 'Unknown'),
-            "supporting": [
-                {
-                    "id": getattr(x, 'id', None),
-                    "agent": getattr(x, 'agent_name', 'unknown'),
-                    "severity": getattr(x, 'severity', 'medium'),
-                    "confidence": getattr(x, 'consensus_confidence', None) or getattr(x, 'confidence', 0.5),
-                    "title": getattr(x, 'title', ''),
-                } for x in fs[:6]
-            ],
+            "cluster_count": len(clusters),
+            "supporting": supporting,
         })
     
     theses.sort(
@@ -93,6 +106,14 @@ def compress_findings(findings: list, window_minutes: int = 90) -> List[Dict[str
     return theses
 
 
+def _agents_label(s: Dict[str, Any]) -> str:
+    """Reporting agent, plus how many near-duplicates were folded in."""
+    agents = s.get("agents") or [s.get("agent", "unknown")]
+    label = ", ".join(agents[:3]) + (f" +{len(agents) - 3}" if len(agents) > 3 else "")
+    dups = s.get("duplicates") or 0
+    return f"{label} (x{dups + 1})" if dups else label
+
+
 def build_ic_memo_text(theses: List[Dict[str, Any]], max_theses: int = 10) -> str:
     """
     Build IC memo text from compressed theses.
@@ -123,7 +144,7 @@ def build_ic_memo_text(theses: List[Dict[str, Any]], max_theses: int = 10) -> st
         
         for s in th["supporting"]:
             conf = s.get('confidence') or 0.5
-            lines.append(f"     • {s['agent']} [{s['severity']}] ({conf:.2f}) {s['title']}")
+            lines.append(f"     • {_agents_label(s)} [{s['severity']}] ({conf:.2f}) {s['title']}")
         lines.append("")
     
     lines.append("=" * 60)
@@ -173,7 +194,7 @@ def build_ic_memo_html(theses: List[Dict[str, Any]], max_theses: int = 10) -> st
         html.append("<ul>")
         for s in th["supporting"]:
             conf = s.get('confidence') or 0.5
-            html.append(f"<li><strong>{s['agent']}</strong> [{s['severity']}] ({conf:.2f}) — {s['title']}</li>")
+            html.append(f"<li><strong>{_agents_label(s)}</strong> [{s['severity']}] ({conf:.2f}) — {s['title']}</li>")
         html.append("</ul>")
         html.append("<hr>")
     
@@ -67,14 +67,19 @@ def build_thesis_for_findings(findings: list, model: str = "gpt") -> str:
     if not findings:
         return "No recent alerts to analyze."
     
+    # One line per near-duplicate cluster, naming every agent that reported it
+    from services.finding_similarity import group_by_cluster
+    
     lines = []
-    for f in findings:
+    for members in group_by_cluster(findings).values():
+        f = members[0]
         severity = (f.severity or "INFO").upper()
         confidence = f.confidence if hasattr(f, 'confidence') and f.confidence else 0.5
-        agent_name = f.agent_name if hasattr(f, 'agent_name') else "Unknown"
+        agents = sorted({getattr(m, 'agent_name', None) or "Unknown" for m in members})
         title = f.title if hasattr(f, 'title') else "No title"
         symbol = f.symbol if hasattr(f, 'symbol') else "N/A"
-        lines.append(f"- [{severity}|{confidence:.2f}] {agent_name}: {title} ({symbol})")
+        repeat = f" x{len(members)}" if len(members) > 1 else ""
+        lines.append(f"- [{severity}|{confidence:.2f}] {', '.join(agents)}{repeat}: {title} ({symbol})")
     
     prompt = "Recent alerts:\n" + "\n".join(lines)
     
@@ -0,0 +1,167 @@
+"""
+Data-Change Triggers and Agent DAG
+
+`TriggerGate` replaces blind interval runs for agents that declare their
+inputs in the agents/manifest.yaml `registry:` section:
+
+    ZillowDistressAgent: {module: agents.zillow_distress_agent,
+                          inputs: ["file:data/zillow/*.csv"], max_staleness: 1440}
+
+The interval trigger still fires, but the run only goes ahead if an
+input changed since the agent last ran (services.data_events), or if
+`max_staleness` minutes have passed. `file:` inputs are polled (stat
+only) by the gate itself; other inputs are published by the data
+sources. Agents without declared inputs always run. The inputs only
+count as consumed once the scheduler reports the run `completed`, so a
+failed run is retried on the next trigger.
+
+`AgentDAG` reads the manifest `dag:` section:
+
+    dag:
+      agent_allocation: {after: ["*"], debounce_s: 60}
+
+and tells the scheduler which downstream nodes are due when an upstream
+agent finishes: a node is due once any of its upstream agents completed
+since the node last ran.
+"""
+import logging
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional
+
+from services.data_events import DataEvents, data_events
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_S = 30.0
+
+
+class TriggerGate:
+    """Run an agent only when a declared input changed or it went stale."""
+
+    def __init__(self, events: Optional[DataEvents] = None, registry=None):
+        self.events = events or data_events
+        self._registry = registry
+        self._consumed: Dict[str, int] = {}
+        self._last_run: Dict[str, float] = {}
+        self._pending: Dict[str, tuple] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from agents.registry import registry
+            self._registry = registry
+        return self._registry
+
+    def inputs(self, agent_name: str) -> List[str]:
+        return list(self.registry.spec(agent_name).get("inputs") or [])
+
+    def should_run(self, agent_name: str, now: Optional[float] = None) -> bool:
+        spec = self.registry.spec(agent_name)
+        inputs = list(spec.get("inputs") or [])
+        if not inputs:
+            return True
+        now = time.time() if now is None else now
+        max_staleness = spec.get("max_staleness")
+
+        self.events.poll_files(inputs)
+        with self._lock:
+            stats = self._stats.setdefault(agent_name, {"changed": 0, "stale": 0, "skipped": 0})
+            seq = self._consumed.get(agent_name)
+            last = self._last_run.get(agent_name)
+            if seq is None:
+                reason = "first run"
+            elif self.events.changed_since(inputs, seq):
+                reason = "changed"
+            elif max_staleness is not None and (last is None or now - last >= float(max_staleness) * 60):
+                reason = "stale"
+            else:
+                stats["skipped"] += 1
+                logger.debug(f"{agent_name}: inputs unchanged, skipping run")
+                return False
+            if reason in stats:
+                stats[reason] += 1
+            self._pending[agent_name] = (self.events.seq, now)
+        logger.debug(f"{agent_name}: running ({reason})")
+        return True
+
+    def completed(self, agent_name: str):
+        """Record that the run `should_run` let through succeeded."""
+        with self._lock:
+            pending = self._pending.pop(agent_name, None)
+            if pending is not None:
+                self._consumed[agent_name], self._last_run[agent_name] = pending
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {name: dict(s) for name, s in self._stats.items()}
+        return {"runs_saved": sum(s["skipped"] for s in agents.values()), "agents": agents}
+
+
+class AgentDAG:
+    """Downstream consumer nodes that run after their upstream agents finish."""
+
+    def __init__(self, registry=None, nodes: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._registry = registry
+        self._nodes = nodes
+        self._pending: Dict[str, set] = {}
+        self._runs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nodes(self) -> Dict[str, Dict[str, Any]]:
+        if self._nodes is not None:
+            return self._nodes
+        if self._registry is None:
+            from agents.registry import registry
+            self._registry = registry
+        return self._registry.section("dag") or {}
+
+    @staticmethod
+    def _upstream_of(node: Dict[str, Any], agent_name: str) -> bool:
+        return any(fnmatchcase(agent_name, pattern) for pattern in node.get("after") or ())
+
+    def completed(self, agent_name: str) -> List[str]:
+        """Record that `agent_name` finished; returns the nodes that became due."""
+        due = []
+        with self._lock:
+            for name, node in self.nodes.items():
+                if not self._upstream_of(node or {}, agent_name):
+                    continue
+                pending = self._pending.setdefault(name, set())
+                if not pending:
+                    due.append(name)
+                pending.add(agent_name)
+        return due
+
+    def debounce(self, node: str) -> float:
+        return float((self.nodes.get(node) or {}).get("debounce_s", DEFAULT_DEBOUNCE_S))
+
+    def started(self, node: str) -> List[str]:
+        """Mark `node` as running; returns the upstream agents it is consuming."""
+        with self._lock:
+            upstream = sorted(self._pending.pop(node, set()))
+            self._runs[node] = self._runs.get(node, 0) + 1
+        return upstream
+
+    def abandon(self, node: str) -> List[str]:
+        """
+        Drop `node`'s pending upstream set when it couldn't be scheduled,
+        so the next upstream completion makes it due again.
+        """
+        with self._lock:
+            return sorted(self._pending.pop(node, set()))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: {"after": list((node or {}).get("after") or []),
+                           "pending": sorted(self._pending.get(name, ())),
+                           "runs": self._runs.get(name, 0)}
+                    for name, node in self.nodes.items()}
+
+
+trigger_gate = TriggerGate()
+agent_dag = AgentDAG()
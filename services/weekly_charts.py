@@ -3,14 +3,18 @@ from pathlib import Path
 from datetime import datetime, timezone
 from collections import defaultdict
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 
 RECON = Path("alpha/reconciled.jsonl")
 OUTDIR = Path("meta_supervisor/reports/weekly_assets")
 
+def _pyplot():
+    """matplotlib is imported on first chart, not at module load."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
 def _load_jsonl(p: Path) -> list[dict]:
     if not p.exists():
         return []
@@ -53,6 +57,7 @@ def cvar_heatmap_by_regime_png(horizon_hours: int = 24) -> Path | None:
     OUTDIR.mkdir(parents=True, exist_ok=True)
     out = OUTDIR / f"cvar_heatmap_{_now_tag()}.png"
 
+    plt = _pyplot()
     plt.figure(figsize=(10, 2.2))
     plt.imshow(mat, aspect="auto")
     plt.yticks([0], ["|CVaR95|"])
@@ -97,6 +102,7 @@ def live_vs_sim_attribution_png(horizon_hours: int = 24) -> Path | None:
         cum_live.append(a)
         cum_sim.append(b)
 
+    plt = _pyplot()
     plt.figure(figsize=(10, 3.2))
     plt.plot(cum_live, label="Live cumulative PnL (bps)")
     plt.plot(cum_sim, label="Sim cumulative (proxy) (bps)")
@@ -6,6 +6,9 @@
 class Dashboard {
     constructor() {
         this.updateInterval = 30000; // 30 seconds
+        this.streamUpdateInterval = 300000; // 5 minutes while the findings stream is live
+        this.maxRecentFindings = 10;
+        this.findingsStream = null;
         this.chart = null;
         this.updateTimer = null;
         this.timeWindowHours = 24; // Default time window
@@ -19,6 +22,7 @@ class Dashboard {
         this.setupEventListeners();
         this.loadInitialData();
         this.startAutoUpdate();
+        this.startFindingsStream();
     }
     
     loadSavedTimeWindow() {
@@ -171,6 +175,7 @@ class Dashboard {
         
         findings.forEach(finding => {
             const findingCard = this.createFindingElement(finding);
+            findingCard.dataset.findingId = finding.id;
             container.appendChild(findingCard);
         });
         
@@ -447,9 +452,44 @@ class Dashboard {
     }
     
     startAutoUpdate() {
+        this.stopAutoUpdate();
+        const live = this.findingsStream && this.findingsStream.connected;
         this.updateTimer = setInterval(() => {
             this.loadInitialData();
-        }, this.updateInterval);
+        }, live ? this.streamUpdateInterval : this.updateInterval);
+    }
+    
+    startFindingsStream() {
+        if (!window.FindingsStream) return;
+        this.findingsStream = new FindingsStream({
+            onFinding: (finding) => this.prependFinding(finding),
+            // Poll slowly while pushed, fall back to normal polling when disconnected
+            onStatus: () => this.startAutoUpdate()
+        });
+        this.findingsStream.start();
+    }
+    
+    prependFinding(finding) {
+        const container = document.getElementById('recent-findings-container');
+        if (!container) return;
+        if (container.querySelector(`[data-finding-id="${finding.id}"]`)) return;
+        
+        // Drop the "No recent findings" placeholder
+        if (!container.querySelector('[data-finding-id]')) {
+            while (container.firstChild) {
+                container.removeChild(container.firstChild);
+            }
+        }
+        
+        const card = this.createFindingElement(finding);
+        card.dataset.findingId = finding.id;
+        container.insertBefore(card, container.firstChild);
+        
+        const cards = container.querySelectorAll('[data-finding-id]');
+        for (let i = this.maxRecentFindings; i < cards.length; i++) {
+            cards[i].remove();
+        }
+        feather.replace();
     }
     
     stopAutoUpdate() {
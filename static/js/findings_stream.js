@@ -0,0 +1,70 @@
+/**
+ * Findings Stream
+ * EventSource wrapper for /api/stream/findings with filters and resume.
+ * The browser resends Last-Event-ID on reconnect; after a hard error we
+ * reopen with ?last_id= so no findings are missed.
+ */
+
+class FindingsStream {
+    constructor(options = {}) {
+        this.filters = options.filters || {}; // {agent, symbol, severity}
+        this.onFinding = options.onFinding || (() => {});
+        this.onStatus = options.onStatus || (() => {});
+        this.lastId = null;
+        this.source = null;
+        this.retryDelay = 3000;
+        this.connected = false;
+    }
+
+    url() {
+        const params = new URLSearchParams();
+        Object.entries(this.filters).forEach(([key, value]) => {
+            if (value && value.length) params.set(key, [].concat(value).join(','));
+        });
+        if (this.lastId !== null) params.set('last_id', this.lastId);
+        const qs = params.toString();
+        return '/api/stream/findings' + (qs ? '?' + qs : '');
+    }
+
+    start() {
+        if (!window.EventSource) return false;
+        this.stop();
+        this.source = new EventSource(this.url());
+
+        this.source.onopen = () => {
+            this.connected = true;
+            this.retryDelay = 3000;
+            this.onStatus(true);
+        };
+
+        this.source.addEventListener('finding', (e) => {
+            const id = parseInt(e.lastEventId, 10);
+            if (!isNaN(id)) this.lastId = id;
+            try {
+                this.onFinding(JSON.parse(e.data));
+            } catch (err) {
+                console.error('Bad finding event:', err);
+            }
+        });
+
+        this.source.onerror = () => {
+            if (this.source.readyState === EventSource.CLOSED) {
+                this.connected = false;
+                this.onStatus(false);
+                setTimeout(() => this.start(), this.retryDelay);
+                this.retryDelay = Math.min(this.retryDelay * 2, 60000);
+            }
+        };
+        return true;
+    }
+
+    stop() {
+        if (this.source) {
+            this.source.close();
+            this.source = null;
+        }
+        this.connected = false;
+    }
+}
+
+window.FindingsStream = FindingsStream;
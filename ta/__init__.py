@@ -1,10 +1,25 @@
 """Technical Analysis module for signal generation and regime detection"""
-from ta.signals import generate_signals
-from ta.indicators import rsi, macd, bollinger, ma, ema, atr, adx
-from ta.regime import classify_ta_regime, get_regime_agent_weights
+import importlib
+
+# Resolved on first access: the submodules import pandas
+_EXPORTS = {
+    'generate_signals': 'ta.signals',
+    'rsi': 'ta.indicators', 'macd': 'ta.indicators', 'bollinger': 'ta.indicators',
+    'ma': 'ta.indicators', 'ema': 'ta.indicators', 'atr': 'ta.indicators', 'adx': 'ta.indicators',
+    'classify_ta_regime': 'ta.regime', 'get_regime_agent_weights': 'ta.regime',
+}
 
 __all__ = [
     'generate_signals',
     'rsi', 'macd', 'bollinger', 'ma', 'ema', 'atr', 'adx',
     'classify_ta_regime', 'get_regime_agent_weights'
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
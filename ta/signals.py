@@ -49,13 +49,29 @@ def find_support_resistance(prices: pd.Series, lookback: int = 20) -> Tuple[floa
     return support, resistance
 
 
-def generate_signals(symbol: str, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def moving_averages(symbol: str, close: pd.Series, store=None) -> pd.DataFrame:
+    """
+    ma_20 / ma_50 for the last two bars of `close`, from the shared feature
+    definitions. With a FeatureStore the bars are merged into it and read
+    back, so the averages can use history beyond `close`.
+    """
+    names = ["ma_20", "ma_50"]
+    if store is not None:
+        store.update(symbol, close)
+        return store.get(symbol, names, asof=close.index[-1], lookback=2)
+    from features.definitions import compute
+    return compute(close, names).iloc[-2:]
+
+
+def generate_signals(symbol: str, df: pd.DataFrame, store=None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Generate technical analysis signals from price data
     
     Args:
         symbol: Ticker symbol
         df: DataFrame with OHLCV data (must have 'Close' column)
+        store: FeatureStore to read the moving averages through (live runs);
+            None computes them from `df` alone (backtests)
         
     Returns:
         Tuple of (signals list, ta_snapshot dict)
@@ -71,8 +87,9 @@ def generate_signals(symbol: str, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]
     bb_upper, bb_middle, bb_lower = compute_bollinger_bands(close)
     support, resistance = find_support_resistance(close)
     
-    ma20 = close.rolling(window=20).mean()
-    ma50 = close.rolling(window=50).mean()
+    mas = moving_averages(symbol, close, store)
+    ma20 = mas["ma_20"]
+    ma50 = mas["ma_50"]
     
     current_price = float(close.iloc[-1])
     current_rsi = float(rsi.iloc[-1])
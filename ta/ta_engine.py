@@ -22,7 +22,25 @@ def rsi(close: pd.Series, period: int = 14) -> pd.Series:
     return 100 - (100 / (1 + rs))
 
 
-def ta_vote(df) -> dict:
+TA_FEATURES = ["close", "rsi_14", "ma_20", "ma_50", "ma_200"]
+
+
+def indicators(df, symbol: str = None) -> dict:
+    """
+    Close, RSI-14 and 20/50/200 MAs at the last bar of `df`, from the shared
+    feature definitions. With a `symbol` the bars are merged into the
+    feature store first, so the MAs can use history beyond `df`.
+    """
+    if symbol:
+        from features import feature_store
+        feature_store.update(symbol, df)
+        return feature_store.latest(symbol, TA_FEATURES, asof=df.index[-1])
+    from features.definitions import compute
+    row = compute(df["Close"].astype(float), TA_FEATURES).iloc[-1]
+    return {n: float(row[n]) for n in TA_FEATURES}
+
+
+def ta_vote(df, symbol: str = None) -> dict:
     """
     Returns a TA decision: ACT/WATCH/IGNORE + rationale.
     
@@ -34,15 +52,15 @@ def ta_vote(df) -> dict:
         return {"vote": "WATCH", "score": 0.5, "reason": "insufficient price history"}
 
     try:
-        close = df["Close"].astype(float)
-        r = float(rsi(close, 14).iloc[-1])
+        ind = indicators(df, symbol)
+        r = ind["rsi_14"]
         
         if np.isnan(r):
             r = 50.0
 
-        ma20 = float(close.rolling(20).mean().iloc[-1])
-        ma50 = float(close.rolling(50).mean().iloc[-1])
-        px = float(close.iloc[-1])
+        ma20 = ind["ma_20"]
+        ma50 = ind["ma_50"]
+        px = ind["close"]
 
         trend_up = (px > ma20) and (ma20 > ma50)
         trend_down = (px < ma20) and (ma20 < ma50)
@@ -76,15 +94,14 @@ def get_ta_signals(df, symbol: str = None) -> dict:
         }
     
     try:
-        close = df["Close"].astype(float)
-        
-        rsi_val = float(rsi(close, 14).iloc[-1])
-        ma20 = float(close.rolling(20).mean().iloc[-1])
-        ma50 = float(close.rolling(50).mean().iloc[-1])
-        ma200 = float(close.rolling(200).mean().iloc[-1]) if len(close) >= 200 else None
-        px = float(close.iloc[-1])
+        ind = indicators(df, symbol)
+        rsi_val = ind["rsi_14"]
+        ma20 = ind["ma_20"]
+        ma50 = ind["ma_50"]
+        ma200 = ind["ma_200"]
+        px = ind["close"]
         
-        vote_result = ta_vote(df)
+        vote_result = ta_vote(df, symbol)
         
         return {
             "symbol": symbol,
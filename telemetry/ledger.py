@@ -0,0 +1,416 @@
+"""
+Streaming Performance Ledger
+
+One in-process view of per-agent and portfolio reward performance,
+updated as events are appended to telemetry/events.jsonl instead of
+re-parsing the log on every query.
+
+- telemetry.logger.log_event feeds each event straight in as it is written
+- lines appended by anything else (other processes, other writers) are
+  picked up incrementally from a byte-offset watermark on the next query
+- per-agent windows keep O(1) running mean/std/Sharpe and current drawdown
+  (ring buffer + running sums + monotonic deque over the equity curve)
+- state is snapshotted to disk so a restart resumes from the watermark
+
+Consumers: meta.quarantine_manager, meta.retirement, telemetry.rolling_stats,
+services.drawdown_governor, trading.drawdown_governor and
+meta.agent_builder.promotion_runner.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EVENTS = Path("telemetry/events.jsonl")
+SNAPSHOT = Path("telemetry/ledger_snapshot.json")
+
+AGENT_WINDOWS = (200, 500)
+PORTFOLIO_WINDOW = 5000
+SNAPSHOT_EVERY = 500
+SNAPSHOT_INTERVAL_S = 60.0
+
+
+class RollingWindow:
+    """
+    Fixed-size reward window with O(1) updates.
+
+    Mean, std and Sharpe come from running sums. Current drawdown comes
+    from a monotonic deque holding the running max of the cumulative
+    equity curve over the window; the equity curve starts at 0 at the
+    window's first element, so the starting level counts as a peak.
+    Max drawdown needs the whole window and is computed on demand,
+    cached until the next push.
+    """
+
+    __slots__ = ("size", "_ring", "_head", "n", "_sum", "_sumsq", "_cum", "_peaks", "_mdd")
+
+    def __init__(self, size: int):
+        self.size = int(size)
+        self._ring: List[float] = []
+        self._head = 0
+        self.n = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._cum = 0.0
+        # (index, cumulative equity) pairs, decreasing in equity; index 0 is the start level
+        self._peaks = deque([(0, 0.0)])
+        self._mdd: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def push(self, r: float):
+        r = float(r)
+        if len(self._ring) < self.size:
+            self._ring.append(r)
+        else:
+            old = self._ring[self._head]
+            self._ring[self._head] = r
+            self._head = (self._head + 1) % self.size
+            self._sum -= old
+            self._sumsq -= old * old
+        self._sum += r
+        self._sumsq += r * r
+        self.n += 1
+        self._cum += r
+
+        while self._peaks and self._peaks[-1][1] <= self._cum:
+            self._peaks.pop()
+        self._peaks.append((self.n, self._cum))
+        while self._peaks[0][0] < self.n - self.size:
+            self._peaks.popleft()
+
+        # Bound floating-point drift in the running sums
+        if self.n % self.size == 0:
+            self._sum = sum(self._ring)
+            self._sumsq = sum(x * x for x in self._ring)
+        self._mdd = None
+
+    def values(self) -> List[float]:
+        """Window contents, oldest first."""
+        return self._ring[self._head:] + self._ring[:self._head]
+
+    def tail(self, k: int) -> "RollingWindow":
+        """A new window over the last `k` values."""
+        w = RollingWindow(k)
+        for r in self.values()[-k:]:
+            w.push(r)
+        return w
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self._ring) if self._ring else 0.0
+
+    @property
+    def std(self) -> float:
+        k = len(self._ring)
+        if k < 2:
+            return 0.0
+        var = (self._sumsq - self._sum * self._sum / k) / (k - 1)
+        return math.sqrt(max(var, 0.0))
+
+    @property
+    def sharpe(self) -> float:
+        s = self.std
+        return self.mean / s if s > 1e-9 else 0.0
+
+    @property
+    def equity(self) -> float:
+        """Cumulative reward over the window."""
+        return self._sum
+
+    @property
+    def peak(self) -> float:
+        """Highest equity level reached within the window (>= 0)."""
+        return self._peaks[0][1] - (self._cum - self._sum)
+
+    @property
+    def drawdown(self) -> float:
+        """Current drawdown: equity now minus the window peak (<= 0)."""
+        return self._cum - self._peaks[0][1]
+
+    @property
+    def max_drawdown(self) -> float:
+        """Deepest peak-to-trough drawdown within the window (<= 0)."""
+        if self._mdd is None:
+            equity = peak = dd = 0.0
+            for r in self.values():
+                equity += r
+                peak = max(peak, equity)
+                dd = min(dd, equity - peak)
+            self._mdd = dd
+        return self._mdd
+
+    def stats(self) -> Dict[str, Any]:
+        if not self._ring:
+            return {"count": 0}
+        return {
+            "count": len(self._ring),
+            "mean": self.mean,
+            "std": self.std,
+            "sharpe": self.sharpe,
+            "equity": self.equity,
+            "peak": self.peak,
+            "drawdown": self.drawdown,
+            "max_drawdown": self.max_drawdown,
+        }
+
+
+def _reward_of(event: dict) -> Optional[float]:
+    r = event.get("reward")
+    if r is None:
+        return None
+    try:
+        r = float(r)
+    except (TypeError, ValueError):
+        return None
+    return r if math.isfinite(r) else None
+
+
+class PerformanceLedger:
+    """
+    Windowed per-agent and portfolio reward accumulators fed from the
+    events log.
+
+    Every query first catches up on lines appended since the watermark
+    (a single stat() when nothing changed). If the log is rotated or
+    truncated (e.g. services.drawdown_governor.reset_drawdown_state)
+    the ledger starts over from the new file.
+    """
+
+    def __init__(
+        self,
+        events_path=EVENTS,
+        snapshot_path=SNAPSHOT,
+        agent_windows=AGENT_WINDOWS,
+        portfolio_window=PORTFOLIO_WINDOW,
+        snapshot_every=SNAPSHOT_EVERY,
+    ):
+        self.events_path = Path(events_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.agent_windows = tuple(sorted(set(int(w) for w in agent_windows)))
+        self.portfolio_window = int(portfolio_window)
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self):
+        self._agents: Dict[str, Dict[int, RollingWindow]] = {}
+        self._portfolio = RollingWindow(self.portfolio_window)
+        self._portfolio_ts: deque = deque(maxlen=self.portfolio_window)
+        self.watermark = {"offset": 0, "inode": None}
+        self._dirty = 0
+        self._last_snapshot = time.monotonic()
+
+    # ---- ingest -------------------------------------------------------
+
+    def _apply(self, event: dict):
+        r = _reward_of(event)
+        if r is None:
+            return
+        self._portfolio.push(r)
+        self._portfolio_ts.append(event.get("ts") or event.get("timestamp"))
+
+        agent = event.get("agent")
+        if agent:
+            windows = self._agents.get(agent)
+            if windows is None:
+                windows = self._agents[agent] = {w: RollingWindow(w) for w in self.agent_windows}
+            for w in windows.values():
+                w.push(r)
+        self._dirty += 1
+
+    def _catch_up(self):
+        """Apply complete lines appended since the watermark."""
+        try:
+            st = self.events_path.stat()
+        except OSError:
+            if self.watermark["inode"] is not None:
+                self._reset()
+            return
+
+        offset = int(self.watermark.get("offset") or 0)
+        inode = self.watermark.get("inode")
+        if inode is not None and (inode != st.st_ino or st.st_size < offset):
+            logger.info("Events log rotated or truncated; rebuilding performance ledger")
+            self._reset()
+            offset = 0
+        if st.st_size == offset:
+            self.watermark = {"offset": offset, "inode": st.st_ino}
+            return
+
+        with self.events_path.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial write; pick it up next time
+                offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, AttributeError):
+                    continue
+        self.watermark = {"offset": offset, "inode": st.st_ino}
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            self.load_snapshot()
+        self._catch_up()
+
+    def sync(self):
+        """Bring the ledger up to date with the events log."""
+        with self._lock:
+            self._ensure_loaded()
+            self._maybe_snapshot()
+
+    def record(self, event: dict, start: int, end: int):
+        """
+        Feed an event that was just written to the log at [start, end).
+
+        If nothing else has written since the watermark the event is
+        applied directly; otherwise the ledger catches up from the file,
+        which includes this event.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._ensure_loaded()
+            offset = int(self.watermark.get("offset") or 0)
+            if end <= offset:
+                return
+            if start == offset and self.watermark.get("inode") is not None:
+                self._apply(event)
+                self.watermark["offset"] = end
+            else:
+                self._catch_up()
+            self._maybe_snapshot()
+
+    # ---- snapshot -----------------------------------------------------
+
+    def _maybe_snapshot(self):
+        if not self.snapshot_path or not self._dirty:
+            return
+        due = time.monotonic() - self._last_snapshot >= SNAPSHOT_INTERVAL_S
+        if self._dirty >= self.snapshot_every or due:
+            self.save_snapshot()
+
+    def save_snapshot(self):
+        """Write window contents and the watermark atomically (tmp file + rename)."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            largest = self.agent_windows[-1]
+            doc = {
+                "agent_windows": list(self.agent_windows),
+                "portfolio_window": self.portfolio_window,
+                "watermark": self.watermark,
+                "agents": {a: ws[largest].values() for a, ws in self._agents.items()},
+                "portfolio": list(zip(self._portfolio_ts, self._portfolio.values())),
+            }
+            try:
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.snapshot_path.with_suffix(self.snapshot_path.suffix + ".tmp")
+                tmp.write_text(json.dumps(doc, separators=(",", ":")))
+                os.replace(tmp, self.snapshot_path)
+            except OSError as e:
+                logger.warning(f"Could not write ledger snapshot: {e}")
+                return
+            self._dirty = 0
+            self._last_snapshot = time.monotonic()
+
+    def load_snapshot(self) -> bool:
+        """Restore windows and watermark from the snapshot, if compatible."""
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return False
+        try:
+            doc = json.loads(self.snapshot_path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ledger snapshot: {e}")
+            return False
+        if (tuple(doc.get("agent_windows") or ()) != self.agent_windows
+                or doc.get("portfolio_window") != self.portfolio_window):
+            return False
+
+        with self._lock:
+            self._reset()
+            for agent, rs in (doc.get("agents") or {}).items():
+                windows = self._agents[agent] = {w: RollingWindow(w) for w in self.agent_windows}
+                for r in rs:
+                    for w in windows.values():
+                        w.push(r)
+            for ts, r in doc.get("portfolio") or []:
+                self._portfolio.push(r)
+                self._portfolio_ts.append(ts)
+            self.watermark = doc.get("watermark") or {"offset": 0, "inode": None}
+            self._dirty = 0
+        return True
+
+    # ---- queries ------------------------------------------------------
+
+    def _window(self, windows: Dict[int, RollingWindow], window: int) -> RollingWindow:
+        w = windows.get(window)
+        if w is not None:
+            return w
+        largest = windows[self.agent_windows[-1]]
+        return largest.tail(window) if window < largest.size else largest
+
+    def agents(self) -> List[str]:
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._agents)
+
+    def stats(self, agent: str, window: int = 500) -> Dict[str, Any]:
+        """
+        Rolling stats for one agent over its last `window` rewards:
+        count, mean, std, sharpe, equity, peak, drawdown (current) and
+        max_drawdown. {"count": 0} if the agent has no rewards.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            windows = self._agents.get(agent)
+            if not windows:
+                return {"count": 0}
+            return self._window(windows, window).stats()
+
+    def all_stats(self, window: int = 500) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return {a: self._window(ws, window).stats() for a, ws in self._agents.items()}
+
+    def portfolio_rewards(self, last_n: Optional[int] = None) -> List[float]:
+        with self._lock:
+            self._ensure_loaded()
+            rs = self._portfolio.values()
+        return rs[-last_n:] if last_n else rs
+
+    def portfolio_curve(self, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cumulative reward equity curve over the last `last_n` rewards, starting from 0."""
+        with self._lock:
+            self._ensure_loaded()
+            pairs = list(zip(self._portfolio_ts, self._portfolio.values()))
+        if last_n:
+            pairs = pairs[-last_n:]
+        eq = 0.0
+        curve = []
+        for ts, r in pairs:
+            eq += r
+            curve.append({"t": ts, "equity": eq})
+        return curve
+
+    def portfolio_stats(self) -> Dict[str, Any]:
+        """Stats over the portfolio window (all rewards, any agent)."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._portfolio.stats()
+
+
+performance_ledger = PerformanceLedger()
@@ -1,9 +1,12 @@
 import json
+import logging
 import uuid
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional
 
+from telemetry.ledger import performance_ledger
+
 LOG_PATH = Path("telemetry/events.jsonl")
 
 
@@ -39,5 +42,13 @@ def log_event(
         "reward": reward,
     }
 
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    line = (json.dumps(event) + "\n").encode("utf-8")
+    with LOG_PATH.open("ab") as f:
+        f.write(line)
+        f.flush()
+        end = f.tell()
+
+    try:
+        performance_ledger.record(event, end - len(line), end)
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"Performance ledger update failed: {e}")
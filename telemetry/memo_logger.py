@@ -0,0 +1,25 @@
+import json
+from pathlib import Path
+from datetime import datetime
+
+LOG = Path("telemetry/memo_events.jsonl")
+
+
+def log_unchanged(agent: str, key: str, cpu_saved_s: float):
+    """
+    Append an "unchanged" event: the agent's run was skipped because its
+    inputs matched the previous run (kept out of events.jsonl, which is
+    one line per real run).
+    """
+    LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    event = {
+        "ts": datetime.utcnow().isoformat(),
+        "agent": agent,
+        "event": "unchanged",
+        "key": key,
+        "cpu_saved_s": round(cpu_saved_s, 4),
+    }
+
+    with open(LOG, "a") as f:
+        f.write(json.dumps(event) + "\n")
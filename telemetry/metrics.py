@@ -15,3 +15,10 @@ AGENT_REWARD_STD = Gauge("agent_reward_std", "Rolling stddev reward", ["agent"])
 AGENT_REWARD_SHARPE = Gauge("agent_reward_sharpe", "Rolling Sharpe-like (mean/std)", ["agent"])
 AGENT_DRAWDOWN = Gauge("agent_reward_drawdown", "Rolling drawdown (peak-to-trough) using reward proxy", ["agent"])
 AGENT_QUARANTINED = Gauge("agent_quarantined", "1 if quarantined else 0", ["agent"])
+
+AGENT_MEMO_HITS = Counter("agent_memo_hits_total", "Agent runs skipped because inputs were unchanged", ["agent"])
+AGENT_MEMO_MISSES = Counter("agent_memo_misses_total", "Memoized agent runs that had to execute", ["agent"])
+AGENT_CPU_SAVED = Counter("agent_cpu_seconds_saved_total", "CPU seconds saved by skipped unchanged runs", ["agent"])
+
+HTTP_CACHE_REQUESTS = Counter("http_cache_requests_total", "Cacheable GETs by result (hit, revalidated, miss)", ["host", "result"])
+HTTP_CACHE_BYTES_SAVED = Counter("http_cache_bytes_saved_total", "Response bytes served from the HTTP cache", ["host"])
@@ -1,15 +1,11 @@
-import json
 import math
-from pathlib import Path
-from collections import defaultdict, deque
 
+from telemetry.ledger import performance_ledger
 from telemetry.metrics import (
     AGENT_REWARD_MEAN, AGENT_REWARD_STD, AGENT_REWARD_SHARPE,
     AGENT_DRAWDOWN, AGENT_QUARANTINED
 )
 
-EVENTS = Path("telemetry/events.jsonl")
-
 
 def _mean(xs):
     return sum(xs) / len(xs) if xs else 0.0
@@ -37,36 +33,14 @@ def _drawdown(xs):
 
 
 def update_prom_metrics(window=500, last_n=5000, quarantine_set=None):
+    """Publish rolling per-agent reward gauges from the performance ledger."""
     quarantine_set = quarantine_set or set()
 
-    if not EVENTS.exists():
-        return
-
-    lines = EVENTS.read_text().splitlines()[-last_n:]
-    by = defaultdict(lambda: deque(maxlen=window))
-
-    for ln in lines:
-        try:
-            e = json.loads(ln)
-        except Exception:
+    for agent, st in performance_ledger.all_stats(window=window).items():
+        if not st["count"]:
             continue
-        a = e.get("agent")
-        r = e.get("reward")
-        if a and r is not None:
-            try:
-                by[a].append(float(r))
-            except Exception:
-                pass
-
-    for agent, dq in by.items():
-        xs = list(dq)
-        m = _mean(xs)
-        s = _std(xs)
-        sharpe = (m / s) if s > 1e-9 else 0.0
-        dd = _drawdown(xs)
-
-        AGENT_REWARD_MEAN.labels(agent).set(m)
-        AGENT_REWARD_STD.labels(agent).set(s)
-        AGENT_REWARD_SHARPE.labels(agent).set(sharpe)
-        AGENT_DRAWDOWN.labels(agent).set(dd)
+        AGENT_REWARD_MEAN.labels(agent).set(st["mean"])
+        AGENT_REWARD_STD.labels(agent).set(st["std"])
+        AGENT_REWARD_SHARPE.labels(agent).set(st["sharpe"])
+        AGENT_DRAWDOWN.labels(agent).set(st["max_drawdown"])
         AGENT_QUARANTINED.labels(agent).set(1.0 if agent in quarantine_set else 0.0)
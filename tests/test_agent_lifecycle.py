@@ -0,0 +1,153 @@
+"""
+Tests for the warm agent instance pool.
+"""
+
+import sys
+import threading
+import types
+
+import pytest
+
+import agents.lifecycle as lifecycle
+import data_sources.shared as shared
+from agents.base_agent import BaseAgent
+from agents.lifecycle import AgentLifecycleManager
+
+
+class CountingAgent(BaseAgent):
+    built = 0
+
+    def __init__(self):
+        super().__init__()
+        CountingAgent.built += 1
+        self.resets = 0
+        self.refreshes = 0
+        self.closed = False
+
+    def reset(self):
+        self.resets += 1
+
+    def refresh(self):
+        self.refreshes += 1
+
+    def close(self):
+        self.closed = True
+
+    def analyze(self):
+        return []
+
+
+class ScratchAgent(BaseAgent):
+    run_state = {"seen": list}
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def analyze(self):
+        self.seen.append(1)
+        return []
+
+
+class ColdAgent(CountingAgent):
+    warm_instance = False
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    classes = {"CountingAgent": CountingAgent, "ColdAgent": ColdAgent, "ScratchAgent": ScratchAgent}
+    monkeypatch.setattr(lifecycle, "get_agent_class", classes.get)
+    CountingAgent.built = 0
+    return AgentLifecycleManager(refresh_after=3600, max_age=6 * 3600)
+
+
+class TestAgentLifecycle:
+    """Warm reuse, hooks and timings"""
+
+    def test_instance_reused_and_reset(self, pool):
+        with pool.acquire("CountingAgent") as a:
+            first = a
+        with pool.acquire("CountingAgent") as b:
+            assert b is first
+        assert CountingAgent.built == 1
+        assert first.resets == 1
+
+        stats = pool.stats()["CountingAgent"]
+        assert stats["builds"] == 1 and stats["runs"] == 2 and stats["warm_runs"] == 1
+
+    def test_overlapping_run_gets_throwaway(self, pool):
+        with pool.acquire("CountingAgent") as a:
+            with pool.acquire("CountingAgent") as b:
+                assert b is not a
+            assert b.closed
+        assert not a.closed
+
+    def test_refresh_after_interval(self, pool):
+        pool.refresh_after = 0
+        with pool.acquire("CountingAgent"):
+            pass
+        with pool.acquire("CountingAgent") as a:
+            assert a.refreshes == 1
+
+    def test_teardown_closes_and_rebuilds(self, pool):
+        with pool.acquire("CountingAgent") as a:
+            pass
+        assert pool.teardown("CountingAgent")
+        assert a.closed
+        with pool.acquire("CountingAgent") as b:
+            assert b is not a
+        assert pool.stats()["CountingAgent"]["teardowns"] == 1
+
+    def test_cold_agents_are_not_pooled(self, pool):
+        with pool.acquire("ColdAgent") as a:
+            pass
+        with pool.acquire("ColdAgent") as b:
+            assert b is not a
+        assert a.closed and b.closed
+
+    def test_unknown_agent(self, pool):
+        with pool.acquire("Missing") as a:
+            assert a is None
+
+    def test_reset_rebuilds_run_state(self, pool):
+        with pool.acquire("ScratchAgent") as a:
+            a.analyze()
+        with pool.acquire("ScratchAgent") as b:
+            assert b is a and b.seen == []
+
+
+class TestSharedExchange:
+    """Market loading doesn't block the other shared getters"""
+
+    def test_load_markets_outside_module_lock(self, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+
+        class SlowExchange:
+            def __init__(self, config):
+                self.loads = 0
+
+            def load_markets(self, reload=False):
+                self.loads += 1
+                started.set()
+                release.wait(5)
+
+        monkeypatch.setitem(sys.modules, "ccxt", types.SimpleNamespace(slowex=SlowExchange))
+        monkeypatch.setattr(shared, "_exchanges", {})
+        monkeypatch.setattr(shared, "_exchange_locks", {})
+        monkeypatch.setattr(shared, "_markets_loaded", {})
+        results = []
+        loaders = [threading.Thread(target=lambda: results.append(shared.get_exchange("slowex")))
+                   for _ in range(2)]
+        for t in loaders:
+            t.start()
+        assert started.wait(5)
+
+        acquired = shared._lock.acquire(timeout=1)
+        assert acquired
+        shared._lock.release()
+
+        release.set()
+        for t in loaders:
+            t.join(5)
+        assert len(results) == 2 and results[0] is results[1]
+        assert results[0].loads == 1
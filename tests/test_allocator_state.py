@@ -0,0 +1,74 @@
+"""
+Tests for persisted UCB allocator state.
+
+Verifies that repeated ingests do not double-count events and that
+bandit state survives a restart.
+"""
+
+import json
+
+from meta.allocator import UCBAllocator
+
+
+def _append(path, events):
+    with path.open("a") as f:
+        for e in events:
+            f.write(json.dumps(e) + "\n")
+
+
+class TestAllocatorState:
+    """Watermarked ingestion and restore"""
+
+    def test_repeated_ingest_does_not_double_count(self, tmp_path):
+        events = tmp_path / "events.jsonl"
+        _append(events, [{"agent": "A", "reward": 1.0}, {"agent": "A", "reward": -0.5}])
+
+        alloc = UCBAllocator(state_path=tmp_path / "state.json", events_path=events)
+        assert alloc.ingest_events() == 2
+        assert alloc.ingest_events() == 0
+        assert alloc.counts["A"] == 2
+
+    def test_only_new_events_are_ingested(self, tmp_path):
+        events = tmp_path / "events.jsonl"
+        _append(events, [{"agent": "A", "reward": 1.0}])
+
+        alloc = UCBAllocator(state_path=tmp_path / "state.json", events_path=events)
+        alloc.ingest_events()
+        _append(events, [{"agent": "B", "reward": 2.0}])
+
+        assert alloc.ingest_events() == 1
+        assert alloc.counts == {"A": 1, "B": 1}
+
+    def test_partial_line_waits_for_newline(self, tmp_path):
+        events = tmp_path / "events.jsonl"
+        events.write_text('{"agent": "A", "rew')
+
+        alloc = UCBAllocator(state_path=tmp_path / "state.json", events_path=events)
+        assert alloc.ingest_events() == 0
+        with events.open("a") as f:
+            f.write('ard": 3.0}\n')
+
+        assert alloc.ingest_events() == 1
+        assert list(alloc.rewards["A"]) == [3.0]
+
+    def test_state_restored_on_restart(self, tmp_path):
+        events = tmp_path / "events.jsonl"
+        state = tmp_path / "state.json"
+        _append(events, [{"agent": "A", "reward": r} for r in (1.0, -1.0, 2.0)])
+
+        UCBAllocator(state_path=state, events_path=events).ingest_events()
+        restored = UCBAllocator(state_path=state, events_path=events)
+
+        assert restored.counts["A"] == 3
+        assert restored.last_positive["A"] == 3
+        assert restored.reward_sums["A"] == 2.0
+        assert restored.ingest_events() == 0
+
+    def test_window_bounds_running_sum(self, tmp_path):
+        alloc = UCBAllocator(window=3, state_path=None, events_path=tmp_path / "none.jsonl")
+        for r in (1.0, 2.0, 3.0, 4.0):
+            alloc._push_reward("A", r)
+
+        assert list(alloc.rewards["A"]) == [2.0, 3.0, 4.0]
+        assert alloc.reward_sums["A"] == 9.0
+        assert alloc.counts["A"] == 4
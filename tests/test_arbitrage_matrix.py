@@ -0,0 +1,157 @@
+"""
+Tests for the concurrent quote fan-out and vectorized arbitrage scan.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+import agents.arbitrage_finder_agent as arb
+from data_sources.quote_matrix import fetch_quote_matrix
+
+
+class FakeExchange:
+    def __init__(self, id, quotes, bulk=True, delay=0.0, fee=0.001, fail=False):
+        self.id = id
+        self.quotes = quotes
+        self.has = {"fetchTickers": bulk}
+        self.markets = {p: {"taker": fee} for p in quotes}
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def _ticker(self, pair):
+        bid, ask = self.quotes[pair]
+        return {"symbol": pair, "bid": bid, "ask": ask, "last": (bid + ask) / 2, "baseVolume": 10.0}
+
+    def fetch_tickers(self, symbols=None):
+        self.calls.append(("bulk", tuple(symbols)))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("exchange down")
+        return {p: self._ticker(p) for p in symbols}
+
+    def fetch_ticker(self, pair):
+        self.calls.append(("one", pair))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("exchange down")
+        return self._ticker(pair)
+
+
+PAIRS = ["BTC/USD", "ETH/USD", "SOL/USD"]
+
+
+def _exchanges(delay=0.0):
+    return {
+        "coinbase": FakeExchange("coinbase", {"BTC/USD": (100.0, 100.1), "ETH/USD": (10.0, 10.01)}, delay=delay),
+        "kraken": FakeExchange("kraken", {"BTC/USD": (104.0, 104.2), "ETH/USD": (10.0, 10.02)},
+                               bulk=False, delay=delay, fee=0.0026),
+        "kucoin": FakeExchange("kucoin", {"BTC/USD": (99.0, 99.5), "SOL/USD": (1.0, 1.01)}, delay=delay),
+    }
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(arb, "get_exchange", lambda eid: None)
+    monkeypatch.setattr(arb, "get_coinbase_client", lambda: None)
+    return arb.ArbitrageFinderAgent()
+
+
+class TestQuoteMatrix:
+    """Concurrent fan-out into a pairs x exchanges matrix"""
+
+    def test_matrix_and_bulk_calls(self):
+        exchanges = _exchanges()
+        m = fetch_quote_matrix(exchanges, PAIRS)
+        assert m.bid.shape == (3, 3)
+        assert m.bid[0].tolist() == [100.0, 104.0, 99.0]
+        assert np.isnan(m.ask[2, 0]) and m.ask[2, 2] == 1.01
+        assert exchanges["coinbase"].calls == [("bulk", ("BTC/USD", "ETH/USD"))]
+        assert [c[0] for c in exchanges["kraken"].calls] == ["one", "one"]
+        assert m.taker_fee[0, 1] == 0.0026
+
+    def test_exchanges_run_in_parallel(self):
+        m = fetch_quote_matrix(_exchanges(delay=0.2), PAIRS)
+        assert m.elapsed_s < 0.6  # kraken alone does two 0.2s calls
+
+    def test_failures_and_timeouts_are_isolated(self):
+        exchanges = _exchanges()
+        exchanges["kucoin"].fail = True
+        exchanges["coinbase"].delay = 2.0
+        m = fetch_quote_matrix(exchanges, PAIRS, timeout_s=0.3)
+        assert set(m.errors) == {"kucoin", "coinbase"}
+        assert m.bid[0, 1] == 104.0
+        assert np.isnan(m.bid[:, [0, 2]]).all()
+
+    def test_timed_out_exchange_skipped_until_fetch_returns(self):
+        exchanges = _exchanges()
+        exchanges["coinbase"].delay = 0.5
+        fetch_quote_matrix(exchanges, PAIRS, timeout_s=0.1)
+        m = fetch_quote_matrix(exchanges, PAIRS, timeout_s=0.1)
+        assert m.errors == {"coinbase": "previous fetch still in flight"}
+        assert len(exchanges["coinbase"].calls) == 1
+        assert m.bid[0, 1] == 104.0
+
+        time.sleep(0.6)
+        exchanges["coinbase"].delay = 0.0
+        m = fetch_quote_matrix(exchanges, PAIRS, timeout_s=0.1)
+        assert m.errors == {} and m.bid[0, 0] == 100.0
+
+
+class TestNetSpreads:
+    """Vectorized spreads match the pairwise definition"""
+
+    def test_matches_loop(self):
+        rng = np.random.default_rng(0)
+        bid = rng.uniform(99, 101, (4, 5))
+        ask = bid + rng.uniform(0.01, 0.5, (4, 5))
+        bid[1, 3] = ask[1, 3] = np.nan
+        fee = rng.uniform(0, 0.005, (4, 5))
+        gross, net = arb.net_spreads(bid, ask, fee)
+        for p in range(4):
+            for i in range(5):
+                for j in range(5):
+                    if i == j or np.isnan(ask[p, i]) or np.isnan(bid[p, j]):
+                        assert np.isnan(net[p, i, j])
+                        continue
+                    expected = bid[p, j] * (1 - fee[p, j]) / (ask[p, i] * (1 + fee[p, i])) - 1
+                    assert net[p, i, j] == pytest.approx(expected)
+                    assert gross[p, i, j] == pytest.approx(bid[p, j] / ask[p, i] - 1)
+
+    def test_unknown_fee_is_nan(self):
+        bid = np.array([[100.0, 104.0]])
+        ask = np.array([[100.1, 104.2]])
+        _, net = arb.net_spreads(bid, ask, np.array([[0.001, np.nan]]))
+        assert np.isnan(net).all()
+
+
+class TestAgent:
+    """Best route per pair, net of fees"""
+
+    def test_finds_best_route(self, agent):
+        m = fetch_quote_matrix(_exchanges(), PAIRS)
+        (finding,) = agent._find_arbitrage_opportunities(m)
+        meta = finding["metadata"]
+        assert (meta["buy_exchange"], meta["sell_exchange"]) == ("kucoin", "kraken")
+        assert meta["profit_percent"] == pytest.approx(104 * (1 - 0.0026) / (99.5 * 1.001) - 1)
+        assert meta["profit_percent"] < meta["gross_profit_percent"]
+        assert set(meta["all_prices"]) == {"coinbase", "kraken", "kucoin"}
+
+    def test_fees_can_erase_opportunity(self, agent):
+        agent.fee_overrides = {"kraken": 0.03, "kucoin": 0.03}
+        m = fetch_quote_matrix(_exchanges(), PAIRS)
+        assert agent._find_arbitrage_opportunities(m) == []
+
+    def test_unknown_fee_uses_default(self, agent):
+        exchanges = _exchanges()
+        exchanges["kraken"].markets = {}
+        m = fetch_quote_matrix(exchanges, PAIRS)
+        (finding,) = agent._find_arbitrage_opportunities(m)
+        meta = finding["metadata"]
+        assert meta["sell_fee"] == agent.default_fee
+        assert meta["profit_percent"] == pytest.approx(104 * (1 - agent.default_fee) / (99.5 * 1.001) - 1)
+
+        agent.default_fee = 0.03
+        assert agent._find_arbitrage_opportunities(m) == []
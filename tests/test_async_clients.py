@@ -0,0 +1,91 @@
+"""
+Tests for the asyncio data-source clients and their sync batch wrappers.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from data_sources.etherscan_client import AsyncEtherscanClient
+from data_sources.shared import gather_limited, run_async
+from data_sources.yahoo_finance_client import AsyncYahooFinanceClient
+
+DELAY = 0.3
+
+
+class _SlowEtherscan(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(DELAY)
+        query = parse_qs(urlparse(self.path).query)
+        body = json.dumps({"status": "1", "result": [{"hash": query["address"][0]}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowEtherscan)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api"
+    httpd.shutdown()
+
+
+class _FakeYahoo:
+    def __init__(self):
+        self.calls = []
+
+    def get_current_price(self, symbol):
+        time.sleep(DELAY)
+        self.calls.append(symbol)
+        if symbol == "BAD":
+            raise ValueError("no data")
+        return 100.0
+
+
+class TestAsyncBatches:
+    """Batch methods overlap their requests and isolate failures"""
+
+    def test_etherscan_batch_runs_concurrently(self, server):
+        client = AsyncEtherscanClient(base_url=server)
+        addresses = [f"0x{i:040x}" for i in range(6)]
+        start = time.monotonic()
+        result = run_async(client.get_transactions_many(addresses, limit=5), timeout=30)
+        elapsed = time.monotonic() - start
+        assert result == {a: [{"hash": a}] for a in addresses}
+        assert elapsed < DELAY * 3
+
+    def test_yahoo_batch_uses_worker_threads(self):
+        fake = _FakeYahoo()
+        client = AsyncYahooFinanceClient(sync_client=fake)
+        start = time.monotonic()
+        prices = asyncio.run(client.get_current_prices(["SPY", "QQQ", "BAD", "IWM"]))
+        assert time.monotonic() - start < DELAY * 3
+        assert prices == {"SPY": 100.0, "QQQ": 100.0, "BAD": None, "IWM": 100.0}
+        assert sorted(fake.calls) == ["BAD", "IWM", "QQQ", "SPY"]
+
+    def test_gather_limited_caps_concurrency(self):
+        in_flight = peak = 0
+
+        async def job(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return i
+
+        results = asyncio.run(gather_limited((job(i) for i in range(10)), limit=3))
+        assert results == list(range(10))
+        assert peak == 3
@@ -0,0 +1,113 @@
+"""
+Tests for the backtest market panel, feature cache and panel-mode agents.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.market_correction_agent import MarketCorrectionAgent
+from backtests.panel import FeatureCache, MarketPanel, rsi
+from backtests.runner import analyze, iter_contexts
+
+SYMBOLS = ["SPY", "QQQ", "IWM", "^VIX", "^TNX", "TLT"]
+
+
+def _frames(days=700, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2006-01-02", periods=days)
+    # Regime shifts so drawdowns, death crosses and RSI extremes all occur
+    drift = np.where((np.arange(days) // 120) % 2 == 0, 0.002, -0.003)
+    frames = {}
+    for i, sym in enumerate(SYMBOLS):
+        if sym == "^VIX":
+            close = np.clip(20 + np.cumsum(rng.normal(0, 1.5, days)), 9, 80)
+        elif sym == "^TNX":
+            close = np.clip(4 + np.cumsum(rng.normal(0, 0.06, days)), 0.5, 8)
+        else:
+            close = 100 * np.exp(np.cumsum(drift * (1 + 0.3 * i) + rng.normal(0, 0.012, days)))
+        df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99,
+                           "Close": close, "Volume": rng.integers(1e6, 5e6, days)}, index=idx)
+        if sym == "^TNX":  # bond market holidays the equity tape doesn't have
+            df = df.drop(df.index[rng.choice(days, 25, replace=False)])
+        frames[sym] = df
+    return frames
+
+
+def _strip(findings):
+    """Drop the timestamp; rolling sums may differ in the last ulp."""
+    out = []
+    for f in findings:
+        f = {k: v for k, v in f.items() if k != "timestamp"}
+        f["metadata"] = {k: pytest.approx(v, rel=1e-9) for k, v in f["metadata"].items()}
+        out.append(f)
+    return out
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return _frames()
+
+
+class TestMarketPanel:
+    """Aligned arrays and as-of feature reads"""
+
+    def test_alignment_and_counts(self, frames):
+        panel = MarketPanel.from_frames(frames, SYMBOLS)
+        tnx = panel.column("^TNX")
+        assert panel.data["Close"].shape == (700, len(SYMBOLS))
+        assert np.isnan(panel.data["Close"][:, tnx]).sum() == 25
+        assert panel.bars("^TNX", len(panel.dates) - 1) == 675
+
+        day = panel.dates[400]
+        cut = panel.frame_asof("^TNX", 400, lookback=252)
+        expected = frames["^TNX"].loc[frames["^TNX"].index <= day].tail(252)
+        pd.testing.assert_frame_equal(cut, expected)
+
+    def test_features_have_no_lookahead(self, frames):
+        panel = MarketPanel.from_frames(frames, SYMBOLS)
+        cache = FeatureCache(panel)
+        t = 450
+        for sym in ("SPY", "^TNX"):
+            close = frames[sym].loc[frames[sym].index <= panel.dates[t], "Close"]
+            assert cache.get("ma_200", sym, t) == pytest.approx(close.tail(200).mean())
+            assert cache.get("rsi_14", sym, t) == pytest.approx(rsi(close).iloc[-1])
+            assert cache.get("peak_252", sym, t) == pytest.approx(close.tail(252).max())
+            assert cache.get("close", sym, t, lag=19) == close.iloc[-20]
+
+        # Changing the future doesn't change the past
+        future = {s: df.copy() for s, df in frames.items()}
+        future["SPY"].iloc[t + 1:, future["SPY"].columns.get_loc("Close")] *= 3
+        shifted = FeatureCache(MarketPanel.from_frames(future, SYMBOLS))
+        for name in cache.names:
+            assert np.array_equal(cache.values[name][: t + 1], shifted.values[name][: t + 1], equal_nan=True)
+
+
+class TestPanelMode:
+    """Panel-mode agents reproduce frame-mode findings"""
+
+    def test_market_correction_parity(self, frames):
+        agent = MarketCorrectionAgent()
+        days = list(pd.bdate_range("2006-06-01", "2008-08-29"))
+        frame_ctx = iter_contexts(frames, SYMBOLS, days, panel=False)
+        panel_ctx = iter_contexts(frames, SYMBOLS, days, panel=True)
+
+        total = 0
+        for a, b in zip(frame_ctx, panel_ctx):
+            expected = _strip(agent.analyze_ctx(a))
+            assert _strip(analyze(agent, b)) == expected, a.asof
+            total += len(expected)
+        assert total > 50
+
+    def test_agents_without_panel_variant_get_frames(self, frames):
+        class FrameOnly:
+            def analyze_ctx(self, ctx):
+                return [{"n": len(ctx.frame("^TNX"))}]
+
+        ctx = next(iter_contexts(frames, SYMBOLS, [pd.Timestamp("2007-06-01")], lookback=100))
+        assert analyze(FrameOnly(), ctx) == [{"n": 100}]
+
+    def test_feature_needs_panel_context(self, frames):
+        ctx = next(iter_contexts(frames, SYMBOLS, [pd.Timestamp("2007-06-01")], panel=False))
+        with pytest.raises(ValueError):
+            ctx.feature("close", "SPY")
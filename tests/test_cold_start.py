@@ -0,0 +1,77 @@
+"""
+Cold-start regression tests.
+
+The web app must boot without importing agent code or heavy optional
+dependencies, and within a fixed time budget.
+"""
+
+import os
+import textwrap
+
+import pytest
+
+from agents.registry import AgentRegistry, module_name_for
+from scripts.profile_imports import run_importtime
+
+# Generous relative to a ~1.5s local cold start; override on slow CI
+WEB_COLD_START_BUDGET_S = float(os.environ.get("WEB_COLD_START_BUDGET_S", 6.0))
+
+DEFERRED = ("ccxt", "yfinance", "pandas", "sklearn", "matplotlib", "reportlab", "sendgrid")
+
+
+@pytest.fixture(scope="module")
+def profile():
+    return run_importtime("app:create_app")
+
+
+class TestWebColdStart:
+    """create_app stays light"""
+
+    def test_under_budget(self, profile):
+        _, wall = profile
+        assert wall < WEB_COLD_START_BUDGET_S
+
+    def test_heavy_dependencies_deferred(self, profile):
+        records, _ = profile
+        loaded = {r.name.split(".")[0] for r in records}
+        assert not loaded & set(DEFERRED)
+
+    def test_agents_package_does_not_import_agents(self):
+        records, _ = run_importtime("agents")
+        names = {r.name for r in records}
+        assert "agents.registry" in names
+        agent_modules = {n for n in names if n.startswith("agents.") and n.endswith("_agent")}
+        assert agent_modules == {"agents.base_agent"}
+
+
+class TestAgentRegistry:
+    """Manifest-backed lazy lookup"""
+
+    def test_module_convention_handles_acronyms(self):
+        assert module_name_for("CTAFlowsAgent") == "agents.cta_flows_agent"
+        assert module_name_for("MacroWatcherAgent") == "agents.macro_watcher_agent"
+
+    def test_manifest_registry_and_callables(self, tmp_path):
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(textwrap.dedent("""
+            agents:
+            - name: macro_watcher
+              module: agents.macro_watcher_agent
+              callable: MacroWatcherAgent.analyze
+            - name: example
+              module: agents.example_agent.agent
+              callable: run
+            registry:
+              LPPLSBubbleAgent: agents.lppl_bubble_agent
+              OddAgent: {module: agents.odd, calendar: crypto}
+        """))
+        reg = AgentRegistry(manifest)
+
+        assert set(reg.names()) == {"MacroWatcherAgent", "LPPLSBubbleAgent", "OddAgent"}
+        assert reg.module_for("LPPLSBubbleAgent") == "agents.lppl_bubble_agent"
+        assert reg.spec("OddAgent")["calendar"] == "crypto"
+        assert reg.module_for("UnlistedAgent") == "agents.unlisted_agent"
+
+    def test_unknown_agent_returns_none(self, tmp_path):
+        reg = AgentRegistry(tmp_path / "missing.yaml")
+        assert reg.get("NoSuchAgent") is None
@@ -0,0 +1,132 @@
+"""
+Tests for data-change events, the trigger gate and the agent DAG.
+"""
+
+import os
+
+import pandas as pd
+
+from services.data_events import DataEvents, bars_fingerprint
+from services.triggers import AgentDAG, TriggerGate
+
+
+class FakeRegistry:
+    def __init__(self, specs):
+        self.specs = specs
+
+    def spec(self, name):
+        return dict(self.specs.get(name, {}))
+
+
+def _bars(n, last=100.0):
+    idx = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame({"Close": [100.0] * (n - 1) + [last]}, index=idx)
+
+
+def _run(gate, name, now):
+    """should_run, then report the run completed if it went ahead"""
+    ok = gate.should_run(name, now)
+    if ok:
+        gate.completed(name)
+    return ok
+
+
+class TestDataEvents:
+    """Fingerprint-based change detection"""
+
+    def test_publish_only_on_change(self):
+        events = DataEvents()
+        assert events.publish_bars("SPY", _bars(5))
+        assert not events.publish_bars("SPY", _bars(5))
+        assert events.publish_bars("SPY", _bars(5, last=101.0))  # revised last bar
+        assert events.publish_bars("SPY", _bars(6))  # new bar
+        assert events.seq == 3
+        assert [e.key for e in events.changed_since(["bars:S*"], 2)] == ["bars:SPY"]
+        assert events.changed_since(["bars:QQQ"], 0) == []
+        assert bars_fingerprint(pd.DataFrame()) is None
+
+    def test_poll_files(self, tmp_path):
+        events = DataEvents()
+        f = tmp_path / "a.csv"
+        f.write_text("x\n1\n")
+        pattern = f"file:{tmp_path}/*.csv"
+        assert events.poll_files([pattern]) == 1
+        assert events.poll_files([pattern]) == 0
+        f.write_text("x\n1\n2\n")
+        os.utime(f, ns=(1, 2))
+        assert events.poll_files([pattern]) == 1
+
+
+class TestTriggerGate:
+    """Runs only on input change or staleness"""
+
+    def test_gate(self, tmp_path):
+        events = DataEvents()
+        gate = TriggerGate(events, FakeRegistry({
+            "Zillow": {"inputs": [f"file:{tmp_path}/*.csv"], "max_staleness": 60},
+            "Bars": {"inputs": ["bars:SPY"]},
+        }))
+        f = tmp_path / "z.csv"
+        f.write_text("a")
+        t = 1_000_000.0
+        assert _run(gate, "Zillow", t)  # first run
+        assert not _run(gate, "Zillow", t + 60)
+        f.write_text("ab")
+        assert _run(gate, "Zillow", t + 120)  # file changed
+        assert not _run(gate, "Zillow", t + 180)
+        assert _run(gate, "Zillow", t + 120 + 3600)  # stale
+
+        assert _run(gate, "Bars", t)
+        assert not _run(gate, "Bars", t + 10 ** 6)  # no staleness bound
+        events.publish_bars("SPY", _bars(3))
+        assert _run(gate, "Bars", t + 10 ** 6)
+
+        assert _run(gate, "Undeclared", t) and _run(gate, "Undeclared", t)
+        stats = gate.stats()
+        assert stats["agents"]["Zillow"] == {"changed": 1, "stale": 1, "skipped": 2}
+        assert stats["runs_saved"] == 3
+
+    def test_failed_run_not_consumed(self, tmp_path):
+        events = DataEvents()
+        gate = TriggerGate(events, FakeRegistry({"Bars": {"inputs": ["bars:SPY"], "max_staleness": 60}}))
+        t = 1_000_000.0
+        assert _run(gate, "Bars", t)
+        events.publish_bars("SPY", _bars(3))
+        assert gate.should_run("Bars", t + 60)  # run fails: completed() never called
+        assert gate.should_run("Bars", t + 120)  # same change triggers again
+        assert _run(gate, "Bars", t + 180)
+        assert not gate.should_run("Bars", t + 240)
+        assert _run(gate, "Bars", t + 180 + 3600)  # staleness counts from the last success
+
+
+class TestAgentDAG:
+    """Downstream nodes become due once per batch of upstream completions"""
+
+    def test_completion_and_start(self):
+        dag = AgentDAG(nodes={
+            "allocation": {"after": ["*"], "debounce_s": 5},
+            "regime": {"after": ["MacroWatcherAgent"]},
+        })
+        assert dag.completed("EquityMomentumAgent") == ["allocation"]
+        assert dag.completed("MacroWatcherAgent") == ["regime"]  # allocation already queued
+        assert dag.started("allocation") == ["EquityMomentumAgent", "MacroWatcherAgent"]
+        assert dag.completed("BondStressAgent") == ["allocation"]
+        assert dag.debounce("allocation") == 5.0
+        assert dag.stats()["regime"]["pending"] == ["MacroWatcherAgent"]
+
+    def test_failed_scheduling_requeues(self, monkeypatch):
+        import scheduler
+
+        dag = AgentDAG(nodes={"ensemble": {"after": ["*"]}})
+        monkeypatch.setattr(scheduler, "agent_dag", dag)
+
+        class FailingScheduler:
+            def add_job(self, **kwargs):
+                raise RuntimeError("scheduler shut down")
+
+        s = scheduler.AgentScheduler.__new__(scheduler.AgentScheduler)
+        s.scheduler = FailingScheduler()
+        for node in dag.completed("EquityMomentumAgent"):
+            s._queue_dag_node(node)
+        assert dag.stats()["ensemble"]["pending"] == []
+        assert dag.completed("BondStressAgent") == ["ensemble"]
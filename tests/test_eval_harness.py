@@ -0,0 +1,189 @@
+"""
+Tests for the concurrent, cached eval harness.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from eval import harness
+
+CALLS = []
+_calls_lock = threading.Lock()
+
+
+def slow_echo(case_input):
+    """Adapter-style callable: sleeps for input['sleep'] seconds, then echoes."""
+    with _calls_lock:
+        CALLS.append(case_input)
+    time.sleep(case_input.get("sleep", 0))
+    return [{"value": case_input.get("value")}]
+
+
+ADAPTER = f"{__name__}:slow_echo"
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def pid_echo(case_input):
+    return [{"value": case_input.get("value"), "pid": os.getpid()}]
+
+
+def _die(*args):
+    os._exit(1)
+
+
+def _dying_pool(workers):
+    ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_die), ctx.SimpleQueue()
+
+
+class StatefulAgent:
+    """Class-style callable whose instances must not be shared across threads."""
+    instances = []
+
+    def __init__(self):
+        self.threads = set()
+        StatefulAgent.instances.append(self)
+
+    def run(self, value, sleep=0):
+        self.threads.add(threading.get_ident())
+        time.sleep(sleep)
+        return [{"value": value}]
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    CALLS.clear()
+    events = []
+    monkeypatch.setattr(harness, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(harness, "log_event", lambda **kw: events.append(kw))
+    return tmp_path, events
+
+
+def _suite(path, cases):
+    path.write_text("\n".join(json.dumps(c) for c in cases) + "\n")
+    return str(path)
+
+
+def _run(tmp_path, suite, **kw):
+    return harness.run_suite(
+        module=__name__, callable_name="slow_echo", suite_path=suite,
+        out_path=str(tmp_path / "out.json"), eval_adapter=ADAPTER, **kw,
+    )
+
+
+class TestEvalHarness:
+    """Concurrent cases, timeouts, caching and latency report"""
+
+    def test_cases_run_concurrently_in_order(self, env):
+        tmp_path, events = env
+        cases = [{"id": f"c{i}", "input": {"value": i, "sleep": 0.2}} for i in range(6)]
+        suite = _suite(tmp_path / "s.jsonl", cases)
+
+        t0 = time.monotonic()
+        results = _run(tmp_path, suite, max_workers=6, executor="thread", timeout_s=0)
+        assert time.monotonic() - t0 < 0.9  # serial would take 1.2s
+
+        assert [r["id"] for r in results] == [c["id"] for c in cases]
+        assert [r["output"][0]["value"] for r in results] == list(range(6))
+        assert len(events) == 6
+
+        report = json.loads((tmp_path / "out.json").read_text())
+        assert report["latency"]["executed"] == 6
+        assert report["latency"]["p50_ms"] >= 150
+
+    def test_per_case_timeout(self, env):
+        tmp_path, _ = env
+        suite = _suite(tmp_path / "s.jsonl", [
+            {"id": "fast", "input": {"value": 1}},
+            {"id": "hung", "input": {"value": 2, "sleep": 2}},
+        ])
+        t0 = time.monotonic()
+        results = _run(tmp_path, suite, timeout_s=0.3, executor="thread", use_cache=False)
+        by_id = {r["id"]: r for r in results}
+        assert by_id["fast"]["ok"]
+        assert by_id["hung"]["timed_out"] and not by_id["hung"]["ok"]
+        assert time.monotonic() - t0 < 1.9   # the hung worker was killed, not waited on
+
+    def test_timeout_resubmits_unfinished_cases(self, env):
+        tmp_path, _ = env
+        suite = _suite(tmp_path / "s.jsonl", [
+            {"id": "hung", "input": {"value": 0, "sleep": 5}},
+            {"id": "first", "input": {"value": 1, "sleep": 0.3}},
+            {"id": "killed_with_hung", "input": {"value": 2, "sleep": 0.35}},
+            {"id": "queued", "input": {"value": 3}},
+        ])
+        results = _run(tmp_path, suite, timeout_s=0.5, max_workers=2, use_cache=False)
+        assert [r.get("timed_out", False) for r in results] == [True, False, False, False]
+        assert [r["output"][0]["value"] for r in results[1:]] == [1, 2, 3]
+
+    def test_thread_workers_get_their_own_callable(self, env):
+        tmp_path, _ = env
+        StatefulAgent.instances = []
+        suite = _suite(tmp_path / "s.jsonl", [{"id": f"c{i}", "input": {"value": i, "sleep": 0.05}}
+                                              for i in range(8)])
+        results = harness.run_suite(
+            module=__name__, callable_name="StatefulAgent.run", suite_path=suite,
+            out_path=str(tmp_path / "out.json"), executor="thread", timeout_s=0, max_workers=4,
+            use_cache=False,
+        )
+        assert [r["output"][0]["value"] for r in results] == list(range(8))
+        used = [a for a in StatefulAgent.instances if a.threads]
+        assert len(used) > 1
+        assert all(len(a.threads) == 1 for a in used)
+
+    def test_unchanged_agent_served_from_cache(self, env):
+        tmp_path, events = env
+        suite = _suite(tmp_path / "s.jsonl", [{"id": "a", "input": {"value": 1}}])
+        _run(tmp_path, suite, executor="thread", timeout_s=0)
+        assert len(CALLS) == 1
+
+        results = _run(tmp_path, suite, executor="thread", timeout_s=0)
+        assert len(CALLS) == 1
+        assert results[0]["cached"] and results[0]["output"] == [{"value": 1}]
+        assert len(events) == 1  # cache hits don't re-log telemetry
+
+        # An edited case is re-evaluated
+        suite = _suite(tmp_path / "s.jsonl", [{"id": "a", "input": {"value": 2}}])
+        assert _run(tmp_path, suite, executor="thread", timeout_s=0)[0]["output"] == [{"value": 2}]
+        assert len(CALLS) == 2
+
+    def test_source_change_invalidates_cache(self, env, monkeypatch):
+        tmp_path, _ = env
+        suite = _suite(tmp_path / "s.jsonl", [{"id": "a", "input": {"value": 1}}])
+        _run(tmp_path, suite)
+        assert _run(tmp_path, suite)[0].get("cached")
+        monkeypatch.setattr(harness, "source_fingerprint", lambda *a: "edited")
+        assert not _run(tmp_path, suite)[0].get("cached")
+
+    def test_process_executor(self, env):
+        tmp_path, _ = env
+        suite = _suite(tmp_path / "s.jsonl", [{"id": f"c{i}", "input": {"value": i}} for i in range(3)])
+        results = _run(tmp_path, suite, executor="process", max_workers=2, use_cache=False)
+        assert [r["output"][0]["value"] for r in results] == [0, 1, 2]
+
+    def test_process_workers_with_repo_root_first_on_sys_path(self, env, monkeypatch):
+        tmp_path, _ = env
+        monkeypatch.setattr(sys, "path", [ROOT] + [p for p in sys.path if p != ROOT])
+        suite = _suite(tmp_path / "s.jsonl", [{"id": f"c{i}", "input": {"value": i}} for i in range(3)])
+        results = harness.run_suite(
+            module=__name__, callable_name="pid_echo", suite_path=suite, out_path=str(tmp_path / "out.json"),
+            eval_adapter=f"{__name__}:pid_echo", executor="process", max_workers=2, use_cache=False,
+        )
+        assert all(r["ok"] for r in results), [r["error"] for r in results]
+        assert all(r["output"][0]["pid"] != os.getpid() for r in results)
+
+    def test_broken_pool_falls_back_to_threads(self, env, monkeypatch):
+        tmp_path, _ = env
+        monkeypatch.setattr(harness, "_process_pool", _dying_pool)
+        suite = _suite(tmp_path / "s.jsonl", [{"id": f"c{i}", "input": {"value": i}} for i in range(3)])
+        results = _run(tmp_path, suite, executor="process", max_workers=2, use_cache=False)
+        assert all(r["ok"] for r in results), [r["error"] for r in results]
+        assert [r["output"][0]["value"] for r in results] == [0, 1, 2]
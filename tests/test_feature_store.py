@@ -0,0 +1,157 @@
+"""
+Tests for the versioned, as-of feature store.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import features
+from features import definitions
+from features.definitions import FEATURES, compute
+from features.store import FeatureStore, LookAheadError, MARKET
+from regime.features import extract_features, extract_features_asof, merge_inputs
+from ta.signals import generate_signals
+from ta.ta_engine import indicators, ta_vote
+
+
+def _bars(n=400, seed=0, start="2020-01-01", level=100.0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(start, periods=n)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({"Close": close, "Volume": 1e6}, index=idx)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(root=tmp_path)
+
+
+class TestIncrementalUpdates:
+    """Appending bars matches a full recompute"""
+
+    def test_append_matches_full(self, store):
+        bars = _bars()
+        assert store.update("SPY", bars.iloc[:300]) == 300
+        assert store.update("SPY", bars.iloc[:300]) == 0  # nothing new
+        assert store.update("SPY", bars.iloc[250:]) == 100
+
+        full = compute(bars["Close"])
+        got = store.get("SPY")
+        assert list(got.index) == list(full.index)
+        pd.testing.assert_frame_equal(got, full[got.columns], check_names=False, rtol=1e-9)
+
+    def test_revised_bar_recomputes_from_there(self, store):
+        bars = _bars()
+        store.update("SPY", bars)
+        revised = bars.copy()
+        revised.iloc[350, 0] *= 1.2
+        assert store.update("SPY", revised.iloc[300:]) == 50
+        expected = compute(revised["Close"])
+        assert store.value("SPY", "ma_20") == pytest.approx(expected["ma_20"].iloc[-1])
+
+    def test_persisted_and_rebuilt_on_version_bump(self, tmp_path, monkeypatch):
+        FeatureStore(root=tmp_path).update("SPY", _bars())
+        reopened = FeatureStore(root=tmp_path)
+        assert reopened.value("SPY", "ma_50") == pytest.approx(_bars()["Close"].tail(50).mean())
+
+        monkeypatch.setitem(FEATURES, "ma_50", definitions.Feature("ma_50", 2, 50, lambda c: c * 0 + 1.0))
+        assert FeatureStore(root=tmp_path).value("SPY", "ma_50") == 1.0
+
+
+class TestAsOfReads:
+    """Reads never see past their as-of date"""
+
+    def test_asof_clips(self, store):
+        bars = _bars()
+        store.update("SPY", bars)
+        day = bars.index[199]
+        assert store.get("SPY", ["close"], asof=day).index[-1] == day
+        assert store.value("SPY", "close", asof=day, lag=19) == bars["Close"].iloc[180]
+
+    def test_view_refuses_future(self, store):
+        bars = _bars()
+        store.update("SPY", bars)
+        view = store.view(bars.index[100])
+        assert view.value("SPY", "close") == bars["Close"].iloc[100]
+        with pytest.raises(LookAheadError):
+            view.get("SPY", ["close"], asof=bars.index[101])
+        view.advance(bars.index[101])
+        assert view.value("SPY", "close") == bars["Close"].iloc[101]
+
+    def test_unknown_feature(self, store):
+        with pytest.raises(KeyError):
+            store.get("SPY", ["ma_13"])
+
+
+class TestMarketFeatures:
+    """Cross-symbol features and the regime extractor"""
+
+    def test_yield_curve_spread_carries_forward(self, store):
+        tnx = _bars(seed=1, level=4.0)
+        irx = _bars(seed=2, level=2.0).drop(tnx.index[10])  # 3M holiday
+        store.update("^TNX", tnx)
+        store.update("^IRX", irx)
+        spread = store.market(["yield_curve_spread"])["yield_curve_spread"]
+        day = tnx.index[10]
+        assert spread[day] == pytest.approx(tnx["Close"].iloc[10] - irx["Close"].loc[tnx.index[9]])
+        assert MARKET not in store.symbols()
+
+    def test_regime_features_match_frames(self, store):
+        frames = {"SPY": _bars(seed=3), "^VIX": _bars(seed=4, level=20.0), "^TNX": _bars(seed=5, level=4.0)}
+        for sym, df in frames.items():
+            store.update(sym, df)
+        asof = frames["SPY"].index[250]
+        cut = {s: df.loc[:asof] for s, df in frames.items()}
+        assert extract_features_asof(store, asof) == extract_features(cut["SPY"], cut["^VIX"], cut["^TNX"])
+
+
+class TestConsumers:
+    """TA, regime and bond consumers read through the store"""
+
+    @pytest.fixture
+    def shared(self, store, monkeypatch):
+        monkeypatch.setattr(features, "feature_store", store)
+        return store
+
+    def test_ta_vote_uses_stored_history(self, shared):
+        bars = _bars()
+        assert ta_vote(bars) == ta_vote(bars, "SPY")
+        short = bars.tail(60)
+        assert np.isnan(indicators(short)["ma_200"])
+        assert indicators(short, "SPY")["ma_200"] == pytest.approx(bars["Close"].tail(200).mean())
+
+    def test_signals_read_moving_averages_from_store(self, store):
+        bars = _bars()
+        store.update("QQQ", bars.iloc[:300])
+        live, ta = generate_signals("QQQ", bars.tail(80), store=store)
+        _, full = generate_signals("QQQ", bars)
+        assert ta["ma50"] == pytest.approx(full["ma50"]) and ta["ma20"] == pytest.approx(full["ma20"])
+        assert store.get("QQQ").index[-1] == bars.index[-1]
+
+    def test_regime_inputs_merged_from_loader_frames(self, store):
+        spy = _bars(seed=3).rename_axis("Date").reset_index()   # load_spy's shape
+        frames = {"SPY": spy, "^VIX": None, "^TNX": _bars(seed=5, level=4.0), "GLD": None}
+        assert not merge_inputs(frames, store)          # no VIX history yet
+        frames["^VIX"] = _bars(seed=4, level=20.0)
+        assert merge_inputs(frames, store)
+        assert merge_inputs({"SPY": spy, "^VIX": None, "^TNX": None}, store)   # failed downloads keep history
+        bars = {"SPY": _bars(seed=3), "^VIX": frames["^VIX"], "^TNX": frames["^TNX"]}
+        assert extract_features_asof(store) == extract_features(bars["SPY"], bars["^VIX"], bars["^TNX"])
+
+    def test_bond_stress_reads_yield_curve_spread(self, shared, monkeypatch):
+        import agents.bond_stress_agent as bsa
+        monkeypatch.setattr(bsa, "get_yahoo_client", lambda: None)
+        agent = bsa.BondStressAgent()
+        tnx, irx = _bars(seed=1, level=4.0), _bars(seed=2, level=2.0)
+        irx.iloc[-1, 0] = irx["Close"].iloc[-30] * 0.5       # a 50% move over 30 bars trips the signal
+        data = {s: {"data": df.tail(21), "info": agent.bond_instruments[s]} for s, df in (("^TNX", tnx), ("^IRX", irx))}
+        shared.update("^TNX", tnx.iloc[:-21])
+        shared.update("^IRX", irx.iloc[:-21])
+
+        findings = agent._analyze_yield_curve(data)
+        assert len(findings) == 1
+        meta = findings[0]["metadata"]
+        assert meta["yield_curve_spread"] == pytest.approx(tnx["Close"].iloc[-1] - irx["Close"].iloc[-1])
+        expected_3m = -(irx["Close"].iloc[-1] - irx["Close"].iloc[-30]) / irx["Close"].iloc[-30]
+        assert meta["three_month_change"] == pytest.approx(expected_3m)
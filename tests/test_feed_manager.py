@@ -0,0 +1,167 @@
+"""
+Tests for the distressed data feed runtime: per-feed cache, rate budget
+and concurrent fan-out.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import data_feeds.feed_manager as fm
+import services.rate_budget as rb
+from data_feeds.feed_manager import (
+    BaseDataFeed, DataFeedConfig, DataSourceType, FeedCache, FeedItem, FeedManager, NewsFeed,
+)
+from data_sources.shared import BudgetedSession
+
+
+class _NewsHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        type(self).hits.append(self.path)
+        body = json.dumps({"articles": [{"url": f"https://n/{len(self.hits)}", "title": "Chapter 11"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def news_api():
+    _NewsHandler.hits = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _NewsHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    fresh = rb.RateBudget(budgets={}, config_path=None)
+    monkeypatch.setattr(rb, "rate_budget", fresh)
+    monkeypatch.setattr(fm, "rate_budget", fresh)
+    return fresh
+
+
+def _news_feed(base_url, **config):
+    feed = NewsFeed(DataFeedConfig(name="news", source_type=DataSourceType.NEWS, base_url=base_url, **config))
+    feed._session = BudgetedSession()
+    return feed
+
+
+class TestFeedCache:
+    """LRU + TTL"""
+
+    def test_max_age_and_ttl(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(fm.time, "time", lambda: clock[0])
+        cache = FeedCache(max_entries=2, ttl=100)
+        cache.set("k", ["v"])
+
+        clock[0] += 30
+        assert cache.get("k", max_age=60) == ["v"]
+        clock[0] += 40
+        assert cache.get("k", max_age=60) is None     # stale for this caller, kept
+        assert "k" in cache
+        clock[0] += 40
+        assert cache.get("k") is None                 # past the hard TTL, dropped
+        assert "k" not in cache
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    def test_lru_eviction(self):
+        cache = FeedCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache and "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_repeat_fetch_served_from_cache(self, budget, news_api):
+        feed = _news_feed(news_api)
+        first = feed.fetch(company="Acme")
+        assert feed.fetch(company="Acme") is first
+        assert len(_NewsHandler.hits) == 1
+
+
+class TestRateBudget:
+    """Fetches wait on, and respect, the host's token bucket"""
+
+    def test_fetches_are_spaced_by_bucket(self, budget, news_api):
+        feed = _news_feed(news_api, rate_limit=600, burst=1)    # one token per 0.1s
+        start = time.monotonic()
+        for company in ("A", "B", "C"):
+            assert len(feed.fetch(company=company)) == 1
+        assert time.monotonic() - start >= 0.18
+        assert len(_NewsHandler.hits) == 3
+
+    def test_paused_host_skips_fetch(self, budget, news_api):
+        feed = _news_feed(news_api, timeout=5)
+        budget.feedback(news_api, 429, retry_after=120)
+        assert feed.fetch(company="Acme") == []
+        assert _NewsHandler.hits == []
+        assert len(feed._cache) == 0
+
+    def test_budget_timeout_skips_request(self, budget, news_api, monkeypatch):
+        feed = _news_feed(news_api, rate_limit=1, burst=1)
+        monkeypatch.setattr(feed._session, "budget_timeout", 0.05)
+        assert len(feed.fetch(company="A")) == 1
+        assert feed.fetch(company="B") == []
+        assert len(_NewsHandler.hits) == 1
+
+
+class _StubFeed(BaseDataFeed):
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__(DataFeedConfig(name=name, source_type=DataSourceType.NEWS, base_url=f"https://{name}.test"))
+        self.delay, self.fail = delay, fail
+
+    def fetch(self, **kwargs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.config.name} down")
+        return [self.normalize({"id": f"{self.config.name}-{i}"}) for i in range(2)]
+
+    def normalize(self, raw_data):
+        return FeedItem(id=raw_data["id"], source=self.config.name, source_type="news", timestamp="t")
+
+
+class TestFetchAll:
+    """Concurrent fan-out with incremental delivery"""
+
+    @pytest.fixture
+    def manager(self, budget):
+        manager = FeedManager()
+        manager.feeds = {f.config.name: f for f in (
+            _StubFeed("slow", delay=0.3), _StubFeed("broken", fail=True), _StubFeed("fast"),
+        )}
+        return manager
+
+    def test_order_and_error_isolation(self, manager):
+        delivered = []
+        manager.subscribe(DataSourceType.NEWS, lambda item: delivered.append(item.id))
+        items = manager.fetch_all(DataSourceType.NEWS)
+
+        assert [i.id for i in items] == ["slow-0", "slow-1", "fast-0", "fast-1"]
+        assert delivered == ["fast-0", "fast-1", "slow-0", "slow-1"]
+
+    def test_feeds_fetched_concurrently(self, manager):
+        for name in ("broken", "fast"):
+            manager.feeds[name] = _StubFeed(name, delay=0.3)
+        start = time.monotonic()
+        assert len(manager.fetch_all()) == 6
+        assert time.monotonic() - start < 0.8
+
+    def test_items_delivered_once(self, manager):
+        delivered = []
+        manager.subscribe(DataSourceType.NEWS, lambda item: delivered.append(item.id))
+        manager.fetch_all()
+        manager.fetch_all()
+        assert sorted(delivered) == ["fast-0", "fast-1", "slow-0", "slow-1"]
@@ -0,0 +1,146 @@
+"""
+Tests for near-duplicate finding clustering.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import services.finding_similarity as fs
+from services.finding_similarity import FindingIndex, group_by_cluster, signature, similarity
+from services.signal_compression import build_ic_memo_text, compress_findings
+
+T0 = datetime(2026, 1, 5, 14, 0)
+
+
+def _finding(i, agent, title, desc, symbol="SPY", minutes=0, cluster_id=None):
+    return SimpleNamespace(
+        id=i, agent_name=agent, title=title, description=desc, symbol=symbol,
+        market_type="equity", severity="medium", confidence=0.7,
+        consensus_action=None, consensus_confidence=None,
+        timestamp=T0 + timedelta(minutes=minutes), cluster_id=cluster_id,
+    )
+
+
+RSI_A = ("Bearish RSI Divergence in SPY", "Price up while RSI declined. RSI: 71.4")
+RSI_B = ("Bearish RSI Divergence in SPY", "Price up while RSI declined. RSI: 68.9")
+DEATH = ("Death Cross Detected in S&P 500", "50-day MA crossed below 200-day MA")
+
+
+class TestFindingIndex:
+    """MinHash/LSH near-duplicate assignment"""
+
+    def test_numbers_dont_split_duplicates(self):
+        assert similarity(signature(" ".join(RSI_A)), signature(" ".join(RSI_B))) == 1.0
+        assert similarity(signature(" ".join(RSI_A)), signature(" ".join(DEATH))) < 0.3
+
+    def test_clusters_by_text_and_symbol(self):
+        index = FindingIndex()
+        a = index.assign(" ".join(RSI_A), symbol="SPY", ts=T0)
+        b = index.assign(" ".join(RSI_B), symbol="spy", ts=T0)
+        c = index.assign(" ".join(DEATH), symbol="SPY", ts=T0)
+        d = index.assign(" ".join(RSI_A), symbol="QQQ", ts=T0)
+        assert a == b
+        assert len({a, c, d}) == 3
+        assert index.stats == {"inserted": 4, "joined": 1}
+
+    def test_ids_are_stable_across_processes(self):
+        assert FindingIndex().assign("x y z", "SPY", T0) == FindingIndex().assign("x y z", "SPY", T0)
+
+    def test_time_window_and_eviction(self):
+        index = FindingIndex(window_hours=1, max_items=3)
+        a = index.assign(" ".join(RSI_A), "SPY", T0)
+        variant = " ".join(RSI_A) + " again"
+        assert index.assign(variant, "SPY", T0 + timedelta(minutes=30)) == a
+        assert index.assign(variant, "SPY", T0 + timedelta(hours=2)) != a
+
+        for i in range(5):
+            index.assign(f"unrelated finding number {i} word{i}", "SPY", T0)
+        assert len(index) == 3
+        assert sum(len(b) for b in index._buckets.values()) == 3 * 16
+
+    def test_discard_rolled_back_entries(self):
+        index = FindingIndex()
+        kept = index.assign(" ".join(DEATH), "SPY", T0)
+        added = []
+        a = index.assign(" ".join(RSI_A), "SPY", T0, added=added)
+        assert index.assign(" ".join(RSI_B), "SPY", T0, added=added) == a
+        assert index.discard(added) == 2
+        assert len(index) == 1 and sum(len(b) for b in index._buckets.values()) == 16
+        assert index.assign(" ".join(DEATH) + " again", "SPY", T0) == kept
+
+
+class TestCompression:
+    """Theses and memos list each cluster once"""
+
+    def test_supporting_deduplicated(self):
+        findings = [
+            _finding(1, "EquityMomentumAgent", *RSI_A, minutes=5),
+            _finding(2, "TechnicalAnalysisAgent", *RSI_B, minutes=4),
+            _finding(3, "MarketCorrectionAgent", *DEATH, minutes=3),
+        ]
+        findings.sort(key=lambda f: f.timestamp)
+        (thesis,) = compress_findings(findings)
+        assert thesis["finding_count"] == 3
+        assert thesis["cluster_count"] == 2
+        first = thesis["supporting"][0]
+        assert first["duplicates"] == 1
+        assert first["agents"] == ["EquityMomentumAgent", "TechnicalAnalysisAgent"]
+        assert "(x2)" in build_ic_memo_text([thesis])
+
+    def test_stored_cluster_ids_win(self):
+        findings = [
+            _finding(1, "A", *RSI_A, cluster_id="c1"),
+            _finding(2, "B", *DEATH, cluster_id="c1"),
+            _finding(3, "C", *RSI_B),
+        ]
+        groups = group_by_cluster(findings)
+        assert [len(v) for v in groups.values()] == [2, 1]
+
+    def test_caller_index_used_even_when_empty(self):
+        index = FindingIndex(window_hours=24 * 365)
+        groups = group_by_cluster([_finding(1, "A", *RSI_A), _finding(2, "B", *RSI_B, minutes=1)], index=index)
+        assert len(groups) == 1 and len(index) == 2
+
+
+class _Column:
+    def __ge__(self, other):
+        return True
+
+    def isnot(self, value):
+        return True
+
+    def desc(self):
+        return None
+
+
+class _Query:
+    def __init__(self, rows, fail):
+        self.rows, self.fail = rows, fail
+
+    def filter(self, *args):
+        return self
+
+    order_by = limit = filter
+
+    def all(self):
+        if self.fail:
+            raise RuntimeError("database not ready")
+        return self.rows
+
+
+class TestWarmUp:
+    """Shared index warm-up from stored findings"""
+
+    def test_failed_warm_up_is_retried(self, monkeypatch):
+        finding = SimpleNamespace(timestamp=_Column(), cluster_id=_Column(), query=_Query([], fail=True))
+        monkeypatch.setitem(sys.modules, "models", SimpleNamespace(Finding=finding))
+        monkeypatch.setattr(fs, "_warmed", False)
+        monkeypatch.setattr(fs, "finding_index", FindingIndex(window_hours=24 * 365))
+
+        assert fs.warm_from_db() == 0
+        assert not fs._warmed
+
+        finding.query = _Query([_finding(1, "A", *RSI_A, cluster_id="c1")], fail=False)
+        assert fs.warm_from_db() == 1
+        assert fs._warmed and fs.warm_from_db() == 0
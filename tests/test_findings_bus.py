@@ -0,0 +1,92 @@
+"""
+Tests for the findings push bus.
+
+Covers server-side filtering, resume from the history ring and
+slow-subscriber backpressure.
+"""
+
+import pytest
+from flask import Flask
+
+import routes.stream as stream
+from models import Finding, db
+from websocket.bus import FindingFilter, FindingsBus
+
+
+def _event(i, agent="MacroWatcherAgent", symbol="SPY", severity="high"):
+    return {"id": i, "agent_name": agent, "symbol": symbol, "severity": severity}
+
+
+class TestFindingsBus:
+    """Fan-out, filtering and resume"""
+
+    def test_filters_on_agent_symbol_severity(self):
+        bus = FindingsBus()
+        sub, _, _ = bus.subscribe(FindingFilter(agents="macrowatcheragent", symbols="spy,qqq", severities="high,critical"))
+        bus.publish(_event(1))
+        bus.publish(_event(2, agent="Other"))
+        bus.publish(_event(3, symbol="BTC"))
+        bus.publish(_event(4, severity="low"))
+
+        assert sub.get(timeout=0)["id"] == 1
+        assert sub.get(timeout=0) is None
+
+    def test_resume_from_ring(self):
+        bus = FindingsBus(history=10)
+        for i in range(1, 6):
+            bus.publish(_event(i))
+
+        _, backlog, complete = bus.subscribe(last_id=3)
+        assert complete
+        assert [e["id"] for e in backlog] == [4, 5]
+
+    def test_resume_beyond_ring_is_incomplete(self):
+        bus = FindingsBus(history=3)
+        for i in range(1, 11):
+            bus.publish(_event(i))
+
+        _, backlog, complete = bus.subscribe(last_id=2)
+        assert not complete
+        assert [e["id"] for e in backlog] == [8, 9, 10]
+
+    def test_slow_subscriber_drops_oldest(self):
+        bus = FindingsBus()
+        sub, _, _ = bus.subscribe()
+        sub.queue.maxsize = 2
+        for i in range(1, 5):
+            bus.publish(_event(i))
+
+        assert [sub.get(timeout=0)["id"] for _ in range(2)] == [3, 4]
+        assert sub.dropped == 2
+
+    def test_unsubscribe(self):
+        bus = FindingsBus()
+        sub, _, _ = bus.subscribe()
+        bus.unsubscribe(sub)
+        bus.publish(_event(1))
+        assert sub.get(timeout=0) is None
+        assert bus.stats()["subscribers"] == 0
+
+
+@pytest.fixture
+def app_ctx():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+    with app.app_context():
+        Finding.__table__.create(db.engine)
+        yield app
+
+
+class TestBackfill:
+    """Database resume applies every filter before the row limit"""
+
+    def test_symbol_filter_before_limit(self, app_ctx, monkeypatch):
+        monkeypatch.setattr(stream, "MAX_BACKFILL", 5)
+        for i in range(8):
+            symbol = "SPY" if i >= 6 else "QQQ"
+            db.session.add(Finding(agent_name="MacroWatcherAgent", title=f"f{i}", description="d", symbol=symbol))
+        db.session.commit()
+
+        events = stream._backfill(FindingFilter(symbols="spy"), 0)
+        assert [e["title"] for e in events] == ["f6", "f7"]
@@ -0,0 +1,161 @@
+"""
+Tests for the conditional-request HTTP cache.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import services.rate_budget as rb
+from data_sources import http_cache
+from data_sources.http_cache import CachingSession, HttpCacheStore
+
+
+class _Handler(BaseHTTPRequestHandler):
+    body = b'{"v": 1}'
+    etag = '"v1"'
+    max_age = 0
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path.startswith("/etag") and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.path.startswith("/etag"):
+            self.send_header("ETag", self.etag)
+        if self.path.startswith("/maxage"):
+            self.send_header("Cache-Control", f"max-age={self.max_age}")
+        if self.path.startswith("/nostore"):
+            self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def budget(monkeypatch):
+    """Requests here don't draw on the process-wide budget for 127.0.0.1."""
+    monkeypatch.setattr(rb, "rate_budget", rb.RateBudget(budgets={}, config_path=None))
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+class TestCachingSession:
+    """ETag revalidation, max-age freshness and per-call TTLs"""
+
+    def test_etag_revalidation(self, server, tmp_path):
+        session = CachingSession(HttpCacheStore(tmp_path))
+        first = session.get(f"{server}/etag", params={"q": 1})
+        assert first.json() == {"v": 1} and not getattr(first, "from_cache", False)
+        second = session.get(f"{server}/etag", params={"q": 1})
+        assert second.from_cache and second.json() == {"v": 1}
+        assert _Handler.hits == 2  # the second request was a conditional GET answered with 304
+
+        # Another session on the same store (e.g. after a restart) revalidates too
+        third = CachingSession(HttpCacheStore(tmp_path)).get(f"{server}/etag", params={"q": 1})
+        assert third.from_cache and third.status_code == 200
+        assert http_cache.stats()["hosts"]["127.0.0.1"]["revalidated"] >= 2
+
+    def test_max_age_and_overrides(self, server, tmp_path):
+        session = CachingSession(HttpCacheStore(tmp_path))
+        _Handler.max_age = 60
+        session.get(f"{server}/maxage")
+        assert session.get(f"{server}/maxage").from_cache
+        assert _Handler.hits == 1  # fresh: no network at all
+
+        session.get(f"{server}/nostore")
+        session.get(f"{server}/nostore")
+        assert _Handler.hits == 3
+
+        session.get(f"{server}/plain", cache_ttl=60)
+        assert session.get(f"{server}/plain", cache_ttl=60).from_cache
+        assert _Handler.hits == 4
+
+    def test_auth_header_varies_key(self, server, tmp_path):
+        session = CachingSession(HttpCacheStore(tmp_path))
+        session.get(f"{server}/plain", headers={"Authorization": "token a"}, cache_ttl=60)
+        session.get(f"{server}/plain", headers={"Authorization": "token b"}, cache_ttl=60)
+        assert _Handler.hits == 2
+
+    def test_host_predicate_rejects_error_payloads(self, server, tmp_path, monkeypatch):
+        monkeypatch.setitem(http_cache.SOURCE_CACHEABLE, "127.0.0.1", http_cache._etherscan_ok)
+        session = CachingSession(HttpCacheStore(tmp_path))
+        monkeypatch.setattr(_Handler, "body", b'{"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}')
+        session.get(f"{server}/plain", cache_ttl=60)
+        assert not getattr(session.get(f"{server}/plain", cache_ttl=60), "from_cache", False)
+        assert _Handler.hits == 2
+
+        monkeypatch.setattr(_Handler, "body", b'{"status": "1", "message": "OK", "result": []}')
+        session.get(f"{server}/plain", cache_ttl=60)
+        assert session.get(f"{server}/plain", cache_ttl=60).from_cache
+        assert _Handler.hits == 3
+
+    def test_cached_response_iterates_and_streams_bypass(self, server, tmp_path):
+        session = CachingSession(HttpCacheStore(tmp_path))
+        session.get(f"{server}/plain", cache_ttl=60)
+        cached = session.get(f"{server}/plain", cache_ttl=60)
+        assert cached.from_cache
+        assert b"".join(cached.iter_content(3)) == _Handler.body
+        assert list(cached.iter_lines()) == [_Handler.body]
+        assert cached.raw.read() == _Handler.body
+
+        streamed = session.get(f"{server}/plain", cache_ttl=60, stream=True)
+        assert not getattr(streamed, "from_cache", False)
+        assert b"".join(streamed.iter_content(3)) == _Handler.body
+        assert _Handler.hits == 2
+
+    def test_credentials_not_written_to_disk(self, server, tmp_path, monkeypatch):
+        session = CachingSession(HttpCacheStore(tmp_path))
+        session.get(f"{server}/plain", params={"module": "account", "apikey": "SECRET"}, cache_ttl=60)
+        stored = [p.read_text() for p in tmp_path.glob("*/*.json")]
+        assert len(stored) == 1 and "SECRET" not in stored[0] and "module=account" in stored[0]
+
+        cached = session.get(f"{server}/plain", params={"module": "account", "apikey": "SECRET"}, cache_ttl=60)
+        assert cached.from_cache and "apikey=SECRET" in cached.url
+
+        def disk_full(*args):
+            raise OSError("disk full")
+
+        warnings = []
+        monkeypatch.setattr(session.store, "put", disk_full)
+        monkeypatch.setattr(http_cache.logger, "warning", warnings.append)
+        session.get(f"{server}/plain", params={"apikey": "SECRET", "page": 2}, cache_ttl=60)
+        assert len(warnings) == 1 and "SECRET" not in warnings[0]
+
+
+class TestHttpCacheStore:
+    """The entry limit holds on disk, across processes"""
+
+    def test_limit_counts_entries_from_earlier_processes(self, tmp_path):
+        earlier = HttpCacheStore(tmp_path, max_entries=3)
+        for i, key in enumerate(("aa1", "bb2", "cc3")):
+            earlier.put(key, {"stored_at": 1000.0 + i}, b"x")
+            os.utime(earlier._path(key, ".json"), (1000.0 + i, 1000.0 + i))
+        (tmp_path / "dd").mkdir()
+        (tmp_path / "dd" / "dd4.body").write_bytes(b"orphan")
+
+        store = HttpCacheStore(tmp_path, max_entries=3)
+        store.put("ee5", {"stored_at": 2000.0}, b"y")
+        store.put("ff6", {"stored_at": 2001.0}, b"z")
+
+        on_disk = sorted(p.name for p in tmp_path.glob("*/*.json"))
+        assert on_disk == ["cc3.json", "ee5.json", "ff6.json"]
+        assert len(list(tmp_path.glob("*/*.body"))) == 3     # the orphaned body went first
+        assert store.meta("aa1") is None and store.body("ff6") == b"z"
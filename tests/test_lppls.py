@@ -0,0 +1,112 @@
+"""
+Tests for the LPPLS calibration engine.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import agents.analyzers.lppls as lppls
+from agents.analyzers.lppls import (
+    LPPLSFilters, LPPLSFit, LPPLSGrid, _grid_sse, _summarize, confidence, fit_lppls, linear_params, scan,
+    synthetic_lppl, window_slices,
+)
+
+
+def _die():
+    os._exit(1)
+
+
+class TestFit:
+    """Concentrated grid search recovers known LPPL parameters"""
+
+    def test_grid_sse_matches_direct_least_squares(self):
+        y = np.log(synthetic_lppl(n=120, noise=0.01, seed=3))
+        t = np.linspace(0.0, 1.0, len(y))
+        yc = y - y.mean()
+        tc, m, omega = np.array([1.05, 1.2]), np.array([0.3, 0.6]), np.array([7.0, 11.0])
+        sse, _ = _grid_sse(t, yc, tc, m, omega)
+        for i, j, k in np.ndindex(sse.shape):
+            _, direct = linear_params(t, yc, tc[i], m[j], omega[k])
+            assert np.isclose(sse[i, j, k], direct, rtol=1e-6, atol=1e-9)
+
+    def test_recovers_synthetic_parameters(self):
+        prices = synthetic_lppl(n=300, tc=1.08, m=0.4, omega=9.0, B=-0.8, C1=0.04, C2=-0.03, noise=0.005)
+        fit = fit_lppls(np.log(prices))
+        assert abs(fit.tc - 1.08) < 0.02
+        assert abs(fit.m - 0.4) < 0.05
+        assert abs(fit.omega - 9.0) < 0.5
+        assert fit.B < 0 and fit.qualified()
+
+    def test_short_or_invalid_window(self):
+        assert fit_lppls(np.log(np.arange(1, 10, dtype=float))) is None
+        assert fit_lppls([1.0] * 30 + [np.nan]) is None
+
+
+class TestConfidence:
+    """DS-LPPLS indicator over shrinking windows"""
+
+    def test_bubble_scores_above_random_walk(self):
+        grid = LPPLSGrid(tc_n=12, m_n=8, omega_n=8, refine_rounds=2)
+        windows = (240, 200, 160, 120, 80)
+        bubble = confidence(synthetic_lppl(n=300, tc=1.03, noise=0.005), windows, grid, workers=1)
+        walk = np.exp(4 + np.cumsum(np.random.default_rng(7).normal(0, 0.01, 300)))
+        random_walk = confidence(walk, windows, grid, workers=1)
+        assert bubble.windows == 5
+        assert bubble.bubble >= 0.6 and bubble.negative_bubble == 0
+        assert random_walk.bubble < bubble.bubble
+        assert bubble.bubble_tc_days is not None and bubble.bubble_tc_days > 0
+        assert bubble.negative_bubble_tc_days is None
+
+    def test_tc_days_split_by_sign(self):
+        def fit(B, tc):
+            return LPPLSFit(tc=tc, m=0.5, omega=8.0, A=5.0, B=B, C1=0.01, C2=0.01, sse=0.0, n=101)
+        fits = [fit(-1.0, 1.1), fit(-1.0, 1.15), fit(1.0, 1.05), None]
+        summary = _summarize(fits, LPPLSFilters())
+        assert summary.bubble == 0.5 and summary.negative_bubble == 0.25
+        assert np.isclose(summary.bubble_tc_days, 12.5)
+        assert np.isclose(summary.negative_bubble_tc_days, 5.0)
+
+    def test_scan_in_process_pool(self, monkeypatch):
+        monkeypatch.setattr(lppls.os, "cpu_count", lambda: 4)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        monkeypatch.setattr(sys, "path", [root] + [p for p in sys.path if p != root])   # as under gunicorn
+        grid = LPPLSGrid(tc_n=6, m_n=4, omega_n=4, top_k=1, refine_rounds=1)
+        series = {"A": synthetic_lppl(n=150, seed=1), "B": synthetic_lppl(n=90, seed=2)}
+        serial = scan(series, (120, 80, 40), grid, workers=1)
+        pooled = scan(series, (120, 80, 40), grid, workers=2)
+        assert {s: r.windows for s, r in pooled.items()} == {"A": 3, "B": 2}
+        for symbol in series:
+            assert [f.tc for f in pooled[symbol].fits] == [f.tc for f in serial[symbol].fits]
+        assert lppls._pool is not None   # the pool survived the scan
+        assert lppls._pool._mp_context.get_start_method() in ("forkserver", "spawn")
+        assert lppls._get_pool(2) is lppls._pool
+        lppls.shutdown_pool()
+
+    def test_broken_pool_discarded_and_refit_in_process(self, monkeypatch):
+        monkeypatch.setattr(lppls.os, "cpu_count", lambda: 4)
+        grid = LPPLSGrid(tc_n=6, m_n=4, omega_n=4, top_k=1, refine_rounds=1)
+        jobs = window_slices(np.log(synthetic_lppl(n=150, seed=1)), (120, 80, 40))
+        serial = lppls.fit_windows(jobs, grid, workers=1)
+
+        lppls.shutdown_pool()
+        broken = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_die)
+        monkeypatch.setattr(lppls, "_pool", broken)
+        monkeypatch.setattr(lppls, "_pool_workers", 2)
+        fits = lppls.fit_windows(jobs, grid, workers=2)
+        assert [f.tc for f in fits] == [f.tc for f in serial]
+        assert lppls._pool is None
+
+        fits = lppls.fit_windows(jobs, grid, workers=2)
+        assert [f.tc for f in fits] == [f.tc for f in serial]
+        assert lppls._pool is not None and lppls._pool is not broken
+        lppls.shutdown_pool()
+
+    def test_window_slices_end_at_last_bar(self):
+        y = np.arange(100.0)
+        assert [len(w) for w in window_slices(y, (150, 100, 60))] == [100, 60]
+        assert all(w[-1] == 99.0 for w in window_slices(y, (100, 60)))
@@ -0,0 +1,78 @@
+"""
+Tests for session-aware agent scheduling.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from backtest.data.calendar import nyse_early_closes, nyse_holidays
+from services.market_hours import ExchangeCalendar, MarketHoursGate
+
+ET = ZoneInfo("America/New_York")
+
+
+def et(*args):
+    return datetime(*args, tzinfo=ET)
+
+
+class FakeRegistry:
+    def __init__(self, specs):
+        self.specs = specs
+
+    def spec(self, name):
+        return dict(self.specs.get(name, {}))
+
+
+class TestCalendar:
+    """NYSE holiday table and session checks"""
+
+    def test_holidays(self):
+        h = nyse_holidays(2024)
+        assert date(2024, 3, 29) in h  # Good Friday
+        assert date(2024, 6, 19) in h
+        assert date(2024, 11, 28) in h
+        assert len(h) == 10
+        assert date(2021, 12, 24) in nyse_holidays(2021)  # Christmas on Saturday
+        assert date(2021, 12, 31) not in nyse_holidays(2021)  # New Year's on Saturday: not observed
+        assert date(2022, 12, 26) in nyse_holidays(2022)
+        assert date(2024, 11, 29) in nyse_early_closes(2024)
+
+    def test_sessions(self):
+        cal = ExchangeCalendar()
+        assert cal.is_open("equity", et(2024, 3, 28, 10, 0))
+        assert not cal.is_open("equity", et(2024, 3, 29, 10, 0))  # holiday
+        assert not cal.is_open("equity", et(2024, 3, 30, 10, 0))  # Saturday
+        assert not cal.is_open("equity", et(2024, 3, 28, 9, 0))
+        assert cal.is_open("equity", et(2024, 3, 28, 16, 10))  # close grace
+        assert not cal.is_open("equity", et(2024, 11, 29, 14, 0))  # early close
+        assert cal.is_open("crypto", et(2024, 3, 30, 3, 0))
+        assert cal.is_open("fx", et(2024, 3, 31, 18, 0))  # Sunday evening
+        assert not cal.is_open("fx", et(2024, 3, 29, 18, 0))
+        assert cal.is_open("macro_monthly", et(2024, 3, 28, 8, 30))
+
+
+class TestGate:
+    """Off-hours slow cadence and savings accounting"""
+
+    def test_off_hours_cadence(self):
+        gate = MarketHoursGate(registry=FakeRegistry({
+            "Equity": {"calendar": "equity", "off_hours_interval": 60, "requests_per_run": 5},
+            "Crypto": {"calendar": "crypto"},
+        }))
+        start = et(2024, 3, 30, 0, 0)  # Saturday
+        runs = {"Equity": 0, "Crypto": 0, "Undeclared": 0}
+        for i in range(24 * 4):  # every 15 minutes for a day
+            now = start + timedelta(minutes=15 * i)
+            for name in runs:
+                runs[name] += gate.should_run(name, now.astimezone(timezone.utc))
+        assert runs == {"Equity": 24, "Crypto": 96, "Undeclared": 96}
+        stats = gate.stats()
+        assert stats["runs_saved"] == 72
+        assert stats["requests_saved"] == 72 * 5
+        assert stats["agents"]["Equity"]["off_hours_runs"] == 24
+
+    def test_open_session_always_runs(self):
+        gate = MarketHoursGate(registry=FakeRegistry({"Equity": {"calendar": "equity"}}))
+        now = et(2024, 3, 28, 10, 0)
+        assert all(gate.should_run("Equity", now + timedelta(minutes=m)) for m in range(0, 60, 5))
+        assert gate.stats()["runs_saved"] == 0
@@ -0,0 +1,121 @@
+"""
+Tests for the streaming performance ledger.
+"""
+
+import json
+import math
+import random
+
+import pytest
+
+from telemetry.ledger import PerformanceLedger, RollingWindow
+from telemetry.rolling_stats import _drawdown, _mean, _std
+
+
+def _append(path, *events):
+    with path.open("a") as f:
+        for e in events:
+            f.write(json.dumps(e) + "\n")
+
+
+def _naive_current_drawdown(xs):
+    equity = peak = 0.0
+    for r in xs:
+        equity += r
+        peak = max(peak, equity)
+    return equity - peak
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "events.jsonl", tmp_path / "ledger.json"
+
+
+class TestRollingWindow:
+    """O(1) accumulators agree with recomputing from scratch"""
+
+    def test_matches_naive_over_sliding_window(self):
+        rng = random.Random(7)
+        w = RollingWindow(50)
+        history = []
+        for _ in range(400):
+            r = rng.gauss(0.0, 1.0)
+            w.push(r)
+            history.append(r)
+            xs = history[-50:]
+            assert w.mean == pytest.approx(_mean(xs))
+            assert w.std == pytest.approx(_std(xs))
+            assert w.equity == pytest.approx(sum(xs))
+            assert w.drawdown == pytest.approx(_naive_current_drawdown(xs))
+            assert w.max_drawdown == pytest.approx(_drawdown(xs))
+        assert w.values() == pytest.approx(history[-50:])
+
+    def test_tail_window(self):
+        w = RollingWindow(10)
+        for r in range(10):
+            w.push(float(r))
+        assert w.tail(3).values() == [7.0, 8.0, 9.0]
+
+
+class TestPerformanceLedger:
+    """Incremental ingest, snapshot resume and log rotation"""
+
+    def test_record_and_foreign_writes(self, paths):
+        events, snap = paths
+        ledger = PerformanceLedger(events, snap, agent_windows=(5, 10), portfolio_window=20)
+
+        _append(events, {"agent": "A", "reward": 1.0}, {"agent": "B", "reward": -1.0})
+        assert ledger.stats("A")["count"] == 1
+
+        line = (json.dumps({"agent": "A", "reward": 2.0}) + "\n").encode()
+        with events.open("ab") as f:
+            f.write(line)
+            end = f.tell()
+        ledger.record({"agent": "A", "reward": 2.0}, end - len(line), end)
+
+        # written by another process, no record() call
+        _append(events, {"agent": "A", "reward": -4.0}, {"agent": "A", "latency_ms": 5})
+
+        st = ledger.stats("A", window=10)
+        assert st["count"] == 3
+        assert st["mean"] == pytest.approx(-1 / 3)
+        assert st["drawdown"] == pytest.approx(-4.0)
+        assert ledger.portfolio_rewards() == [1.0, -1.0, 2.0, -4.0]
+        assert ledger.portfolio_curve()[-1]["equity"] == pytest.approx(-2.0)
+
+    def test_untracked_window_uses_tail(self, paths):
+        events, snap = paths
+        ledger = PerformanceLedger(events, snap, agent_windows=(5, 10), portfolio_window=20)
+        _append(events, *({"agent": "A", "reward": float(i)} for i in range(10)))
+        assert ledger.stats("A", window=3)["mean"] == pytest.approx(8.0)
+        assert ledger.stats("A", window=50)["count"] == 10
+
+    def test_snapshot_resumes_from_watermark(self, paths):
+        events, snap = paths
+        _append(events, *({"agent": "A", "reward": 1.0} for _ in range(4)))
+        first = PerformanceLedger(events, snap, agent_windows=(5, 10), portfolio_window=20)
+        first.sync()
+        first.save_snapshot()
+
+        # Lines before the watermark are never re-read: corrupting them changes nothing
+        raw = events.read_bytes()
+        events.write_bytes(raw.replace(b"1.0", b"9.0"))
+        _append(events, {"agent": "A", "reward": -1.0})
+
+        restarted = PerformanceLedger(events, snap, agent_windows=(5, 10), portfolio_window=20)
+        st = restarted.stats("A")
+        assert st["count"] == 5
+        assert st["equity"] == pytest.approx(3.0)
+
+    def test_rotation_rebuilds(self, paths):
+        events, snap = paths
+        ledger = PerformanceLedger(events, snap, agent_windows=(5, 10), portfolio_window=20)
+        _append(events, *({"agent": "A", "reward": -1.0} for _ in range(5)))
+        assert ledger.portfolio_stats()["drawdown"] == pytest.approx(-5.0)
+
+        events.rename(events.with_suffix(".archived"))
+        assert ledger.portfolio_stats() == {"count": 0}
+
+        _append(events, {"agent": "B", "reward": 1.0})
+        assert ledger.agents() == ["B"]
+        assert math.isclose(ledger.portfolio_stats()["peak"], 1.0)
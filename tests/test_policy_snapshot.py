@@ -0,0 +1,91 @@
+"""
+Tests for the compiled agent-policy snapshot.
+"""
+
+import json
+import os
+
+import pytest
+
+from services import kill_switch, quarantine
+from services.policy_snapshot import PolicyCache, atomic_write_json
+import services.policy_snapshot as ps
+from meta_supervisor import kill_list
+from meta_supervisor.policy import kill_switch as policy_kill_switch
+from backtests import registry
+
+
+@pytest.fixture
+def policy_files(tmp_path, monkeypatch):
+    paths = {
+        "killed_agents": tmp_path / "killed_agents.json",
+        "killed_strategies": tmp_path / "killed_strategies.json",
+        "kill_list": tmp_path / "kill_list.json",
+        "kill_switch": tmp_path / "kill_switch.json",
+        "quarantine": tmp_path / "quarantine.json",
+        "schedule": tmp_path / "agent_schedule.json",
+    }
+    monkeypatch.setattr(kill_switch, "KILLED_AGENTS", paths["killed_agents"])
+    monkeypatch.setattr(kill_switch, "KILLED_STRATEGIES", paths["killed_strategies"])
+    monkeypatch.setattr(kill_list, "KILL", paths["kill_list"])
+    monkeypatch.setattr(policy_kill_switch, "KILL", paths["kill_switch"])
+    monkeypatch.setattr(quarantine, "QPATH", paths["quarantine"])
+    monkeypatch.setattr(registry, "SCHEDULE_PATH", paths["schedule"])
+    cache = PolicyCache()
+    monkeypatch.setattr(ps, "policy_snapshot", cache)
+    return paths, cache
+
+
+class TestPolicySnapshot:
+    """Merged gate and file-watch invalidation"""
+
+    def test_merges_every_source(self, policy_files):
+        paths, cache = policy_files
+        kill_switch.kill_agent("A1", "bad")
+        atomic_write_json(paths["killed_strategies"], [{"strategy": "perp_funding", "reason": "retired"}])
+        atomic_write_json(paths["kill_list"], {"agents": ["A2"], "strategy_classes": []})
+        policy_kill_switch.disable_agents(["A3"])
+        quarantine.quarantine("A4", "drawdown")
+        atomic_write_json(paths["schedule"], {"A5": {"enabled": False}, "A6": 15})
+        cache.set_regime_weights({"A7": 0.0, "A6": 0.5})
+
+        snap = cache.get()
+        assert snap.blocked("A1") == "kill-switch"
+        assert snap.blocked("CryptoFundingRateAgent") == "kill-switch"
+        assert snap.blocked("A2") == "meta-supervisor kill-list"
+        assert snap.blocked("A3") == "policy kill-switch"
+        assert snap.blocked("A4") == "policy kill-switch"
+        assert snap.blocked("A5") == "Meta-Agent ranking"
+        assert snap.blocked("A7") == "regime rotation"
+        assert snap.blocked("A6") is None and snap.schedule["A6"]["interval"] == 15
+        with pytest.raises(TypeError):
+            snap.schedule["A6"]["enabled"] = False
+
+    def test_rebuilds_only_on_change(self, policy_files):
+        paths, cache = policy_files
+        atomic_write_json(paths["schedule"], {"A": {"enabled": True}})
+        first = cache.get()
+        assert cache.get() is first and cache.stats["rebuilds"] == 1
+
+        # An external writer (no bump) is picked up via mtime/inode.
+        tmp = paths["schedule"].with_suffix(".new")
+        tmp.write_text(json.dumps({"A": {"enabled": False}}))
+        os.replace(tmp, paths["schedule"])
+        second = cache.get()
+        assert second is not first and not second.enabled("A")
+
+        cache.bump()
+        assert cache.get().version == cache.version
+        assert cache.stats["rebuilds"] == 3
+
+    def test_registry_reads_snapshot(self, policy_files):
+        paths, cache = policy_files
+        registry.update_schedule({"A": {"enabled": False, "weight": 0.0, "reason": "rank"}})
+        assert registry.is_agent_enabled("A") is False
+        assert registry.is_agent_enabled("B") is True
+
+    def test_torn_file_is_treated_as_empty(self, policy_files):
+        paths, cache = policy_files
+        paths["kill_list"].write_text('{"agents": ["A"')
+        assert cache.get().blocked("A") is None
+        assert not list(paths["kill_list"].parent.glob("*.tmp"))
@@ -0,0 +1,75 @@
+"""
+Tests for the array-backed position book.
+
+Checks that vectorized exposure, marks and stress P&L agree with
+straightforward per-position arithmetic.
+"""
+
+import pytest
+
+from portfolio.portfolio_manager import Portfolio, Position, RiskLimits, SecurityType
+from portfolio.position_book import historical_var, nav_returns
+
+
+def _portfolio():
+    limits = RiskLimits(
+        max_single_position_pct=1.0, max_single_issuer_pct=1.0,
+        max_sector_exposure_pct=1.0, max_subordinated_pct=1.0,
+        max_equity_pct=1.0, max_bankruptcy_pct=1.0,
+    )
+    p = Portfolio("test", 10_000_000, limits)
+    specs = [
+        ("A", SecurityType.SECURED_LOAN, "retail", "bankruptcy", 1_000_000, 80),
+        ("A", SecurityType.EQUITY, "retail", "bankruptcy", 500_000, 20),
+        ("B", SecurityType.SUBORDINATED, "energy", "distressed", 2_000_000, 50),
+    ]
+    for i, (issuer, sec_type, sector, status, face, price) in enumerate(specs):
+        ok, msg = p.add_position(Position(
+            position_id=f"p{i}", company_name=issuer, company_id=issuer,
+            security_type=sec_type, security_id=f"S{i}", face_amount=face,
+            entry_price=price, entry_date="2024-01-01",
+            industry=sector, case_status=status,
+        ))
+        assert ok, msg
+    return p
+
+
+class TestPositionBook:
+    """Vectorized risk matches per-position arithmetic"""
+
+    def test_exposure_groupby(self):
+        p = _portfolio()
+        assert p._calculate_exposure("sector") == {"retail": 900_000, "energy": 1_000_000}
+        assert p.book.exposure_of("issuer", ["A"]) == 900_000
+
+    def test_update_marks_writes_back(self):
+        p = _portfolio()
+        p.update_marks({"S2": 60})
+        pos = p.positions["p2"]
+        assert pos.current_value == pytest.approx(1_200_000)
+        assert pos.unrealized_pnl == pytest.approx(200_000)
+        assert p._calculate_nav() == pytest.approx(p.cash + 2_100_000)
+
+    def test_batched_stress_matches_loop(self):
+        p = _portfolio()
+        scenarios = p.get_default_stress_scenarios()
+        results = p.run_stress_test(scenarios)
+
+        for scenario, result in zip(scenarios, results):
+            ps = scenario.get("price_shocks", {})
+            rs = scenario.get("recovery_shocks", {})
+            expected = sum(
+                pos.current_value * (ps.get(pos.security_type.value, ps.get("default", 0)) + rs.get(pos.case_status, 0))
+                for pos in p.positions.values()
+            )
+            assert result["pnl"] == pytest.approx(expected)
+
+    def test_book_rebuilt_after_close(self):
+        p = _portfolio()
+        assert len(p.book) == 3
+        p.close_position("p0", 90)
+        assert len(p.book) == 2
+
+    def test_historical_var_quantile(self):
+        returns = nav_returns([100, 90, 99, 99, 108.9])
+        assert historical_var(returns, 0.80) == pytest.approx(0.10)
@@ -0,0 +1,129 @@
+"""
+Tests for the process-wide outbound rate budget.
+"""
+
+import asyncio
+import threading
+import time
+
+from services.rate_budget import HostBudget, RateBudget, priority_scope, retry_after_seconds
+
+
+def _drain(budget):
+    while budget.try_acquire("critical") == 0:
+        pass
+
+
+class TestHostBudget:
+    """Priority classes, throttling feedback and recovery"""
+
+    def test_priority_reserve(self):
+        budget = HostBudget("h", rate_per_min=0.001, burst=5)
+        granted = 0
+        while budget.try_acquire("exploratory") == 0:
+            granted += 1
+        assert granted == 3  # leaves half of the burst above one token
+        assert budget.try_acquire("normal") == 0
+        assert budget.try_acquire("normal") > 0
+        assert budget.try_acquire("critical") == 0
+        assert budget.stats()["by_priority"] == {"critical": 1, "normal": 1, "exploratory": 3}
+
+    def test_waiting_critical_holds_back_lower_classes(self):
+        budget = HostBudget("h", rate_per_min=600, burst=1)  # one token per 0.1s
+        _drain(budget)
+        got = []
+        t = threading.Thread(target=lambda: got.append(budget.acquire("critical", timeout=2)))
+        t.start()
+        while budget.stats()["waiting"]["critical"] == 0:
+            time.sleep(0.001)
+        time.sleep(0.12)  # a token is available now, but reserved for the critical waiter
+        assert budget.try_acquire("exploratory") > 0
+        t.join()
+        assert got == [True]
+
+    def test_throttle_feedback(self):
+        budget = HostBudget("h", rate_per_min=60, burst=2)
+        budget.feedback(429, retry_after=0.2)
+        assert budget.rate * 60 == 30
+        assert 0 < budget.try_acquire("critical") <= 0.2
+        assert budget.paused_for() > 0
+        assert not budget.acquire("critical", timeout=0.05)
+        for _ in range(20):
+            budget.feedback(200)
+        assert budget.rate * 60 == 60
+        assert budget.stats()["throttled"] == 1
+
+    def test_acquire_async_does_not_block_loop(self):
+        budget = HostBudget("h", rate_per_min=600, burst=1)
+        _drain(budget)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            results = await asyncio.gather(budget.acquire_async("normal", timeout=1), ticker())
+            return results[0]
+
+        assert asyncio.run(main())
+        assert len(ticks) == 5
+
+
+class TestRateBudget:
+    """Host resolution, aliases and priority scoping"""
+
+    def test_resolution_and_aliases(self):
+        rb = RateBudget(budgets={"finance.yahoo.com": (120, 10), "sec.gov": (600, 10)}, config_path=None)
+        assert rb.budget("https://query2.finance.yahoo.com/v8/chart") is rb.budget("yahoo_finance")
+        assert rb.budget("https://data.sec.gov/x") is rb.budget("https://www.sec.gov/y")
+        # A feed registering a stricter budget for an already-configured domain keeps the shared one
+        assert rb.register("https://data.sec.gov", 10).base_rate * 60 == 600
+        assert rb.register("https://example.com:8443", 30, 2).capacity == 2
+        assert set(rb.stats()["hosts"]) == {"finance.yahoo.com", "sec.gov", "example.com"}
+
+    def test_priority_scope(self):
+        rb = RateBudget(budgets={"h.io": (0.001, 5)}, config_path=None)
+        with priority_scope("critical"):
+            granted = sum(rb.acquire("h.io", timeout=0) for _ in range(6))
+        assert granted == 5
+        assert rb.stats()["hosts"]["h.io"]["by_priority"]["critical"] == 5
+
+    def test_retry_after_parsing(self):
+        assert retry_after_seconds("7") == 7.0
+        assert retry_after_seconds(None) is None
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class TestClients:
+    """Data-source clients honour a refused token"""
+
+    def test_coinbase_skips_call_when_budget_refuses(self, monkeypatch):
+        from data_sources import coinbase_client
+
+        rb = RateBudget(budgets={"coinbase": (0.001, 1)}, config_path=None)
+        rb.feedback("coinbase", 429, retry_after=120)
+        monkeypatch.setattr(coinbase_client, "rate_budget", rb)
+        monkeypatch.setattr(coinbase_client, "RATE_BUDGET_TIMEOUT", 0.05)
+
+        calls = []
+        client = coinbase_client.CoinbaseClient()
+        monkeypatch.setattr(client.exchange, "fetch_ticker", lambda s: calls.append(s) or {"last": 1.0})
+        assert client.get_ticker("BTC/USD") is None
+        assert calls == []
+
+    def test_yahoo_skips_call_when_budget_refuses(self, monkeypatch):
+        from data_sources import yahoo_finance_client as yfc
+
+        rb = RateBudget(budgets={"yahoo_finance": (0.001, 1)}, config_path=None)
+        rb.feedback("yahoo_finance", 429, retry_after=120)
+        monkeypatch.setattr(yfc, "rate_budget", rb)
+        monkeypatch.setattr(yfc, "RATE_BUDGET_TIMEOUT", 0.05)
+        calls = []
+        monkeypatch.setattr(yfc.yf, "Ticker", lambda s: calls.append(s))
+
+        client = yfc.YahooFinanceClient()
+        assert client.get_current_price("SPY") is None
+        assert asyncio.run(yfc.AsyncYahooFinanceClient(client).get_current_price("SPY")) is None
+        assert calls == []
@@ -0,0 +1,118 @@
+"""
+Tests for the vectorized recovery waterfall engine.
+"""
+
+import numpy as np
+import pytest
+
+from agents.analyzers.recovery_waterfall import (
+    CapitalStack,
+    RecoveryWaterfallEngine,
+    ScenarioSet,
+    recover,
+)
+from agents.distressed_deal_evaluator_agent import (
+    CapitalStructureLayer,
+    DistressedDealEvaluatorAgent,
+)
+
+
+def _layer(name, seniority, principal, price=100.0):
+    return CapitalStructureLayer(
+        name=name, seniority=seniority, claim_type="secured", principal=principal,
+        accrued_interest=0.0, secured=True, trading_price=price,
+    )
+
+
+def _loop_waterfall(layers, value):
+    """Reference: walk the layers in priority order."""
+    recovery, remaining = {}, value
+    for layer in sorted(layers, key=lambda x: x.seniority):
+        claim = layer.principal + layer.accrued_interest
+        if remaining >= claim:
+            recovery[layer.name] = 100.0
+            remaining -= claim
+        elif remaining > 0:
+            recovery[layer.name] = remaining / claim * 100
+            remaining = 0
+        else:
+            recovery[layer.name] = 0.0
+    recovery["Equity"] = max(remaining, 0)
+    return recovery
+
+
+LAYERS = [
+    _layer("Term Loan", 1, 100.0, price=95.0),
+    _layer("Senior Notes", 4, 80.0, price=60.0),
+    _layer("Sub Notes", 6, 50.0, price=20.0),
+]
+
+
+@pytest.fixture
+def engine():
+    return RecoveryWaterfallEngine(n_draws=4000, ev_vol=0.2)
+
+
+class TestWaterfall:
+    """Cumulative-sum clipping matches the priority walk"""
+
+    def test_matches_loop(self, engine):
+        stack = CapitalStack.from_layers(LAYERS)
+        values = [-10.0, 0.0, 50.0, 100.0, 150.0, 180.0, 230.0, 400.0]
+        for value, got in zip(values, engine.waterfall_points(stack, values)):
+            assert got == pytest.approx(_loop_waterfall(LAYERS, value))
+
+    def test_seniority_sorted(self):
+        stack = CapitalStack.from_layers(list(reversed(LAYERS)))
+        assert stack.names == ("Term Loan", "Senior Notes", "Sub Notes")
+
+    def test_batched_shapes(self):
+        claims = np.array([[100.0, 80.0, 0.0], [50.0, 50.0, 50.0]])
+        pct, equity = recover(claims, np.array([[120.0, 300.0], [75.0, 10.0]]))
+        assert pct.shape == (2, 2, 3)
+        assert pct[1, 0] == pytest.approx([100.0, 50.0, 0.0])
+        assert equity[0] == pytest.approx([0.0, 120.0])
+
+
+class TestSimulation:
+    """Monte Carlo recovery distributions"""
+
+    SCENARIOS = ScenarioSet(
+        enterprise_values=np.array([90.0, 170.0, 260.0]),
+        probabilities=np.array([0.3, 0.5, 0.2]),
+        timeline_months=np.array([18.0, 12.0, 12.0]),
+    )
+
+    def test_distribution_shape(self, engine):
+        stack = CapitalStack.from_layers(LAYERS)
+        (dist,) = engine.simulate([stack], [self.SCENARIOS], ["Senior Notes"], seeds=[1])
+
+        assert sum(dist["fulcrum_probability"].values()) == pytest.approx(1.0)
+        term = dist["recovery_by_class"]["Term Loan"]
+        assert term["p5"] <= term["p50"] <= term["p95"] <= 100.0
+        irr = dist["irr_percentiles"]
+        assert irr["p5"] <= irr["p50"] <= irr["p95"]
+        assert 0.0 <= dist["prob_loss"] <= 1.0
+
+    def test_batch_independent_of_composition(self, engine):
+        a = CapitalStack.from_layers(LAYERS)
+        b = CapitalStack.from_layers(LAYERS[:1])
+        alone = engine.simulate([a], [self.SCENARIOS], ["Sub Notes"], seeds=[7])[0]
+        batch = engine.simulate([b, a], [self.SCENARIOS, self.SCENARIOS], [None, "Sub Notes"], seeds=[3, 7])
+        assert batch[1] == alone
+        assert "irr_percentiles" not in batch[0]
+
+
+class TestEvaluatorIntegration:
+    """Both evaluator modules use the engine"""
+
+    def test_sample_deals_carry_distribution(self):
+        agent = DistressedDealEvaluatorAgent()
+        deal = agent._get_sample_deals()[0]
+        ev = agent.evaluate_deal(deal)
+        assert ev.recovery_distribution["n_draws"] == agent.RECOVERY_DRAWS
+        assert ev.recovery_distribution["recovery_by_class"]
+
+    def test_enhanced_module_is_same_agent(self):
+        from agents import distressed_deal_evaluator_agent_enhanced as enhanced
+        assert enhanced.DistressedDealEvaluatorAgent is DistressedDealEvaluatorAgent
@@ -0,0 +1,110 @@
+"""
+Tests for input-fingerprint memoization of agent runs.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from agents.memo import RunMemo, last_bar_stamp
+
+
+class CountingAgent(BaseAgent):
+    def __init__(self, memoize=True):
+        super().__init__("CountingAgent")
+        self.config = {"memoize": memoize}
+        self.inputs = {"bars": {"SPY": ["closed", "2024-06-14", "abc"]}}
+        self.calls = 0
+
+    def memo_inputs(self):
+        return self.inputs if self.config["memoize"] else None
+
+    def analyze(self):
+        self.calls += 1
+        return [self.create_finding("t", "d")]
+
+
+class _Pool:
+    def __init__(self, agent):
+        self.agent = agent
+
+    def peek(self, agent_name):
+        return self.agent
+
+
+@pytest.fixture
+def sched(monkeypatch):
+    """A scheduler whose only agent is the returned CountingAgent"""
+    import scheduler
+
+    agent = CountingAgent()
+    queued = []
+    monkeypatch.setattr(scheduler, "agent_pool", _Pool(agent))
+    monkeypatch.setattr(scheduler.market_hours, "should_run", lambda name: True)
+    monkeypatch.setattr(scheduler.trigger_gate, "should_run", lambda name: True)
+    monkeypatch.setattr(scheduler.agent_dag, "completed", lambda name: ["Downstream"])
+    s = scheduler.AgentScheduler.__new__(scheduler.AgentScheduler)
+    s._run_agent = lambda name: agent.run()
+    s._queue_dag_node = queued.append
+    return s, agent, queued
+
+
+class TestRunMemo:
+    """Skips scheduled runs while declared inputs are unchanged"""
+
+    def test_hit_skips_run(self, tmp_path, monkeypatch, sched):
+        monkeypatch.chdir(tmp_path)
+        memo = RunMemo()
+        monkeypatch.setattr("agents.memo.run_memo", memo)
+        monkeypatch.setattr("scheduler.run_memo", memo)
+        s, agent, queued = sched
+        events = tmp_path / "telemetry" / "events.jsonl"
+
+        assert len(s._run_scheduled("CountingAgent")) == 1
+        runs_logged = events.read_text()
+        assert s._run_scheduled("CountingAgent") is None
+        assert agent.calls == 1
+        assert events.read_text() == runs_logged
+        assert queued == ["Downstream"]
+        assert (tmp_path / "telemetry" / "memo_events.jsonl").read_text().count('"unchanged"') == 1
+
+        agent.inputs = {"bars": {"SPY": ["closed", "2024-06-17", "def"]}}
+        assert len(s._run_scheduled("CountingAgent")) == 1
+        assert agent.calls == 2
+        assert queued == ["Downstream", "Downstream"]
+
+        stats = memo.stats()
+        assert stats["agents"]["CountingAgent"]["hits"] == 1
+        assert stats["agents"]["CountingAgent"]["misses"] == 2
+        assert abs(stats["hit_rate"] - 1 / 3) < 1e-9
+
+    def test_run_now_is_never_memoized(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("agents.memo.run_memo", RunMemo())
+        agent = CountingAgent()
+        agent.run()
+        agent.run()
+        assert agent.calls == 2
+
+    def test_disabled_and_ttl(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        memo = RunMemo()
+        monkeypatch.setattr("agents.memo.run_memo", memo)
+
+        off = CountingAgent(memoize=False)
+        off.run()
+        assert memo.lookup(off) == (False, None)
+        assert memo.stats()["agents"] == {}
+
+        expiring = CountingAgent()
+        expiring.config["memo_ttl_minutes"] = 0
+        expiring.run()
+        assert memo.lookup(expiring)[0] is False
+
+    def test_last_bar_stamp(self):
+        saturday = datetime(2024, 6, 15, 15, 0, tzinfo=timezone.utc)
+        assert last_bar_stamp("equity", saturday) == ("closed", "2024-06-14")
+        open_ = datetime(2024, 6, 14, 15, 0, tzinfo=timezone.utc)  # 11:00 ET
+        assert last_bar_stamp("equity", open_) == ("live", "2024-06-14T15:00")
+        assert last_bar_stamp("crypto", saturday)[0] == "live"
@@ -0,0 +1,73 @@
+"""
+Tests for the DB-backed scheduler lease (leader election).
+"""
+
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from models import SchedulerLease as LeaseRow, db
+from services.scheduler_lease import SchedulerLease
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def app_ctx():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+    with app.app_context():
+        LeaseRow.__table__.create(db.engine)
+        yield app
+
+
+class TestSchedulerLease:
+    """Only one holder at a time; expired leases can be taken over"""
+
+    def test_single_leader(self, app_ctx):
+        a = SchedulerLease(holder="a", ttl=60)
+        b = SchedulerLease(holder="b", ttl=60)
+        assert a.acquire()
+        assert not b.acquire()
+        assert a.acquire()  # re-acquire by the holder is a renewal
+
+    def test_renew_only_by_holder(self, app_ctx):
+        a = SchedulerLease(holder="a", ttl=60)
+        b = SchedulerLease(holder="b", ttl=60)
+        a.acquire()
+        assert a.renew() is True
+        assert b.renew() is False
+
+    def test_takeover_after_expiry(self, app_ctx):
+        a = SchedulerLease(holder="a", ttl=60)
+        b = SchedulerLease(holder="b", ttl=60)
+        a.acquire()
+        row = db.session.get(LeaseRow, a.name)
+        row.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        assert b.acquire()
+        assert a.renew() is False
+        assert b.current()["holder"] == "b"
+
+    def test_release_frees_lease(self, app_ctx):
+        a = SchedulerLease(holder="a", ttl=60)
+        b = SchedulerLease(holder="b", ttl=60)
+        a.acquire()
+        a.release()
+        assert b.acquire()
+
+
+class TestWorkerEntry:
+    """The Procfile worker command starts from the repo root"""
+
+    def test_python_m_scheduler_imports(self):
+        proc = subprocess.run([sys.executable, "-m", "scheduler", "--help"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=120)
+        assert proc.returncode == 0, proc.stderr
+        assert "standalone worker" in proc.stdout
@@ -0,0 +1,87 @@
+"""
+Tests for incremental, cursor-based wallet tracking.
+"""
+
+import asyncio
+
+from data_sources.wallet_tracker import WalletTracker, WalletTx, rapid_fire, repeated_amounts
+
+WHALE = "0xAbC0000000000000000000000000000000000001"
+
+
+def _tx(block, ts, value_eth, h=None, sender=WHALE):
+    return {"blockNumber": str(block), "timeStamp": str(ts), "hash": h or f"0x{block:x}{ts:x}",
+            "value": str(int(value_eth * 1e18)), "from": sender, "to": "0xdead"}
+
+
+class FakeEtherscan:
+    def __init__(self, txs, balance=100.0):
+        self.txs = list(txs)
+        self.balance = balance
+        self.calls = []
+
+    async def get_balances(self, addresses):
+        self.calls.append(("balancemulti", len(addresses)))
+        return {a.lower(): self.balance for a in addresses}
+
+    async def get_transactions(self, address, limit=10):
+        self.calls.append(("txlist", 0))
+        return sorted(self.txs, key=lambda t: -int(t["blockNumber"]))[:limit]
+
+    async def get_transactions_since(self, address, startblock, limit=100):
+        self.calls.append(("txlist", startblock))
+        return [t for t in self.txs if int(t["blockNumber"]) >= startblock][:limit]
+
+
+def _poll(tracker, addresses=(WHALE,), now=1000.0):
+    return asyncio.run(tracker.poll_async(addresses, now=now))
+
+
+class TestWalletTracker:
+    """Cursors, dedup, balance gating and persistence"""
+
+    def test_only_new_transactions_are_returned(self, tmp_path):
+        client = FakeEtherscan([_tx(10, 100, 1), _tx(11, 200, 2, h="0xa")])
+        tracker = WalletTracker(tmp_path, client=client)
+        assert _poll(tracker)[WHALE] == []            # bootstrap seeds history only
+        assert tracker.cursor(WHALE).block == 11
+
+        client.txs += [_tx(11, 201, 3, h="0xb"), _tx(12, 300, 4)]
+        client.balance = 90.0
+        new = _poll(tracker, now=1010.0)[WHALE]
+        assert [t.hash for t in new] == ["0xb", _tx(12, 300, 4)["hash"]]
+        assert client.calls[-1] == ("txlist", 11)
+        assert len(tracker.history(WHALE)) == 4
+
+    def test_unchanged_balance_skips_txlist(self, tmp_path):
+        client = FakeEtherscan([_tx(10, 100, 1)])
+        tracker = WalletTracker(tmp_path, client=client)
+        _poll(tracker)
+        client.calls.clear()
+        assert _poll(tracker, now=1010.0)[WHALE] == []
+        assert client.calls == [("balancemulti", 1)]
+        assert tracker.stats["balance_skips"] == 1
+
+    def test_state_survives_restart(self, tmp_path):
+        client = FakeEtherscan([_tx(10, 100, 1)])
+        _poll(WalletTracker(tmp_path, client=client))
+        client.txs.append(_tx(11, 200, 5))
+        client.balance = 95.0
+        restarted = WalletTracker(tmp_path, client=client)
+        new = _poll(restarted, now=1010.0)[WHALE]
+        assert [t.block for t in new] == [11]
+        assert [t.block for t in restarted.history(WHALE)] == [10, 11]
+
+
+class TestPatterns:
+    """Rapid-fire bursts and repeated amounts over stored history"""
+
+    def test_rapid_fire(self):
+        txs = [WalletTx.from_etherscan(_tx(i, ts, 1)) for i, ts in enumerate([0, 60, 120, 180, 5000, 9000])]
+        bursts = rapid_fire(txs)
+        assert [[t.timestamp for t in b] for b in bursts] == [[0, 60, 120, 180]]
+
+    def test_repeated_amounts(self):
+        txs = [WalletTx.from_etherscan(_tx(i, i, v)) for i, v in enumerate([50, 51, 52.5, 3, 3.1, 3.2, 400])]
+        groups = repeated_amounts(txs)
+        assert [[t.value_eth for t in g] for g in groups] == [[50, 51, 52.5]]
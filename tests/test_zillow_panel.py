@@ -0,0 +1,124 @@
+"""
+Tests for the columnar Zillow panel and vectorized metro scoring.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.zillow_distress_agent import (
+    _pct_change_latest,
+    _pct_change_panel,
+    _zscore_latest,
+    classify_distress_regime,
+    classify_distress_regimes,
+    estimate_time_to_mean_months,
+    estimate_time_to_mean_panel,
+    REGIMES,
+)
+from data_sources import zillow_panel
+from data_sources.zillow_panel import ZILLOW_FILES, load_panel
+
+
+def _write_csvs(data_dir, metros=("Austin, TX", "Boise, ID", "Tampa, FL"), months=48, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2019-01-31", periods=months, freq="ME").strftime("%Y-%m-%d")
+    for name, fn in ZILLOW_FILES.items():
+        cols = dates[:-1] if name == "zori" else dates  # rent lags a month
+        values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(metros), len(cols))), axis=1))
+        df = pd.DataFrame(values, columns=cols)
+        df.insert(0, "RegionName", list(metros))
+        df.insert(0, "RegionID", range(len(metros)))
+        df.to_csv(data_dir / fn, index=False)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    zillow_panel._cache.clear()
+    _write_csvs(tmp_path)
+    yield tmp_path
+    zillow_panel._cache.clear()
+
+
+class TestZillowPanel:
+    """CSV -> aligned metro x month panel, rebuilt only on source change"""
+
+    def test_alignment(self, data_dir):
+        panel = load_panel(data_dir)
+        assert list(panel.metros) == ["Austin, TX", "Boise, ID", "Tampa, FL"]
+        assert panel.values.shape == (6, 3, 48)
+        assert str(panel.dates[-1]) == "2022-12-31"
+        assert np.isnan(panel["zori"][:, -1]).all()
+        assert not np.isnan(panel["zhvi"]).any()
+
+    def test_cached_until_source_changes(self, data_dir, monkeypatch):
+        first = load_panel(data_dir)
+        assert (data_dir / zillow_panel.PANEL_FILE).exists()
+
+        # Fresh process: served from the .npz without re-reading CSVs
+        zillow_panel._cache.clear()
+        monkeypatch.setattr(zillow_panel, "build_panel", lambda paths: pytest.fail("rebuilt"))
+        assert np.array_equal(load_panel(data_dir).values, first.values, equal_nan=True)
+        monkeypatch.undo()
+
+        path = data_dir / ZILLOW_FILES["zhvi"]
+        df = pd.read_csv(path)
+        df.iloc[0, -1] = 1.0
+        df.to_csv(path, index=False)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        rebuilt = load_panel(data_dir)
+        assert rebuilt["zhvi"][0, -1] == 1.0
+
+
+class TestVectorizedScoring:
+    """2-D scoring matches the per-metro definitions"""
+
+    def test_zscore_matches_series_definition(self):
+        rng = np.random.default_rng(3)
+        X = rng.normal(size=(4, 80))
+        X[1, :30] = np.nan  # shorter history
+        X[2, :75] = np.nan  # too short to score
+        z = _zscore_latest(X, 60)
+
+        for i in (0, 1):
+            ts = pd.Series(X[i]).dropna()
+            window = ts.iloc[-60:]
+            assert z[i] == pytest.approx((ts.iloc[-1] - window.mean()) / window.std(ddof=0))
+        assert z[2] == 0.0
+
+    def test_gaps_skipped_like_dropna(self):
+        rng = np.random.default_rng(11)
+        X = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (3, 90)), axis=1))
+        X[0, [60, 61, 75, 88]] = np.nan      # missing months inside the windows
+        X[1, :20] = np.nan
+        X[1, 70:74] = np.nan
+        change = _pct_change_panel(X, 12)
+        z = _zscore_latest(change, 60)
+        latest = _pct_change_latest(X, 12)
+        recovery = estimate_time_to_mean_panel(change, lookback=60)
+
+        for i in range(3):
+            ts = pd.Series(X[i]).dropna()
+            assert latest[i] == pytest.approx(ts.iloc[-1] / ts.iloc[-13] - 1)
+            yoy = ts.pct_change(12).dropna()
+            window = yoy.iloc[-60:]
+            assert z[i] == pytest.approx((yoy.iloc[-1] - window.mean()) / window.std(ddof=0))
+            expected = estimate_time_to_mean_months(yoy, lookback=60)
+            for key, value in expected.items():
+                assert recovery[key][i] == pytest.approx(value)
+
+    def test_regimes_match_scalar(self):
+        rng = np.random.default_rng(5)
+        z = rng.normal(scale=2.0, size=(5, 20))
+        best, conf, _ = classify_distress_regimes(*z)
+        for j in range(z.shape[1]):
+            regime, c, _ = classify_distress_regime({
+                "z_dom": z[0, j], "z_inventory": z[1, j], "z_sales": z[2, j],
+                "z_afford": z[3, j], "z_rent_price_div": z[4, j],
+            })
+            assert REGIMES[best[j]] == regime
+            assert conf[j] == pytest.approx(c)
@@ -1,21 +1,20 @@
 """
 Portfolio-level Drawdown Governor
 
-Computes rolling portfolio drawdown from telemetry rewards.
+Computes rolling portfolio drawdown from telemetry rewards
+(via the streaming performance ledger).
 If drawdown breaches threshold:
 - reduces allocator aggressiveness
 - slows cadence
 - optionally quarantines high-variance agents
 """
 from dataclasses import dataclass
-from typing import Dict, Any, List
-from pathlib import Path
-import json
+from typing import Dict, Any, List, Tuple
 import logging
 
-logger = logging.getLogger(__name__)
+from telemetry.ledger import performance_ledger
 
-EVENTS = Path("telemetry/events.jsonl")
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -27,25 +26,12 @@ class DrawdownState:
 
 
 def load_rewards(last_n: int = 5000) -> List[float]:
-    """Load reward history from telemetry events."""
-    if not EVENTS.exists():
-        return []
-    
-    out = []
+    """Reward history (all agents) from the performance ledger."""
     try:
-        for ln in EVENTS.read_text().splitlines()[-last_n:]:
-            try:
-                e = json.loads(ln)
-            except Exception:
-                continue
-            r = e.get("reward")
-            if r is None:
-                continue
-            out.append(float(r))
+        return performance_ledger.portfolio_rewards(last_n=last_n)
     except Exception as e:
         logger.warning(f"Error loading rewards: {e}")
-    
-    return out
+        return []
 
 
 def compute_drawdown(rewards: List[float]) -> DrawdownState:
@@ -61,6 +47,16 @@ def compute_drawdown(rewards: List[float]) -> DrawdownState:
     return st
 
 
+def current_state() -> Tuple[DrawdownState, int]:
+    """Current drawdown over the portfolio window, kept incrementally by the ledger."""
+    stats = performance_ledger.portfolio_stats()
+    if not stats["count"]:
+        return DrawdownState(), 0
+    return DrawdownState(
+        peak=stats["peak"], equity=stats["equity"], drawdown=stats["drawdown"]
+    ), stats["count"]
+
+
 def governor(decision: Dict[str, Any], dd_limit: float = -3.0) -> Dict[str, Any]:
     """
     Apply drawdown governance to allocation decision.
@@ -74,8 +70,7 @@ def governor(decision: Dict[str, Any], dd_limit: float = -3.0) -> Dict[str, Any]
         - cadence_multiplier < 1 slows scheduler changes/runs
         - budget_multiplier < 1 reduces runs allocated
     """
-    rewards = load_rewards(last_n=5000)
-    st = compute_drawdown(rewards)
+    st, _ = current_state()
     breached = st.drawdown <= dd_limit
 
     if breached:
@@ -101,13 +96,12 @@ def governor(decision: Dict[str, Any], dd_limit: float = -3.0) -> Dict[str, Any]
 
 def get_drawdown_status() -> Dict[str, Any]:
     """Get current drawdown status for dashboard."""
-    rewards = load_rewards(last_n=5000)
-    st = compute_drawdown(rewards)
+    st, count = current_state()
     
     return {
         "equity": st.equity,
         "peak": st.peak,
         "drawdown": st.drawdown,
         "drawdown_pct": (st.drawdown / st.peak * 100) if st.peak > 0 else 0.0,
-        "sample_count": len(rewards),
+        "sample_count": count,
     }
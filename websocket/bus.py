@@ -0,0 +1,225 @@
+"""
+Findings Push Bus
+
+Process-local pub/sub for newly committed findings.
+
+The scheduler publishes each finding once, after its DB commit; the
+streaming endpoint fans events out to connected dashboard clients.
+A bounded history ring lets reconnecting clients resume from the last
+event id they saw without touching the database.
+"""
+
+import queue
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _norm_set(values, upper=False) -> Optional[Set[str]]:
+    if not values:
+        return None
+    if isinstance(values, str):
+        values = values.split(",")
+    out = {str(v).strip() for v in values if str(v).strip()}
+    if upper:
+        out = {v.upper() for v in out}
+    else:
+        out = {v.lower() for v in out}
+    return out or None
+
+
+class FindingFilter:
+    """Server-side filter on agent / symbol / severity (any-of per field)."""
+
+    def __init__(self, agents=None, symbols=None, severities=None):
+        self.agents = _norm_set(agents)
+        self.symbols = _norm_set(symbols, upper=True)
+        self.severities = _norm_set(severities)
+
+    def matches(self, event: dict) -> bool:
+        if self.agents and (event.get("agent_name") or "").lower() not in self.agents:
+            return False
+        if self.symbols and (event.get("symbol") or "").upper() not in self.symbols:
+            return False
+        if self.severities and (event.get("severity") or "").lower() not in self.severities:
+            return False
+        return True
+
+
+class Subscription:
+    """A single client's bounded event queue."""
+
+    def __init__(self, filters: FindingFilter, maxsize: int = 500):
+        self.filters = filters
+        self.queue: "queue.Queue[dict]" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: dict):
+        if not self.filters.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # Slow client: drop the oldest event rather than block the publisher
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+
+    def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class FindingsBus:
+    """
+    Thread-safe broadcast bus keyed by finding id.
+
+    Event ids are Finding primary keys, so they are monotonic and a
+    client's last id can also be resumed from the database when it has
+    fallen out of the history ring.
+    """
+
+    def __init__(self, history: int = 2000):
+        self._history: "deque[dict]" = deque(maxlen=history)
+        self._ids: Set[int] = set()
+        self._subs: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self._relay: Optional[threading.Thread] = None
+
+    def publish(self, event: dict) -> bool:
+        """Broadcast an event. Ids already in the ring are ignored (returns False)."""
+        with self._lock:
+            if event["id"] in self._ids:
+                return False
+            if len(self._history) == self._history.maxlen:
+                self._ids.discard(self._history[0]["id"])
+            self._history.append(event)
+            self._ids.add(event["id"])
+            self.published += 1
+            subs = list(self._subs)
+        for sub in subs:
+            sub.offer(event)
+        return True
+
+    def publish_findings(self, findings: Iterable) -> int:
+        """Publish committed Finding rows. Returns the number published."""
+        n = 0
+        for f in findings:
+            if getattr(f, "id", None) is None:
+                continue
+            n += self.publish(finding_event(f))
+        return n
+
+    def ensure_db_relay(self, app, interval: float = 5.0, overlap: int = 50):
+        """
+        Tail the findings table into this bus from a daemon thread.
+
+        Needed when findings are committed by another process (the standalone
+        scheduler worker or another web worker's embedded scheduler). Rows
+        already published in-process are deduplicated by id; re-reading the
+        last `overlap` ids catches rows that committed out of id order.
+        """
+        with self._lock:
+            if self._relay is not None:
+                return
+            self._relay = threading.Thread(
+                target=self._relay_loop, args=(app, interval, overlap),
+                name="findings-db-relay", daemon=True,
+            )
+        self._relay.start()
+
+    def _relay_loop(self, app, interval: float, overlap: int):
+        import logging
+        import time
+        from sqlalchemy import func
+        from models import Finding, db
+
+        logger = logging.getLogger(__name__)
+        with app.app_context():
+            cursor = db.session.query(func.max(Finding.id)).scalar() or 0
+            # Existing rows are history, not news: remember them without broadcasting
+            recent = Finding.query.filter(Finding.id > cursor - overlap).order_by(Finding.id.asc()).all()
+            with self._lock:
+                for f in recent:
+                    if f.id not in self._ids:
+                        self._history.append(finding_event(f))
+                        self._ids.add(f.id)
+            db.session.remove()
+            while True:
+                time.sleep(interval)
+                try:
+                    rows = (
+                        Finding.query.filter(Finding.id > cursor - overlap)
+                        .order_by(Finding.id.asc()).limit(500).all()
+                    )
+                    if rows:
+                        self.publish_findings(rows)
+                        cursor = max(cursor, rows[-1].id)
+                except Exception as e:
+                    logger.warning(f"Findings relay error: {e}")
+                finally:
+                    db.session.remove()
+
+    def subscribe(
+        self,
+        filters: Optional[FindingFilter] = None,
+        last_id: Optional[int] = None,
+    ) -> Tuple[Subscription, List[dict], bool]:
+        """
+        Register a subscriber.
+
+        Returns (subscription, backlog, complete). `backlog` holds buffered
+        events newer than `last_id` that match the filter; `complete` is
+        False when the ring no longer reaches back to `last_id` and the
+        caller should backfill from the database.
+        """
+        sub = Subscription(filters or FindingFilter())
+        with self._lock:
+            self._subs.add(sub)
+            if last_id is None:
+                return sub, [], True
+            backlog = [e for e in self._history if e["id"] > last_id and sub.filters.matches(e)]
+            oldest = self._history[0]["id"] if self._history else None
+        complete = oldest is not None and oldest <= last_id + 1
+        return sub, backlog, complete
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs.discard(sub)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subs),
+                "published": self.published,
+                "buffered": len(self._history),
+                "last_id": self._history[-1]["id"] if self._history else 0,
+            }
+
+
+def finding_event(f) -> dict:
+    """Compact, JSON-safe payload for a Finding row (same keys as to_dict)."""
+    return {
+        "id": f.id,
+        "agent_name": f.agent_name,
+        "timestamp": f.timestamp.isoformat() if f.timestamp else None,
+        "title": f.title,
+        "description": f.description,
+        "severity": f.severity,
+        "confidence": f.confidence,
+        "symbol": f.symbol,
+        "market_type": f.market_type,
+        "metadata": f.finding_metadata,
+    }
+
+
+findings_bus = FindingsBus()